@@ -1,3 +1,4 @@
+import asyncio
 import os
 import logging
 from uuid import uuid4
@@ -51,7 +52,7 @@ def init_openai_client():
 
 @bp_chat_history_response.route("/history/list", methods=["GET"])
 async def list_conversations():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
     if not config.enable_chat_history:
         return jsonify({"error": "Chat history is not available"}), 400
 
@@ -90,7 +91,7 @@ async def list_conversations():
 
 @bp_chat_history_response.route("/history/rename", methods=["POST"])
 async def rename_conversation():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
     if not config.enable_chat_history:
         return jsonify({"error": "Chat history is not available"}), 400
 
@@ -157,7 +158,7 @@ async def rename_conversation():
 
 @bp_chat_history_response.route("/history/read", methods=["POST"])
 async def get_conversation():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
     if not config.enable_chat_history:
         return jsonify({"error": "Chat history is not available"}), 400
 
@@ -234,7 +235,7 @@ async def get_conversation():
 
 @bp_chat_history_response.route("/history/delete", methods=["DELETE"])
 async def delete_conversation():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
     if not config.enable_chat_history:
         return jsonify({"error": "Chat history is not available"}), 400
 
@@ -300,7 +301,7 @@ async def delete_conversation():
 
 @bp_chat_history_response.route("/history/delete_all", methods=["DELETE"])
 async def delete_all_conversations():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
 
     # Check if chat history is available
     if not config.enable_chat_history:
@@ -371,7 +372,7 @@ async def delete_all_conversations():
 
 @bp_chat_history_response.route("/history/update", methods=["POST"])
 async def update_conversation():
-    config = ConfigHelper.get_active_config_or_default()
+    config = await asyncio.to_thread(ConfigHelper.get_active_config_or_default)
     if not config.enable_chat_history:
         return jsonify({"error": "Chat history is not available"}), 400
 
@@ -478,9 +479,6 @@ async def update_conversation():
 @bp_chat_history_response.route("/history/frontend_settings", methods=["GET"])
 def get_frontend_settings():
     try:
-        # Clear the cache for the config helper method
-        ConfigHelper.get_active_config_or_default.cache_clear()
-
         # Retrieve active config
         config = ConfigHelper.get_active_config_or_default()
 
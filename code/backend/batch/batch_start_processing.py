@@ -18,14 +18,24 @@ logger.setLevel(level=os.environ.get("LOGLEVEL", "INFO").upper())
 
 @bp_batch_start_processing.route(route="BatchStartProcessing")
 def batch_start_processing(req: func.HttpRequest) -> func.HttpResponse:
-    logger.info("Requested to start processing all documents received")
+    # With incremental=true, only files that are new or changed since they were
+    # last ingested are reprocessed
+    incremental = req.params.get("incremental", "false").lower() == "true"
+    logger.info(
+        f"Requested to start processing {'new and changed' if incremental else 'all'} documents received"
+    )
     env_helper: EnvHelper = EnvHelper()
     # Set up Blob Storage Client
     azure_blob_storage_client = AzureBlobStorageClient()
-    # Get all files from Blob Storage
-    files_data = azure_blob_storage_client.get_all_files()
-
-    files_data = list(map(lambda x: {"filename": x["filename"]}, files_data))
+    if incremental:
+        files_data = [
+            {"filename": filename}
+            for filename in azure_blob_storage_client.get_changed_files()
+        ]
+    else:
+        # Get all files from Blob Storage
+        files_data = azure_blob_storage_client.get_all_files()
+        files_data = list(map(lambda x: {"filename": x["filename"]}, files_data))
 
     if env_helper.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION:
         reprocess_integrated_vectorization(env_helper)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+import asyncpg
+from azure.core.credentials import AccessToken
+
+from ..helpers.app_event_loop import AppEventLoop
+from ..helpers.azure_credential_utils import get_azure_credential
+from ..helpers.env_helper import EnvHelper
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresConversationPool:
+    """
+    App-lifetime asyncpg pool of the chat history database, shared by the
+    PostgresConversationClient of every request, see ClientRegistry. Reusing
+    connections also reuses the statements asyncpg prepares and caches per
+    connection, so the fixed chat history queries are not parsed again for
+    every request.
+
+    An asyncpg pool belongs to the event loop it was created in, so the pool
+    is created and queried in the AppEventLoop, in which the web app runs its
+    async views. Queries made from any other event loop are handed over to
+    it. It opens up to AZURE_POSTGRES_CHAT_HISTORY_POOL_SIZE connections.
+
+    Connections are authenticated with an Entra ID token when they are
+    opened. The token is fetched again once it is about to expire, so that
+    connections opened later are authenticated too.
+    """
+
+    TOKEN_SCOPE = "https://ossrdbms-aad.database.windows.net/.default"
+    TOKEN_REFRESH_MARGIN = 300
+    CLOSE_TIMEOUT = 10
+
+    def __init__(self, user: str, host: str, database: str):
+        env_helper = EnvHelper()
+        self.user = user
+        self.host = host
+        self.database = database
+        self.max_size = env_helper.AZURE_POSTGRES_CHAT_HISTORY_POOL_SIZE
+        self.__credential = get_azure_credential(env_helper.MANAGED_IDENTITY_CLIENT_ID)
+        self.__token: Optional[AccessToken] = None
+        self.__pool: Optional[asyncpg.Pool] = None
+        self.__pool_lock: Optional[asyncio.Lock] = None
+        self.__event_loop = AppEventLoop()
+        self.__stats_lock = threading.Lock()
+        self.connections_opened = 0
+        self.token_refreshes = 0
+        self.queries = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+
+    async def fetch(self, query: str, *args) -> list:
+        return await self.__submit("fetch", query, *args)
+
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        return await self.__submit("fetchrow", query, *args)
+
+    async def execute(self, query: str, *args) -> str:
+        return await self.__submit("execute", query, *args)
+
+    async def __submit(self, method: str, query: str, *args) -> Any:
+        return await self.__event_loop.arun(self.__run(method, query, *args))
+
+    async def __run(self, method: str, query: str, *args) -> Any:
+        pool = await self.__get_pool()
+        start = time.perf_counter()
+        async with pool.acquire() as conn:
+            waited = time.perf_counter() - start
+            with self.__stats_lock:
+                self.queries += 1
+                self.acquire_wait_total += waited
+                self.acquire_wait_max = max(self.acquire_wait_max, waited)
+            return await getattr(conn, method)(query, *args)
+
+    async def __get_pool(self) -> asyncpg.Pool:
+        # only ever called in the AppEventLoop
+        if self.__pool_lock is None:
+            self.__pool_lock = asyncio.Lock()
+        async with self.__pool_lock:
+            if self.__pool is None:
+                self.__pool = await asyncpg.create_pool(
+                    user=self.user,
+                    host=self.host,
+                    database=self.database,
+                    password=self.__get_password,
+                    port=5432,
+                    ssl=True,
+                    min_size=1,
+                    max_size=self.max_size,
+                    init=self.__count_connection,
+                )
+                logger.info("Created the chat history connection pool")
+        return self.__pool
+
+    async def __get_password(self) -> str:
+        token = self.__token
+        if token is None or token.expires_on - time.time() < self.TOKEN_REFRESH_MARGIN:
+            token = await asyncio.to_thread(
+                self.__credential.get_token, self.TOKEN_SCOPE
+            )
+            self.__token = token
+            with self.__stats_lock:
+                self.token_refreshes += 1
+            logger.info("Fetched a token for the chat history database")
+        return token.token
+
+    async def __count_connection(self, conn: asyncpg.Connection) -> None:
+        with self.__stats_lock:
+            self.connections_opened += 1
+
+    def get_stats(self) -> dict:
+        pool = self.__pool
+        with self.__stats_lock:
+            return {
+                "size": pool.get_size() if pool else 0,
+                "idle": pool.get_idle_size() if pool else 0,
+                "max_size": self.max_size,
+                "connections_opened": self.connections_opened,
+                "token_refreshes": self.token_refreshes,
+                "queries": self.queries,
+                "acquire_wait_avg_ms": (
+                    self.acquire_wait_total / self.queries * 1000
+                    if self.queries
+                    else 0.0
+                ),
+                "acquire_wait_max_ms": self.acquire_wait_max * 1000,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the connections of the pool, in the AppEventLoop.
+        """
+        pool, self.__pool = self.__pool, None
+        if pool is None:
+            return
+        try:
+            self.__event_loop.run(asyncio.wait_for(pool.close(), self.CLOSE_TIMEOUT))
+        except Exception:
+            logger.exception("Failed to close the chat history connection pool")
@@ -1,9 +1,10 @@
 import logging
-import asyncpg
 from datetime import datetime, timezone
-from ..helpers.azure_credential_utils import get_azure_credential
+from ..helpers.client_registry import ClientRegistry
 from ..helpers.env_helper import EnvHelper
 
+from .postgres_conversation_pool import PostgresConversationPool
+
 from .database_client_base import DatabaseClientBase
 
 logger = logging.getLogger(__name__)
@@ -23,25 +24,18 @@ class PostgresConversationClient(DatabaseClientBase):
 
     async def connect(self):
         try:
-            credential = get_azure_credential(self.env_helper.MANAGED_IDENTITY_CLIENT_ID)
-            token = credential.get_token(
-                "https://ossrdbms-aad.database.windows.net/.default"
-            ).token
-            self.conn = await asyncpg.connect(
-                user=self.user,
-                host=self.host,
-                database=self.database,
-                password=token,
-                port=5432,
-                ssl=True,
+            self.conn = ClientRegistry().get_or_create(
+                "postgres_chat_history",
+                (self.host, self.database, self.user),
+                lambda: PostgresConversationPool(self.user, self.host, self.database),
             )
         except Exception as e:
             logger.error("Failed to connect to PostgreSQL: %s", e)
             raise
 
     async def close(self):
-        if self.conn:
-            await self.conn.close()
+        # the pool outlives the request, its connections are only returned
+        self.conn = None
 
     async def ensure(self):
         if not self.conn:
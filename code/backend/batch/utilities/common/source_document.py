@@ -63,6 +63,23 @@ class SourceDocument:
             dict_obj["chunk_id"],
         )
 
+    @staticmethod
+    def get_source(document_url: str) -> str:
+        """
+        Returns the source of the chunks of the document at the URL, without
+        the query of the URL, like a SAS token, which the placeholder stands
+        for in blob URLs.
+        """
+        parsed_url = urlparse(document_url)
+        file_url = parsed_url.scheme + "://" + parsed_url.netloc + parsed_url.path
+        sas_placeholder = (
+            "_SAS_TOKEN_PLACEHOLDER_"
+            if parsed_url.netloc
+            and parsed_url.netloc.endswith(".blob.core.windows.net")
+            else ""
+        )
+        return f"{file_url}{sas_placeholder}"
+
     @classmethod
     def from_metadata(
         cls: Type["SourceDocument"],
@@ -76,16 +93,10 @@ class SourceDocument:
         filename = parsed_url.path
         hash_key = hashlib.sha1(f"{file_url}_{idx}".encode("utf-8")).hexdigest()
         hash_key = f"doc_{hash_key}"
-        sas_placeholder = (
-            "_SAS_TOKEN_PLACEHOLDER_"
-            if parsed_url.netloc
-            and parsed_url.netloc.endswith(".blob.core.windows.net")
-            else ""
-        )
         return cls(
             id=metadata.get("id", hash_key),
             content=content,
-            source=metadata.get("source", f"{file_url}{sas_placeholder}"),
+            source=metadata.get("source", cls.get_source(document_url)),
             title=metadata.get("title", filename),
             chunk=metadata.get("chunk", idx),
             offset=metadata.get("offset"),
@@ -1,6 +1,6 @@
 from typing import List
 from .document_chunking_base import DocumentChunkingBase
-from langchain.text_splitter import TokenTextSplitter
+from .streaming import split_tokens
 from .chunking_strategy import ChunkingSettings
 from ..common.source_document import SourceDocument
 
@@ -12,19 +12,13 @@ class FixedSizeOverlapDocumentChunking(DocumentChunkingBase):
     def chunk(
         self, documents: List[SourceDocument], chunking: ChunkingSettings
     ) -> List[SourceDocument]:
-        full_document_content = "".join(
-            list(map(lambda document: document.content, documents))
-        )
         document_url = documents[0].source
-        splitter = TokenTextSplitter.from_tiktoken_encoder(
-            chunk_size=chunking.chunk_size, chunk_overlap=chunking.chunk_overlap
-        )
-        chunked_content_list = splitter.split_text(full_document_content)
-        # Create document for each chunk
-        documents = []
-        chunk_offset = 0
-        for idx, chunked_content in enumerate(chunked_content_list):
-            documents.append(
+        # Create document for each chunk, reading the pages one at a time
+        chunked_documents = []
+        for idx, (chunked_content, chunk_offset) in enumerate(
+            split_tokens(documents, chunking.chunk_size, chunking.chunk_overlap)
+        ):
+            chunked_documents.append(
                 SourceDocument.from_metadata(
                     content=chunked_content,
                     document_url=document_url,
@@ -32,5 +26,4 @@ class FixedSizeOverlapDocumentChunking(DocumentChunkingBase):
                     idx=idx,
                 )
             )
-            chunk_offset += len(chunked_content)
-        return documents
+        return chunked_documents
@@ -13,11 +13,9 @@ class JSONDocumentChunking(DocumentChunkingBase):
     def chunk(
         self, documents: List[SourceDocument], chunking: ChunkingSettings
     ) -> List[SourceDocument]:
-        full_document_content = "".join(
-            list(map(lambda document: str(document.content), documents))
-        )
         document_url = documents[0].source
-        json_data = json.loads(full_document_content)
+        # json.loads needs the whole document, only skip the copy of the pages
+        json_data = json.loads("".join(str(document.content) for document in documents))
         splitter = RecursiveJsonSplitter(max_chunk_size=chunking.chunk_size)
         chunked_content_list = splitter.split_json(json_data)
         # Create document for each chunk
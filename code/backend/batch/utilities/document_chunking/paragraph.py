@@ -1,15 +1,211 @@
-from typing import List
+import re
+from typing import Iterator, List, Optional, Tuple
 from .document_chunking_base import DocumentChunkingBase
 from .chunking_strategy import ChunkingSettings
+from .streaming import count_tokens, split_tokens
 from ..common.source_document import SourceDocument
 
+# The blocks emitted by the layout loader and WordDocumentLoading
+BLOCK_PATTERN = re.compile(r"<(h[1-6]|p|table)>(.*?)</\1>", re.DOTALL)
+# Text outside of the blocks, like the read loader output, is split on blank lines
+UNTAGGED_PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+
+
+class Block:
+    def __init__(
+        self,
+        tag: Optional[str],
+        content: str,
+        offset: int,
+        page_number: Optional[int],
+        tokens: int,
+    ) -> None:
+        self.tag = tag
+        self.content = content
+        self.offset = offset
+        self.page_number = page_number
+        self.tokens = tokens
+
+    @property
+    def heading_level(self) -> Optional[int]:
+        if self.tag is not None and self.tag.startswith("h"):
+            return int(self.tag[1])
+        return None
+
 
 class ParagraphDocumentChunking(DocumentChunkingBase):
+    """
+    Packs whole paragraphs and tables into chunks of up to chunk_size tokens.
+    A heading always starts a new chunk, and every chunk starts with the
+    headings of the section it belongs to. The headings of sections without
+    any paragraph start the chunk of the next section, or a chunk of their own
+    at the end of the document. The last paragraphs of a chunk, up to
+    chunk_overlap tokens, are repeated at the start of the next one in the
+    same section. Only a block larger than a chunk on its own is split, by
+    tokens, and a heading that large is chunked like a paragraph.
+    """
+
     def __init__(self) -> None:
         pass
 
-    # TO DO: Implement the following chunking strategies
     def chunk(
         self, documents: List[SourceDocument], chunking: ChunkingSettings
     ) -> List[SourceDocument]:
-        raise NotImplementedError("Paragraph chunking is not implemented yet")
+        document_url = documents[0].source
+        chunked_documents = []
+        # the section headings of the current block
+        headings: List[Block] = []
+        # the headings in no chunk yet, including the ones of ended sections
+        pending_headings: List[Block] = []
+
+        def get_chunk_headings() -> List[Block]:
+            return sorted(
+                headings
+                + [heading for heading in pending_headings if heading not in headings],
+                key=lambda heading: heading.offset,
+            )
+
+        def add_chunk(body: List[Block]) -> None:
+            # the headings are repeated, so the chunk is located by its body
+            first_block = body[0] if body else pending_headings[0]
+            chunked_documents.append(
+                SourceDocument.from_metadata(
+                    content="\n".join(
+                        block.content for block in get_chunk_headings() + body
+                    ),
+                    document_url=document_url,
+                    metadata={
+                        "offset": first_block.offset,
+                        "page_number": first_block.page_number,
+                    },
+                    idx=len(chunked_documents),
+                )
+            )
+            pending_headings.clear()
+
+        def add_split_block(block: Block) -> None:
+            headings_tokens = sum(heading.tokens for heading in get_chunk_headings())
+            chunk_size = max(chunking.chunk_size - headings_tokens, 1)
+            for part in self.__split_block(
+                block, chunk_size, min(chunking.chunk_overlap, chunk_size - 1)
+            ):
+                add_chunk([part])
+
+        body: List[Block] = []
+        body_tokens = 0
+        for block in self.__get_blocks(documents):
+            level = block.heading_level
+            if level is not None:
+                if body:
+                    add_chunk(body)
+                    body, body_tokens = [], 0
+                headings = [
+                    heading for heading in headings if heading.heading_level < level
+                ]
+                if block.tokens > chunking.chunk_size:
+                    # too large to start the chunks of its section
+                    add_split_block(block)
+                    continue
+                if pending_headings and (
+                    sum(heading.tokens for heading in get_chunk_headings())
+                    + block.tokens
+                    > chunking.chunk_size
+                ):
+                    add_chunk([])
+                headings.append(block)
+                pending_headings.append(block)
+                continue
+
+            headings_tokens = sum(heading.tokens for heading in get_chunk_headings())
+            if headings_tokens + block.tokens > chunking.chunk_size:
+                if body:
+                    add_chunk(body)
+                    body, body_tokens = [], 0
+                add_split_block(block)
+                continue
+
+            if body and headings_tokens + body_tokens + block.tokens > (
+                chunking.chunk_size
+            ):
+                add_chunk(body)
+                body = self.__get_overlap(
+                    body,
+                    min(
+                        chunking.chunk_overlap,
+                        chunking.chunk_size - headings_tokens - block.tokens,
+                    ),
+                )
+                body_tokens = sum(overlap.tokens for overlap in body)
+            body.append(block)
+            body_tokens += block.tokens
+
+        if body or pending_headings:
+            add_chunk(body)
+        return chunked_documents
+
+    def __get_blocks(self, documents: List[SourceDocument]) -> Iterator[Block]:
+        document_offset = 0
+        for document in documents:
+            for tag, content, offset in self.__parse_blocks(document.content):
+                yield Block(
+                    tag,
+                    content,
+                    document_offset + offset,
+                    document.page_number,
+                    count_tokens(content),
+                )
+            document_offset += len(document.content)
+
+    @staticmethod
+    def __parse_blocks(text: str) -> Iterator[Tuple[Optional[str], str, int]]:
+        position = 0
+        for match in BLOCK_PATTERN.finditer(text):
+            yield from ParagraphDocumentChunking.__parse_untagged(
+                text, position, match.start()
+            )
+            if match.group(2).strip():
+                yield match.group(1), match.group(0), match.start()
+            position = match.end()
+        yield from ParagraphDocumentChunking.__parse_untagged(text, position, len(text))
+
+    @staticmethod
+    def __parse_untagged(
+        text: str, start: int, end: int
+    ) -> Iterator[Tuple[Optional[str], str, int]]:
+        separators = list(UNTAGGED_PARAGRAPH_SEPARATOR.finditer(text, start, end))
+        paragraph_starts = [start] + [separator.end() for separator in separators]
+        paragraph_ends = [separator.start() for separator in separators] + [end]
+        for paragraph_start, paragraph_end in zip(paragraph_starts, paragraph_ends):
+            paragraph = text[paragraph_start:paragraph_end]
+            content = paragraph.strip()
+            if content:
+                yield None, content, paragraph_start + paragraph.index(content)
+
+    @staticmethod
+    def __split_block(
+        block: Block, chunk_size: int, chunk_overlap: int
+    ) -> Iterator[Block]:
+        # split the text inside the tags, and wrap each part in them again
+        opening_tag = f"<{block.tag}>" if block.tag else ""
+        closing_tag = f"</{block.tag}>" if block.tag else ""
+        text = block.content[len(opening_tag) : len(block.content) - len(closing_tag)]
+        for content, offset in split_tokens(
+            [SourceDocument(content=text, source="")], chunk_size, chunk_overlap
+        ):
+            yield Block(
+                block.tag,
+                f"{opening_tag}{content}{closing_tag}",
+                block.offset + len(opening_tag) + offset,
+                block.page_number,
+                0,
+            )
+
+    @staticmethod
+    def __get_overlap(body: List[Block], overlap_tokens: int) -> List[Block]:
+        overlap = []
+        for block in reversed(body):
+            if block.tokens > overlap_tokens:
+                break
+            overlap.insert(0, block)
+            overlap_tokens -= block.tokens
+        return overlap
@@ -0,0 +1,163 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import tiktoken
+from langchain.text_splitter import Language, MarkdownTextSplitter
+
+from ..common.source_document import SourceDocument
+
+# The langchain text splitters count tokens with the gpt2 encoding by default
+_ENCODING_NAME = "gpt2"
+# UTF-8 continuation bytes, every other byte starts a character
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+_MARKDOWN_SEPARATORS = MarkdownTextSplitter.get_separators_for_language(
+    Language.MARKDOWN
+)
+# the chunks split_markdown splits again with the next page at most
+MAX_CARRIED_CHUNKS = 2
+
+
+@lru_cache(maxsize=None)
+def get_encoder(encoding_name: str = _ENCODING_NAME) -> tiktoken.Encoding:
+    return tiktoken.get_encoding(encoding_name)
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoder().encode(text))
+
+
+def split_tokens(
+    documents: Iterable[SourceDocument], chunk_size: int, chunk_overlap: int
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yields the (content, offset) of chunks of chunk_size tokens, each one
+    overlapping the previous one by chunk_overlap tokens, like TokenTextSplitter
+    does for the concatenated documents.
+
+    Each document is tokenized once, as it is reached, so only one page of
+    tokens plus the overlap is held at a time. Offsets are the position of each
+    chunk in the concatenated documents, in characters.
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError(
+            f"Chunk overlap ({chunk_overlap}) must be smaller than the chunk size ({chunk_size})"
+        )
+    encoder = get_encoder()
+    stride = chunk_size - chunk_overlap
+    tokens: List[int] = []
+    # offset of tokens[0] in the concatenated documents
+    offset = 0
+    for document in documents:
+        tokens.extend(encoder.encode(document.content))
+        # only emit a chunk once there are tokens after it, the last chunk is
+        # shorter and ends the document
+        while len(tokens) > chunk_size:
+            yield encoder.decode(tokens[:chunk_size]), offset
+            offset += _count_characters(encoder, tokens[:stride])
+            del tokens[:stride]
+    if tokens:
+        yield encoder.decode(tokens), offset
+
+
+def split_markdown(
+    documents: Iterable[SourceDocument], chunk_size: int, chunk_overlap: int
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yields the (content, offset) of the chunks MarkdownTextSplitter makes of the
+    concatenated documents, without concatenating them.
+
+    The splitter merges the pieces between its top level separators greedily,
+    so a chunk is only final once the piece after it is complete. Each document
+    is split along with the text from the first chunk that was not final yet,
+    restarting at a piece boundary, so only one page plus a few chunks is held
+    at a time.
+
+    A piece that goes on for pages, like a long section after the only heading,
+    would be carried and split again with every page. Rather, the split
+    restarts from the last chunk once more than MAX_CARRIED_CHUNKS chunks would
+    be carried, so the chunks of such a piece may be cut slightly differently
+    than when splitting the full document, but the text split with each page
+    stays within a chunk and its overlap.
+    """
+    splitter = MarkdownTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=count_tokens
+    )
+    text = ""
+    # offset of text in the concatenated documents
+    offset = 0
+    for document in documents:
+        text += document.content
+        chunks = _locate(text, splitter.split_text(text))
+        restart = _find_restart(text, chunks)
+        if restart is None or len(chunks) - restart[0] > MAX_CARRIED_CHUNKS:
+            if len(chunks) <= 1:
+                continue
+            # the last chunk holds the overlap with the chunk before it
+            restart = len(chunks) - 1, chunks[-1][1]
+        index, restart_position = restart
+        for chunk, position in chunks[:index]:
+            yield chunk, offset + position
+        text = text[restart_position:]
+        offset += restart_position
+    for chunk, position in _locate(text, splitter.split_text(text)):
+        yield chunk, offset + position
+
+
+def _find_restart(
+    text: str, chunks: List[Tuple[str, int]]
+) -> Optional[Tuple[int, int]]:
+    """
+    Returns the index of the last chunk the text can be split again from, with
+    the same result, once more text is added to it, and the position to split
+    it from. This is a chunk before the last piece, which may continue on the
+    next page, that starts a piece of the top level separator.
+    """
+    separator = next(
+        (
+            separator
+            for separator in _MARKDOWN_SEPARATORS
+            if separator == "" or separator in text
+        )
+    )
+    if separator == "":
+        return None
+    # pieces start with the separator before them
+    piece_starts = [0] + [
+        match.start() for match in re.finditer(re.escape(separator), text)
+    ]
+    last_piece_end = len(text[: piece_starts[-1]].rstrip())
+    restart = None
+    for index, (chunk, position) in enumerate(chunks):
+        piece_start = piece_starts[bisect_right(piece_starts, position) - 1]
+        if text[piece_start:position].isspace() or piece_start == position:
+            restart = index, piece_start
+        if position + len(chunk) >= last_piece_end:
+            break
+    return restart
+
+
+def _locate(text: str, chunks: List[str]) -> List[Tuple[str, int]]:
+    # each chunk starts after the previous one starts and ends after it ends,
+    # and the last one ends the text
+    text_end = len(text.rstrip())
+    located = []
+    start, end = -1, -1
+    for index, chunk in enumerate(chunks):
+        if index == len(chunks) - 1 and text.endswith(chunk, 0, text_end):
+            position = text_end - len(chunk)
+        else:
+            position = text.find(chunk, start + 1)
+            while position != -1 and position + len(chunk) <= end:
+                position = text.find(chunk, position + 1)
+            if position == -1:
+                position = start + 1
+        start, end = position, position + len(chunk)
+        located.append((chunk, position))
+    return located
+
+
+def _count_characters(encoder: tiktoken.Encoding, tokens: List[int]) -> int:
+    # a character split across tokens is counted with the token it starts in
+    return len(encoder.decode_bytes(tokens).translate(None, _CONTINUATION_BYTES))
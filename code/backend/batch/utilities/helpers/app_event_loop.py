@@ -0,0 +1,160 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from typing import AsyncIterator, Coroutine, Iterator, TypeVar
+
+from .client_registry import ClientRegistry
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AppEventLoop(Singleton):
+    """
+    Event loop running on a thread of its own, in which the web app runs its
+    async views and streams. Flask would otherwise run every
+    async view in a new event loop, so the async clients, which are bound to
+    the loop they were created in, could not be reused by the next request.
+    In one long-lived loop they are shared by all requests through the
+    ClientRegistry, and concurrent requests interleave while they await.
+
+    The threads serving the requests block until their coroutine is done, in
+    the context of the request. Blocking calls made by the coroutines must be
+    run with asyncio.to_thread, in a pool of APP_EVENT_LOOP_BLOCKING_THREADS
+    threads, so that they do not hold up the other requests.
+    """
+
+    CLOSE_TIMEOUT = 10
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            env_helper.APP_EVENT_LOOP_BLOCKING_THREADS,
+            thread_name_prefix="app-event-loop-blocking",
+        )
+        self.__loop = asyncio.new_event_loop()
+        self.__loop.set_default_executor(self.__executor)
+        self.__thread = threading.Thread(
+            target=self.__run_loop, name="app-event-loop", daemon=True
+        )
+        self.__thread.start()
+        self.__stats_lock = threading.Lock()
+        self.tasks = 0
+        self.active_tasks = 0
+        self.max_active_tasks = 0
+
+    def run(self, coroutine: Coroutine[object, object, T]) -> T:
+        """
+        Runs the coroutine in the event loop, in a copy of the context of the
+        calling thread, and returns its result once it is done.
+        """
+        if threading.current_thread() is self.__thread:
+            raise RuntimeError("AppEventLoop.run cannot be called from its own loop")
+        context = contextvars.copy_context()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def start() -> None:
+            # the task runs in a copy of the context it is created in
+            task = context.run(self.__loop.create_task, coroutine)
+            task.add_done_callback(lambda done: self.__complete(done, future))
+
+        with self.__stats_lock:
+            self.tasks += 1
+            self.active_tasks += 1
+            self.max_active_tasks = max(self.max_active_tasks, self.active_tasks)
+        try:
+            self.__loop.call_soon_threadsafe(start)
+        except RuntimeError:
+            # the loop is closed
+            with self.__stats_lock:
+                self.active_tasks -= 1
+            coroutine.close()
+            raise
+        return future.result()
+
+    async def arun(self, coroutine: Coroutine[object, object, T]) -> T:
+        """
+        Awaits the coroutine in the event loop, from a coroutine running in
+        this or any other event loop, like for clients bound to this one.
+        """
+        if asyncio.get_running_loop() is self.__loop:
+            return await coroutine
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        )
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """
+        Yields the items of the async iterator, each awaited in the event
+        loop, like for a streamed response. The iterator is closed when the
+        generator is closed before it is exhausted.
+        """
+        exhausted = False
+        try:
+            while True:
+                try:
+                    yield self.run(self.__anext(iterator))
+                except StopAsyncIteration:
+                    exhausted = True
+                    return
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if not exhausted and aclose is not None:
+                self.run(aclose())
+
+    def get_stats(self) -> dict:
+        with self.__stats_lock:
+            return {
+                "tasks": self.tasks,
+                "active_tasks": self.active_tasks,
+                "max_active_tasks": self.max_active_tasks,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the async clients created in the event loop, then stops the
+        loop and its thread, and the threads of the blocking calls.
+        """
+        if not self.__loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                ClientRegistry().aclose_loop_clients(), self.__loop
+            ).result(self.CLOSE_TIMEOUT)
+        except Exception:
+            logger.exception("Failed to close the async clients of the event loop")
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join(self.CLOSE_TIMEOUT)
+        self.__executor.shutdown(wait=False)
+        logger.info("Closed the app event loop")
+
+    def __run_loop(self) -> None:
+        try:
+            self.__loop.run_forever()
+        finally:
+            self.__loop.close()
+
+    @staticmethod
+    async def __anext(iterator: AsyncIterator[T]) -> T:
+        return await iterator.__anext__()
+
+    def __complete(self, task: asyncio.Task, future: concurrent.futures.Future):
+        with self.__stats_lock:
+            self.active_tasks -= 1
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    @classmethod
+    def clear_instance(cls):
+        if cls._instance is not None:
+            cls._instance.close()
+        super().clear_instance()
@@ -1,3 +1,4 @@
+import base64
 import mimetypes
 from typing import Optional
 from datetime import datetime, timedelta
@@ -9,10 +10,16 @@ from azure.storage.blob import (
     UserDelegationKey,
 )
 from azure.core.credentials import AzureNamedKeyCredential
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.queue import QueueClient, BinaryBase64EncodePolicy
 import chardet
 from .env_helper import EnvHelper
 from .azure_credential_utils import get_azure_credential
+from .client_registry import ClientRegistry
+from .blob_sas_cache import BlobSasCache
+
+# Blob metadata recording the Content-MD5 of the blob when it was last ingested
+INGESTED_CONTENT_MD5_METADATA_KEY = "ingested_content_md5"
 
 
 def connection_string(account_name: str, account_key: str):
@@ -39,6 +46,13 @@ def create_queue_client():
         )
 
 
+def encode_content_md5(content_md5) -> Optional[str]:
+    # Metadata values must be strings, so the MD5 digest is stored base64 encoded
+    if not content_md5:
+        return None
+    return base64.b64encode(bytes(content_md5)).decode("ascii")
+
+
 class AzureBlobStorageClient:
     def __init__(
         self,
@@ -55,18 +69,29 @@ class AzureBlobStorageClient:
 
         if self.auth_type == "rbac":
             self.account_key = None
-            self.blob_service_client = BlobServiceClient(
-                account_url=self.endpoint, credential=get_azure_credential(env_helper.MANAGED_IDENTITY_CLIENT_ID)
+            self.blob_service_client = ClientRegistry().get_or_create(
+                "blob",
+                (self.endpoint, None),
+                lambda: BlobServiceClient(
+                    account_url=self.endpoint,
+                    credential=get_azure_credential(env_helper.MANAGED_IDENTITY_CLIENT_ID),
+                    transport=ClientRegistry().create_transport("blob"),
+                ),
             )
             self.user_delegation_key = self.request_user_delegation_key(
                 blob_service_client=self.blob_service_client
             )
         else:
             self.account_key = account_key or env_helper.AZURE_BLOB_ACCOUNT_KEY
-            self.blob_service_client = BlobServiceClient(
-                self.endpoint,
-                credential=AzureNamedKeyCredential(
-                    name=self.account_name, key=self.account_key
+            self.blob_service_client = ClientRegistry().get_or_create(
+                "blob",
+                (self.endpoint, self.account_name, self.account_key),
+                lambda: BlobServiceClient(
+                    self.endpoint,
+                    credential=AzureNamedKeyCredential(
+                        name=self.account_name, key=self.account_key
+                    ),
+                    transport=ClientRegistry().create_transport("blob"),
                 ),
             )
             self.user_delegation_key = None
@@ -74,15 +99,15 @@ class AzureBlobStorageClient:
     def request_user_delegation_key(
         self, blob_service_client: BlobServiceClient
     ) -> UserDelegationKey:
-        # Get a user delegation key that's valid for 1 day
-        delegation_key_start_time = datetime.utcnow()
-        delegation_key_expiry_time = delegation_key_start_time + timedelta(days=1)
-
-        user_delegation_key = blob_service_client.get_user_delegation_key(
-            key_start_time=delegation_key_start_time,
-            key_expiry_time=delegation_key_expiry_time,
+        # Get a user delegation key that's valid for 1 day, shared by the
+        # clients of the account until it is about to expire
+        return BlobSasCache().get_user_delegation_key(
+            blob_service_client.url,
+            lambda start, expiry: blob_service_client.get_user_delegation_key(
+                key_start_time=start,
+                key_expiry_time=expiry,
+            ),
         )
-        return user_delegation_key
 
     def file_exists(self, file_name):
         blob_client = self.blob_service_client.get_blob_client(
@@ -91,6 +116,19 @@ class AzureBlobStorageClient:
 
         return blob_client.exists()
 
+    def get_etag(self, file_name) -> Optional[str]:
+        """
+        Returns the ETag of the file, which changes whenever the file is
+        written, or None if the file does not exist.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=file_name
+        )
+        try:
+            return blob_client.get_blob_properties().etag
+        except ResourceNotFoundError:
+            return None
+
     def upload_file(
         self,
         bytes_data,
@@ -181,14 +219,7 @@ class AzureBlobStorageClient:
         )
         blob_list = container_client.list_blobs(include="metadata")
         # sas = generate_blob_sas(account_name, container_name, blob.name,account_key=account_key,  permission="r", expiry=datetime.utcnow() + timedelta(hours=3))
-        sas = generate_container_sas(
-            self.account_name,
-            self.container_name,
-            user_delegation_key=self.user_delegation_key,
-            account_key=self.account_key,
-            permission="r",
-            expiry=datetime.utcnow() + timedelta(hours=3),
-        )
+        sas = self.__get_cached_container_sas(timedelta(hours=3))
         files = []
         converted_files = {}
         for blob in blob_list:
@@ -228,6 +259,42 @@ class AzureBlobStorageClient:
 
         return files
 
+    def get_changed_files(self) -> list[str]:
+        """
+        Lists the files that are new or whose content changed since they were
+        last ingested, by comparing each blob's Content-MD5 with the one
+        recorded in its metadata when its embeddings were added.
+
+        The ETag cannot be used for this, as it also changes whenever the
+        metadata is updated. Blobs without a Content-MD5 are always listed.
+
+        Returns:
+            list[str]: The names of the files to reprocess.
+        """
+        container_client = self.blob_service_client.get_container_client(
+            self.container_name
+        )
+        changed_files = []
+        for blob in container_client.list_blobs(include="metadata"):
+            if blob.name.startswith("converted/"):
+                continue
+            metadata = blob.metadata or {}
+            content_md5 = encode_content_md5(blob.content_settings.content_md5)
+            if (
+                metadata.get("embeddings_added", "false") != "true"
+                or content_md5 is None
+                or metadata.get(INGESTED_CONTENT_MD5_METADATA_KEY) != content_md5
+            ):
+                changed_files.append(blob.name)
+        return changed_files
+
+    def get_blob_content_md5(self, file_name) -> Optional[str]:
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=file_name
+        )
+        properties = blob_client.get_blob_properties()
+        return encode_content_md5(properties.content_settings.content_md5)
+
     def upsert_blob_metadata(self, file_name, metadata):
         blob_client = self.blob_service_client.get_blob_client(
             container=self.container_name, blob=file_name
@@ -241,13 +308,28 @@ class AzureBlobStorageClient:
 
     def get_container_sas(self):
         # Generate a SAS URL to the container and return it
-        return "?" + generate_container_sas(
-            account_name=self.account_name,
-            container_name=self.container_name,
-            user_delegation_key=self.user_delegation_key,
-            account_key=self.account_key,
-            permission="r",
-            expiry=datetime.utcnow() + timedelta(days=365 * 5),
+        return "?" + self.__get_cached_container_sas(timedelta(days=365 * 5))
+
+    def __get_cached_container_sas(self, lifetime: timedelta) -> str:
+        # A read SAS for the container, signed again only when the cached one
+        # is about to expire or the user delegation key was replaced
+        signing_key = (
+            self.user_delegation_key.value
+            if self.user_delegation_key is not None
+            else self.account_key
+        )
+        return BlobSasCache().get_sas(
+            (self.account_name, self.container_name, lifetime),
+            lifetime,
+            lambda expiry: generate_container_sas(
+                account_name=self.account_name,
+                container_name=self.container_name,
+                user_delegation_key=self.user_delegation_key,
+                account_key=self.account_key,
+                permission="r",
+                expiry=expiry,
+            ),
+            signing_key,
         )
 
     def get_blob_sas(self, file_name):
@@ -1,7 +1,12 @@
 import logging
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from .azure_credential_utils import get_azure_credential
+from .client_registry import ClientRegistry
 import html
 import traceback
 from .env_helper import EnvHelper
@@ -16,23 +21,37 @@ class AzureFormRecognizerClient:
         self.AZURE_FORM_RECOGNIZER_ENDPOINT: str = (
             env_helper.AZURE_FORM_RECOGNIZER_ENDPOINT
         )
+        self.pages_per_request = env_helper.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST
+        self.max_concurrency = max(1, env_helper.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY)
         if env_helper.AZURE_AUTH_TYPE == "rbac":
-            self.document_analysis_client = DocumentAnalysisClient(
-                endpoint=self.AZURE_FORM_RECOGNIZER_ENDPOINT,
-                credential=get_azure_credential(env_helper.MANAGED_IDENTITY_CLIENT_ID),
-                headers={
-                    "x-ms-useragent": "chat-with-your-data-solution-accelerator/1.0.0"
-                },
+            self.document_analysis_client = ClientRegistry().get_or_create(
+                "form_recognizer",
+                (self.AZURE_FORM_RECOGNIZER_ENDPOINT, None),
+                lambda: DocumentAnalysisClient(
+                    endpoint=self.AZURE_FORM_RECOGNIZER_ENDPOINT,
+                    credential=get_azure_credential(
+                        env_helper.MANAGED_IDENTITY_CLIENT_ID
+                    ),
+                    headers={
+                        "x-ms-useragent": "chat-with-your-data-solution-accelerator/1.0.0"
+                    },
+                    transport=ClientRegistry().create_transport("form_recognizer"),
+                ),
             )
         else:
             self.AZURE_FORM_RECOGNIZER_KEY: str = env_helper.AZURE_FORM_RECOGNIZER_KEY
 
-            self.document_analysis_client = DocumentAnalysisClient(
-                endpoint=self.AZURE_FORM_RECOGNIZER_ENDPOINT,
-                credential=AzureKeyCredential(self.AZURE_FORM_RECOGNIZER_KEY),
-                headers={
-                    "x-ms-useragent": "chat-with-your-data-solution-accelerator/1.0.0"
-                },
+            self.document_analysis_client = ClientRegistry().get_or_create(
+                "form_recognizer",
+                (self.AZURE_FORM_RECOGNIZER_ENDPOINT, self.AZURE_FORM_RECOGNIZER_KEY),
+                lambda: DocumentAnalysisClient(
+                    endpoint=self.AZURE_FORM_RECOGNIZER_ENDPOINT,
+                    credential=AzureKeyCredential(self.AZURE_FORM_RECOGNIZER_KEY),
+                    headers={
+                        "x-ms-useragent": "chat-with-your-data-solution-accelerator/1.0.0"
+                    },
+                    transport=ClientRegistry().create_transport("form_recognizer"),
+                ),
             )
 
     form_recognizer_role_to_html = {
@@ -73,83 +92,186 @@ class AzureFormRecognizerClient:
     def begin_analyze_document_from_url(
         self, source_url: str, use_layout: bool = True, paragraph_separator: str = ""
     ):
-        offset = 0
-        page_map = []
         model_id = "prebuilt-layout" if use_layout else "prebuilt-read"
 
         try:
             logger.info("Method begin_analyze_document_from_url started")
             logger.info(f"Model ID selected: {model_id}")
+            if self.pages_per_request > 0:
+                return self.__analyze_page_ranges(model_id, source_url)
             poller = self.document_analysis_client.begin_analyze_document_from_url(
                 model_id, document_url=source_url
             )
             form_recognizer_results = poller.result()
+            return self._build_page_map(form_recognizer_results)
+        except Exception as e:
+            logger.exception(f"Exception in begin_analyze_document_from_url: {e}")
+            raise ValueError(f"Error: {traceback.format_exc()}. Error: {e}")
+        finally:
+            logger.info("Method begin_analyze_document_from_url ended")
 
-            # (if using layout) mark all the positions of headers
-            roles_start = {}
-            roles_end = {}
-            for paragraph in form_recognizer_results.paragraphs:
-                # if paragraph.role!=None:
-                para_start = paragraph.spans[0].offset
-                para_end = paragraph.spans[0].offset + paragraph.spans[0].length
-                roles_start[para_start] = (
-                    paragraph.role if paragraph.role is not None else "paragraph"
-                )
-                roles_end[para_end] = (
-                    paragraph.role if paragraph.role is not None else "paragraph"
-                )
+    def __analyze_page_ranges(self, model_id: str, source_url: str):
+        """
+        Analyzes the document in ranges of pages_per_request pages, up to
+        max_concurrency ranges at a time, and stitches their page maps together.
 
-            for page_num, page in enumerate(form_recognizer_results.pages):
-                tables_on_page = [
-                    table
-                    for table in form_recognizer_results.tables
-                    if table.bounding_regions[0].page_number == page_num + 1
+        The page count is not known upfront, so ranges are requested in waves
+        until one comes back with fewer pages than requested.
+        """
+        page_map = []
+        offset = 0
+        first_page = 1
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="analyze"
+        ) as executor:
+            while True:
+                range_starts = [
+                    first_page + i * self.pages_per_request
+                    for i in range(self.max_concurrency)
+                ]
+                futures = [
+                    executor.submit(
+                        self.__analyze_page_range, model_id, source_url, start
+                    )
+                    for start in range_starts
                 ]
+                for start, future in zip(range_starts, futures):
+                    form_recognizer_results = future.result()
+                    if form_recognizer_results is None:
+                        return page_map
+                    for page in self._build_page_map(
+                        form_recognizer_results, first_page_number=start - 1
+                    ):
+                        page["offset"] += offset
+                        page_map.append(page)
+                    if page_map:
+                        offset = page_map[-1]["offset"] + len(page_map[-1]["page_text"])
+                    if len(form_recognizer_results.pages) < self.pages_per_request:
+                        logger.info(
+                            f"Analyzed {len(page_map)} pages in ranges of {self.pages_per_request}"
+                        )
+                        return page_map
+                first_page = range_starts[-1] + self.pages_per_request
+
+    def __analyze_page_range(self, model_id: str, source_url: str, first_page: int):
+        pages = f"{first_page}-{first_page + self.pages_per_request - 1}"
+        try:
+            poller = self.document_analysis_client.begin_analyze_document_from_url(
+                model_id, document_url=source_url, pages=pages
+            )
+            return poller.result()
+        except HttpResponseError as e:
+            # A range past the end of the document is rejected as a bad request
+            if first_page > 1 and e.status_code == 400:
+                logger.info(f"Pages {pages} are past the end of the document: {e}")
+                return None
+            raise
+
+    def _build_page_map(self, form_recognizer_results, first_page_number: int = 0):
+        offset = 0
+        page_map = []
+        content = form_recognizer_results.content
+
+        # (if using layout) mark all the positions of headers
+        roles_start = {}
+        roles_end = {}
+        for paragraph in form_recognizer_results.paragraphs:
+            para_start = paragraph.spans[0].offset
+            para_end = paragraph.spans[0].offset + paragraph.spans[0].length
+            roles_start[para_start] = (
+                paragraph.role if paragraph.role is not None else "paragraph"
+            )
+            roles_end[para_end] = (
+                paragraph.role if paragraph.role is not None else "paragraph"
+            )
+
+        # html to insert before the character at each position, opening tags first
+        tags = {}
+        for position in roles_start.keys() | roles_end.keys():
+            tag = ""
+            html_role = self.form_recognizer_role_to_html.get(roles_start.get(position))
+            if html_role is not None:
+                tag += f"<{html_role}>"
+            html_role = self.form_recognizer_role_to_html.get(roles_end.get(position))
+            if html_role is not None:
+                tag += f"</{html_role}>"
+            if tag:
+                tags[position] = tag
+        tag_positions = sorted(tags)
 
-                # (if using layout) mark all positions of the table spans in the page
-                page_offset = page.spans[0].offset
-                page_length = page.spans[0].length
-                table_chars = [-1] * page_length
-                for table_id, table in enumerate(tables_on_page):
-                    for span in table.spans:
-                        # replace all table spans with "table_id" in table_chars array
-                        for i in range(span.length):
-                            idx = span.offset - page_offset + i
-                            if idx >= 0 and idx < page_length:
-                                table_chars[idx] = table_id
-
-                # build page text by replacing charcters in table spans with table html and replace the characters corresponding to headers with html headers, if using layout
-                page_text = ""
-                added_tables = set()
-                for idx, table_id in enumerate(table_chars):
-                    if table_id == -1:
-                        position = page_offset + idx
-                        if position in roles_start.keys():
-                            role = roles_start[position]
-                            html_role = self.form_recognizer_role_to_html.get(role)
-                            if html_role is not None:
-                                page_text += f"<{html_role}>"
-                        if position in roles_end.keys():
-                            role = roles_end[position]
-                            html_role = self.form_recognizer_role_to_html.get(role)
-                            if html_role is not None:
-                                page_text += f"</{html_role}>"
-
-                        page_text += form_recognizer_results.content[page_offset + idx]
-
-                    elif table_id not in added_tables:
-                        page_text += self._table_to_html(tables_on_page[table_id])
-                        added_tables.add(table_id)
-
-                page_text += " "
-                page_map.append(
-                    {"page_number": page_num, "offset": offset, "page_text": page_text}
+        tables_by_page = defaultdict(list)
+        for table in form_recognizer_results.tables:
+            tables_by_page[table.bounding_regions[0].page_number].append(table)
+
+        for page_num, page in enumerate(
+            form_recognizer_results.pages, start=first_page_number
+        ):
+            tables_on_page = tables_by_page[page_num + 1]
+            page_offset = page.spans[0].offset
+            page_end = page_offset + page.spans[0].length
+
+            # build page text by replacing table spans with the table html and
+            # inserting html headers around paragraphs, if using layout
+            page_parts = []
+            added_tables = set()
+            position = page_offset
+            for start, end, table_id in self._get_table_intervals(
+                tables_on_page, page_offset, page_end
+            ):
+                self._append_text(
+                    page_parts, content, tags, tag_positions, position, start
                 )
-                offset += len(page_text)
+                if table_id not in added_tables:
+                    page_parts.append(self._table_to_html(tables_on_page[table_id]))
+                    added_tables.add(table_id)
+                position = end
+            self._append_text(
+                page_parts, content, tags, tag_positions, position, page_end
+            )
 
-            return page_map
-        except Exception as e:
-            logger.exception(f"Exception in begin_analyze_document_from_url: {e}")
-            raise ValueError(f"Error: {traceback.format_exc()}. Error: {e}")
-        finally:
-            logger.info("Method begin_analyze_document_from_url ended")
+            page_parts.append(" ")
+            page_text = "".join(page_parts)
+            page_map.append(
+                {"page_number": page_num, "offset": offset, "page_text": page_text}
+            )
+            offset += len(page_text)
+
+        return page_map
+
+    @staticmethod
+    def _get_table_intervals(tables, page_start: int, page_end: int):
+        """
+        Returns the (start, end, table_id) intervals of the page covered by the
+        tables, in order. Where spans overlap, the later table wins.
+        """
+        spans = []
+        for table_id, table in enumerate(tables):
+            for span in table.spans:
+                start = max(span.offset, page_start)
+                end = min(span.offset + span.length, page_end)
+                if start < end:
+                    spans.append((start, end, table_id))
+
+        boundaries = sorted({boundary for span in spans for boundary in span[:2]})
+        intervals = []
+        for start, end in zip(boundaries, boundaries[1:]):
+            covering = [
+                table_id
+                for span_start, span_end, table_id in spans
+                if span_start <= start and end <= span_end
+            ]
+            if covering:
+                intervals.append((start, end, max(covering)))
+        return intervals
+
+    @staticmethod
+    def _append_text(parts, content, tags, tag_positions, start: int, end: int):
+        # append content[start:end] with the html tags at those positions
+        i = bisect_left(tag_positions, start)
+        while i < len(tag_positions) and tag_positions[i] < end:
+            position = tag_positions[i]
+            parts.append(content[start:position])
+            parts.append(tags[position])
+            start = position
+            i += 1
+        parts.append(content[start:end])
@@ -1,9 +1,11 @@
 import logging
-from typing import Union
+import threading
+from typing import Set, Tuple, Union
 from langchain_community.vectorstores import AzureSearch
 from azure.core.credentials import AzureKeyCredential
-from .azure_credential_utils import get_azure_credential
+from .azure_credential_utils import get_azure_credential, get_azure_credential_async
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     ExhaustiveKnnAlgorithmConfiguration,
@@ -26,7 +28,9 @@ from azure.search.documents.indexes.models import (
 )
 
 from ..helpers.azure_computer_vision_client import AzureComputerVisionClient
+from .client_registry import ClientRegistry
 from .llm_helper import LLMHelper
+from .search_index_cache import SearchIndexCache
 from .env_helper import EnvHelper
 
 logger = logging.getLogger(__name__)
@@ -35,16 +39,41 @@ logger = logging.getLogger(__name__)
 class AzureSearchHelper:
     _search_dimension: int | None = None
     _image_search_dimension: int | None = None
+    _ensured_indexes: Set[Tuple[str, str]] = set()
+    _ensure_index_lock = threading.Lock()
 
     def __init__(self):
         self.llm_helper = LLMHelper()
         self.env_helper = EnvHelper()
 
-        search_credential = self._search_credential()
-        self.search_client = self._create_search_client(search_credential)
-        self.search_index_client = self._create_search_index_client(search_credential)
+        self.search_client, self.search_index_client = ClientRegistry().get_or_create(
+            "search", self.__get_client_key(), self.__create_clients
+        )
         self.azure_computer_vision_client = AzureComputerVisionClient(self.env_helper)
 
+    def __get_key(self) -> Tuple[str, str]:
+        return (
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            self.env_helper.AZURE_SEARCH_INDEX,
+        )
+
+    def __get_client_key(self) -> tuple:
+        return (
+            *self.__get_key(),
+            (
+                self.env_helper.AZURE_SEARCH_KEY
+                if self.env_helper.is_auth_type_keys()
+                else None
+            ),
+        )
+
+    def __create_clients(self) -> Tuple[SearchClient, SearchIndexClient]:
+        search_credential = self._search_credential()
+        return (
+            self._create_search_client(search_credential),
+            self._create_search_index_client(search_credential),
+        )
+
     def _search_credential(self):
         if self.env_helper.is_auth_type_keys():
             return AzureKeyCredential(self.env_helper.AZURE_SEARCH_KEY)
@@ -58,19 +87,68 @@ class AzureSearchHelper:
             endpoint=self.env_helper.AZURE_SEARCH_SERVICE,
             index_name=self.env_helper.AZURE_SEARCH_INDEX,
             credential=search_credential,
+            transport=ClientRegistry().create_transport("search"),
         )
 
     def _create_search_index_client(
         self, search_credential: Union[AzureKeyCredential, get_azure_credential]
     ):
         return SearchIndexClient(
-            endpoint=self.env_helper.AZURE_SEARCH_SERVICE, credential=search_credential
+            endpoint=self.env_helper.AZURE_SEARCH_SERVICE,
+            credential=search_credential,
+            transport=ClientRegistry().create_transport("search"),
         )
 
     def get_search_client(self) -> SearchClient:
-        self.create_index()
+        self.ensure_index()
         return self.search_client
 
+    async def get_async_search_client(self) -> AsyncSearchClient:
+        """
+        Returns the async search client of the running event loop. The index
+        is ensured when the helper's search client is first requested, which
+        the search handlers do when they are created.
+        """
+        search_client, _ = await ClientRegistry().aget_or_create(
+            "search_async", self.__get_client_key(), self.__create_async_clients
+        )
+        return search_client
+
+    async def __create_async_clients(self) -> tuple:
+        if self.env_helper.is_auth_type_keys():
+            search_credential = AzureKeyCredential(self.env_helper.AZURE_SEARCH_KEY)
+        else:
+            search_credential = await get_azure_credential_async(
+                self.env_helper.MANAGED_IDENTITY_CLIENT_ID
+            )
+        search_client = AsyncSearchClient(
+            endpoint=self.env_helper.AZURE_SEARCH_SERVICE,
+            index_name=self.env_helper.AZURE_SEARCH_INDEX,
+            credential=search_credential,
+            transport=ClientRegistry().create_async_transport("search_async"),
+        )
+        # the async credential holds a session of its own, closed with the client
+        return search_client, search_credential
+
+    def ensure_index(self) -> None:
+        """
+        Creates the index if it does not exist, once per process. Once an
+        index is created or found, it is not checked again until
+        clear_ensured_indexes is called.
+        """
+        key = self.__get_key()
+        if key in AzureSearchHelper._ensured_indexes:
+            return
+        with AzureSearchHelper._ensure_index_lock:
+            if key not in AzureSearchHelper._ensured_indexes:
+                self.create_index()
+                AzureSearchHelper._ensured_indexes.add(key)
+
+    @classmethod
+    def clear_ensured_indexes(cls):
+        with cls._ensure_index_lock:
+            cls._ensured_indexes = set()
+
     @property
     def search_dimensions(self) -> int:
         if AzureSearchHelper._search_dimension is None:
@@ -88,6 +166,11 @@ class AzureSearchHelper:
         return AzureSearchHelper._image_search_dimension
 
     def create_index(self):
+        # the schema needs the embedding dimensions, so it is only built when
+        # the index has to be created
+        if not self._index_not_exists(self.env_helper.AZURE_SEARCH_INDEX):
+            return
+
         fields = [
             SimpleField(
                 name=self.env_helper.AZURE_SEARCH_FIELDS_ID,
@@ -214,16 +297,18 @@ class AzureSearchHelper:
             ),
         )
 
-        if self._index_not_exists(self.env_helper.AZURE_SEARCH_INDEX):
-            logger.info(
-                f"Creating or updating index {self.env_helper.AZURE_SEARCH_INDEX}"
-            )
-            self.search_index_client.create_index(index)
+        logger.info(f"Creating or updating index {self.env_helper.AZURE_SEARCH_INDEX}")
+        self.search_index_client.create_index(index)
+        SearchIndexCache().mark_created(
+            self.env_helper.AZURE_SEARCH_SERVICE, index.name
+        )
 
     def _index_not_exists(self, index_name: str) -> bool:
-        return index_name not in [
-            name for name in self.search_index_client.list_index_names()
-        ]
+        return not SearchIndexCache().index_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            index_name,
+            self.search_index_client.list_index_names,
+        )
 
     def get_conversation_logger(self):
         fields = [
@@ -0,0 +1,124 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from azure.storage.blob import UserDelegationKey
+
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class BlobSasCache(Singleton):
+    """
+    Holds on to the user delegation keys of the storage accounts and to the
+    SAS tokens signed with them or with the account key, so that
+    rendering citations neither requests a new key nor signs a new SAS for
+    every source document. Keys and tokens are replaced once less than
+    AZURE_BLOB_SAS_EXPIRY_MARGIN seconds are left before they expire.
+
+    A SAS signed with a user delegation key is only valid as long as the key,
+    so callers pass the value of the key they sign with to get_sas: the token
+    expires no later than the key, and the tokens signed with a key are
+    dropped once the key is replaced.
+    """
+
+    USER_DELEGATION_KEY_LIFETIME = timedelta(days=1)
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.__margin = timedelta(seconds=env_helper.AZURE_BLOB_SAS_EXPIRY_MARGIN)
+        self.__user_delegation_keys_lock = threading.Lock()
+        self.__user_delegation_keys: Dict[str, Tuple[datetime, UserDelegationKey]] = {}
+        self.__sas_tokens_lock = threading.Lock()
+        self.__sas_tokens: Dict[
+            Tuple[Hashable, Optional[str]], Tuple[datetime, str]
+        ] = {}
+        # the expiry of the user delegation keys, by their value
+        self.__signing_key_expiries: Dict[str, datetime] = {}
+        self.__stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_user_delegation_key(
+        self,
+        account_url: str,
+        request: Callable[[datetime, datetime], UserDelegationKey],
+    ) -> UserDelegationKey:
+        """
+        Returns the user delegation key of the account, calling request with
+        the start and expiry time of a new key when there is none yet or the
+        cached one is about to expire.
+        """
+        now = datetime.utcnow()
+        # held during the request, so concurrent clients wait for a single key
+        with self.__user_delegation_keys_lock:
+            entry = self.__user_delegation_keys.get(account_url)
+            if entry is not None and now < entry[0] - self.__margin:
+                self.__count(hit=True)
+                return entry[1]
+            expiry = now + self.USER_DELEGATION_KEY_LIFETIME
+            user_delegation_key = request(now, expiry)
+            self.__user_delegation_keys[account_url] = (expiry, user_delegation_key)
+            with self.__sas_tokens_lock:
+                if entry is not None:
+                    self.__drop_signing_key(entry[1].value)
+                self.__signing_key_expiries[user_delegation_key.value] = expiry
+        self.__count(hit=False)
+        logger.info(f"Requested a user delegation key for {account_url}")
+        return user_delegation_key
+
+    def get_sas(
+        self,
+        key: Hashable,
+        lifetime: timedelta,
+        generate: Callable[[datetime], str],
+        signing_key: Optional[str] = None,
+    ) -> str:
+        """
+        Returns the SAS token cached under key for the signing key, calling
+        generate with the expiry time of a new token when there is none yet or
+        the cached one is about to expire. The token expires lifetime from
+        now, or with the user delegation key it is signed with, if sooner.
+        """
+        now = datetime.utcnow()
+        with self.__sas_tokens_lock:
+            entry = self.__sas_tokens.get((key, signing_key))
+            if entry is not None and now < entry[0] - self.__margin:
+                self.__count(hit=True)
+                return entry[1]
+            # drop the expired tokens
+            self.__sas_tokens = {
+                cached_key: cached
+                for cached_key, cached in self.__sas_tokens.items()
+                if now < cached[0] - self.__margin
+            }
+            expiry = now + lifetime
+            signing_key_expiry = self.__signing_key_expiries.get(signing_key)
+            if signing_key_expiry is not None:
+                expiry = min(expiry, signing_key_expiry)
+            sas = generate(expiry)
+            self.__sas_tokens[(key, signing_key)] = (expiry, sas)
+        self.__count(hit=False)
+        return sas
+
+    def get_stats(self) -> dict:
+        with self.__stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def __drop_signing_key(self, signing_key: str) -> None:
+        self.__signing_key_expiries.pop(signing_key, None)
+        self.__sas_tokens = {
+            cached_key: cached
+            for cached_key, cached in self.__sas_tokens.items()
+            if cached_key[1] != signing_key
+        }
+
+    def __count(self, hit: bool) -> None:
+        with self.__stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
@@ -0,0 +1,376 @@
+import asyncio
+import importlib.util
+import inspect
+import logging
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple, TypeVar
+
+import aiohttp
+import httpx
+import requests
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ClientRegistry(Singleton):
+    """
+    Registry of the Azure SDK and OpenAI clients. Every helper
+    gets its clients from here, so that requests reuse the open connections
+    and cached tokens of the first client instead of opening new ones. The
+    clients are thread safe, so one instance of each is shared.
+
+    The transports created by the registry keep up to
+    AZURE_CLIENT_CONNECTION_POOL_SIZE connections open per host, and count
+    the connections they open and the requests they send, see get_stats. The
+    HTTP clients of the OpenAI clients keep idle connections open for
+    AZURE_CLIENT_KEEPALIVE_EXPIRY seconds, use HTTP/2 when the h2 package is
+    installed, and measure how long requests wait for a connection.
+
+    Async clients are bound to the event loop they were created in, so they
+    are shared per event loop, see aget_or_create. The web app runs all its
+    async views in the AppEventLoop, so its async clients are shared by all
+    requests.
+    """
+
+    EVENTS = ["created", "closed"]
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.pool_size = max(1, env_helper.AZURE_CLIENT_CONNECTION_POOL_SIZE)
+        self.keepalive_expiry = env_helper.AZURE_CLIENT_KEEPALIVE_EXPIRY
+        self.http2 = importlib.util.find_spec("h2") is not None
+        self.__clients_lock = threading.Lock()
+        self.__clients: Dict[Tuple[str, Hashable], Any] = {}
+        # held while a client is created, so that clients of other names and
+        # keys are got meanwhile, including by the factory
+        self.__creation_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        # dropped with their event loop
+        self.__async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[Tuple[str, Hashable], Any]
+        ] = weakref.WeakKeyDictionary()
+        self.__stats_lock = threading.Lock()
+        self.__created: Dict[str, int] = {}
+        self.__reused: Dict[str, int] = {}
+        self.__requests: Dict[str, int] = {}
+        # per HTTP client name: connections opened, waits, total and longest wait
+        self.__connections: Dict[str, List[float]] = {}
+        self.__sessions: List[Tuple[str, requests.Session]] = []
+        self.__http_clients: List[Tuple[str, httpx.Client]] = []
+        self.__hooks: Dict[str, List[Callable[[str, Any], None]]] = {
+            event: [] for event in self.EVENTS
+        }
+
+    def get_or_create(self, name: str, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Returns the client registered under the name and key, creating it with
+        factory the first time. The key must change whenever the client would
+        be created differently, like with another endpoint or API key.
+        """
+        with self.__clients_lock:
+            client = self.__clients.get((name, key))
+            if client is None:
+                creation_lock = self.__creation_locks.setdefault(
+                    (name, key), threading.Lock()
+                )
+        created = False
+        if client is None:
+            with creation_lock:
+                with self.__clients_lock:
+                    client = self.__clients.get((name, key))
+                created = client is None
+                if created:
+                    client = factory()
+                    with self.__clients_lock:
+                        self.__clients[(name, key)] = client
+                        self.__creation_locks.pop((name, key), None)
+        self.__count(name, created, client)
+        return client
+
+    async def aget_or_create(
+        self, name: str, key: Hashable, factory: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Returns the async client registered under the name and key for the
+        running event loop, creating it with the async factory the first time.
+
+        A process running short-lived event loops, like asyncio.run, must
+        call aclose_loop_clients before the loop ends.
+        """
+        with self.__clients_lock:
+            clients = self.__async_clients.setdefault(asyncio.get_running_loop(), {})
+            client = clients.get((name, key))
+        created = client is None
+        if created:
+            new_client = await factory()
+            with self.__clients_lock:
+                client = clients.setdefault((name, key), new_client)
+            if client is not new_client:
+                # another task of the loop created it in the meantime
+                created = False
+                await self.__aclose_client(name, new_client)
+        self.__count(name, created, client)
+        return client
+
+    async def aclose_loop_clients(self) -> None:
+        """
+        Closes the async clients of the running event loop and forgets them.
+        """
+        with self.__clients_lock:
+            clients = self.__async_clients.pop(asyncio.get_running_loop(), {})
+        for (name, _), client in clients.items():
+            await self.__aclose_client(name, client)
+            self.__run_hooks("closed", name, client)
+
+    def create_transport(self, name: str) -> RequestsTransport:
+        """
+        Returns a transport for an Azure SDK client, with a connection pool of
+        pool_size connections per host. Closing the client does not close the
+        pool, the registry does on close.
+        """
+        # the same retry settings as the default transport, the retries are
+        # done by the pipeline
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        with self.__stats_lock:
+            self.__sessions.append((name, session))
+        return RequestsTransport(session=session, session_owner=False)
+
+    def create_async_transport(self, name: str) -> AioHttpTransport:
+        """
+        Returns a transport for an async Azure SDK client, with a connection
+        pool of pool_size connections, closed with the client. It must be
+        created in the event loop of the client.
+        """
+
+        async def count_request(session, context, params) -> None:
+            with self.__stats_lock:
+                self.__requests[name] = self.__requests.get(name, 0) + 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(count_request)
+        # aiohttp's default SSL context is created on import, before
+        # SSL_CERT_FILE may be set, so the transport gets one of its own
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.pool_size, ssl=ssl.create_default_context()
+            ),
+            trace_configs=[trace_config],
+        )
+        return AioHttpTransport(session=session, session_owner=True)
+
+    def create_async_http_client(self, name: str) -> httpx.AsyncClient:
+        """
+        Returns an HTTP client for an async OpenAI client, with the OpenAI
+        defaults and a connection pool of pool_size connections. It is closed
+        with the OpenAI client.
+        """
+
+        async def count_request(request: httpx.Request) -> None:
+            with self.__stats_lock:
+                self.__requests[name] = self.__requests.get(name, 0) + 1
+            record = self.__create_connection_recorder(name)
+
+            async def trace(event: str, info: dict) -> None:
+                record(event)
+
+            request.extensions["trace"] = trace
+
+        return DefaultAsyncHttpxClient(
+            limits=self.__create_limits(),
+            http2=self.http2,
+            event_hooks={"request": [count_request]},
+        )
+
+    def create_http_client(self, name: str) -> httpx.Client:
+        """
+        Returns an HTTP client for an OpenAI client, with the OpenAI defaults
+        and a connection pool of pool_size connections.
+        """
+
+        def count_request(request: httpx.Request) -> None:
+            with self.__stats_lock:
+                self.__requests[name] = self.__requests.get(name, 0) + 1
+            record = self.__create_connection_recorder(name)
+            request.extensions["trace"] = lambda event, info: record(event)
+
+        http_client = DefaultHttpxClient(
+            limits=self.__create_limits(),
+            http2=self.http2,
+            event_hooks={"request": [count_request]},
+        )
+        with self.__stats_lock:
+            self.__http_clients.append((name, http_client))
+        return http_client
+
+    def __create_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def __create_connection_recorder(self, name: str) -> Callable[[str], None]:
+        """
+        Returns a callback for the httpcore trace events of a request, which
+        records how long the request waited for a connection of the pool, until
+        a new connection is opened or the request is sent on an idle one.
+        """
+        start = time.perf_counter()
+        waiting = True
+
+        def record(event: str) -> None:
+            nonlocal waiting
+            opened = event == "connection.connect_tcp.started"
+            if not waiting or not (
+                opened or event.endswith(".send_request_headers.started")
+            ):
+                return
+            waiting = False
+            waited = time.perf_counter() - start
+            with self.__stats_lock:
+                stats = self.__connections.setdefault(name, [0, 0, 0.0, 0.0])
+                stats[0] += opened
+                stats[1] += 1
+                stats[2] += waited
+                stats[3] = max(stats[3], waited)
+
+        return record
+
+    def add_hook(self, event: str, hook: Callable[[str, Any], None]) -> None:
+        """
+        Calls hook with the name and client whenever a client is created or,
+        on close, closed.
+        """
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown client registry event: {event}")
+        self.__hooks[event].append(hook)
+
+    def get_stats(self) -> dict:
+        """
+        Returns, per client name, how many clients were created and how many
+        times they were reused. Per transport name, how many requests were sent
+        and how many connections were opened for them, and for the OpenAI
+        clients how long requests waited for a connection. Per client with
+        stats of its own, like the connection pools, those stats.
+        """
+        with self.__stats_lock:
+            transports: Dict[str, Dict[str, Any]] = {}
+            for name, session in self.__sessions:
+                stats = transports.setdefault(name, {"requests": 0, "connections": 0})
+                for connection_pool in self.__get_connection_pools(session):
+                    stats["requests"] += connection_pool.num_requests
+                    stats["connections"] += connection_pool.num_connections
+            # the transports of the OpenAI clients, counted by their requests
+            for name, count in self.__requests.items():
+                transports.setdefault(name, {"requests": count, "connections": 0})
+            for name, (opened, waits, total, longest) in self.__connections.items():
+                transports[name].update(
+                    {
+                        "connections": int(opened),
+                        "connection_wait_avg_ms": total / waits * 1000,
+                        "connection_wait_max_ms": longest * 1000,
+                    }
+                )
+        with self.__clients_lock:
+            clients = list(self.__clients.items())
+        pools = {
+            name: client.get_stats()
+            for (name, _), client in clients
+            if callable(getattr(client, "get_stats", None))
+        }
+        with self.__stats_lock:
+            return {
+                "clients": {
+                    name: {
+                        "created": self.__created.get(name, 0),
+                        "reused": self.__reused.get(name, 0),
+                    }
+                    for name in sorted(set(self.__created) | set(self.__reused))
+                },
+                "transports": transports,
+                "pools": pools,
+            }
+
+    def close(self) -> None:
+        """
+        Closes every client, then the connection pools of the transports, and
+        forgets them, so the next get_or_create creates new clients. Async
+        clients are only forgotten, see aclose_loop_clients.
+        """
+        with self.__clients_lock:
+            clients = list(self.__clients.items())
+            self.__clients.clear()
+            self.__async_clients.clear()
+        for (name, _), client in clients:
+            # a factory may create several clients that are used together
+            for part in client if isinstance(client, tuple) else (client,):
+                close = getattr(part, "close", None)
+                if callable(close):
+                    try:
+                        close()
+                    except Exception:
+                        logger.exception(f"Failed to close {name} client")
+            self.__run_hooks("closed", name, client)
+        with self.__stats_lock:
+            sessions, self.__sessions = self.__sessions, []
+            http_clients, self.__http_clients = self.__http_clients, []
+        for _, session in sessions:
+            session.close()
+        for _, http_client in http_clients:
+            http_client.close()
+        logger.info(f"Closed {len(clients)} clients")
+
+    def __count(self, name: str, created: bool, client: Any) -> None:
+        with self.__stats_lock:
+            counts = self.__created if created else self.__reused
+            counts[name] = counts.get(name, 0) + 1
+        if created:
+            logger.info(f"Created {name} client")
+            self.__run_hooks("created", name, client)
+
+    @staticmethod
+    async def __aclose_client(name: str, client: Any) -> None:
+        # a factory may create several clients that are used together, like
+        # a client and its async credential
+        for part in client if isinstance(client, tuple) else (client,):
+            close = getattr(part, "close", None)
+            if callable(close):
+                try:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception(f"Failed to close {name} client")
+
+    def __run_hooks(self, event: str, name: str, client: Any) -> None:
+        for hook in self.__hooks[event]:
+            try:
+                hook(name, client)
+            except Exception:
+                logger.exception(f"Client registry {event} hook failed for {name}")
+
+    @staticmethod
+    def __get_connection_pools(session: requests.Session) -> list:
+        connection_pools = []
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            connection_pools += [pools[key] for key in pools.keys()]
+        return connection_pools
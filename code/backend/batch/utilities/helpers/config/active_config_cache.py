@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from ..env_helper import EnvHelper
+from ..singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class ActiveConfigCache(Singleton):
+    """
+    Keeps the parsed active configuration, so that requests neither download
+    nor parse the configuration again. The configuration is
+    revalidated in the background by its ETag once it is older than
+    CONFIG_REFRESH_INTERVAL seconds, and only downloaded again when the ETag
+    changed, for instance after the admin app saved a new one. Requests keep
+    getting the cached configuration meanwhile.
+
+    A revalidation that fails keeps the cached configuration, so that an
+    unavailable storage account does not fail the requests.
+    """
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.refresh_interval = env_helper.CONFIG_REFRESH_INTERVAL
+        # held while loading, so concurrent requests wait for a single load
+        self.__load_lock = threading.Lock()
+        self.__state_lock = threading.Lock()
+        self.__config: Any = None
+        self.__etag: Optional[str] = None
+        self.__checked_at = 0.0
+        self.__revalidating = False
+        # bumped by invalidate, so that revalidations started before are dropped
+        self.__generation = 0
+        self.loads = 0
+        self.revalidations = 0
+        self.failed_revalidations = 0
+
+    def get(
+        self,
+        load: Callable[[], Tuple[Any, Optional[str]]],
+        get_etag: Callable[[], Optional[str]],
+    ) -> Any:
+        """
+        Returns the cached configuration, calling load for the configuration
+        and its ETag when there is none yet. Once the configuration is older
+        than the refresh interval, get_etag is called in the background and
+        the configuration is loaded again if the ETag changed.
+        """
+        with self.__state_lock:
+            config = self.__config
+            generation = self.__generation
+            revalidate = (
+                config is not None and self.__is_stale() and not self.__revalidating
+            )
+            if revalidate:
+                self.__revalidating = True
+        if revalidate:
+            threading.Thread(
+                target=self.__revalidate,
+                args=(load, get_etag, generation),
+                name="active-config-revalidation",
+                daemon=True,
+            ).start()
+        if config is not None:
+            return config
+
+        with self.__load_lock:
+            with self.__state_lock:
+                if self.__config is not None:
+                    return self.__config
+                generation = self.__generation
+            config, etag = load()
+            with self.__state_lock:
+                self.loads += 1
+                if generation == self.__generation:
+                    self.__set(config, etag)
+        return config
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached configuration, so that the next call to get loads it
+        again, like after this process saved a new configuration.
+        """
+        with self.__state_lock:
+            self.__config = None
+            self.__etag = None
+            self.__generation += 1
+
+    def get_stats(self) -> dict:
+        with self.__state_lock:
+            return {
+                "loads": self.loads,
+                "revalidations": self.revalidations,
+                "failed_revalidations": self.failed_revalidations,
+                "age_seconds": (
+                    time.monotonic() - self.__checked_at
+                    if self.__config is not None
+                    else None
+                ),
+            }
+
+    def __is_stale(self) -> bool:
+        return time.monotonic() - self.__checked_at >= self.refresh_interval
+
+    def __set(self, config: Any, etag: Optional[str]) -> None:
+        self.__config = config
+        self.__etag = etag
+        self.__checked_at = time.monotonic()
+
+    def __revalidate(
+        self,
+        load: Callable[[], Tuple[Any, Optional[str]]],
+        get_etag: Callable[[], Optional[str]],
+        generation: int,
+    ) -> None:
+        try:
+            etag = get_etag()
+            with self.__state_lock:
+                unchanged = etag == self.__etag
+            if unchanged:
+                config = None
+            else:
+                logger.info("Active configuration changed, loading it again")
+                config, etag = load()
+            with self.__state_lock:
+                self.revalidations += 1
+                if generation == self.__generation:
+                    if config is None:
+                        self.__checked_at = time.monotonic()
+                    else:
+                        self.loads += 1
+                        self.__set(config, etag)
+        except Exception:
+            logger.exception("Failed to revalidate the active configuration")
+            with self.__state_lock:
+                self.failed_revalidations += 1
+                if generation == self.__generation:
+                    # try again after the next interval rather than on every request
+                    self.__checked_at = time.monotonic()
+        finally:
+            with self.__state_lock:
+                self.__revalidating = False
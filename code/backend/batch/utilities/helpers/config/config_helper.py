@@ -3,6 +3,7 @@ import json
 import logging
 import functools
 from string import Template
+from typing import Optional
 
 from ..azure_blob_storage_client import AzureBlobStorageClient
 from ...document_chunking.chunking_strategy import ChunkingStrategy, ChunkingSettings
@@ -11,6 +12,7 @@ from .embedding_config import EmbeddingConfig
 from ...orchestrator.orchestration_strategy import OrchestrationStrategy
 from ...orchestrator import OrchestrationSettings
 from ..env_helper import EnvHelper
+from .active_config_cache import ActiveConfigCache
 from .assistant_strategy import AssistantStrategy
 from .conversation_flow import ConversationFlow
 from .database_type import DatabaseType
@@ -189,17 +191,26 @@ class ConfigHelper:
             config["enable_chat_history"] = default_config["enable_chat_history"]
 
     @staticmethod
-    @functools.cache
     def get_active_config_or_default():
+        return ActiveConfigCache().get(
+            ConfigHelper._load_active_config_or_default,
+            ConfigHelper._get_active_config_etag,
+        )
+
+    @staticmethod
+    def _load_active_config_or_default() -> tuple[Config, Optional[str]]:
         logger.info("Method get_active_config_or_default started")
         env_helper = EnvHelper()
         config = ConfigHelper.get_default_config()
+        etag = None
 
         if env_helper.LOAD_CONFIG_FROM_BLOB_STORAGE:
             logger.info("Loading configuration from Blob Storage")
             blob_client = AzureBlobStorageClient(container_name=CONFIG_CONTAINER_NAME)
+            # read before the file, so that a concurrent save is loaded on the next revalidation
+            etag = blob_client.get_etag(CONFIG_FILE_NAME)
 
-            if blob_client.file_exists(CONFIG_FILE_NAME):
+            if etag is not None:
                 logger.info("Configuration file found in Blob Storage")
                 default_config = config
                 config_file = blob_client.download_file(CONFIG_FILE_NAME)
@@ -212,7 +223,14 @@ class ConfigHelper:
                 )
 
         logger.info("Method get_active_config_or_default ended")
-        return Config(config)
+        return Config(config), etag
+
+    @staticmethod
+    def _get_active_config_etag() -> Optional[str]:
+        if not EnvHelper().LOAD_CONFIG_FROM_BLOB_STORAGE:
+            return None
+        blob_client = AzureBlobStorageClient(container_name=CONFIG_CONTAINER_NAME)
+        return blob_client.get_etag(CONFIG_FILE_NAME)
 
     @staticmethod
     @functools.cache
@@ -229,7 +247,7 @@ class ConfigHelper:
             CONFIG_FILE_NAME,
             content_type="application/json",
         )
-        ConfigHelper.get_active_config_or_default.cache_clear()
+        ActiveConfigCache().invalidate()
 
     @staticmethod
     def validate_config(config: dict):
@@ -304,7 +322,7 @@ class ConfigHelper:
     @staticmethod
     def clear_config():
         ConfigHelper._default_config = None
-        ConfigHelper.get_active_config_or_default.cache_clear()
+        ActiveConfigCache().invalidate()
 
     @staticmethod
     def _append_advanced_image_processors():
@@ -331,3 +349,4 @@ class ConfigHelper:
     def delete_config():
         blob_client = AzureBlobStorageClient(container_name=CONFIG_CONTAINER_NAME)
         blob_client.delete_file(CONFIG_FILE_NAME)
+        ActiveConfigCache().invalidate()
@@ -14,6 +14,9 @@ class DocumentChunking:
     def chunk(
         self, documents: List[SourceDocument], chunking: ChunkingSettings
     ) -> List[SourceDocument]:
+        if not documents:
+            # the chunkers locate the chunks by the source of the first document
+            return []
         chunker = get_document_chunker(chunking.chunking_strategy.value)
         if chunker is None:
             raise Exception(
@@ -0,0 +1,155 @@
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from ..common.source_document import SourceDocument
+from ..document_chunking.chunking_strategy import ChunkingSettings
+from .document_chunking_helper import DocumentChunking
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+
+def chunk_documents(
+    document_chunking: DocumentChunking,
+    chunking: ChunkingSettings,
+    documents: List[SourceDocument],
+) -> List[SourceDocument]:
+    # A module level function, so that it can be sent to the chunking processes
+    return document_chunking.chunk(documents, chunking)
+
+
+class PipelineJob:
+    def __init__(self, steps: List[Callable]):
+        self.steps = steps
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class DocumentProcessingPipeline(Singleton):
+    """
+    Embeds documents in four stages: fetch, chunk, embed and upload. Each
+    stage has its own worker threads fed by a bounded queue, so one function
+    worker keeps fetching, chunking and embedding other documents while a
+    document waits on the network in one of the stages. A full queue blocks
+    the stage that feeds it, down to the callers submitting new documents, so
+    a slow stage does not pile up documents in memory.
+
+    Chunking is CPU bound, so it runs in a pool of
+    DOCUMENT_PROCESSING_CHUNKING_PROCESSES processes when that is set.
+    """
+
+    STAGES = ["fetch", "chunk", "embed", "upload"]
+    __CHUNK_STAGE = 1
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.__stats_lock = threading.Lock()
+        self.__in_progress = [0] * len(self.STAGES)
+        self.__completed = 0
+        self.__failed = 0
+        self.__queues = [
+            queue.Queue(maxsize=max(1, env_helper.DOCUMENT_PROCESSING_STAGE_QUEUE_SIZE))
+            for _ in self.STAGES
+        ]
+        self.__process_pool = (
+            ProcessPoolExecutor(
+                max_workers=env_helper.DOCUMENT_PROCESSING_CHUNKING_PROCESSES,
+                # forking a process with running threads can deadlock it
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            if env_helper.DOCUMENT_PROCESSING_CHUNKING_PROCESSES > 0
+            else None
+        )
+        self.__workers = max(1, env_helper.DOCUMENT_PROCESSING_STAGE_WORKERS)
+        for stage_index, stage in enumerate(self.STAGES):
+            for worker in range(self.__workers):
+                threading.Thread(
+                    target=self.__work,
+                    args=(stage_index,),
+                    name=f"document-processing-{stage}-{worker}",
+                    daemon=True,
+                ).start()
+
+    def run(
+        self,
+        fetch: Callable[[], Any],
+        chunk: Callable[[Any], Any],
+        embed: Callable[[Any], Any],
+        upload: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Runs a document through the stages, each one called with the result of
+        the previous one, and returns the result of upload. Blocks while the
+        fetch queue is full, and raises the error of the stage that failed.
+
+        When chunking runs in processes, chunk must be picklable, like a
+        functools.partial of chunk_documents.
+        """
+        job = PipelineJob([fetch, chunk, embed, upload])
+        self.__queues[0].put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.value
+
+    def get_stats(self) -> dict:
+        with self.__stats_lock:
+            return {
+                "queued": {
+                    stage: self.__queues[i].qsize()
+                    for i, stage in enumerate(self.STAGES)
+                },
+                "in_progress": dict(zip(self.STAGES, self.__in_progress)),
+                "completed": self.__completed,
+                "failed": self.__failed,
+            }
+
+    def __work(self, stage_index: int) -> None:
+        while True:
+            job: Optional[PipelineJob] = self.__queues[stage_index].get()
+            if job is None:
+                return
+            with self.__stats_lock:
+                self.__in_progress[stage_index] += 1
+            try:
+                job.value = self.__run_step(stage_index, job)
+            except BaseException as e:
+                job.error = e
+            finally:
+                with self.__stats_lock:
+                    self.__in_progress[stage_index] -= 1
+
+            if job.error is None and stage_index < len(self.STAGES) - 1:
+                # blocks while the next stage is behind
+                self.__queues[stage_index + 1].put(job)
+                continue
+            with self.__stats_lock:
+                if job.error is None:
+                    self.__completed += 1
+                else:
+                    self.__failed += 1
+            job.done.set()
+
+    def __run_step(self, stage_index: int, job: PipelineJob) -> Any:
+        step = job.steps[stage_index]
+        if stage_index == 0:
+            return step()
+        if stage_index == self.__CHUNK_STAGE and self.__process_pool is not None:
+            return self.__process_pool.submit(step, job.value).result()
+        return step(job.value)
+
+    def __shutdown(self) -> None:
+        for stage_queue in self.__queues:
+            for _ in range(self.__workers):
+                stage_queue.put(None)
+        if self.__process_pool is not None:
+            self.__process_pool.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def clear_instance(cls):
+        if cls._instance is not None:
+            cls._instance.__shutdown()
+        super().clear_instance()
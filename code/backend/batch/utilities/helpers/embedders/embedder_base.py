@@ -1,7 +1,62 @@
+import hashlib
 from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+from ..env_helper import EnvHelper
+from ..semantic_answer_cache import SemanticAnswerCache
 
 
 class EmbedderBase(ABC):
     @abstractmethod
     def embed_file(self, source_url: str, file_name: str = None):
         pass
+
+    @staticmethod
+    def _get_chunk_hash(content: str) -> str:
+        # the embedding only depends on the content, not on the position
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _invalidate_cached_answers(env_helper: EnvHelper) -> None:
+        # Answers cached from the index may no longer be the best ones
+        SemanticAnswerCache().invalidate(SemanticAnswerCache.get_index_name(env_helper))
+
+    @staticmethod
+    def _diff_chunks(
+        chunks: Dict[str, Tuple[str, str]], indexed_chunks: Dict[str, Tuple[str, str]]
+    ) -> Tuple[List[str], Dict[str, str], List[str]]:
+        """
+        Compares the chunks of a document with the ones already indexed for it.
+        A chunk whose content is already indexed, under its own id or under
+        another one when the content moved within the document, can reuse the
+        embedding of the indexed chunk, so that only its position is updated.
+
+        Args:
+            chunks (dict[str, tuple[str, str]]): The hash of the content and
+                the metadata of each new chunk by id.
+            indexed_chunks (dict[str, tuple[str, str]]): The hash of the content
+                and the metadata of each indexed chunk by id.
+
+        Returns:
+            tuple[list[str], dict[str, str], list[str]]: The ids of the chunks
+            whose content is not indexed, the id of the indexed chunk with the
+            same content for each chunk that moved, and the ids of the indexed
+            chunks that are no longer part of the document.
+        """
+        indexed_ids_by_hash = {}
+        for id, (hash, _) in indexed_chunks.items():
+            indexed_ids_by_hash.setdefault(hash, id)
+        changed_ids = []
+        moved_ids = {}
+        for id, (hash, metadata) in chunks.items():
+            indexed_chunk = indexed_chunks.get(id)
+            if indexed_chunk == (hash, metadata):
+                continue
+            if indexed_chunk is not None and indexed_chunk[0] == hash:
+                moved_ids[id] = id
+            elif hash in indexed_ids_by_hash:
+                moved_ids[id] = indexed_ids_by_hash[hash]
+            else:
+                changed_ids.append(id)
+        orphan_ids = [id for id in indexed_chunks if id not in chunks]
+        return changed_ids, moved_ids, orphan_ids
@@ -40,6 +40,7 @@ class IntegratedVectorizationEmbedder(EmbedderBase):
                 self.env_helper.AZURE_SEARCH_INDEXER_NAME,
                 skillset_name=search_skillset_result.name,
             )
+            self._invalidate_cached_answers(self.env_helper)
             logger.info("Integrated vectorization process completed successfully.")
             return indexer_result
         except Exception as e:
@@ -54,6 +55,7 @@ class IntegratedVectorizationEmbedder(EmbedderBase):
                 f"Running indexer: {self.env_helper.AZURE_SEARCH_INDEXER_NAME}."
             )
             search_indexer.run_indexer(self.env_helper.AZURE_SEARCH_INDEXER_NAME)
+            self._invalidate_cached_answers(self.env_helper)
         else:
             logger.info("Indexer does not exist. Starting full processing.")
             self.process_using_integrated_vectorization(source_url="all")
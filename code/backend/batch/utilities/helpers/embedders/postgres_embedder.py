@@ -1,10 +1,15 @@
 import json
 import logging
-from typing import List
+from functools import partial
+from typing import Dict, List, Tuple
 
 from ...helpers.llm_helper import LLMHelper
 from ...helpers.env_helper import EnvHelper
-from ..azure_blob_storage_client import AzureBlobStorageClient
+from ..embedding_executor import EmbeddingExecutor
+from ..azure_blob_storage_client import (
+    AzureBlobStorageClient,
+    INGESTED_CONTENT_MD5_METADATA_KEY,
+)
 
 from ..config.embedding_config import EmbeddingConfig
 from ..config.config_helper import ConfigHelper
@@ -13,6 +18,10 @@ from .embedder_base import EmbedderBase
 from ..azure_postgres_helper import AzurePostgresHelper
 from ..document_loading_helper import DocumentLoading
 from ..document_chunking_helper import DocumentChunking
+from ..document_processing_pipeline import (
+    DocumentProcessingPipeline,
+    chunk_documents,
+)
 from ...common.source_document import SourceDocument
 
 logger = logging.getLogger(__name__)
@@ -23,9 +32,11 @@ class PostgresEmbedder(EmbedderBase):
         logger.info("Initializing PostgresEmbedder.")
         self.env_helper = env_helper
         self.llm_helper = LLMHelper()
+        self.embedding_executor = EmbeddingExecutor(self.llm_helper, env_helper)
         self.azure_postgres_helper = AzurePostgresHelper()
         self.document_loading = DocumentLoading()
         self.document_chunking = DocumentChunking()
+        self.pipeline = DocumentProcessingPipeline()
         self.blob_client = blob_client
         self.config = ConfigHelper.get_active_config_or_default()
         self.embedding_configs = {}
@@ -37,21 +48,28 @@ class PostgresEmbedder(EmbedderBase):
         logger.info(f"Embedding file: {file_name} from source: {source_url}")
         file_extension = file_name.split(".")[-1].lower()
         embedding_config = self.embedding_configs.get(file_extension)
+        # Read before embedding, so that a change made while the file is being
+        # embedded is picked up by the next incremental reprocess
+        content_md5 = (
+            self.blob_client.get_blob_content_md5(file_name)
+            if file_extension != "url"
+            else None
+        )
         self.__embed(
             source_url=source_url,
             file_extension=file_extension,
             embedding_config=embedding_config,
         )
         if file_extension != "url":
-            self.blob_client.upsert_blob_metadata(
-                file_name, {"embeddings_added": "true"}
-            )
+            metadata = {"embeddings_added": "true"}
+            if content_md5:
+                metadata[INGESTED_CONTENT_MD5_METADATA_KEY] = content_md5
+            self.blob_client.upsert_blob_metadata(file_name, metadata)
 
     def __embed(
         self, source_url: str, file_extension: str, embedding_config: EmbeddingConfig
     ):
         logger.info(f"Starting embedding process for source: {source_url}")
-        documents_to_upload: List[SourceDocument] = []
         if (
             embedding_config.use_advanced_image_processing
             and file_extension
@@ -63,30 +81,98 @@ class PostgresEmbedder(EmbedderBase):
             raise NotImplementedError(
                 "Advanced image processing is not supported in PostgresEmbedder."
             )
-        else:
-            logger.info(f"Loading documents from source: {source_url}")
-            documents: List[SourceDocument] = self.document_loading.load(
-                source_url, embedding_config.loading
-            )
-            documents = self.document_chunking.chunk(
-                documents, embedding_config.chunking
-            )
-            logger.info("Chunked into document chunks.")
+        self.pipeline.run(
+            fetch=lambda: self.__load_documents(source_url, embedding_config),
+            chunk=partial(
+                chunk_documents, self.document_chunking, embedding_config.chunking
+            ),
+            embed=lambda documents: self.__embed_documents(source_url, documents),
+            upload=self.__upload_documents,
+        )
+
+    def __load_documents(
+        self, source_url: str, embedding_config: EmbeddingConfig
+    ) -> List[SourceDocument]:
+        logger.info(f"Loading documents from source: {source_url}")
+        return self.document_loading.load(source_url, embedding_config.loading)
 
-            for document in documents:
-                documents_to_upload.append(self.__convert_to_search_document(document))
+    def __embed_documents(
+        self, source_url: str, documents: List[SourceDocument]
+    ) -> Tuple[List[dict], List[str], List[str]]:
+        logger.info("Chunked into document chunks.")
+        search_documents = {
+            document.id: self.__convert_to_search_document(document)
+            for document in documents
+        }
+        # Only embed the chunks whose content changed since the document was
+        # last indexed, insert the ones that moved with their indexed
+        # embedding, and remove the ones the document no longer has
+        changed_ids, moved_ids, orphan_ids = self._diff_chunks(
+            {
+                id: (
+                    self._get_chunk_hash(search_document["content"]),
+                    search_document["metadata"],
+                )
+                for id, search_document in search_documents.items()
+            },
+            # by the source of the URL, as the document may have no chunks left
+            self.__get_indexed_chunks(SourceDocument.get_source(source_url)),
+        )
+        logger.info(
+            f"{len(changed_ids)} of {len(documents)} chunks changed, "
+            f"{len(moved_ids)} moved, {len(orphan_ids)} chunks to delete"
+        )
+        indexed_vectors = self.__get_indexed_vectors(list(set(moved_ids.values())))
+        for id, indexed_id in moved_ids.items():
+            search_documents[id]["content_vector"] = indexed_vectors.get(indexed_id)
+        upload_ids = changed_ids + list(moved_ids)
+        documents_to_upload = [search_documents[id] for id in upload_ids]
+        # a moved chunk whose embedding could not be read is embedded again
+        documents_to_embed = [
+            document
+            for document in documents_to_upload
+            if document["content_vector"] is None
+        ]
+        embeddings = self.embedding_executor.embed(
+            [document["content"] for document in documents_to_embed]
+        )
+        for document, embedded_content in zip(documents_to_embed, embeddings):
+            document["content_vector"] = embedded_content
+        return documents_to_upload, upload_ids, orphan_ids
 
-        if documents_to_upload:
+    def __upload_documents(
+        self, changes: Tuple[List[dict], List[str], List[str]]
+    ) -> None:
+        documents_to_upload, changed_ids, orphan_ids = changes
+        if documents_to_upload or orphan_ids:
             logger.info(
                 f"Uploading {len(documents_to_upload)} documents to vector store."
             )
-            self.azure_postgres_helper.create_vector_store(documents_to_upload)
+            # Changed chunks are deleted along with the orphans, in the same
+            # transaction as the insert, as vector_store has no unique id
+            self.azure_postgres_helper.create_vector_store(
+                documents_to_upload, ids_to_replace=changed_ids + orphan_ids
+            )
+            self._invalidate_cached_answers(self.env_helper)
         else:
-            logger.warning("No documents to upload.")
+            logger.info("No new or changed documents to upload.")
+
+    def __get_indexed_chunks(self, source: str) -> Dict[str, Tuple[str, str]]:
+        return {
+            row["id"]: (self._get_chunk_hash(row["content"]), row["metadata"])
+            for row in self.azure_postgres_helper.get_chunks_by_source([source])
+        }
+
+    def __get_indexed_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        if not ids:
+            return {}
+        return {
+            row["id"]: row["content_vector"]
+            for row in self.azure_postgres_helper.get_vectors_by_id(ids)
+        }
 
     def __convert_to_search_document(self, document: SourceDocument):
-        logger.info(f"Generating embeddings for document ID: {document.id}")
-        embedded_content = self.llm_helper.generate_embeddings(document.content)
+        logger.info(f"Converting document ID {document.id} to search document format")
         metadata = {
             "id": document.id,
             "source": document.source,
@@ -100,7 +186,7 @@ class PostgresEmbedder(EmbedderBase):
         return {
             "id": document.id,
             "content": document.content,
-            "content_vector": embedded_content,
+            "content_vector": None,
             "metadata": json.dumps(metadata),
             "title": document.title,
             "source": document.source,
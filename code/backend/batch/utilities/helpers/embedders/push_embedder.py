@@ -1,22 +1,32 @@
 import hashlib
 import json
 import logging
-from typing import List
+from functools import partial
+from typing import Dict, List, Tuple
 from urllib.parse import urlparse
 import urllib.request
 from ...helpers.llm_helper import LLMHelper
 from ...helpers.env_helper import EnvHelper
+from ..embedding_executor import EmbeddingExecutor
 from ..azure_computer_vision_client import AzureComputerVisionClient
 
-from ..azure_blob_storage_client import AzureBlobStorageClient
+from ..azure_blob_storage_client import (
+    AzureBlobStorageClient,
+    INGESTED_CONTENT_MD5_METADATA_KEY,
+)
 
 from ..config.embedding_config import EmbeddingConfig
 from ..config.config_helper import ConfigHelper
 
 from .embedder_base import EmbedderBase
 from ..azure_search_helper import AzureSearchHelper
+from azure.search.documents import SearchClient
 from ..document_loading_helper import DocumentLoading
 from ..document_chunking_helper import DocumentChunking
+from ..document_processing_pipeline import (
+    DocumentProcessingPipeline,
+    chunk_documents,
+)
 from ...common.source_document import SourceDocument
 import base64
 from mimetypes import guess_type
@@ -25,14 +35,19 @@ logger = logging.getLogger(__name__)
 
 
 class PushEmbedder(EmbedderBase):
+    # the most results the search service returns at once
+    INDEXED_CHUNKS_PAGE_SIZE = 1000
+
     def __init__(self, blob_client: AzureBlobStorageClient, env_helper: EnvHelper):
         logger.info("Initializing PushEmbedder")
         self.env_helper = env_helper
         self.llm_helper = LLMHelper()
+        self.embedding_executor = EmbeddingExecutor(self.llm_helper, env_helper)
         self.azure_search_helper = AzureSearchHelper()
         self.azure_computer_vision_client = AzureComputerVisionClient(env_helper)
         self.document_loading = DocumentLoading()
         self.document_chunking = DocumentChunking()
+        self.pipeline = DocumentProcessingPipeline()
         self.blob_client = blob_client
         self.config = ConfigHelper.get_active_config_or_default()
         self.embedding_configs = {}
@@ -46,6 +61,13 @@ class PushEmbedder(EmbedderBase):
         logger.info(f"Embedding file: {file_name} from URL: {source_url}")
         file_extension = file_name.split(".")[-1].lower()
         embedding_config = self.embedding_configs.get(file_extension)
+        # Read before embedding, so that a change made while the file is being
+        # embedded is picked up by the next incremental reprocess
+        content_md5 = (
+            self.blob_client.get_blob_content_md5(file_name)
+            if file_extension != "url"
+            else None
+        )
         self.__embed(
             source_url=source_url,
             file_extension=file_extension,
@@ -53,15 +75,16 @@ class PushEmbedder(EmbedderBase):
         )
         if file_extension != "url":
             logger.info(f"Upserting blob metadata for file: {file_name}")
-            self.blob_client.upsert_blob_metadata(
-                file_name, {"embeddings_added": "true"}
-            )
+            metadata = {"embeddings_added": "true"}
+            if content_md5:
+                metadata[INGESTED_CONTENT_MD5_METADATA_KEY] = content_md5
+            self.blob_client.upsert_blob_metadata(file_name, metadata)
 
     def __embed(
         self, source_url: str, file_extension: str, embedding_config: EmbeddingConfig
     ):
         logger.info(f"Processing embedding for file extension: {file_extension}")
-        documents_to_upload: List[SourceDocument] = []
+        search_client = self.azure_search_helper.get_search_client()
         if (
             embedding_config.use_advanced_image_processing
             and file_extension
@@ -69,31 +92,98 @@ class PushEmbedder(EmbedderBase):
         ):
             logger.info(f"Using advanced image processing for: {source_url}")
             caption = self.__generate_image_caption(source_url)
-            caption_vector = self.llm_helper.generate_embeddings(caption)
+            caption_vector = self.embedding_executor.embed([caption])[0]
 
             image_vector = self.azure_computer_vision_client.vectorize_image(source_url)
-            documents_to_upload.append(
-                self.__create_image_document(
-                    source_url, image_vector, caption, caption_vector
-                )
+            self.__upload_documents(
+                search_client,
+                (
+                    [
+                        self.__create_image_document(
+                            source_url, image_vector, caption, caption_vector
+                        )
+                    ],
+                    [],
+                ),
             )
         else:
-            logger.info(f"Loading documents from source: {source_url}")
-            documents: List[SourceDocument] = self.document_loading.load(
-                source_url, embedding_config.loading
-            )
-            documents = self.document_chunking.chunk(
-                documents, embedding_config.chunking
+            self.pipeline.run(
+                fetch=lambda: self.__load_documents(source_url, embedding_config),
+                chunk=partial(
+                    chunk_documents, self.document_chunking, embedding_config.chunking
+                ),
+                embed=lambda documents: self.__embed_documents(
+                    search_client, source_url, documents
+                ),
+                upload=lambda changes: self.__upload_documents(search_client, changes),
             )
 
-            for document in documents:
-                documents_to_upload.append(self.__convert_to_search_document(document))
+    def __load_documents(
+        self, source_url: str, embedding_config: EmbeddingConfig
+    ) -> List[SourceDocument]:
+        logger.info(f"Loading documents from source: {source_url}")
+        return self.document_loading.load(source_url, embedding_config.loading)
+
+    def __embed_documents(
+        self,
+        search_client: SearchClient,
+        source_url: str,
+        documents: List[SourceDocument],
+    ) -> Tuple[List[dict], List[str]]:
+        search_documents = {
+            document.id: self.__convert_to_search_document(document)
+            for document in documents
+        }
+        # Only embed the chunks whose content changed since the document was
+        # last indexed, upload the ones that moved with their indexed
+        # embedding, and remove the ones the document no longer has
+        changed_ids, moved_ids, orphan_ids = self._diff_chunks(
+            {
+                id: self.__get_search_document_key(search_document)
+                for id, search_document in search_documents.items()
+            },
+            # by the source of the URL, as the document may have no chunks left
+            self.__get_indexed_chunks(
+                search_client, SourceDocument.get_source(source_url)
+            ),
+        )
+        logger.info(
+            f"{len(changed_ids)} of {len(documents)} chunks changed, "
+            f"{len(moved_ids)} moved, {len(orphan_ids)} chunks to delete"
+        )
+        vector_column = self.env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN
+        indexed_vectors = self.__get_indexed_vectors(
+            search_client, list(set(moved_ids.values()))
+        )
+        for id, indexed_id in moved_ids.items():
+            search_documents[id][vector_column] = indexed_vectors.get(indexed_id)
+        documents_to_upload = [
+            search_documents[id] for id in changed_ids + list(moved_ids)
+        ]
+        # a moved chunk whose embedding could not be read is embedded again
+        documents_to_embed = [
+            document
+            for document in documents_to_upload
+            if document[vector_column] is None
+        ]
+        embeddings = self.embedding_executor.embed(
+            [
+                document[self.env_helper.AZURE_SEARCH_CONTENT_COLUMN]
+                for document in documents_to_embed
+            ]
+        )
+        for document, embedded_content in zip(documents_to_embed, embeddings):
+            document[vector_column] = embedded_content
+        return documents_to_upload, orphan_ids
 
+    def __upload_documents(
+        self, search_client: SearchClient, changes: Tuple[List[dict], List[str]]
+    ):
+        documents_to_upload, orphan_ids = changes
+        batch_size = self.env_helper.AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE
         # Upload documents (which are chunks) to search index in batches
         if documents_to_upload:
             logger.info("Uploading documents in batches")
-            batch_size = self.env_helper.AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE
-            search_client = self.azure_search_helper.get_search_client()
             for i in range(0, len(documents_to_upload), batch_size):
                 batch = documents_to_upload[i : i + batch_size]
                 response = search_client.upload_documents(batch)
@@ -101,7 +191,20 @@ class PushEmbedder(EmbedderBase):
                     logger.error("Failed to upload documents to search index")
                     raise RuntimeError(f"Upload failed for some documents: {response}")
         else:
-            logger.warning("No documents to upload.")
+            logger.info("No new or changed documents to upload.")
+
+        # Orphans are deleted once the new chunks are uploaded, so that the
+        # document stays searchable throughout
+        for i in range(0, len(orphan_ids), batch_size):
+            search_client.delete_documents(
+                [
+                    {self.env_helper.AZURE_SEARCH_FIELDS_ID: id}
+                    for id in orphan_ids[i : i + batch_size]
+                ]
+            )
+
+        if documents_to_upload or orphan_ids:
+            self._invalidate_cached_answers(self.env_helper)
 
     def __local_image_to_data_url(self, image_path):
         """Convert a local image file or URL to a data URL."""
@@ -152,9 +255,70 @@ If the image is mostly text, use OCR to extract the text as it is displayed in t
         logger.info("Caption generation completed")
         return caption
 
+    def __get_indexed_chunks(
+        self, search_client: SearchClient, source: str
+    ) -> Dict[str, Tuple[str, str]]:
+        # Single quotes are escaped by doubling them in OData string literals
+        source_filter = "{} eq '{}'".format(
+            self.env_helper.AZURE_SEARCH_SOURCE_COLUMN, source.replace("'", "''")
+        )
+        chunks = {}
+        skip = 0
+        # the search only returns 50 results unless told otherwise
+        while True:
+            results = list(
+                search_client.search(
+                    "*",
+                    select=[
+                        self.env_helper.AZURE_SEARCH_FIELDS_ID,
+                        self.env_helper.AZURE_SEARCH_CONTENT_COLUMN,
+                        self.env_helper.AZURE_SEARCH_FIELDS_METADATA,
+                    ],
+                    filter=source_filter,
+                    top=self.INDEXED_CHUNKS_PAGE_SIZE,
+                    skip=skip,
+                )
+            )
+            skip += len(results)
+            for result in results:
+                chunks[result[self.env_helper.AZURE_SEARCH_FIELDS_ID]] = (
+                    self.__get_search_document_key(result)
+                )
+            if len(results) < self.INDEXED_CHUNKS_PAGE_SIZE:
+                return chunks
+
+    def __get_indexed_vectors(
+        self, search_client: SearchClient, ids: List[str]
+    ) -> Dict[str, List[float]]:
+        id_column = self.env_helper.AZURE_SEARCH_FIELDS_ID
+        vector_column = self.env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN
+        vectors = {}
+        # in pages, so that the filter stays within the limits of the service
+        for i in range(0, len(ids), self.INDEXED_CHUNKS_PAGE_SIZE):
+            page_ids = ids[i : i + self.INDEXED_CHUNKS_PAGE_SIZE]
+            # Single quotes are escaped by doubling them in OData string literals
+            id_filter = "search.in({}, '{}', ',')".format(
+                id_column, ",".join(page_ids).replace("'", "''")
+            )
+            for result in search_client.search(
+                "*",
+                select=[id_column, vector_column],
+                filter=id_filter,
+                top=len(page_ids),
+            ):
+                vectors[result[id_column]] = result.get(vector_column)
+        return vectors
+
+    def __get_search_document_key(self, search_document: dict) -> Tuple[str, str]:
+        return (
+            self._get_chunk_hash(
+                search_document[self.env_helper.AZURE_SEARCH_CONTENT_COLUMN]
+            ),
+            search_document[self.env_helper.AZURE_SEARCH_FIELDS_METADATA],
+        )
+
     def __convert_to_search_document(self, document: SourceDocument):
         logger.info(f"Converting document ID {document.id} to search document format")
-        embedded_content = self.llm_helper.generate_embeddings(document.content)
         metadata = {
             self.env_helper.AZURE_SEARCH_FIELDS_ID: document.id,
             self.env_helper.AZURE_SEARCH_SOURCE_COLUMN: document.source,
@@ -167,7 +331,7 @@ If the image is mostly text, use OCR to extract the text as it is displayed in t
         return {
             self.env_helper.AZURE_SEARCH_FIELDS_ID: document.id,
             self.env_helper.AZURE_SEARCH_CONTENT_COLUMN: document.content,
-            self.env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN: embedded_content,
+            self.env_helper.AZURE_SEARCH_CONTENT_VECTOR_COLUMN: None,
             self.env_helper.AZURE_SEARCH_FIELDS_METADATA: json.dumps(metadata),
             self.env_helper.AZURE_SEARCH_TITLE_COLUMN: document.title,
             self.env_helper.AZURE_SEARCH_SOURCE_COLUMN: document.source,
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+from .azure_blob_storage_client import AzureBlobStorageClient
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheBackend(ABC):
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        pass
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        pass
+
+
+class SqliteEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """
+    Stores embeddings in a local SQLite file. Intended for local development
+    and tests, where it keeps embeddings across runs without any Azure resources.
+    """
+
+    __QUERY_BATCH_SIZE = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding TEXT NOT NULL)"
+            )
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        rows = []
+        # Stay well below SQLite's limit on the number of query parameters
+        for i in range(0, len(keys), self.__QUERY_BATCH_SIZE):
+            batch = keys[i : i + self.__QUERY_BATCH_SIZE]
+            placeholders = ",".join("?" for _ in batch)
+            with self.__lock:
+                rows += self.__connection.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+        return {key: json.loads(embedding) for key, embedding in rows}
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                [(key, json.dumps(embedding)) for key, embedding in items.items()],
+            )
+
+
+class BlobEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """
+    Stores each embedding as a JSON blob named after its cache key, so that
+    every ingestion worker shares the same cache.
+    """
+
+    __MAX_WORKERS = 8
+
+    def __init__(self, container_name: str):
+        self.blob_client = AzureBlobStorageClient(container_name=container_name)
+        try:
+            self.blob_client.blob_service_client.create_container(container_name)
+        except ResourceExistsError:
+            pass
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        with ThreadPoolExecutor(max_workers=self.__MAX_WORKERS) as pool:
+            embeddings = pool.map(self.__get, keys)
+        return {
+            key: embedding
+            for key, embedding in zip(keys, embeddings)
+            if embedding is not None
+        }
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        with ThreadPoolExecutor(max_workers=self.__MAX_WORKERS) as pool:
+            list(pool.map(self.__set, items.keys(), items.values()))
+
+    def __get(self, key: str) -> Optional[List[float]]:
+        try:
+            return json.loads(self.blob_client.download_file(f"{key}.json"))
+        except ResourceNotFoundError:
+            return None
+
+    def __set(self, key: str, embedding: List[float]) -> None:
+        self.blob_client.upload_file(
+            json.dumps(embedding).encode("utf-8"),
+            f"{key}.json",
+            content_type="application/json",
+        )
+
+
+class EmbeddingCache(Singleton):
+    """
+    Stores embeddings keyed by model, dimensions and a SHA-256 of the
+    embedded text, so unchanged chunks are not embedded again when a document
+    is reprocessed.
+
+    Enabled by setting AZURE_OPENAI_EMBEDDING_CACHE to "sqlite" (local file at
+    AZURE_OPENAI_EMBEDDING_CACHE_PATH) or "blob" (the storage account container
+    named by AZURE_OPENAI_EMBEDDING_CACHE_CONTAINER).
+    """
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.__stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend = self.__create_backend(env_helper)
+
+    @staticmethod
+    def __create_backend(env_helper: EnvHelper) -> Optional[EmbeddingCacheBackend]:
+        backend = env_helper.AZURE_OPENAI_EMBEDDING_CACHE.lower()
+        if backend == "":
+            return None
+        if backend == "sqlite":
+            return SqliteEmbeddingCacheBackend(
+                env_helper.AZURE_OPENAI_EMBEDDING_CACHE_PATH
+                or os.path.join(tempfile.gettempdir(), "embedding_cache.sqlite")
+            )
+        if backend == "blob":
+            return BlobEmbeddingCacheBackend(
+                env_helper.AZURE_OPENAI_EMBEDDING_CACHE_CONTAINER
+            )
+        raise ValueError(f"Unknown embedding cache backend: {backend}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def get_key(model: str, dimensions: Optional[int], text: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}/{dimensions or 'default'}/{text_hash}"
+
+    def get_or_embed(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        inputs: List[str],
+        embed: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """
+        Returns the embeddings for the inputs, calling embed only for the
+        distinct inputs that are not cached yet and caching what it returns.
+        """
+        keys = [self.get_key(model, dimensions, input) for input in inputs]
+        cached = self.backend.get_many(list(dict.fromkeys(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, input in zip(keys, inputs):
+            if key not in cached:
+                missing.setdefault(key, input)
+
+        with self.__stats_lock:
+            self.hits += len(inputs) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            embedded = dict(zip(missing.keys(), embed(list(missing.values()))))
+            self.backend.set_many(embedded)
+            cached.update(embedded)
+
+        logger.info(
+            f"Embedding cache served {len(inputs) - len(missing)} of {len(inputs)} inputs, stats: {self.get_stats()}"
+        )
+        return [cached[key] for key in keys]
+
+    def get_stats(self) -> dict:
+        with self.__stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
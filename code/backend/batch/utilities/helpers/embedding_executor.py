@@ -0,0 +1,220 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from openai import RateLimitError
+
+from .env_helper import EnvHelper
+from .singleton import Singleton
+from .llm_helper import LLMHelper, get_ordered_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingRateLimiter(Singleton):
+    """
+    Gate for embeddings requests, shared by every EmbeddingExecutor so that
+    concurrent document ingestions draw from the same quota.
+
+    The number of requests in flight is halved whenever Azure OpenAI throttles a
+    request (HTTP 429) and grows back by one after a run of successful requests.
+    A Retry-After from the service pauses all new requests until it has passed,
+    and when a tokens-per-minute budget is set, new requests wait while the
+    tokens used over the last minute exceed it.
+    """
+
+    __WINDOW_SECONDS = 60
+    __SUCCESSES_BEFORE_INCREASE = 5
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.max_concurrency = max(1, env_helper.AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY)
+        self.tokens_per_minute = env_helper.AZURE_OPENAI_EMBEDDING_TOKENS_PER_MINUTE
+        self.concurrency = self.max_concurrency
+        self.__condition = threading.Condition()
+        self.__in_flight = 0
+        self.__queue_depth = 0
+        self.__successes_since_throttle = 0
+        self.__paused_until = 0.0
+        self.__completed_requests = 0
+        self.__throttled_requests = 0
+        # (completion time, tokens, inputs) for requests in the last minute
+        self.__window = deque()
+
+    def enqueue(self, count: int) -> None:
+        with self.__condition:
+            self.__queue_depth += count
+
+    def dequeue(self, count: int) -> None:
+        with self.__condition:
+            self.__queue_depth -= count
+
+    def acquire(self) -> None:
+        with self.__condition:
+            while True:
+                now = time.monotonic()
+                self.__expire_window(now)
+                wait_for = self.__get_wait_time(now)
+                if wait_for == 0:
+                    break
+                self.__condition.wait(timeout=wait_for)
+            self.__in_flight += 1
+
+    def release(self) -> None:
+        with self.__condition:
+            self.__in_flight -= 1
+            self.__condition.notify_all()
+
+    def record_success(self, tokens: int, inputs: int) -> None:
+        with self.__condition:
+            self.__window.append((time.monotonic(), tokens, inputs))
+            self.__completed_requests += 1
+            self.__successes_since_throttle += 1
+            if (
+                self.concurrency < self.max_concurrency
+                and self.__successes_since_throttle >= self.__SUCCESSES_BEFORE_INCREASE
+            ):
+                self.concurrency += 1
+                self.__successes_since_throttle = 0
+                logger.info(f"Raised embedding concurrency to {self.concurrency}")
+            self.__condition.notify_all()
+
+    def record_throttle(self, retry_after: float) -> None:
+        with self.__condition:
+            self.__throttled_requests += 1
+            self.__successes_since_throttle = 0
+            self.concurrency = max(1, self.concurrency // 2)
+            self.__paused_until = max(
+                self.__paused_until, time.monotonic() + retry_after
+            )
+            logger.warning(
+                f"Embeddings request throttled, retrying in {retry_after}s "
+                f"with concurrency {self.concurrency}"
+            )
+
+    def get_stats(self) -> dict:
+        with self.__condition:
+            now = time.monotonic()
+            self.__expire_window(now)
+            window_tokens = sum(tokens for _, tokens, _ in self.__window)
+            window_inputs = sum(inputs for _, _, inputs in self.__window)
+            elapsed = max(now - self.__window[0][0], 1.0) if self.__window else 1.0
+            return {
+                "queue_depth": self.__queue_depth,
+                "in_flight": self.__in_flight,
+                "concurrency": self.concurrency,
+                "completed_requests": self.__completed_requests,
+                "throttled_requests": self.__throttled_requests,
+                "tokens_last_minute": window_tokens,
+                "tokens_per_second": window_tokens / elapsed,
+                "inputs_per_second": window_inputs / elapsed,
+            }
+
+    def __expire_window(self, now: float) -> None:
+        while self.__window and now - self.__window[0][0] >= self.__WINDOW_SECONDS:
+            self.__window.popleft()
+
+    def __get_wait_time(self, now: float) -> Optional[float]:
+        if now < self.__paused_until:
+            return self.__paused_until - now
+        if self.__in_flight >= self.concurrency:
+            # woken up by release()
+            return None
+        if self.tokens_per_minute > 0 and self.__window:
+            window_tokens = sum(tokens for _, tokens, _ in self.__window)
+            if window_tokens >= self.tokens_per_minute:
+                return self.__window[0][0] + self.__WINDOW_SECONDS - now
+        return 0
+
+
+class EmbeddingExecutor:
+    """
+    Embeds texts by sending their batches to Azure OpenAI from a bounded pool
+    of worker threads, throttled by the shared EmbeddingRateLimiter. The pool
+    is reused by every call, and its idle threads exit once the executor is
+    garbage collected.
+    """
+
+    __DEFAULT_BACKOFF_SECONDS = 1.0
+
+    def __init__(self, llm_helper: LLMHelper, env_helper: EnvHelper):
+        self.llm_helper = llm_helper
+        self.max_workers = max(1, env_helper.AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY)
+        self.max_retries = env_helper.AZURE_OPENAI_EMBEDDING_MAX_RETRIES
+        self.rate_limiter = EmbeddingRateLimiter()
+        self.__pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="embedding"
+        )
+
+    def embed(self, inputs: List[str]) -> List[List[float]]:
+        """
+        Embeds the inputs and returns their embeddings in the same order. Inputs
+        found in the embedding cache are not sent to Azure OpenAI.
+        """
+        if not inputs:
+            return []
+        return self.llm_helper.embed_with_cache(inputs, self.__embed)
+
+    def __embed(self, inputs: List[str]) -> List[List[float]]:
+        start = time.monotonic()
+        batches = self.llm_helper.split_embedding_batches(inputs)
+        self.rate_limiter.enqueue(len(batches))
+        futures = [self.__pool.submit(self.__embed_batch, batch) for batch in batches]
+        try:
+            embeddings = [
+                embedding for future in futures for embedding in future.result()
+            ]
+        finally:
+            # the batches not started yet when one failed are dropped
+            cancelled = sum(1 for future in futures if future.cancel())
+            self.rate_limiter.dequeue(cancelled)
+
+        logger.info(
+            f"Embedded {len(inputs)} inputs in {len(batches)} batches in "
+            f"{time.monotonic() - start:.2f}s, stats: {self.rate_limiter.get_stats()}"
+        )
+        return embeddings
+
+    def __embed_batch(self, batch: List[str]) -> List[List[float]]:
+        self.rate_limiter.acquire()
+        self.rate_limiter.dequeue(1)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    # Retries are handled here so that throttling is visible to
+                    # the rate limiter rather than hidden inside the client
+                    response = self.llm_helper.create_embeddings(batch, max_retries=0)
+                    break
+                except RateLimitError as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    self.rate_limiter.record_throttle(
+                        self.__get_retry_after(e, attempt)
+                    )
+                    attempt += 1
+                    self.rate_limiter.release()
+                    self.rate_limiter.acquire()
+        finally:
+            self.rate_limiter.release()
+
+        self.rate_limiter.record_success(
+            response.usage.total_tokens if response.usage else 0, len(batch)
+        )
+        return get_ordered_embeddings(response)
+
+    def __get_retry_after(self, error: RateLimitError, attempt: int) -> float:
+        headers = error.response.headers if error.response is not None else {}
+        retry_after_ms = headers.get("retry-after-ms")
+        retry_after = headers.get("retry-after")
+        try:
+            if retry_after_ms is not None:
+                return float(retry_after_ms) / 1000
+            if retry_after is not None:
+                return float(retry_after)
+        except ValueError:
+            pass
+        return self.__DEFAULT_BACKOFF_SECONDS * (2**attempt)
@@ -94,6 +94,19 @@ class EnvHelper:
         self.AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE = os.getenv(
             "AZURE_SEARCH_DOC_UPLOAD_BATCH_SIZE", 100
         )
+        self.AZURE_SEARCH_INDEX_CACHE_TTL = self.get_env_var_int(
+            "AZURE_SEARCH_INDEX_CACHE_TTL", 300
+        )
+        self.AZURE_SEARCH_QUERY_VECTOR_CACHE_TTL = self.get_env_var_int(
+            "AZURE_SEARCH_QUERY_VECTOR_CACHE_TTL", 3600
+        )
+        # 0 disables the query vector cache
+        self.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES = self.get_env_var_int(
+            "AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES", 1000
+        )
+        self.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_MB = self.get_env_var_int(
+            "AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_MB", 64
+        )
         # Integrated Vectorization
         self.AZURE_SEARCH_DATASOURCE_NAME = os.getenv(
             "AZURE_SEARCH_DATASOURCE_NAME", ""
@@ -218,10 +231,65 @@ class EnvHelper:
         self.SHOULD_STREAM = (
             True if self.AZURE_OPENAI_STREAM.lower() == "true" else False
         )
+        self.AZURE_OPENAI_EMBEDDING_BATCH_SIZE = self.get_env_var_int(
+            "AZURE_OPENAI_EMBEDDING_BATCH_SIZE", 16
+        )
+        self.AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS = self.get_env_var_int(
+            "AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS", 100000
+        )
+        self.AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY = self.get_env_var_int(
+            "AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY", 4
+        )
+        # 0 disables the client-side tokens-per-minute limit
+        self.AZURE_OPENAI_EMBEDDING_TOKENS_PER_MINUTE = self.get_env_var_int(
+            "AZURE_OPENAI_EMBEDDING_TOKENS_PER_MINUTE", 0
+        )
+        self.AZURE_OPENAI_EMBEDDING_MAX_RETRIES = self.get_env_var_int(
+            "AZURE_OPENAI_EMBEDDING_MAX_RETRIES", 5
+        )
+        # "" (disabled), "sqlite" or "blob"
+        self.AZURE_OPENAI_EMBEDDING_CACHE = os.getenv("AZURE_OPENAI_EMBEDDING_CACHE", "")
+        self.AZURE_OPENAI_EMBEDDING_CACHE_PATH = os.getenv(
+            "AZURE_OPENAI_EMBEDDING_CACHE_PATH", ""
+        )
+        self.AZURE_OPENAI_EMBEDDING_CACHE_CONTAINER = os.getenv(
+            "AZURE_OPENAI_EMBEDDING_CACHE_CONTAINER", "embedding-cache"
+        )
+        # "" (disabled) or "memory"
+        self.AZURE_SEMANTIC_ANSWER_CACHE = os.getenv("AZURE_SEMANTIC_ANSWER_CACHE", "")
+        self.AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD = self.get_env_var_float(
+            "AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD", 0.95
+        )
+        # the only expiry of the answers cached by the web app, as ingestion
+        # only invalidates the answers cached by the function app
+        self.AZURE_SEMANTIC_ANSWER_CACHE_TTL = self.get_env_var_int(
+            "AZURE_SEMANTIC_ANSWER_CACHE_TTL", 3600
+        )
+        self.AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES = self.get_env_var_int(
+            "AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES", 1000
+        )
 
         self.AZURE_TOKEN_PROVIDER = get_bearer_token_provider(
             get_azure_credential(self.MANAGED_IDENTITY_CLIENT_ID), "https://cognitiveservices.azure.com/.default"
         )
+        self.AZURE_CLIENT_CONNECTION_POOL_SIZE = self.get_env_var_int(
+            "AZURE_CLIENT_CONNECTION_POOL_SIZE", 10
+        )
+        self.AZURE_CLIENT_KEEPALIVE_EXPIRY = self.get_env_var_int(
+            "AZURE_CLIENT_KEEPALIVE_EXPIRY", 30
+        )
+        self.APP_EVENT_LOOP_BLOCKING_THREADS = self.get_env_var_int(
+            "APP_EVENT_LOOP_BLOCKING_THREADS", 32
+        )
+        self.AZURE_POSTGRES_POOL_SIZE = self.get_env_var_int(
+            "AZURE_POSTGRES_POOL_SIZE", 10
+        )
+        self.AZURE_POSTGRES_CONNECTION_MAX_LIFETIME = self.get_env_var_int(
+            "AZURE_POSTGRES_CONNECTION_MAX_LIFETIME", 1800
+        )
+        self.AZURE_POSTGRES_CHAT_HISTORY_POOL_SIZE = self.get_env_var_int(
+            "AZURE_POSTGRES_CHAT_HISTORY_POOL_SIZE", 10
+        )
         self.ADVANCED_IMAGE_PROCESSING_MAX_IMAGES = self.get_env_var_int(
             "ADVANCED_IMAGE_PROCESSING_MAX_IMAGES", 1
         )
@@ -277,6 +345,16 @@ class EnvHelper:
         self.DOCUMENT_PROCESSING_QUEUE_NAME = os.getenv(
             "DOCUMENT_PROCESSING_QUEUE_NAME", "doc-processing"
         )
+        self.DOCUMENT_PROCESSING_STAGE_WORKERS = self.get_env_var_int(
+            "DOCUMENT_PROCESSING_STAGE_WORKERS", 4
+        )
+        self.DOCUMENT_PROCESSING_STAGE_QUEUE_SIZE = self.get_env_var_int(
+            "DOCUMENT_PROCESSING_STAGE_QUEUE_SIZE", 4
+        )
+        # 0 chunks documents on the pipeline's own threads
+        self.DOCUMENT_PROCESSING_CHUNKING_PROCESSES = self.get_env_var_int(
+            "DOCUMENT_PROCESSING_CHUNKING_PROCESSES", 0
+        )
         # Azure Blob Storage
         azure_blob_storage_info = self.get_info_from_env("AZURE_BLOB_STORAGE_INFO", "")
         if azure_blob_storage_info:
@@ -301,6 +379,9 @@ class EnvHelper:
             "AZURE_STORAGE_ACCOUNT_ENDPOINT",
             f"https://{self.AZURE_BLOB_ACCOUNT_NAME}.blob.core.windows.net/",
         )
+        self.AZURE_BLOB_SAS_EXPIRY_MARGIN = self.get_env_var_int(
+            "AZURE_BLOB_SAS_EXPIRY_MARGIN", 900
+        )
 
         # Azure Form Recognizer
         azure_form_recognizer_info = self.get_info_from_env(
@@ -322,6 +403,13 @@ class EnvHelper:
             self.AZURE_FORM_RECOGNIZER_KEY = self.secretHelper.get_secret(
                 "AZURE_FORM_RECOGNIZER_KEY"
             )
+        # Analyze documents in ranges of this many pages, 0 analyzes them whole
+        self.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = self.get_env_var_int(
+            "AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST", 0
+        )
+        self.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY = self.get_env_var_int(
+            "AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY", 4
+        )
 
         # Azure App Insights
         # APPLICATIONINSIGHTS_ENABLED will be True when the application runs in App Service
@@ -355,6 +443,12 @@ class EnvHelper:
         self.LOAD_CONFIG_FROM_BLOB_STORAGE = self.get_env_var_bool(
             "LOAD_CONFIG_FROM_BLOB_STORAGE"
         )
+        self.CONFIG_REFRESH_INTERVAL = self.get_env_var_int(
+            "CONFIG_REFRESH_INTERVAL", 60
+        )
+        self.DEBUG_METRICS_ENABLED = self.get_env_var_bool(
+            "DEBUG_METRICS_ENABLED", "False"
+        )
 
         self.AZURE_ML_WORKSPACE_NAME = os.getenv("AZURE_ML_WORKSPACE_NAME", "")
 
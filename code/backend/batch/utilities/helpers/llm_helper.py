@@ -1,6 +1,8 @@
 import logging
-from openai import AzureOpenAI
-from typing import List, Union, cast
+import tiktoken
+from openai import AsyncAzureOpenAI, AzureOpenAI
+from openai.types.create_embedding_response import CreateEmbeddingResponse
+from typing import Callable, List, Optional, Union, cast
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
@@ -9,40 +11,91 @@ from semantic_kernel.connectors.ai.open_ai.prompt_execution_settings.azure_chat_
 )
 from azure.ai.ml import MLClient
 from .azure_credential_utils import get_azure_credential
+from .client_registry import ClientRegistry
+from .embedding_cache import EmbeddingCache
 from .env_helper import EnvHelper
 
 logger = logging.getLogger(__name__)
 
 
+def get_ordered_embeddings(response: CreateEmbeddingResponse) -> List[List[float]]:
+    return [item.embedding for item in sorted(response.data, key=lambda x: x.index)]
+
+
 class LLMHelper:
+    _ENCODER_NAME = "cl100k_base"
+
     def __init__(self):
         logger.info("Initializing LLMHelper")
         self.env_helper: EnvHelper = EnvHelper()
         self.auth_type_keys = self.env_helper.is_auth_type_keys()
         self.token_provider = self.env_helper.AZURE_TOKEN_PROVIDER
 
+        self.openai_client = ClientRegistry().get_or_create(
+            "openai", self.__get_openai_client_key(), self.__create_openai_client
+        )
+
+        self.llm_model = self.env_helper.AZURE_OPENAI_MODEL
+        self.llm_max_tokens = (
+            int(self.env_helper.AZURE_OPENAI_MAX_TOKENS)
+            if self.env_helper.AZURE_OPENAI_MAX_TOKENS != ""
+            else None
+        )
+        self.embedding_model = self.env_helper.AZURE_OPENAI_EMBEDDING_MODEL
+        self.embedding_cache = EmbeddingCache()
+
+        logger.info("Initializing LLMHelper completed")
+
+    def __get_openai_client_key(self) -> tuple:
+        return (
+            self.env_helper.AZURE_OPENAI_ENDPOINT,
+            self.env_helper.AZURE_OPENAI_API_VERSION,
+            self.env_helper.OPENAI_API_KEY if self.auth_type_keys else None,
+        )
+
+    async def get_async_openai_client(self) -> AsyncAzureOpenAI:
+        """
+        Returns the async OpenAI client of the running event loop.
+        """
+        return await ClientRegistry().aget_or_create(
+            "openai_async",
+            self.__get_openai_client_key(),
+            self.__create_async_openai_client,
+        )
+
+    async def __create_async_openai_client(self) -> AsyncAzureOpenAI:
+        http_client = ClientRegistry().create_async_http_client("openai_async")
         if self.auth_type_keys:
-            self.openai_client = AzureOpenAI(
+            return AsyncAzureOpenAI(
                 azure_endpoint=self.env_helper.AZURE_OPENAI_ENDPOINT,
                 api_version=self.env_helper.AZURE_OPENAI_API_VERSION,
                 api_key=self.env_helper.OPENAI_API_KEY,
+                http_client=http_client,
             )
         else:
-            self.openai_client = AzureOpenAI(
+            return AsyncAzureOpenAI(
                 azure_endpoint=self.env_helper.AZURE_OPENAI_ENDPOINT,
                 api_version=self.env_helper.AZURE_OPENAI_API_VERSION,
                 azure_ad_token_provider=self.token_provider,
+                http_client=http_client,
             )
 
-        self.llm_model = self.env_helper.AZURE_OPENAI_MODEL
-        self.llm_max_tokens = (
-            int(self.env_helper.AZURE_OPENAI_MAX_TOKENS)
-            if self.env_helper.AZURE_OPENAI_MAX_TOKENS != ""
-            else None
-        )
-        self.embedding_model = self.env_helper.AZURE_OPENAI_EMBEDDING_MODEL
-
-        logger.info("Initializing LLMHelper completed")
+    def __create_openai_client(self) -> AzureOpenAI:
+        http_client = ClientRegistry().create_http_client("openai")
+        if self.auth_type_keys:
+            return AzureOpenAI(
+                azure_endpoint=self.env_helper.AZURE_OPENAI_ENDPOINT,
+                api_version=self.env_helper.AZURE_OPENAI_API_VERSION,
+                api_key=self.env_helper.OPENAI_API_KEY,
+                http_client=http_client,
+            )
+        else:
+            return AzureOpenAI(
+                azure_endpoint=self.env_helper.AZURE_OPENAI_ENDPOINT,
+                api_version=self.env_helper.AZURE_OPENAI_API_VERSION,
+                azure_ad_token_provider=self.token_provider,
+                http_client=http_client,
+            )
 
     def get_llm(self):
         if self.auth_type_keys:
@@ -117,24 +170,119 @@ class LLMHelper:
                 azure_ad_token_provider=self.token_provider,
             )
 
-    def generate_embeddings(self, input: Union[str, list[int]]) -> List[float]:
+    def __get_embedding_kwargs(self) -> dict:
+        kwargs = {"model": self.embedding_model}
         # Only pass dimensions for models that support it (text-embedding-3-*)
         # text-embedding-ada-002 does NOT support the dimensions parameter
         supports_dimensions = "text-embedding-3" in self.embedding_model.lower()
-        dimensions = None
         if supports_dimensions and self.env_helper.AZURE_SEARCH_DIMENSIONS:
-            dimensions = int(self.env_helper.AZURE_SEARCH_DIMENSIONS)
+            kwargs["dimensions"] = int(self.env_helper.AZURE_SEARCH_DIMENSIONS)
+        return kwargs
 
-        kwargs = {"input": [input], "model": self.embedding_model}
-        if dimensions is not None:
-            kwargs["dimensions"] = dimensions
+    def get_embedding_model_key(self) -> str:
+        """
+        Identifies the embeddings generate_embeddings returns, changing with
+        the model and dimensions.
+        """
+        kwargs = self.__get_embedding_kwargs()
+        return f"{kwargs['model']}/{kwargs.get('dimensions') or 'default'}"
 
+    def generate_embeddings(self, input: Union[str, list[int]]) -> List[float]:
+        """
+        Embeds a question, which does not use the embedding cache of the
+        ingestion, as the vectors of the questions are cached in memory by
+        the QueryVectorCache.
+        """
         return (
-            self.openai_client.embeddings.create(**kwargs)
+            self.openai_client.embeddings.create(
+                input=[input], **self.__get_embedding_kwargs()
+            )
             .data[0]
             .embedding
         )
 
+    async def agenerate_embeddings(self, input: Union[str, list[int]]) -> List[float]:
+        """
+        Async variant of generate_embeddings.
+        """
+        client = await self.get_async_openai_client()
+        response = await client.embeddings.create(
+            input=[input], **self.__get_embedding_kwargs()
+        )
+        return response.data[0].embedding
+
+    def embed_with_cache(
+        self, inputs: List[str], embed: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """
+        Looks the inputs up in the embedding cache, if one is configured, and
+        calls embed only for those that are not cached.
+        """
+        if not self.embedding_cache.enabled:
+            return embed(inputs)
+        kwargs = self.__get_embedding_kwargs()
+        return self.embedding_cache.get_or_embed(
+            kwargs["model"], kwargs.get("dimensions"), inputs, embed
+        )
+
+    def split_embedding_batches(self, inputs: List[str]) -> List[List[str]]:
+        """
+        Groups the inputs into batches that fit within the configured number of
+        inputs and total tokens per embeddings request, preserving their order.
+        An input larger than the token budget is sent in a batch of its own.
+        """
+        max_inputs = max(1, self.env_helper.AZURE_OPENAI_EMBEDDING_BATCH_SIZE)
+        max_tokens = self.env_helper.AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS
+        encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in inputs:
+            tokens = len(encoding.encode(text))
+            if batch and (
+                len(batch) >= max_inputs or batch_tokens + tokens > max_tokens
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def create_embeddings(
+        self, inputs: List[str], max_retries: Optional[int] = None
+    ) -> CreateEmbeddingResponse:
+        """
+        Sends a single embeddings request for all of the inputs. When max_retries
+        is given it overrides the client's retry policy for this request only.
+        """
+        client = (
+            self.openai_client
+            if max_retries is None
+            else self.openai_client.with_options(max_retries=max_retries)
+        )
+        return client.embeddings.create(input=inputs, **self.__get_embedding_kwargs())
+
+    def generate_embeddings_batch(self, inputs: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of texts using as few embeddings requests as the batch
+        limits allow. The returned embeddings are in the same order as the inputs.
+        """
+        return self.embed_with_cache(inputs, self.__generate_embeddings_batch)
+
+    def __generate_embeddings_batch(self, inputs: List[str]) -> List[List[float]]:
+        embeddings: List[List[float]] = []
+        batches = self.split_embedding_batches(inputs)
+        logger.info(
+            f"Generating embeddings for {len(inputs)} inputs in {len(batches)} batches"
+        )
+        for batch in batches:
+            embeddings.extend(get_ordered_embeddings(self.create_embeddings(batch)))
+        return embeddings
+
     def get_chat_completion_with_functions(
         self, messages: list[dict], functions: list[dict], function_call: str = "auto"
     ):
@@ -155,6 +303,17 @@ class LLMHelper:
             **kwargs
         )
 
+    async def aget_chat_completion(
+        self, messages: list[dict], model: str | None = None, **kwargs
+    ):
+        client = await self.get_async_openai_client()
+        return await client.chat.completions.create(
+            model=model or self.llm_model,
+            messages=messages,
+            max_tokens=self.llm_max_tokens,
+            **kwargs
+        )
+
     def get_sk_chat_completion_service(self, service_id: str):
         if self.auth_type_keys:
             return AzureChatCompletion(
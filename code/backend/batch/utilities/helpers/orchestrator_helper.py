@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import AsyncIterator, List
 
 from ..orchestrator.orchestration_strategy import OrchestrationStrategy
 from ..orchestrator import OrchestrationSettings
@@ -19,7 +20,10 @@ class Orchestrator:
         orchestrator: OrchestrationSettings,
         **kwargs: dict,
     ) -> dict:
-        orchestrator = get_orchestrator(orchestrator.strategy.value)
+        # the orchestrators load the configuration and create their clients
+        orchestrator = await asyncio.to_thread(
+            get_orchestrator, orchestrator.strategy.value
+        )
         if orchestrator is None:
             raise Exception(
                 f"Unknown orchestration strategy: {orchestrator.strategy.value}"
@@ -27,3 +31,20 @@ class Orchestrator:
         return await orchestrator.handle_message(
             user_message, chat_history, conversation_id
         )
+
+    async def handle_message_stream(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        conversation_id: str,
+        orchestrator: OrchestrationSettings,
+        **kwargs: dict,
+    ) -> AsyncIterator[list[dict]]:
+        # the orchestrators load the configuration and create their clients
+        orchestrator = await asyncio.to_thread(
+            get_orchestrator, orchestrator.strategy.value
+        )
+        async for deltas in orchestrator.handle_message_stream(
+            user_message, chat_history, conversation_id
+        ):
+            yield deltas
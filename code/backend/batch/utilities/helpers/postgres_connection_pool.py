@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Tuple
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection
+
+from .env_helper import EnvHelper
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresConnectionPool:
+    """
+    Bounded pool of PostgreSQL connections, opened with connect, so that
+    queries do not pay for the TLS handshake, the authentication and the
+    start of a backend each. At most AZURE_POSTGRES_POOL_SIZE connections are
+    open at once; callers wait for one to be returned beyond that.
+
+    Connections are only authenticated when they are opened, so connect must
+    fetch a valid access token every time. Connections are closed once they
+    are AZURE_POSTGRES_CONNECTION_MAX_LIFETIME seconds old, so that they are
+    opened again with a fresh token, and the ones left idle for more than
+    HEALTH_CHECK_INTERVAL seconds are checked before they are handed out.
+    """
+
+    HEALTH_CHECK_INTERVAL = 30
+    ACQUIRE_TIMEOUT = 30
+
+    def __init__(self, connect: Callable[[], connection]):
+        env_helper = EnvHelper()
+        self.max_size = env_helper.AZURE_POSTGRES_POOL_SIZE
+        self.max_lifetime = env_helper.AZURE_POSTGRES_CONNECTION_MAX_LIFETIME
+        self.__connect = connect
+        self.__slots = threading.BoundedSemaphore(self.max_size)
+        self.__lock = threading.Lock()
+        # (connection, opened at, returned at), most recently returned last
+        self.__idle: Deque[Tuple[connection, float, float]] = deque()
+        self.__opened_at: Dict[int, float] = {}
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """
+        Lends a connection for the duration of the block. It is returned to
+        the pool afterwards, with any transaction left open rolled back.
+        """
+        if not self.__slots.acquire(timeout=self.ACQUIRE_TIMEOUT):
+            raise TimeoutError(
+                f"No PostgreSQL connection was returned to the pool within {self.ACQUIRE_TIMEOUT} seconds"
+            )
+        try:
+            conn = self.__acquire()
+        except Exception:
+            self.__slots.release()
+            raise
+        try:
+            yield conn
+        finally:
+            self.__release(conn)
+            self.__slots.release()
+
+    def __acquire(self) -> connection:
+        while True:
+            with self.__lock:
+                if not self.__idle:
+                    break
+                conn, opened_at, returned_at = self.__idle.pop()
+            now = time.monotonic()
+            if now - opened_at >= self.max_lifetime:
+                self.__discard(conn, "reached its maximum lifetime")
+            elif conn.closed != 0:
+                self.__discard(conn, "was closed")
+            elif (
+                now - returned_at >= self.HEALTH_CHECK_INTERVAL
+                and not self.__is_healthy(conn)
+            ):
+                self.__discard(conn, "failed its health check")
+            else:
+                with self.__lock:
+                    self.reused += 1
+                return conn
+
+        conn = self.__connect()
+        with self.__lock:
+            self.__opened_at[id(conn)] = time.monotonic()
+            self.opened += 1
+        logger.info("Opened a pooled PostgreSQL connection")
+        return conn
+
+    def __release(self, conn: connection) -> None:
+        if conn.closed != 0:
+            self.__discard(conn, "was closed")
+            return
+        opened_at = self.__opened_at.get(id(conn), 0.0)
+        if time.monotonic() - opened_at >= self.max_lifetime:
+            self.__discard(conn, "reached its maximum lifetime")
+            return
+        if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            # reads open a transaction too, which would hold on to its locks
+            try:
+                conn.rollback()
+            except Exception:
+                self.__discard(conn, "could not be rolled back")
+                return
+        with self.__lock:
+            self.__idle.append((conn, opened_at, time.monotonic()))
+
+    @staticmethod
+    def __is_healthy(conn: connection) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def __discard(self, conn: connection, reason: str) -> None:
+        logger.info(f"Discarding a pooled PostgreSQL connection that {reason}")
+        with self.__lock:
+            self.__opened_at.pop(id(conn), None)
+            self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            logger.exception("Failed to close a PostgreSQL connection")
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "discarded": self.discarded,
+                "idle": len(self.__idle),
+            }
+
+    def close(self) -> None:
+        """
+        Closes the idle connections, and the ones lent out when they are
+        returned.
+        """
+        with self.__lock:
+            idle, self.__idle = list(self.__idle), deque()
+            # a closed pool keeps no connection
+            self.max_lifetime = 0
+        for conn, _, _ in idle:
+            self.__discard(conn, "was idle when the pool was closed")
@@ -0,0 +1,133 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, List, Optional, Tuple
+
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class QueryVectorCache(Singleton):
+    """
+    In-memory cache of the vectors of the questions searched for, shared by
+    the search handlers, so that repeated questions are not embedded again. Questions are keyed by the model that vectorized them and
+    their text with the case and whitespace normalized.
+
+    Vectors are kept for AZURE_SEARCH_QUERY_VECTOR_CACHE_TTL seconds. Once the
+    cache holds more than AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES vectors
+    or AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_MB megabytes, the least recently
+    used are evicted. A maximum of 0 entries disables the cache.
+    """
+
+    # a list of floats holds a pointer and a float object per value
+    __BYTES_PER_VALUE = 32
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.ttl = env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_TTL
+        self.max_entries = env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES
+        self.max_bytes = env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_MB * 1024**2
+        self.__vectors_lock = threading.Lock()
+        # least recently used first
+        self.__vectors: OrderedDict[Hashable, Tuple[float, List[float], int]] = (
+            OrderedDict()
+        )
+        self.__bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        return re.sub(r"\s+", " ", question).strip().casefold()
+
+    def get_or_vectorize(
+        self, model: Hashable, question: str, vectorize: Callable[[], List[float]]
+    ) -> List[float]:
+        """
+        Returns the cached vector of the question for the model, or calls
+        vectorize and caches what it returns. The vector is shared by every
+        caller, so it must not be modified.
+        """
+        if not self.enabled:
+            return vectorize()
+        key = (model, self.normalize(question))
+        vector = self.__get(key)
+        if vector is None:
+            # vectorized without the lock, so other questions are not held up
+            vector = vectorize()
+            self.__set(key, vector)
+        return vector
+
+    async def aget_or_vectorize(
+        self,
+        model: Hashable,
+        question: str,
+        vectorize: Callable[[], Awaitable[List[float]]],
+    ) -> List[float]:
+        """
+        Async variant of get_or_vectorize, awaiting vectorize on a miss.
+        """
+        if not self.enabled:
+            return await vectorize()
+        key = (model, self.normalize(question))
+        vector = self.__get(key)
+        if vector is None:
+            vector = await vectorize()
+            self.__set(key, vector)
+        return vector
+
+    def __get(self, key: Hashable) -> Optional[List[float]]:
+        with self.__vectors_lock:
+            entry = self.__vectors.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                self.__vectors.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def __set(self, key: Hashable, vector: List[float]) -> None:
+        now = time.monotonic()
+        size = self.__BYTES_PER_VALUE * len(vector)
+        with self.__vectors_lock:
+            self.__remove(key)
+            self.__vectors[key] = (now + self.ttl, vector, size)
+            self.__bytes += size
+            self.__evict(now)
+
+    def get_stats(self) -> dict:
+        with self.__vectors_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.__vectors),
+                "bytes": self.__bytes,
+            }
+
+    def __remove(self, key: Hashable) -> None:
+        entry = self.__vectors.pop(key, None)
+        if entry is not None:
+            self.__bytes -= entry[2]
+
+    def __evict(self, now: float) -> None:
+        for key in [key for key, entry in self.__vectors.items() if entry[0] <= now]:
+            self.__remove(key)
+        while self.__vectors and (
+            len(self.__vectors) > self.max_entries or self.__bytes > self.max_bytes
+        ):
+            key = next(iter(self.__vectors))
+            self.__remove(key)
+            self.evictions += 1
+            logger.debug(f"Evicted query vector of {key[0]} from the cache")
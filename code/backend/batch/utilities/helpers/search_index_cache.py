@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexCache(Singleton):
+    """
+    Remembers the index names of each search service, so that checking
+    whether an index exists does not list the indexes of the service on every
+    search. The names are listed again once they are older than
+    AZURE_SEARCH_INDEX_CACHE_TTL seconds. The app creates indexes but never
+    deletes them, so an index it creates is added to the names through
+    mark_created, and an index deleted from outside the app is seen once the
+    names expire.
+    """
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.__ttl = env_helper.AZURE_SEARCH_INDEX_CACHE_TTL
+        self.__entries: Dict[str, Tuple[float, Set[str]]] = {}
+        self.__entries_lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def index_exists(
+        self,
+        service: str,
+        index_name: str,
+        list_index_names: Callable[[], Iterable[str]],
+    ) -> bool:
+        """
+        Returns whether the service has the index, calling list_index_names
+        only when the cached names of the service are missing or expired.
+        """
+        index_names = self.__get(service)
+        if index_names is None:
+            # one caller lists the indexes while the others wait for its result
+            with self.__refresh_lock:
+                index_names = self.__get(service)
+                if index_names is None:
+                    index_names = set(list_index_names())
+                    with self.__entries_lock:
+                        self.misses += 1
+                        self.__entries[service] = (time.monotonic(), index_names)
+                    logger.info(f"Listed {len(index_names)} indexes of {service}")
+        return index_name in index_names
+
+    def mark_created(self, service: str, index_name: str) -> None:
+        self.__update(service, lambda index_names: index_names | {index_name})
+
+    def get_stats(self) -> dict:
+        with self.__entries_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "services": len(self.__entries),
+            }
+
+    def __get(self, service: str) -> Optional[Set[str]]:
+        with self.__entries_lock:
+            entry = self.__entries.get(service)
+            if entry is None or time.monotonic() - entry[0] >= self.__ttl:
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def __update(self, service: str, update: Callable[[Set[str]], Set[str]]) -> None:
+        with self.__entries_lock:
+            entry = self.__entries.get(service)
+            if entry is not None:
+                # keeps the listing time, so the names are still listed again
+                # once the TTL is over
+                self.__entries[service] = (entry[0], update(entry[1]))
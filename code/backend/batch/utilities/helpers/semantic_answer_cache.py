@@ -0,0 +1,268 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..common.answer import Answer
+from ..common.source_document import SourceDocument
+from .config.database_type import DatabaseType
+from .env_helper import EnvHelper
+from .singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+CITATION_PATTERN = re.compile(r"\[doc(\d+)\]")
+
+
+class SemanticAnswerCacheBackend(ABC):
+    """
+    Stores answers with the vectors of their questions. Entries are grouped by
+    the index they were answered from, so that they can be invalidated when
+    documents are ingested into it, and by a context identifying how they
+    were answered, like the prompts.
+    """
+
+    @abstractmethod
+    def search(
+        self, index: str, context: str, vector: List[float]
+    ) -> Optional[Tuple[float, str]]:
+        """
+        Returns the similarity and the answer of the entry whose question is
+        the most similar to vector, or None if there is no entry.
+        """
+
+    @abstractmethod
+    def add(self, index: str, context: str, vector: List[float], answer: str) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, index: Optional[str] = None) -> None:
+        pass
+
+
+class InMemorySemanticAnswerCacheBackend(SemanticAnswerCacheBackend):
+    """
+    Keeps the entries in the memory of the process, for a single instance of
+    the app or for tests. Entries expire after ttl seconds and the least
+    recently used are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        # least recently used first
+        self.__entries: OrderedDict[str, Tuple[str, str, float, np.ndarray, str]] = (
+            OrderedDict()
+        )
+        self.evictions = 0
+
+    def search(
+        self, index: str, context: str, vector: List[float]
+    ) -> Optional[Tuple[float, str]]:
+        query = self.__normalize(vector)
+        now = time.monotonic()
+        with self.__lock:
+            self.__remove_expired(now)
+            candidates = [
+                (entry_id, entry)
+                for entry_id, entry in self.__entries.items()
+                if entry[0] == index and entry[1] == context
+            ]
+            if not candidates:
+                return None
+            similarities = np.stack([entry[3] for _, entry in candidates]) @ query
+            best = int(np.argmax(similarities))
+            entry_id, entry = candidates[best]
+            self.__entries.move_to_end(entry_id)
+            return float(similarities[best]), entry[4]
+
+    def add(self, index: str, context: str, vector: List[float], answer: str) -> None:
+        now = time.monotonic()
+        with self.__lock:
+            self.__entries[str(uuid.uuid4())] = (
+                index,
+                context,
+                now + self.ttl,
+                self.__normalize(vector),
+                answer,
+            )
+            self.__remove_expired(now)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, index: Optional[str] = None) -> None:
+        with self.__lock:
+            for entry_id in [
+                entry_id
+                for entry_id, entry in self.__entries.items()
+                if index is None or entry[0] == index
+            ]:
+                del self.__entries[entry_id]
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def __remove_expired(self, now: float) -> None:
+        for entry_id in [
+            entry_id for entry_id, entry in self.__entries.items() if entry[2] <= now
+        ]:
+            del self.__entries[entry_id]
+
+    @staticmethod
+    def __normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+class SemanticAnswerCache(Singleton):
+    """
+    Caches answers, which are looked up by the cosine similarity of the vector
+    of the question with those of the questions already answered, so that a
+    question close enough to a previous one is answered without a chat
+    completion.
+
+    A cached answer is only returned if every document it cites was retrieved
+    again for the new question, with the same id and content. Answers that
+    cite no document are not cached.
+
+    Enabled by setting AZURE_SEMANTIC_ANSWER_CACHE to "memory". Questions must
+    be at least AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD similar, answers are
+    kept for AZURE_SEMANTIC_ANSWER_CACHE_TTL seconds and at most
+    AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES of them.
+
+    The cache is held in memory by each process. Ingestion invalidates the
+    answers of the index in the process that ingests, the function app, so
+    the web app keeps answering from its cache until the answers expire,
+    unless the documents they cite changed.
+    """
+
+    def _initialize(self) -> None:
+        env_helper = EnvHelper()
+        self.threshold = env_helper.AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD
+        self.backend = self.__create_backend(env_helper)
+        self.__stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def __create_backend(
+        env_helper: EnvHelper,
+    ) -> Optional[SemanticAnswerCacheBackend]:
+        backend = env_helper.AZURE_SEMANTIC_ANSWER_CACHE.lower()
+        if backend == "":
+            return None
+        if backend == "memory":
+            return InMemorySemanticAnswerCacheBackend(
+                env_helper.AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES,
+                env_helper.AZURE_SEMANTIC_ANSWER_CACHE_TTL,
+            )
+        raise ValueError(f"Unknown semantic answer cache backend: {backend}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def get_index_name(env_helper: EnvHelper) -> str:
+        """
+        Names the index the questions are answered from, which ingestion
+        invalidates the answers of.
+        """
+        if env_helper.DATABASE_TYPE == DatabaseType.POSTGRESQL.value:
+            return f"postgresql/{env_helper.POSTGRESQL_DATABASE}"
+        return f"{env_helper.AZURE_SEARCH_SERVICE}/{env_helper.AZURE_SEARCH_INDEX}"
+
+    @staticmethod
+    def get_document_fingerprint(document: SourceDocument) -> Tuple[str, str]:
+        content_hash = hashlib.sha256(document.content.encode("utf-8")).hexdigest()
+        return document.id, content_hash
+
+    @staticmethod
+    def get_cited_documents(answer: Answer) -> List[SourceDocument]:
+        indexes = {int(i) - 1 for i in CITATION_PATTERN.findall(answer.answer)}
+        return [
+            document
+            for i, document in enumerate(answer.source_documents)
+            if i in indexes
+        ]
+
+    def get(
+        self,
+        index: str,
+        context: str,
+        vector: List[float],
+        question: str,
+        source_documents: List[SourceDocument],
+    ) -> Optional[Answer]:
+        """
+        Returns the cached answer of the most similar question, for the new
+        question, if it is similar enough and the documents it cites are
+        among the source documents retrieved for the new question.
+        """
+        result = self.backend.search(index, context, vector)
+        if result is None or result[0] < self.threshold:
+            self.__count("misses")
+            return None
+
+        similarity, answer_json = result
+        cached_answer = Answer.from_json(answer_json)
+        retrieved = {self.get_document_fingerprint(d) for d in source_documents}
+        if not all(
+            self.get_document_fingerprint(document) in retrieved
+            for document in self.get_cited_documents(cached_answer)
+        ):
+            logger.info("Cached answer cites documents that changed, ignoring it")
+            self.__count("stale")
+            return None
+
+        self.__count("hits")
+        logger.info(f"Answering from the semantic answer cache ({similarity:.3f})")
+        # no tokens were used to answer this question
+        return Answer(
+            question=question,
+            answer=cached_answer.answer,
+            source_documents=cached_answer.source_documents,
+            prompt_tokens=0,
+            completion_tokens=0,
+        )
+
+    def add(self, index: str, context: str, vector: List[float], answer: Answer):
+        if not self.get_cited_documents(answer):
+            return
+        self.backend.add(index, context, vector, answer.to_json())
+
+    def invalidate(self, index: Optional[str] = None) -> None:
+        """
+        Drops the answers from index, or all of them, as the documents they
+        cite may be outdated or better ones may have been ingested.
+        """
+        if not self.enabled:
+            return
+        logger.info(f"Invalidating cached answers of {index or 'all indexes'}")
+        self.backend.invalidate(index)
+
+    def get_stats(self) -> dict:
+        with self.__stats_lock:
+            lookups = self.hits + self.misses + self.stale
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __count(self, outcome: str) -> None:
+        with self.__stats_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
@@ -0,0 +1,36 @@
+import threading
+
+
+class Singleton:
+    """
+    Base class of the helpers that are shared by the whole process. Calling
+    the class returns the same instance every time, which is set up by
+    _initialize the first time, rather than by __init__, which would run on
+    every call. clear_instance drops the instance, so that the next call
+    creates a new one, like between tests.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # a lock per class, as the instance of one may create others
+        cls._instance = None
+        cls._lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._initialize()
+                cls._instance = instance
+            return cls._instance
+
+    def _initialize(self) -> None:
+        pass
+
+    @classmethod
+    def clear_instance(cls):
+        if cls._instance is not None:
+            cls._instance = None
@@ -25,6 +25,7 @@ from ..helpers.env_helper import EnvHelper
 from ..helpers.azure_credential_utils import get_azure_credential
 from azure.core.credentials import AzureKeyCredential
 from ..helpers.llm_helper import LLMHelper
+from ..helpers.search_index_cache import SearchIndexCache
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +132,9 @@ class AzureSearchIndex:
             semantic_search=semantic_search,
         )
         result = self.index_client.create_or_update_index(index)
+        SearchIndexCache().mark_created(
+            self.env_helper.AZURE_SEARCH_SERVICE, result.name
+        )
         logger.info(f"{result.name} index created successfully.")
         return result
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import List
 from langchain.agents import Tool
@@ -59,7 +60,9 @@ class LangChainAgent(OrchestratorBase):
         logger.info("Method orchestrate of lang_chain_agent started")
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
-            if response := self.call_content_safety_input(user_message):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_input, user_message
+            ):
                 return response
 
         # Call function to determine route
@@ -92,7 +95,8 @@ class LangChainAgent(OrchestratorBase):
         )
         # Run Agent Chain
         with get_openai_callback() as cb:
-            answer = agent_chain.run(user_message)
+            # the callback is in the context copied to the thread
+            answer = await asyncio.to_thread(agent_chain.run, user_message)
             self.log_tokens(
                 prompt_tokens=cb.prompt_tokens,
                 completion_tokens=cb.completion_tokens,
@@ -106,7 +110,7 @@ class LangChainAgent(OrchestratorBase):
         if self.config.prompts.enable_post_answering_prompt:
             logger.debug("Running post answering prompt")
             post_prompt_tool = PostPromptTool()
-            answer = post_prompt_tool.validate_answer(answer)
+            answer = await asyncio.to_thread(post_prompt_tool.validate_answer, answer)
             self.log_tokens(
                 prompt_tokens=answer.prompt_tokens,
                 completion_tokens=answer.completion_tokens,
@@ -114,11 +118,14 @@ class LangChainAgent(OrchestratorBase):
 
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
-            if response := self.call_content_safety_output(user_message, answer.answer):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_output, user_message, answer.answer
+            ):
                 return response
 
         # Format the output for the UI
-        messages = self.output_parser.parse(
+        messages = await asyncio.to_thread(
+            self.output_parser.parse,
             question=answer.question,
             answer=answer.answer,
             source_documents=answer.source_documents,
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import List
+from typing import AsyncIterator, List
 import json
 
 from .orchestrator_base import OrchestratorBase
@@ -15,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 
 class OpenAIFunctionsOrchestrator(OrchestratorBase):
+    ANSWER_NOT_AVAILABLE = "The requested information is not available in the retrieved data. Please try another query or topic."
+
     def __init__(self) -> None:
         super().__init__()
         self.functions = [
@@ -59,10 +62,91 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
             logger.info("Content Safety enabled. Checking input message...")
-            if response := self.call_content_safety_input(user_message):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_input, user_message
+            ):
                 logger.info("Content Safety check returned a response. Exiting method.")
                 return response
 
+        result = await asyncio.to_thread(self.__route, user_message, chat_history)
+        messages = await self.__respond(user_message, chat_history, result)
+        logger.info("Method orchestrate of open_ai_functions ended")
+        return messages
+
+    async def orchestrate_stream(
+        self, user_message: str, chat_history: List[dict], **kwargs: dict
+    ) -> AsyncIterator[list[dict]]:
+        logger.info("Method orchestrate_stream of open_ai_functions started")
+        if self.config.prompts.enable_content_safety:
+            if response := await asyncio.to_thread(
+                self.call_content_safety_input, user_message
+            ):
+                yield response
+                return
+
+        result = await asyncio.to_thread(self.__route, user_message, chat_history)
+        if not (
+            result.choices[0].finish_reason == "function_call"
+            and result.choices[0].message.function_call.name == "search_documents"
+        ):
+            # only answers searched for in the documents are streamed
+            yield await self.__respond(user_message, chat_history, result)
+            return
+
+        logger.info("search_documents function detected")
+        question = json.loads(result.choices[0].message.function_call.arguments)[
+            "question"
+        ]
+        answering_tool = await asyncio.to_thread(QuestionAnswerTool)
+        answer, text_stream = await answering_tool.aanswer_question_stream(
+            question, chat_history
+        )
+        # the citations link to the documents with a SAS token
+        yield [
+            await asyncio.to_thread(
+                self.output_parser.parse_citations, question, answer.source_documents
+            )
+        ]
+
+        if self.config.prompts.enable_post_answering_prompt:
+            # the answer is validated as a whole before any of it is sent
+            async for _ in text_stream:
+                pass
+            self.log_tokens(
+                prompt_tokens=answer.prompt_tokens,
+                completion_tokens=answer.completion_tokens,
+            )
+            logger.debug("Running post answering prompt")
+            answer = await asyncio.to_thread(PostPromptTool().validate_answer, answer)
+            text_stream = self.__stream_text(answer.answer)
+
+        async for deltas in self.stream_answer(
+            user_message, self.__default_if_empty(text_stream)
+        ):
+            yield deltas
+        self.log_tokens(
+            prompt_tokens=answer.prompt_tokens,
+            completion_tokens=answer.completion_tokens,
+        )
+        logger.info("Method orchestrate_stream of open_ai_functions ended")
+
+    @staticmethod
+    async def __stream_text(text: str) -> AsyncIterator[str]:
+        yield text
+
+    @classmethod
+    async def __default_if_empty(
+        cls, text_stream: AsyncIterator[str]
+    ) -> AsyncIterator[str]:
+        empty = True
+        async for text in text_stream:
+            empty = empty and not text
+            yield text
+        if empty:
+            logger.info("Answer is empty")
+            yield cls.ANSWER_NOT_AVAILABLE
+
+    def __route(self, user_message: str, chat_history: List[dict]):
         # Call function to determine route
         llm_helper = LLMHelper()
         env_helper = EnvHelper()
@@ -96,7 +180,11 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
             prompt_tokens=result.usage.prompt_tokens,
             completion_tokens=result.usage.completion_tokens,
         )
+        return result
 
+    async def __respond(
+        self, user_message: str, chat_history: List[dict], result
+    ) -> list[dict]:
         # TODO: call content safety if needed
 
         if result.choices[0].finish_reason == "function_call":
@@ -107,8 +195,8 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
                     result.choices[0].message.function_call.arguments
                 )["question"]
                 # run answering chain
-                answering_tool = QuestionAnswerTool()
-                answer = answering_tool.answer_question(question, chat_history)
+                answering_tool = await asyncio.to_thread(QuestionAnswerTool)
+                answer = await answering_tool.aanswer_question(question, chat_history)
 
                 self.log_tokens(
                     prompt_tokens=answer.prompt_tokens,
@@ -119,7 +207,9 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
                 if self.config.prompts.enable_post_answering_prompt:
                     logger.debug("Running post answering prompt")
                     post_prompt_tool = PostPromptTool()
-                    answer = post_prompt_tool.validate_answer(answer)
+                    answer = await asyncio.to_thread(
+                        post_prompt_tool.validate_answer, answer
+                    )
                     self.log_tokens(
                         prompt_tokens=answer.prompt_tokens,
                         completion_tokens=answer.completion_tokens,
@@ -133,8 +223,12 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
                     result.choices[0].message.function_call.arguments
                 )["operation"]
                 text_processing_tool = TextProcessingTool()
-                answer = text_processing_tool.answer_question(
-                    user_message, chat_history, text=text, operation=operation
+                answer = await asyncio.to_thread(
+                    text_processing_tool.answer_question,
+                    user_message,
+                    chat_history,
+                    text=text,
+                    operation=operation,
                 )
                 self.log_tokens(
                     prompt_tokens=answer.prompt_tokens,
@@ -151,18 +245,20 @@ class OpenAIFunctionsOrchestrator(OrchestratorBase):
 
         if answer.answer is None:
             logger.info("Answer is None")
-            answer.answer = "The requested information is not available in the retrieved data. Please try another query or topic."
+            answer.answer = self.ANSWER_NOT_AVAILABLE
 
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
-            if response := self.call_content_safety_output(user_message, answer.answer):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_output, user_message, answer.answer
+            ):
                 return response
 
         # Format the output for the UI
-        messages = self.output_parser.parse(
+        messages = await asyncio.to_thread(
+            self.output_parser.parse,
             question=answer.question,
             answer=answer.answer,
             source_documents=answer.source_documents,
         )
-        logger.info("Method orchestrate of open_ai_functions ended")
         return messages
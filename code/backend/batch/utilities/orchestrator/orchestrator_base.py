@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from uuid import uuid4
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from abc import ABC, abstractmethod
 from ..loggers.conversation_logger import ConversationLogger
 from ..helpers.config.config_helper import ConfigHelper
@@ -11,6 +12,11 @@ logger = logging.getLogger(__name__)
 
 
 class OrchestratorBase(ABC):
+    # characters of a streamed answer checked by content safety at once, and
+    # of the text sent before them checked along with them
+    CONTENT_SAFETY_WINDOW = 400
+    CONTENT_SAFETY_OVERLAP = 100
+
     def __init__(self) -> None:
         super().__init__()
         self.config = ConfigHelper.get_active_config_or_default()
@@ -33,6 +39,88 @@ class OrchestratorBase(ABC):
     ) -> list[dict]:
         pass
 
+    async def orchestrate_stream(
+        self, user_message: str, chat_history: List[dict], **kwargs: dict
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Streams the messages of orchestrate as deltas: lists of the messages
+        that changed, the tool message replacing the previous one and the
+        content of the assistant message appended to it, unless the delta has
+        replace set. By default, the messages are all sent at once.
+        """
+        yield await self.orchestrate(user_message, chat_history, **kwargs)
+
+    async def stream_answer(
+        self, user_message: str, text_stream: AsyncIterator[str]
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Streams the text of an answer as deltas of the assistant message. With
+        content safety enabled, the text is held back until a window of
+        CONTENT_SAFETY_WINDOW characters has been checked. If it is harmful,
+        the messages are replaced and the rest of the answer is not sent.
+        """
+        check = self.config.prompts.enable_content_safety
+        sent = ""
+        pending = ""
+        async for text in text_stream:
+            pending += text
+            if check and len(pending) < self.CONTENT_SAFETY_WINDOW:
+                continue
+            if check and (
+                response := await self.__call_content_safety_window(
+                    user_message, sent, pending
+                )
+            ):
+                yield response
+                return
+            yield [{"role": "assistant", "content": pending, "end_turn": False}]
+            sent = (sent + pending)[-self.CONTENT_SAFETY_OVERLAP :]
+            pending = ""
+
+        if check and pending:
+            if response := await self.__call_content_safety_window(
+                user_message, sent, pending
+            ):
+                yield response
+                return
+        yield [{"role": "assistant", "content": pending, "end_turn": True}]
+
+    async def __call_content_safety_window(
+        self, user_message: str, sent: str, pending: str
+    ) -> Optional[list[dict]]:
+        filtered_window = await asyncio.to_thread(
+            self.content_safety_checker.validate_output_and_replace_if_harmful,
+            sent + pending,
+        )
+        if filtered_window == sent + pending:
+            return None
+
+        logger.warning("Content safety detected harmful content in streamed answer")
+        messages = await asyncio.to_thread(
+            self.output_parser.parse, question=user_message, answer=filtered_window
+        )
+        messages[1]["replace"] = True
+        return messages
+
+    @staticmethod
+    def apply_deltas(messages: List[dict], deltas: List[dict]) -> List[dict]:
+        """
+        Returns the messages streamed so far with the deltas applied, see
+        orchestrate_stream.
+        """
+        messages = [dict(message) for message in messages]
+        for delta in deltas:
+            delta = dict(delta)
+            replace = delta.pop("replace", False)
+            message = next((m for m in messages if m["role"] == delta["role"]), None)
+            if message is None:
+                messages.append(delta)
+            elif replace or delta["role"] == "tool":
+                message.update(delta)
+            else:
+                message.update(delta, content=message["content"] + delta["content"])
+        return messages
+
     def call_content_safety_input(self, user_message: str):
         logger.debug("Calling content safety with question")
         filtered_user_message = (
@@ -71,6 +159,35 @@ class OrchestratorBase(ABC):
         **kwargs: Optional[dict],
     ) -> dict:
         result = await self.orchestrate(user_message, chat_history, **kwargs)
+        await asyncio.to_thread(
+            self.__log_message, user_message, conversation_id, result
+        )
+        return result
+
+    async def handle_message_stream(
+        self,
+        user_message: str,
+        chat_history: List[dict],
+        conversation_id: Optional[str],
+        **kwargs: Optional[dict],
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Streams the deltas of orchestrate_stream, and logs the whole messages
+        once they are all sent.
+        """
+        messages = []
+        async for deltas in self.orchestrate_stream(
+            user_message, chat_history, **kwargs
+        ):
+            messages = self.apply_deltas(messages, deltas)
+            yield deltas
+        await asyncio.to_thread(
+            self.__log_message, user_message, conversation_id, messages
+        )
+
+    def __log_message(
+        self, user_message: str, conversation_id: Optional[str], result: List[dict]
+    ) -> None:
         if str(self.config.logging.log_tokens).lower() == "true":
             custom_dimensions = {
                 "conversation_id": conversation_id,
@@ -91,4 +208,3 @@ class OrchestratorBase(ABC):
                 ]
                 + result
             )
-        return result
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import List
 import json
@@ -32,21 +33,24 @@ class PromptFlowOrchestrator(OrchestratorBase):
         # Call Content Safety tool on question
         if self.config.prompts.enable_content_safety:
             logger.info("Content safety check enabled for input.")
-            if response := self.call_content_safety_input(user_message):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_input, user_message
+            ):
                 logger.info("Content safety flagged the input. Returning response.")
                 return response
 
         transformed_chat_history = self.transform_chat_history(chat_history)
 
-        file_name = self.transform_data_into_file(
-            user_message, transformed_chat_history
+        file_name = await asyncio.to_thread(
+            self.transform_data_into_file, user_message, transformed_chat_history
         )
         logger.info(f"File created for Prompt Flow: {file_name}")
 
         # Call the Prompt Flow service
         try:
             logger.info("Invoking Prompt Flow service.")
-            response = self.ml_client.online_endpoints.invoke(
+            response = await asyncio.to_thread(
+                self.ml_client.online_endpoints.invoke,
                 endpoint_name=self.enpoint_name,
                 request_file=file_name,
                 deployment_name=self.deployment_name,
@@ -72,13 +76,16 @@ class PromptFlowOrchestrator(OrchestratorBase):
         # Call Content Safety tool on answer
         if self.config.prompts.enable_content_safety:
             logger.info("Content safety check enabled for output.")
-            if response := self.call_content_safety_output(user_message, answer.answer):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_output, user_message, answer.answer
+            ):
                 logger.info("Content safety flagged the output. Returning response.")
                 return response
 
         # Format the output for the UI
         logger.info("Formatting output for UI.")
-        messages = self.output_parser.parse(
+        messages = await asyncio.to_thread(
+            self.output_parser.parse,
             question=answer.question,
             answer=answer.answer,
             source_documents=answer.source_documents,
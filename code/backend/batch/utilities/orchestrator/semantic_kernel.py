@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 
@@ -39,7 +40,9 @@ class SemanticKernelOrchestrator(OrchestratorBase):
         logger.info("Method orchestrate of semantic_kernel started")
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
-            if response := self.call_content_safety_input(user_message):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_input, user_message
+            ):
                 return response
 
         system_message = self.env_helper.SEMANTIC_KERNEL_SYSTEM_PROMPT
@@ -143,11 +146,14 @@ Do not list all documents in your repository if asked.
 
         # Call Content Safety tool
         if self.config.prompts.enable_content_safety:
-            if response := self.call_content_safety_output(user_message, answer.answer):
+            if response := await asyncio.to_thread(
+                self.call_content_safety_output, user_message, answer.answer
+            ):
                 return response
 
         # Format the output for the UI
-        messages = self.output_parser.parse(
+        messages = await asyncio.to_thread(
+            self.output_parser.parse,
             question=answer.question,
             answer=answer.answer,
             source_documents=answer.source_documents,
@@ -30,6 +30,46 @@ class OutputParserTool(ParserBase):
             offset += len(f"[doc{i + 1}]") - (end - start)
         return updated_answer
 
+    def _get_citation(self, doc: SourceDocument) -> dict:
+        markdown_url = doc.get_markdown_url()
+
+        # The citation needs to have filepath and chunk_id to render in the UI as a file
+        return {
+            "content": markdown_url + "\n\n\n" + doc.content,
+            "id": doc.id,
+            "chunk_id": (
+                re.findall(r"\d+", doc.chunk_id)[-1]
+                if doc.chunk_id is not None
+                else doc.chunk
+            ),
+            "title": doc.title,
+            "filepath": doc.get_filename(include_path=True),
+            "url": markdown_url,
+            "metadata": {
+                "offset": doc.offset,
+                "source": doc.source,
+                "markdown_url": markdown_url,
+                "title": doc.title,
+                "original_url": doc.source,  # TODO: do we need this?
+                "chunk": doc.chunk,
+                "key": doc.id,
+                "filename": doc.get_filename(),
+            },
+        }
+
+    def parse_citations(
+        self, question: str, source_documents: List[SourceDocument]
+    ) -> dict:
+        """
+        Returns the tool message citing every source document, in their order,
+        for answers streamed before it is known which documents they cite.
+        """
+        content = {
+            "citations": [self._get_citation(doc) for doc in source_documents],
+            "intent": question,
+        }
+        return {"role": "tool", "content": json.dumps(content), "end_turn": False}
+
     def parse(
         self,
         question: str,
@@ -60,32 +100,7 @@ class OutputParserTool(ParserBase):
 
             doc = source_documents[idx]
             logger.debug(f"doc{idx}: {doc}")
-
-            # Then update the citation object in the response, it needs to have filepath and chunk_id to render in the UI as a file
-            messages[0]["content"]["citations"].append(
-                {
-                    "content": doc.get_markdown_url() + "\n\n\n" + doc.content,
-                    "id": doc.id,
-                    "chunk_id": (
-                        re.findall(r"\d+", doc.chunk_id)[-1]
-                        if doc.chunk_id is not None
-                        else doc.chunk
-                    ),
-                    "title": doc.title,
-                    "filepath": doc.get_filename(include_path=True),
-                    "url": doc.get_markdown_url(),
-                    "metadata": {
-                        "offset": doc.offset,
-                        "source": doc.source,
-                        "markdown_url": doc.get_markdown_url(),
-                        "title": doc.title,
-                        "original_url": doc.source,  # TODO: do we need this?
-                        "chunk": doc.chunk,
-                        "key": doc.id,
-                        "filename": doc.get_filename(),
-                    },
-                }
-            )
+            messages[0]["content"]["citations"].append(self._get_citation(doc))
         if messages[0]["content"]["citations"] == []:
             answer = re.sub(r"\[doc\d+\]", "", answer)
         messages.append({"role": "assistant", "content": answer, "end_turn": True})
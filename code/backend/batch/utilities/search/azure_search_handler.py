@@ -1,10 +1,13 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from .search_handler_base import SearchHandlerBase
 from ..helpers.llm_helper import LLMHelper
 from ..helpers.azure_computer_vision_client import AzureComputerVisionClient
 from ..helpers.azure_search_helper import AzureSearchHelper
+from ..helpers.query_vector_cache import QueryVectorCache
 from ..common.source_document import SourceDocument
 import json
 from azure.search.documents.models import VectorizedQuery
@@ -80,57 +83,128 @@ class AzureSearchHandler(SearchHandlerBase):
 
     def query_search(self, question) -> List[SourceDocument]:
         logger.info(f"Performing query search for question: {question}")
-        encoding = tiktoken.get_encoding(self._ENCODER_NAME)
-        tokenised_question = encoding.encode(question)
-
-        if self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
-            logger.info("Using advanced image processing for vectorization")
-            vectorized_question = self.azure_computer_vision_client.vectorize_text(
-                question
-            )
-        else:
-            logger.info("Skipping advanced image processing")
-            vectorized_question = None
+        question_embedding, vectorized_question = self._vectorize_question(question)
 
         if self.env_helper.AZURE_SEARCH_USE_SEMANTIC_SEARCH:
             logger.info("Performing semantic search")
             results = self._semantic_search(
-                question, tokenised_question, vectorized_question
+                question, question_embedding, vectorized_question
             )
         else:
             logger.info("Performing hybrid search")
             results = self._hybrid_search(
-                question, tokenised_question, vectorized_question
+                question, question_embedding, vectorized_question
             )
 
         logger.info("Converting search results to SourceDocument list")
         return self._convert_to_source_documents(results)
 
+    async def aquery_search(self, question) -> List[SourceDocument]:
+        logger.info(f"Performing async query search for question: {question}")
+        question_embedding, vectorized_question = await self._avectorize_question(
+            question
+        )
+
+        if self.env_helper.AZURE_SEARCH_USE_SEMANTIC_SEARCH:
+            logger.info("Performing semantic search")
+            search_kwargs = self._get_semantic_search_kwargs(
+                question, question_embedding, vectorized_question
+            )
+        else:
+            logger.info("Performing hybrid search")
+            search_kwargs = self._get_hybrid_search_kwargs(
+                question, question_embedding, vectorized_question
+            )
+
+        search_helper = await asyncio.to_thread(AzureSearchHelper)
+        search_client = await search_helper.get_async_search_client()
+        results = await search_client.search(**search_kwargs)
+
+        logger.info("Converting search results to SourceDocument list")
+        return self._convert_to_source_documents([result async for result in results])
+
+    def _vectorize_question(
+        self, question: str
+    ) -> tuple[list[float], list[float] | None]:
+        if not self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
+            logger.info("Skipping advanced image processing")
+            return self._embed_question(question), None
+
+        logger.info("Using advanced image processing for vectorization")
+        # The Computer Vision and OpenAI requests are independent, so the
+        # question is vectorized for images while it is embedded
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            image_vector = pool.submit(self._vectorize_question_for_images, question)
+            question_embedding = self._embed_question(question)
+            return question_embedding, image_vector.result()
+
+    async def _avectorize_question(
+        self, question: str
+    ) -> tuple[list[float], list[float] | None]:
+        if not self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
+            logger.info("Skipping advanced image processing")
+            return await self._aembed_question(question), None
+
+        logger.info("Using advanced image processing for vectorization")
+        # the Computer Vision client is synchronous, so it runs in a thread
+        question_embedding, image_vector = await asyncio.gather(
+            self._aembed_question(question),
+            asyncio.to_thread(self._vectorize_question_for_images, question),
+        )
+        return question_embedding, image_vector
+
+    def _embed_question(self, question: str) -> list[float]:
+        def embed() -> list[float]:
+            encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+            return self.llm_helper.generate_embeddings(encoding.encode(question))
+
+        return QueryVectorCache().get_or_vectorize(
+            self.llm_helper.get_embedding_model_key(), question, embed
+        )
+
+    async def _aembed_question(self, question: str) -> list[float]:
+        async def embed() -> list[float]:
+            encoding = tiktoken.get_encoding(self._ENCODER_NAME)
+            return await self.llm_helper.agenerate_embeddings(encoding.encode(question))
+
+        return await QueryVectorCache().aget_or_vectorize(
+            self.llm_helper.get_embedding_model_key(), question, embed
+        )
+
+    def _vectorize_question_for_images(self, question: str) -> list[float]:
+        return QueryVectorCache().get_or_vectorize(
+            f"computer-vision/{self.azure_computer_vision_client.model_version}",
+            question,
+            lambda: self.azure_computer_vision_client.vectorize_text(question),
+        )
+
     def _semantic_search(
         self,
         question: str,
-        tokenised_question: list[int],
+        question_embedding: list[float],
         vectorized_question: list[float] | None,
     ):
         return self.search_client.search(
+            **self._get_semantic_search_kwargs(
+                question, question_embedding, vectorized_question
+            )
+        )
+
+    def _get_semantic_search_kwargs(
+        self,
+        question: str,
+        question_embedding: list[float],
+        vectorized_question: list[float] | None,
+    ) -> dict:
+        return dict(
             search_text=question,
             vector_queries=[
                 VectorizedQuery(
-                    vector=self.llm_helper.generate_embeddings(tokenised_question),
+                    vector=question_embedding,
                     k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
                     fields=self._VECTOR_FIELD,
                 ),
-                *(
-                    [
-                        VectorizedQuery(
-                            vector=vectorized_question,
-                            k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
-                            fields=self._IMAGE_VECTOR_FIELD,
-                        )
-                    ]
-                    if vectorized_question is not None
-                    else []
-                ),
+                *self._get_image_vector_queries(vectorized_question),
             ],
             filter=self.env_helper.AZURE_SEARCH_FILTER,
             query_type="semantic",
@@ -143,35 +217,50 @@ class AzureSearchHandler(SearchHandlerBase):
     def _hybrid_search(
         self,
         question: str,
-        tokenised_question: list[int],
+        question_embedding: list[float],
         vectorized_question: list[float] | None,
     ):
         return self.search_client.search(
+            **self._get_hybrid_search_kwargs(
+                question, question_embedding, vectorized_question
+            )
+        )
+
+    def _get_hybrid_search_kwargs(
+        self,
+        question: str,
+        question_embedding: list[float],
+        vectorized_question: list[float] | None,
+    ) -> dict:
+        return dict(
             search_text=question,
             vector_queries=[
                 VectorizedQuery(
-                    vector=self.llm_helper.generate_embeddings(tokenised_question),
+                    vector=question_embedding,
                     k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
                     filter=self.env_helper.AZURE_SEARCH_FILTER,
                     fields=self._VECTOR_FIELD,
                 ),
-                *(
-                    [
-                        VectorizedQuery(
-                            vector=vectorized_question,
-                            k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
-                            fields=self._IMAGE_VECTOR_FIELD,
-                        )
-                    ]
-                    if vectorized_question is not None
-                    else []
-                ),
+                *self._get_image_vector_queries(vectorized_question),
             ],
             query_type="simple",  # this is the default value
             filter=self.env_helper.AZURE_SEARCH_FILTER,
             top=self.env_helper.AZURE_SEARCH_TOP_K,
         )
 
+    def _get_image_vector_queries(
+        self, vectorized_question: list[float] | None
+    ) -> list[VectorizedQuery]:
+        if vectorized_question is None:
+            return []
+        return [
+            VectorizedQuery(
+                vector=vectorized_question,
+                k_nearest_neighbors=self.env_helper.AZURE_SEARCH_TOP_K,
+                fields=self._IMAGE_VECTOR_FIELD,
+            )
+        ]
+
     def _convert_to_source_documents(self, search_results) -> List[SourceDocument]:
         source_documents = []
         for source in search_results:
@@ -6,6 +6,8 @@ from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.models import VectorizableTextQuery
 from azure.core.credentials import AzureKeyCredential
 from ..helpers.azure_credential_utils import get_azure_credential
+from ..helpers.client_registry import ClientRegistry
+from ..helpers.search_index_cache import SearchIndexCache
 from ..common.source_document import SourceDocument
 import re
 
@@ -165,17 +167,36 @@ class IntegratedVectorizationSearchHandler(SearchHandlerBase):
 
     def _check_index_exists(self) -> bool:
         logging.info("Checking if search index exists.")
-        search_index_client = SearchIndexClient(
+        exists = SearchIndexCache().index_exists(
+            self.env_helper.AZURE_SEARCH_SERVICE,
+            self.env_helper.AZURE_SEARCH_INDEX,
+            self._list_index_names,
+        )
+        logging.info(f"Search index exists: {exists}.")
+        return exists
+
+    def _list_index_names(self):
+        search_index_client = ClientRegistry().get_or_create(
+            "search_index",
+            (
+                self.env_helper.AZURE_SEARCH_SERVICE,
+                (
+                    self.env_helper.AZURE_SEARCH_KEY
+                    if self.env_helper.is_auth_type_keys()
+                    else None
+                ),
+            ),
+            self._create_search_index_client,
+        )
+        return search_index_client.list_index_names()
+
+    def _create_search_index_client(self) -> SearchIndexClient:
+        return SearchIndexClient(
             endpoint=self.env_helper.AZURE_SEARCH_SERVICE,
             credential=(
                 AzureKeyCredential(self.env_helper.AZURE_SEARCH_KEY)
                 if self.env_helper.is_auth_type_keys()
                 else get_azure_credential(self.env_helper.MANAGED_IDENTITY_CLIENT_ID)
             ),
+            transport=ClientRegistry().create_transport("search_index"),
         )
-
-        exists = self.env_helper.AZURE_SEARCH_INDEX in [
-            name for name in search_index_client.list_index_names()
-        ]
-        logging.info(f"Search index exists: {exists}.")
-        return exists
@@ -4,6 +4,7 @@ import numpy as np
 
 from .search_handler_base import SearchHandlerBase
 from ..helpers.azure_postgres_helper import AzurePostgresHelper
+from ..helpers.query_vector_cache import QueryVectorCache
 from ..common.source_document import SourceDocument
 
 
@@ -15,8 +16,11 @@ class AzurePostgresHandler(SearchHandlerBase):
 
     def query_search(self, question) -> List[SourceDocument]:
         user_input = question
-        query_embedding = self.azure_postgres_helper.llm_helper.generate_embeddings(
-            user_input
+        llm_helper = self.azure_postgres_helper.llm_helper
+        query_embedding = QueryVectorCache().get_or_vectorize(
+            llm_helper.get_embedding_model_key(),
+            user_input,
+            lambda: llm_helper.generate_embeddings(user_input),
         )
 
         embedding_array = np.array(query_embedding).tolist()
@@ -42,7 +46,9 @@ class AzurePostgresHandler(SearchHandlerBase):
         return source_documents
 
     def create_search_client(self):
-        return self.azure_postgres_helper.get_search_client()
+        # queries borrow a connection from the pool of the helper, rather than
+        # the handler holding one of its own
+        return None
 
     def create_vector_store(self, documents_to_upload):
         return self.azure_postgres_helper.create_vector_store(documents_to_upload)
@@ -26,3 +26,9 @@ class Search:
         search_handler: SearchHandlerBase, question: str
     ) -> list[SourceDocument]:
         return search_handler.query_search(question)
+
+    @staticmethod
+    async def aget_source_documents(
+        search_handler: SearchHandlerBase, question: str
+    ) -> list[SourceDocument]:
+        return await search_handler.aquery_search(question)
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from ..helpers.env_helper import EnvHelper
 from ..common.source_document import SourceDocument
@@ -62,6 +63,13 @@ class SearchHandlerBase(ABC):
     def query_search(self, question) -> list[SourceDocument]:
         pass
 
+    async def aquery_search(self, question) -> list[SourceDocument]:
+        """
+        Async variant of query_search. Handlers without an async client run
+        query_search in a thread, so the event loop is not blocked.
+        """
+        return await asyncio.to_thread(self.query_search, question)
+
     @abstractmethod
     def search_by_blob_url(self, blob_url):
         pass
@@ -4,6 +4,7 @@ from azure.core.credentials import AzureKeyCredential
 from ..helpers.azure_credential_utils import get_azure_credential
 from azure.core.exceptions import HttpResponseError
 from azure.ai.contentsafety.models import AnalyzeTextOptions
+from ..helpers.client_registry import ClientRegistry
 from ..helpers.env_helper import EnvHelper
 from .answer_processing_base import AnswerProcessingBase
 from ..common.answer import Answer
@@ -15,19 +16,37 @@ class ContentSafetyChecker(AnswerProcessingBase):
     def __init__(self):
         env_helper = EnvHelper()
 
+        self.content_safety_client = ClientRegistry().get_or_create(
+            "content_safety",
+            (
+                env_helper.AZURE_CONTENT_SAFETY_ENDPOINT,
+                (
+                    None
+                    if env_helper.AZURE_AUTH_TYPE == "rbac"
+                    else env_helper.AZURE_CONTENT_SAFETY_KEY
+                ),
+            ),
+            lambda: self.__create_content_safety_client(env_helper),
+        )
+
+    @staticmethod
+    def __create_content_safety_client(env_helper: EnvHelper) -> ContentSafetyClient:
+        transport = ClientRegistry().create_transport("content_safety")
         if env_helper.AZURE_AUTH_TYPE == "rbac":
             logger.info("Initializing ContentSafetyClient with RBAC authentication.")
-            self.content_safety_client = ContentSafetyClient(
+            return ContentSafetyClient(
                 env_helper.AZURE_CONTENT_SAFETY_ENDPOINT,
                 get_azure_credential(env_helper.MANAGED_IDENTITY_CLIENT_ID),
+                transport=transport,
             )
         else:
             logger.info(
                 "Initializing ContentSafetyClient with AzureKeyCredential authentication."
             )
-            self.content_safety_client = ContentSafetyClient(
+            return ContentSafetyClient(
                 env_helper.AZURE_CONTENT_SAFETY_ENDPOINT,
                 AzureKeyCredential(env_helper.AZURE_CONTENT_SAFETY_KEY),
+                transport=transport,
             )
 
     def process_answer(self, answer: Answer, **kwargs: dict) -> Answer:
@@ -1,6 +1,9 @@
+import asyncio
+import hashlib
 import json
 import logging
 import warnings
+from typing import AsyncIterator, Optional
 
 from ..common.answer import Answer
 from ..common.source_document import SourceDocument
@@ -9,6 +12,8 @@ from ..helpers.config.config_helper import ConfigHelper
 from ..helpers.env_helper import EnvHelper
 from ..helpers.llm_helper import LLMHelper
 from ..helpers.prompt_utils import get_current_date_suffix
+from ..helpers.query_vector_cache import QueryVectorCache
+from ..helpers.semantic_answer_cache import SemanticAnswerCache
 from ..search.search import Search
 from .answering_tool_base import AnsweringToolBase
 from openai.types.chat import ChatCompletion
@@ -159,6 +164,142 @@ class QuestionAnswerTool(AnsweringToolBase):
         logger.info("Answering question")
         source_documents = Search.get_source_documents(self.search_handler, question)
 
+        answer_cache = SemanticAnswerCache()
+        if answer_cache.enabled:
+            cache_key = self.__get_answer_cache_key(
+                question,
+                chat_history,
+                QueryVectorCache().get_or_vectorize(
+                    self.llm_helper.get_embedding_model_key(),
+                    question,
+                    lambda: self.llm_helper.generate_embeddings(question),
+                ),
+            )
+            cached_answer = answer_cache.get(
+                *cache_key, question=question, source_documents=source_documents
+            )
+            if cached_answer is not None:
+                return cached_answer
+
+        messages, model = self.__generate_answer_messages(
+            question, chat_history, source_documents
+        )
+        response = self.llm_helper.get_chat_completion(
+            messages, model=model, temperature=0
+        )
+        clean_answer = self.format_answer_from_response(
+            response, question, source_documents
+        )
+
+        if answer_cache.enabled:
+            answer_cache.add(*cache_key, answer=clean_answer)
+
+        return clean_answer
+
+    async def aanswer_question(self, question: str, chat_history: list[dict], **kwargs):
+        logger.info("Answering question asynchronously")
+        source_documents = await Search.aget_source_documents(
+            self.search_handler, question
+        )
+
+        answer_cache = SemanticAnswerCache()
+        if answer_cache.enabled:
+            cache_key = await self.__aget_answer_cache_key(question, chat_history)
+            # compares the vector with those of the cached questions
+            cached_answer = await asyncio.to_thread(
+                answer_cache.get,
+                *cache_key,
+                question=question,
+                source_documents=source_documents,
+            )
+            if cached_answer is not None:
+                return cached_answer
+
+        # the image URLs may need a user delegation key, requested synchronously
+        messages, model = await asyncio.to_thread(
+            self.__generate_answer_messages, question, chat_history, source_documents
+        )
+        response = await self.llm_helper.aget_chat_completion(
+            messages, model=model, temperature=0
+        )
+        clean_answer = self.format_answer_from_response(
+            response, question, source_documents
+        )
+
+        if answer_cache.enabled:
+            answer_cache.add(*cache_key, answer=clean_answer)
+
+        return clean_answer
+
+    async def aanswer_question_stream(
+        self, question: str, chat_history: list[dict], **kwargs
+    ) -> tuple[Answer, AsyncIterator[str]]:
+        """
+        Like aanswer_question, but returns once the sources are retrieved,
+        with the stream of the text of the answer. The answer holds the source
+        documents, and its text and tokens once the stream is exhausted.
+        """
+        logger.info("Streaming the answer to a question")
+        source_documents = await Search.aget_source_documents(
+            self.search_handler, question
+        )
+
+        answer_cache = SemanticAnswerCache()
+        cache_key = None
+        if answer_cache.enabled:
+            cache_key = await self.__aget_answer_cache_key(question, chat_history)
+            # compares the vector with those of the cached questions
+            cached_answer = await asyncio.to_thread(
+                answer_cache.get,
+                *cache_key,
+                question=question,
+                source_documents=source_documents,
+            )
+            if cached_answer is not None:
+                return cached_answer, self.__stream_cached_answer(cached_answer)
+
+        messages, model = await asyncio.to_thread(
+            self.__generate_answer_messages, question, chat_history, source_documents
+        )
+        answer = Answer(question=question, answer="", source_documents=source_documents)
+        return answer, self.__stream_answer(answer, messages, model, cache_key)
+
+    async def __stream_answer(
+        self,
+        answer: Answer,
+        messages: list[dict],
+        model: str | None,
+        cache_key: Optional[tuple],
+    ) -> AsyncIterator[str]:
+        response = await self.llm_helper.aget_chat_completion(
+            messages, model=model, temperature=0, stream=True
+        )
+        parts = []
+        async for chunk in response:
+            # only reported for streams by newer API versions
+            if chunk.usage:
+                answer.prompt_tokens = chunk.usage.prompt_tokens
+                answer.completion_tokens = chunk.usage.completion_tokens
+            # the first chunk may only hold the results of the prompt filters
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+        answer.answer = "".join(parts)
+        logger.debug(f"Answer: {answer.answer}")
+
+        if cache_key is not None:
+            SemanticAnswerCache().add(*cache_key, answer=answer)
+
+    @staticmethod
+    async def __stream_cached_answer(answer: Answer) -> AsyncIterator[str]:
+        yield answer.answer
+
+    def __generate_answer_messages(
+        self,
+        question: str,
+        chat_history: list[dict],
+        source_documents: list[SourceDocument],
+    ) -> tuple[list[dict], str | None]:
         if self.env_helper.USE_ADVANCED_IMAGE_PROCESSING:
             image_urls = self.create_image_url_list(source_documents)
             logger.info(
@@ -179,14 +320,47 @@ class QuestionAnswerTool(AnsweringToolBase):
             )
             messages = self.generate_messages(question, source_documents)
 
-        llm_helper = LLMHelper()
+        return messages, model
 
-        response = llm_helper.get_chat_completion(messages, model=model, temperature=0)
-        clean_answer = self.format_answer_from_response(
-            response, question, source_documents
+    async def __aget_answer_cache_key(
+        self, question: str, chat_history: list[dict]
+    ) -> tuple:
+        return self.__get_answer_cache_key(
+            question,
+            chat_history,
+            await QueryVectorCache().aget_or_vectorize(
+                self.llm_helper.get_embedding_model_key(),
+                question,
+                lambda: self.llm_helper.agenerate_embeddings(question),
+            ),
         )
 
-        return clean_answer
+    def __get_answer_cache_key(
+        self, question: str, chat_history: list[dict], vector: list[float]
+    ) -> tuple:
+        # The index answered from, what else the answer depends on, like the
+        # conversation so far, and the vector of the question, shared with
+        # the search for it
+        context = json.dumps(
+            [
+                self.clean_chat_history(chat_history),
+                self.config.prompts.answering_system_prompt,
+                self.config.prompts.answering_user_prompt,
+                self.config.prompts.use_on_your_data_format,
+                self.config.example.documents,
+                self.config.example.user_question,
+                self.config.example.answer,
+                self.env_helper.AZURE_OPENAI_SYSTEM_MESSAGE,
+                self.env_helper.USE_ADVANCED_IMAGE_PROCESSING,
+                self.llm_helper.llm_model,
+            ],
+            default=str,
+        )
+        return (
+            SemanticAnswerCache.get_index_name(self.env_helper),
+            hashlib.sha256(context.encode("utf-8")).hexdigest(),
+            vector,
+        )
 
     def create_image_url_list(self, source_documents):
         image_types = self.config.get_advanced_image_processing_image_types()
@@ -31,11 +31,13 @@ def load_css(file_path):
 load_css("pages/common.css")
 
 
-def reprocess_all():
+def reprocess_all(incremental: bool = False):
     backend_url = urllib.parse.urljoin(
         env_helper.BACKEND_URL, "/api/BatchStartProcessing"
     )
     params = {}
+    if incremental:
+        params["incremental"] = "true"
     if env_helper.FUNCTION_KEY is not None:
         params["code"] = env_helper.FUNCTION_KEY
         params["clientId"] = "clientKey"
@@ -134,6 +136,11 @@ try:
                 "Reprocess all documents in the Azure Storage account",
                 on_click=reprocess_all,
             )
+            st.button(
+                "Reprocess new and changed documents",
+                on_click=reprocess_all,
+                kwargs={"incremental": True},
+            )
 
     with st.expander("Add URLs to the knowledge base", expanded=True):
         col1, col2 = st.columns([3, 1])
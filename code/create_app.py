@@ -2,6 +2,7 @@
 This module creates a Flask app that serves the web interface for the chatbot.
 """
 
+import asyncio
 import contextvars
 import functools
 import json
@@ -10,6 +11,7 @@ import mimetypes
 from os import path
 import sys
 import re
+from typing import AsyncIterator
 from urllib.parse import quote, unquote
 
 import requests
@@ -19,6 +21,8 @@ from flask import Flask, Response, request, Request, jsonify
 from dotenv import load_dotenv
 from backend.batch.utilities.helpers.env_helper import EnvHelper
 from backend.batch.utilities.helpers.azure_search_helper import AzureSearchHelper
+from backend.batch.utilities.helpers.app_event_loop import AppEventLoop
+from backend.batch.utilities.helpers.client_registry import ClientRegistry
 from backend.batch.utilities.helpers.orchestrator_helper import Orchestrator
 from backend.batch.utilities.helpers.config.config_helper import ConfigHelper
 from backend.batch.utilities.helpers.config.conversation_flow import ConversationFlow
@@ -53,6 +57,9 @@ class ConversationSpanProcessor(SpanProcessor):
 
 ERROR_429_MESSAGE = "We're currently experiencing a high number of requests for the service you're trying to access. Please wait a moment and try again."
 ERROR_GENERIC_MESSAGE = "An error occurred. Please try again. If the problem persists, please contact the site administrator."
+# Clients sending this header with DELTA_STREAM_MODE are streamed deltas, see stream_response
+STREAM_MODE_HEADER = "X-Stream-Mode"
+DELTA_STREAM_MODE = "delta"
 logger = logging.getLogger(__name__)
 
 
@@ -113,7 +120,33 @@ def should_use_data(
     return False
 
 
-def stream_with_data(response: Stream[ChatCompletionChunk]):
+def wants_delta_stream(conversation: Request) -> bool:
+    return conversation.headers.get(STREAM_MODE_HEADER) == DELTA_STREAM_MODE
+
+
+def stream_response(lines, stream_deltas: bool) -> Response:
+    """
+    Streams the JSON lines. By default, every line holds the whole response
+    so far. With stream_deltas, which clients ask for with the
+    STREAM_MODE_HEADER, every line only holds the messages that changed, with
+    just the new content of the answer, and the header is sent back.
+    """
+    return Response(
+        lines,
+        mimetype="application/json-lines",
+        headers={STREAM_MODE_HEADER: DELTA_STREAM_MODE} if stream_deltas else None,
+    )
+
+
+def to_json_line(response_obj: dict, messages: list | None = None) -> str:
+    if messages is not None:
+        response_obj = {**response_obj, "choices": [{"messages": messages}]}
+    return json.dumps(response_obj, ensure_ascii=False) + "\n"
+
+
+def stream_with_data(
+    response: Stream[ChatCompletionChunk], stream_deltas: bool = False
+):
     """This function streams the response from Azure OpenAI with data."""
     response_obj = {
         "id": "",
@@ -137,13 +170,17 @@ def stream_with_data(response: Stream[ChatCompletionChunk]):
             }
         ],
     }
+    tool_message, assistant_message = response_obj["choices"][0]["messages"]
 
     for line in response:
         choice = line.choices[0]
 
         if choice.model_extra["end_turn"]:
-            response_obj["choices"][0]["messages"][1]["end_turn"] = True
-            yield json.dumps(response_obj, ensure_ascii=False) + "\n"
+            assistant_message["end_turn"] = True
+            if stream_deltas:
+                yield to_json_line(response_obj, [{**assistant_message, "content": ""}])
+            else:
+                yield to_json_line(response_obj)
             return
 
         response_obj["id"] = line.id
@@ -156,34 +193,81 @@ def stream_with_data(response: Stream[ChatCompletionChunk]):
 
         if role == "assistant":
             citations = get_citations(delta.model_extra["context"])
-            response_obj["choices"][0]["messages"][0]["content"] = json.dumps(
+            tool_message["content"] = json.dumps(
                 citations,
                 ensure_ascii=False,
             )
+            changed_message = tool_message
+        elif stream_deltas:
+            # the citations and the answer so far were sent already
+            changed_message = {**assistant_message, "content": delta.content}
         else:
-            response_obj["choices"][0]["messages"][1]["content"] += delta.content
+            assistant_message["content"] += delta.content
+            changed_message = None
 
-        yield json.dumps(response_obj, ensure_ascii=False) + "\n"
+        if stream_deltas:
+            yield to_json_line(response_obj, [changed_message])
+        else:
+            yield to_json_line(response_obj)
 
 
-def conversation_with_data(conversation: Request, env_helper: EnvHelper):
-    """This function streams the response from Azure OpenAI with data."""
-    logger.info("Method conversation_with_data started")
-    if env_helper.is_auth_type_keys():
+def get_openai_client(env_helper: EnvHelper) -> AzureOpenAI:
+    """
+    Returns the OpenAI client of the BYOD conversation flow, shared by all
+    requests so that they reuse its connections and, with RBAC, its token.
+    """
+    auth_type_keys = env_helper.is_auth_type_keys()
+    return ClientRegistry().get_or_create(
+        "openai_byod",
+        (
+            env_helper.AZURE_OPENAI_ENDPOINT,
+            env_helper.AZURE_OPENAI_API_VERSION,
+            env_helper.AZURE_OPENAI_API_KEY if auth_type_keys else None,
+        ),
+        lambda: create_openai_client(env_helper, auth_type_keys),
+    )
+
+
+def create_openai_client(env_helper: EnvHelper, auth_type_keys: bool) -> AzureOpenAI:
+    http_client = ClientRegistry().create_http_client("openai_byod")
+    if auth_type_keys:
         logger.info("Using key-based authentication for Azure OpenAI")
-        openai_client = AzureOpenAI(
+        return AzureOpenAI(
             azure_endpoint=env_helper.AZURE_OPENAI_ENDPOINT,
             api_version=env_helper.AZURE_OPENAI_API_VERSION,
             api_key=env_helper.AZURE_OPENAI_API_KEY,
+            http_client=http_client,
         )
     else:
         logger.info("Using RBAC authentication for Azure OpenAI")
-        openai_client = AzureOpenAI(
+        return AzureOpenAI(
             azure_endpoint=env_helper.AZURE_OPENAI_ENDPOINT,
             api_version=env_helper.AZURE_OPENAI_API_VERSION,
             azure_ad_token_provider=env_helper.AZURE_TOKEN_PROVIDER,
+            http_client=http_client,
         )
 
+
+class AsyncFlask(Flask):
+    """
+    Flask app running its async views in the long-lived AppEventLoop, rather
+    than in a new event loop per request, so that they share the async clients
+    and interleave while they await.
+    """
+
+    def async_to_sync(self, func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            return AppEventLoop().run(func(*args, **kwargs))
+
+        return run
+
+
+def conversation_with_data(conversation: Request, env_helper: EnvHelper):
+    """This function streams the response from Azure OpenAI with data."""
+    logger.info("Method conversation_with_data started")
+    openai_client = get_openai_client(env_helper)
+
     request_messages = conversation.json["messages"]
     messages = []
     config = ConfigHelper.get_active_config_or_default()
@@ -300,10 +384,13 @@ def conversation_with_data(conversation: Request, env_helper: EnvHelper):
         return response_obj
 
     logger.info("Method conversation_with_data ended")
-    return Response(stream_with_data(response), mimetype="application/json-lines")
+    stream_deltas = wants_delta_stream(conversation)
+    return stream_response(stream_with_data(response, stream_deltas), stream_deltas)
 
 
-def stream_without_data(response: Stream[ChatCompletionChunk]):
+def stream_without_data(
+    response: Stream[ChatCompletionChunk], stream_deltas: bool = False
+):
     """This function streams the response from Azure OpenAI without data."""
     response_text = ""
     for line in response:
@@ -315,7 +402,10 @@ def stream_without_data(response: Stream[ChatCompletionChunk]):
         if delta_text is None:
             return
 
-        response_text += delta_text
+        if stream_deltas:
+            response_text = delta_text
+        else:
+            response_text += delta_text
 
         response_obj = {
             "id": line.id,
@@ -326,7 +416,7 @@ def stream_without_data(response: Stream[ChatCompletionChunk]):
                 {"messages": [{"role": "assistant", "content": response_text}]}
             ],
         }
-        yield json.dumps(response_obj, ensure_ascii=False) + "\n"
+        yield to_json_line(response_obj)
 
 
 def get_message_orchestrator():
@@ -341,18 +431,7 @@ def get_orchestrator_config():
 
 def conversation_without_data(conversation: Request, env_helper: EnvHelper):
     """This function streams the response from Azure OpenAI without data."""
-    if env_helper.AZURE_AUTH_TYPE == "rbac":
-        openai_client = AzureOpenAI(
-            azure_endpoint=env_helper.AZURE_OPENAI_ENDPOINT,
-            api_version=env_helper.AZURE_OPENAI_API_VERSION,
-            azure_ad_token_provider=env_helper.AZURE_TOKEN_PROVIDER,
-        )
-    else:
-        openai_client = AzureOpenAI(
-            azure_endpoint=env_helper.AZURE_OPENAI_ENDPOINT,
-            api_version=env_helper.AZURE_OPENAI_API_VERSION,
-            api_key=env_helper.AZURE_OPENAI_API_KEY,
-        )
+    openai_client = get_openai_client(env_helper)
 
     request_messages = conversation.json["messages"]
     messages = [{"role": "system", "content": env_helper.AZURE_OPENAI_SYSTEM_MESSAGE + get_current_date_suffix()}]
@@ -395,7 +474,57 @@ def conversation_without_data(conversation: Request, env_helper: EnvHelper):
         }
         return jsonify(response_obj), 200
 
-    return Response(stream_without_data(response), mimetype="application/json-lines")
+    stream_deltas = wants_delta_stream(conversation)
+    return stream_response(
+        stream_without_data(response, stream_deltas), stream_deltas
+    )
+
+
+def stream_custom(
+    deltas: AsyncIterator[list[dict]], model: str, conversation_id: str, user_id: str
+):
+    """
+    Streams the deltas of the custom orchestration as JSON lines, see
+    stream_response. Flask iterates the response once the view has returned,
+    so each delta is awaited in the AppEventLoop from the thread serving the
+    request. Errors are streamed as the last line.
+    """
+    response_obj = {
+        "id": "response.id",
+        "model": model,
+        "created": "response.created",
+        "object": "response.object",
+    }
+    messages_stream = AppEventLoop().iterate(deltas)
+    try:
+        for messages in messages_stream:
+            yield to_json_line(response_obj, messages)
+
+        track_event_if_configured("ConversationCustomSuccess", {
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+        })
+    except Exception as e:
+        error_message = str(e)
+        logger.exception("Exception in /api/conversation | %s", error_message)
+        track_event_if_configured("ConversationCustomError", {
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "error": error_message,
+            "error_type": type(e).__name__,
+        })
+        if isinstance(e, APIStatusError):
+            response_json = e.response.json()
+            response_message = response_json.get("error", {}).get("message", "")
+            response_code = response_json.get("error", {}).get("code", "")
+            if response_code == "429" or "429" in response_message:
+                yield to_json_line({"error": ERROR_429_MESSAGE})
+                return
+        yield to_json_line({"error": ERROR_GENERIC_MESSAGE})
+    finally:
+        # closes the deltas when the client went away before the end
+        messages_stream.close()
+        logger.info("Method stream_custom ended")
 
 
 @functools.cache
@@ -428,7 +557,7 @@ def create_app():
         path.join(path.dirname(__file__), "..", "..", ".env")
     )  # Load environment variables from .env file
 
-    app = Flask(__name__)
+    app = AsyncFlask(__name__)
     env_helper: EnvHelper = EnvHelper()
     azure_search_helper: AzureSearchHelper = AzureSearchHelper()
 
@@ -469,6 +598,18 @@ def create_app():
     def health():
         return "OK"
 
+    @app.route("/api/debug/metrics", methods=["GET"])
+    def debug_metrics():
+        """
+        Returns the stats of the shared clients and their connection pools,
+        when DEBUG_METRICS_ENABLED is set.
+        """
+        if not env_helper.DEBUG_METRICS_ENABLED:
+            return jsonify({"error": "Not found"}), 404
+        return jsonify(
+            {**ClientRegistry().get_stats(), "event_loop": AppEventLoop().get_stats()}
+        )
+
     @app.route("/api/files/<path:filename>", methods=["GET"])
     def get_file(filename):
         """
@@ -668,6 +809,20 @@ def create_app():
                 )
             )
 
+            if env_helper.SHOULD_STREAM and wants_delta_stream(request):
+                deltas = message_orchestrator.handle_message_stream(
+                    user_message=user_message,
+                    chat_history=user_assistant_messages,
+                    conversation_id=conversation_id,
+                    orchestrator=get_orchestrator_config(),
+                )
+                return stream_response(
+                    stream_custom(
+                        deltas, env_helper.AZURE_OPENAI_MODEL, conversation_id, user_id
+                    ),
+                    True,
+                )
+
             messages = await message_orchestrator.handle_message(
                 user_message=user_message,
                 chat_history=user_assistant_messages,
@@ -720,13 +875,13 @@ def create_app():
 
     @app.route("/api/conversation", methods=["POST"])
     async def conversation():
-        ConfigHelper.get_active_config_or_default.cache_clear()
         result = ConfigHelper.get_active_config_or_default()
         conversation_flow = result.prompts.conversational_flow
         if conversation_flow == ConversationFlow.CUSTOM.value:
             return await conversation_custom()
         elif conversation_flow == ConversationFlow.BYOD.value:
-            return conversation_azure_byod()
+            # the BYOD flow calls Azure OpenAI synchronously
+            return await asyncio.to_thread(conversation_azure_byod)
         else:
             return (
                 jsonify(
@@ -787,7 +942,6 @@ def create_app():
 
     @app.route("/api/assistanttype", methods=["GET"])
     def assistanttype():
-        ConfigHelper.get_active_config_or_default.cache_clear()
         result = ConfigHelper.get_active_config_or_default()
         return jsonify({"ai_assistant_type": result.prompts.ai_assistant_type})
 
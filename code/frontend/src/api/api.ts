@@ -4,6 +4,10 @@ import {
   ConversationRequest,
   FrontEndSettings,
 } from "./models";
+import {
+  DELTA_STREAM_MODE,
+  STREAM_MODE_HEADER,
+} from "../util/ChatResponseStream";
 
 export async function callConversationApi(
   options: ConversationRequest,
@@ -13,6 +17,7 @@ export async function callConversationApi(
     method: "POST",
     headers: {
       "Content-Type": "application/json",
+      [STREAM_MODE_HEADER]: DELTA_STREAM_MODE,
     },
     body: JSON.stringify({
       messages: options.messages,
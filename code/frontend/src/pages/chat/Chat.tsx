@@ -10,6 +10,10 @@ import { v4 as uuidv4 } from "uuid";
 
 import styles from "./Chat.module.css";
 import { multiLingualSpeechRecognizer } from "../../util/SpeechToText";
+import {
+  applyChatResponseDelta,
+  isDeltaStream,
+} from "../../util/ChatResponseStream";
 import { useBoolean } from "@fluentui/react-hooks";
 import {
   ChatMessage,
@@ -164,6 +168,7 @@ const Chat = () => {
       );
       if (response?.body) {
         const reader = response.body.getReader();
+        const deltaStream = isDeltaStream(response);
         let runningText = "";
         while (true) {
           const { done, value } = await reader.read();
@@ -174,7 +179,11 @@ const Chat = () => {
           objects.forEach((obj) => {
             try {
               runningText += obj;
-              result = JSON.parse(runningText);
+              const line: ChatResponse = JSON.parse(runningText);
+              result =
+                deltaStream && !line.error
+                  ? applyChatResponseDelta(result, line)
+                  : line;
               setShowLoadingMessage(false);
               if (result.error) {
                 setAnswers([
@@ -0,0 +1,62 @@
+import { ChatResponse } from "../api/models";
+import { applyChatResponseDelta, isDeltaStream } from "./ChatResponseStream";
+
+const line = (messages: object[]): ChatResponse =>
+  ({
+    id: "response.id",
+    model: "model",
+    created: 0,
+    object: "chat.completion.chunk",
+    choices: [{ messages }],
+  } as ChatResponse);
+
+describe("ChatResponseStream", () => {
+  it("detects delta streams from the response header", () => {
+    expect(isDeltaStream(new Response("", { headers: { "X-Stream-Mode": "delta" } }))).toBe(true);
+    expect(isDeltaStream(new Response(""))).toBe(false);
+    expect(isDeltaStream({} as Response)).toBe(false);
+  });
+
+  it("sets the citations once and appends the answer", () => {
+    const lines = [
+      line([{ role: "tool", content: '{"citations": []}', end_turn: false }]),
+      line([{ role: "assistant", content: "42 is ", end_turn: false }]),
+      line([{ role: "assistant", content: "the answer", end_turn: false }]),
+      line([{ role: "assistant", content: "", end_turn: true }]),
+    ];
+
+    const result = lines.reduce(applyChatResponseDelta, {} as ChatResponse);
+
+    expect(result.id).toBe("response.id");
+    expect(result.choices[0].messages).toEqual([
+      { role: "tool", content: '{"citations": []}', end_turn: false },
+      { role: "assistant", content: "42 is the answer", end_turn: true },
+    ]);
+  });
+
+  it("replaces the answer when asked to", () => {
+    const lines = [
+      line([{ role: "tool", content: '{"citations": ["doc"]}' }]),
+      line([{ role: "assistant", content: "harmful", end_turn: false }]),
+      line([
+        { role: "tool", content: '{"citations": []}' },
+        { role: "assistant", content: "Unfortunately...", end_turn: true, replace: true },
+      ]),
+    ];
+
+    const result = lines.reduce(applyChatResponseDelta, {} as ChatResponse);
+
+    expect(result.choices[0].messages).toEqual([
+      { role: "tool", content: '{"citations": []}' },
+      { role: "assistant", content: "Unfortunately...", end_turn: true },
+    ]);
+  });
+
+  it("does not modify the response streamed so far", () => {
+    const response = line([{ role: "assistant", content: "42" }]);
+
+    applyChatResponseDelta(response, line([{ role: "assistant", content: "!" }]));
+
+    expect(response.choices[0].messages[0].content).toBe("42");
+  });
+});
@@ -0,0 +1,42 @@
+import { ChatMessage, ChatResponse } from "../api/models";
+
+// Sent by callConversationApi; the backend sends it back when it streams deltas
+export const STREAM_MODE_HEADER = "X-Stream-Mode";
+export const DELTA_STREAM_MODE = "delta";
+
+const TOOL = "tool";
+
+export const isDeltaStream = (response: Response): boolean =>
+  response.headers?.get(STREAM_MODE_HEADER) === DELTA_STREAM_MODE;
+
+type ChatMessageDelta = ChatMessage & { replace?: boolean };
+
+/**
+ * Applies a line of a delta stream to the response streamed so far. A line
+ * only holds the messages that changed: the citations of the tool message
+ * replace the previous ones, the content of the other messages is appended
+ * unless the message has replace set, like when content safety replaced a
+ * streamed answer.
+ */
+export const applyChatResponseDelta = (
+  response: ChatResponse,
+  delta: ChatResponse
+): ChatResponse => {
+  const messages: ChatMessage[] = [...(response.choices?.[0]?.messages ?? [])];
+  for (const { replace, ...message } of (delta.choices?.[0]?.messages ??
+    []) as ChatMessageDelta[]) {
+    const index = messages.findIndex((m) => m.role === message.role);
+    if (index === -1) {
+      messages.push(message);
+    } else if (replace || message.role === TOOL) {
+      messages[index] = { ...messages[index], ...message };
+    } else {
+      messages[index] = {
+        ...messages[index],
+        ...message,
+        content: messages[index].content + message.content,
+      };
+    }
+  }
+  return { ...delta, choices: [{ messages }] };
+};
@@ -0,0 +1,81 @@
+import copy
+import json
+import os
+import time
+from typing import Callable
+
+import pytest
+from azure.ai.formrecognizer import AnalyzeResult
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources")
+
+
+@pytest.fixture(scope="session")
+def layout_analyze_result() -> dict:
+    """A prebuilt-layout analyzer result, as returned by AnalyzeResult.to_dict()."""
+    with open(os.path.join(RESOURCES_DIR, "layout_analyze_result.json")) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def repeat_pages() -> Callable[[dict, int], AnalyzeResult]:
+    """
+    Returns a function that builds a page_count pages document by repeating
+    the pages of an analyzer result, to simulate long documents.
+    """
+
+    def _repeat_pages(analyze_result: dict, page_count: int) -> AnalyzeResult:
+        content = analyze_result["content"]
+        result = {
+            **analyze_result,
+            "content": "",
+            "pages": [],
+            "paragraphs": [],
+            "tables": [],
+        }
+        copies = -(-page_count // len(analyze_result["pages"]))
+
+        def shift(element: dict, shift_by: int, page_shift: int):
+            element = copy.deepcopy(element)
+            for span in element.get("spans", []):
+                span["offset"] += shift_by
+            for cell in element.get("cells", []):
+                for span in cell["spans"]:
+                    span["offset"] += shift_by
+            for region in element.get("bounding_regions", []):
+                region["page_number"] += page_shift
+            if "page_number" in element:
+                element["page_number"] += page_shift
+            return element
+
+        for i in range(copies):
+            shift_by = i * len(content)
+            page_shift = i * len(analyze_result["pages"])
+            result["content"] += content
+            for key in ["pages", "paragraphs", "tables"]:
+                result[key] += [
+                    shift(element, shift_by, page_shift)
+                    for element in analyze_result[key]
+                ]
+        result["pages"] = result["pages"][:page_count]
+        return AnalyzeResult.from_dict(result)
+
+    return _repeat_pages
+
+
+@pytest.fixture
+def measure() -> Callable[..., float]:
+    """
+    Returns a function that runs the callable `repeat` times and returns the
+    fastest run in seconds, which is the least noisy estimate on a shared machine.
+    """
+
+    def _measure(func: Callable[[], object], repeat: int = 5) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    return _measure
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+import httpx
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+from backend.batch.utilities.helpers.client_registry import ClientRegistry
+from create_app import AsyncFlask
+
+pytestmark = pytest.mark.benchmark
+
+SESSIONS = 300
+CONCURRENCY = 32
+# the content safety check, the search and the completion of a conversation
+UPSTREAM_CALLS = 3
+UPSTREAM_LATENCY = 0.02
+
+
+class Upstream:
+    """
+    Answers every request after UPSTREAM_LATENCY seconds over keep-alive
+    connections, like the Azure services the conversation calls.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0)
+        )
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+        self.connections = 0
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(UPSTREAM_LATENCY)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: 2\r\n\r\n{}"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.__close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def __close(self):
+        self.server.close()
+        handlers = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+
+@pytest.fixture
+def upstream() -> Iterator[Upstream]:
+    upstream = Upstream()
+    yield upstream
+    upstream.close()
+
+
+def create_conversation_app(app: Flask, upstream: Upstream, shared: bool) -> Flask:
+    """
+    Adds a view calling the upstream UPSTREAM_CALLS times with an async client
+    of the ClientRegistry, like the custom conversation flow. Without a shared
+    event loop, the clients are closed at the end of each request, as Flask
+    runs each async view in an event loop of its own.
+    """
+
+    async def create_client() -> httpx.AsyncClient:
+        return ClientRegistry().create_async_http_client("benchmark")
+
+    @app.route("/api/conversation")
+    async def conversation():
+        client = await ClientRegistry().aget_or_create(
+            "benchmark", upstream.url, create_client
+        )
+        try:
+            for _ in range(UPSTREAM_CALLS):
+                (await client.get(upstream.url)).raise_for_status()
+        finally:
+            if not shared:
+                await ClientRegistry().aclose_loop_clients()
+        return "OK"
+
+    return app
+
+
+def measure_capacity(app: Flask) -> tuple[float, float]:
+    """
+    Serves the app from a thread per connection, like uwsgi with threads,
+    runs SESSIONS conversations from CONCURRENCY clients, and returns the
+    sessions per second and per second of CPU time of the process.
+    """
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/conversation"
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+    try:
+        with httpx.Client(limits=limits, timeout=30) as client:
+
+            def converse(_) -> None:
+                client.get(url).raise_for_status()
+
+            with ThreadPoolExecutor(CONCURRENCY) as pool:
+                # warms up the connections of the clients and of the app
+                list(pool.map(converse, range(CONCURRENCY)))
+                start, start_cpu = time.perf_counter(), time.process_time()
+                list(pool.map(converse, range(SESSIONS)))
+                elapsed = time.perf_counter() - start
+                cpu = time.process_time() - start_cpu
+    finally:
+        server.shutdown()
+    return SESSIONS / elapsed, SESSIONS / cpu
+
+
+def test_shared_event_loop_serves_more_sessions_per_core(upstream: Upstream):
+    # given
+    # Flask runs each async view in a new event loop, as the app used to
+    per_request_app = create_conversation_app(Flask(__name__), upstream, False)
+    shared_app = create_conversation_app(AsyncFlask(__name__), upstream, True)
+
+    # when
+    per_request_rate, per_request_per_core = measure_capacity(per_request_app)
+    per_request_connections = upstream.connections
+    shared_rate, shared_per_core = measure_capacity(shared_app)
+    shared_connections = upstream.connections - per_request_connections
+
+    # then
+    print(
+        f"\n{SESSIONS} sessions from {CONCURRENCY} clients, each calling the"
+        f" upstream {UPSTREAM_CALLS} times ({os.cpu_count()} cores):"
+        f"\n  event loop per request: {per_request_rate:.0f} sessions/s,"
+        f" {per_request_per_core:.0f} sessions per CPU second,"
+        f" {per_request_connections} upstream connections"
+        f"\n  shared event loop:      {shared_rate:.0f} sessions/s,"
+        f" {shared_per_core:.0f} sessions per CPU second,"
+        f" {shared_connections} upstream connections"
+    )
+    assert shared_per_core > per_request_per_core
+    assert shared_connections < per_request_connections
@@ -0,0 +1,98 @@
+import re
+
+import pytest
+
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.document_chunking.chunking_strategy import (
+    ChunkingSettings,
+    ChunkingStrategy,
+)
+from backend.batch.utilities.document_chunking.streaming import (
+    count_tokens,
+    get_encoder,
+)
+from backend.batch.utilities.document_chunking.strategies import get_document_chunker
+from backend.batch.utilities.helpers.azure_form_recognizer_helper import (
+    AzureFormRecognizerClient,
+)
+
+pytestmark = pytest.mark.benchmark
+
+PAGE_COUNT = 100
+CHUNK_SIZE = 200
+CHUNK_OVERLAP = 20
+PARAGRAPH_TAG_PATTERN = re.compile(r"</?p>")
+
+
+@pytest.fixture(autouse=True)
+def encoder():
+    try:
+        return get_encoder()
+    except Exception as e:
+        pytest.skip(f"The tiktoken encoding could not be loaded: {e}")
+
+
+@pytest.fixture
+def documents(layout_analyze_result, repeat_pages):
+    """The pages of a long document, as the layout loader returns them."""
+    form_recognizer_results = repeat_pages(layout_analyze_result, PAGE_COUNT)
+    # page assembly does not use the Document Intelligence client
+    client = AzureFormRecognizerClient.__new__(AzureFormRecognizerClient)
+    return [
+        SourceDocument(
+            content=page["page_text"],
+            source="https://example.blob.core.windows.net/documents/long.pdf",
+            offset=page["offset"],
+            page_number=page["page_number"],
+        )
+        for page in client._build_page_map(form_recognizer_results)
+    ]
+
+
+def cuts_a_paragraph(chunk: str) -> bool:
+    """
+    Whether the chunk starts or ends in the middle of a paragraph, as a proxy
+    for the retrieval quality lost to chunk boundaries.
+    """
+    tags = PARAGRAPH_TAG_PATTERN.findall(chunk)
+    return tags != ["<p>", "</p>"] * (len(tags) // 2)
+
+
+def test_paragraph_chunking_is_the_fastest_structure_aware_strategy(documents, measure):
+    # given
+    results = {}
+
+    # when
+    for strategy in [
+        ChunkingStrategy.LAYOUT,
+        ChunkingStrategy.PAGE,
+        ChunkingStrategy.FIXED_SIZE_OVERLAP,
+        ChunkingStrategy.PARAGRAPH,
+    ]:
+        chunker = get_document_chunker(strategy.value)
+        chunking = ChunkingSettings(
+            {"strategy": strategy, "size": CHUNK_SIZE, "overlap": CHUNK_OVERLAP}
+        )
+        chunked_documents = chunker.chunk(documents, chunking)
+        seconds = measure(lambda: chunker.chunk(documents, chunking), repeat=3)
+        results[strategy] = (seconds, chunked_documents)
+
+    # then
+    print(f"\n{PAGE_COUNT} pages, {CHUNK_SIZE} token chunks:")
+    cut_chunks = {}
+    for strategy, (seconds, chunked_documents) in results.items():
+        average_tokens = sum(
+            count_tokens(document.content) for document in chunked_documents
+        ) / len(chunked_documents)
+        cut_chunks[strategy] = sum(
+            cuts_a_paragraph(document.content) for document in chunked_documents
+        )
+        print(
+            f"{strategy.value:>20}: {seconds * 1000:8.1f}ms, "
+            f"{len(chunked_documents):4} chunks of {average_tokens:3.0f} tokens, "
+            f"{cut_chunks[strategy]:4} cutting a paragraph"
+        )
+    paragraph_seconds = results[ChunkingStrategy.PARAGRAPH][0]
+    assert cut_chunks[ChunkingStrategy.PARAGRAPH] == 0
+    assert paragraph_seconds < results[ChunkingStrategy.LAYOUT][0]
+    assert paragraph_seconds < results[ChunkingStrategy.PAGE][0]
@@ -0,0 +1,101 @@
+import pytest
+
+from backend.batch.utilities.helpers.azure_form_recognizer_helper import (
+    AzureFormRecognizerClient,
+)
+
+pytestmark = pytest.mark.benchmark
+
+PAGE_COUNT = 300
+
+
+def build_page_map_by_character(client, form_recognizer_results):
+    """
+    The page assembly this benchmark guards against regressing to: it appends
+    one character at a time and marks table characters in a per page list.
+    """
+    offset = 0
+    page_map = []
+    roles_start = {}
+    roles_end = {}
+    for paragraph in form_recognizer_results.paragraphs:
+        para_start = paragraph.spans[0].offset
+        para_end = paragraph.spans[0].offset + paragraph.spans[0].length
+        roles_start[para_start] = (
+            paragraph.role if paragraph.role is not None else "paragraph"
+        )
+        roles_end[para_end] = (
+            paragraph.role if paragraph.role is not None else "paragraph"
+        )
+
+    for page_num, page in enumerate(form_recognizer_results.pages):
+        tables_on_page = [
+            table
+            for table in form_recognizer_results.tables
+            if table.bounding_regions[0].page_number == page_num + 1
+        ]
+        page_offset = page.spans[0].offset
+        page_length = page.spans[0].length
+        table_chars = [-1] * page_length
+        for table_id, table in enumerate(tables_on_page):
+            for span in table.spans:
+                for i in range(span.length):
+                    idx = span.offset - page_offset + i
+                    if idx >= 0 and idx < page_length:
+                        table_chars[idx] = table_id
+
+        page_text = ""
+        added_tables = set()
+        for idx, table_id in enumerate(table_chars):
+            if table_id == -1:
+                position = page_offset + idx
+                if position in roles_start.keys():
+                    html_role = client.form_recognizer_role_to_html.get(
+                        roles_start[position]
+                    )
+                    if html_role is not None:
+                        page_text += f"<{html_role}>"
+                if position in roles_end.keys():
+                    html_role = client.form_recognizer_role_to_html.get(
+                        roles_end[position]
+                    )
+                    if html_role is not None:
+                        page_text += f"</{html_role}>"
+                page_text += form_recognizer_results.content[page_offset + idx]
+            elif table_id not in added_tables:
+                page_text += client._table_to_html(tables_on_page[table_id])
+                added_tables.add(table_id)
+
+        page_text += " "
+        page_map.append(
+            {"page_number": page_num, "offset": offset, "page_text": page_text}
+        )
+        offset += len(page_text)
+
+    return page_map
+
+
+def test_page_assembly_is_faster_than_building_pages_by_character(
+    layout_analyze_result, repeat_pages, measure
+):
+    # given
+    form_recognizer_results = repeat_pages(layout_analyze_result, PAGE_COUNT)
+    # page assembly does not use the Document Intelligence client
+    client = AzureFormRecognizerClient.__new__(AzureFormRecognizerClient)
+
+    # when
+    page_map = client._build_page_map(form_recognizer_results)
+    span_seconds = measure(lambda: client._build_page_map(form_recognizer_results))
+    character_seconds = measure(
+        lambda: build_page_map_by_character(client, form_recognizer_results)
+    )
+
+    # then
+    print(
+        f"\n{PAGE_COUNT} pages: {span_seconds * 1000:.1f}ms by span, "
+        f"{character_seconds * 1000:.1f}ms by character "
+        f"({character_seconds / span_seconds:.1f}x)"
+    )
+    assert page_map == build_page_map_by_character(client, form_recognizer_results)
+    assert len(page_map) == PAGE_COUNT
+    assert span_seconds * 3 < character_seconds
@@ -0,0 +1,128 @@
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, ContextManager, List
+
+import psycopg2
+import pytest
+
+from backend.batch.utilities.helpers.postgres_connection_pool import (
+    PostgresConnectionPool,
+)
+
+pytestmark = pytest.mark.benchmark
+
+DOCUMENT_COUNT = 2000
+DIMENSIONS = 1536
+QUERY_COUNT = 400
+CONCURRENCY = 8
+TABLE = "vector_store_benchmark"
+
+
+def random_vector() -> List[float]:
+    return [random.uniform(-1, 1) for _ in range(DIMENSIONS)]
+
+
+@pytest.fixture(scope="module")
+def dsn() -> str:
+    """
+    The connection string of a PostgreSQL database with pgvector, for
+    instance of a local pgvector/pgvector container.
+    """
+    dsn = os.getenv("BENCHMARK_POSTGRES_DSN")
+    if not dsn:
+        pytest.skip("BENCHMARK_POSTGRES_DSN is not set")
+    try:
+        psycopg2.connect(dsn).close()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"The benchmark database is not reachable: {e}")
+    return dsn
+
+
+@pytest.fixture(scope="module", autouse=True)
+def vector_store(dsn: str):
+    with closing(psycopg2.connect(dsn)) as conn, conn.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cur.execute(f"""
+            CREATE TABLE {TABLE} (
+                id TEXT PRIMARY KEY, title TEXT, chunk INTEGER, "offset" INTEGER,
+                page_number INTEGER, content TEXT, source TEXT,
+                content_vector VECTOR({DIMENSIONS})
+            )
+            """)
+        for i in range(DOCUMENT_COUNT):
+            cur.execute(
+                f"INSERT INTO {TABLE} VALUES (%s, %s, %s, %s, %s, %s, %s, %s::vector)",
+                (
+                    str(i),
+                    f"document {i // 10}",
+                    i % 10,
+                    i * 100,
+                    i % 10,
+                    f"content {i}",
+                    f"https://example.blob.core.windows.net/documents/{i // 10}.pdf",
+                    str(random_vector()),
+                ),
+            )
+        conn.commit()
+        yield
+        cur.execute(f"DROP TABLE {TABLE}")
+        conn.commit()
+
+
+def measure_latencies(connection: Callable[[], ContextManager]) -> List[float]:
+    """
+    Runs the retrieval query of AzurePostgresHelper.get_vector_store
+    QUERY_COUNT times from CONCURRENCY threads, each with a connection from
+    connection, and returns the latencies in milliseconds.
+    """
+    queries = [str(random_vector()) for _ in range(QUERY_COUNT)]
+
+    def retrieve(vector: str) -> float:
+        start = time.perf_counter()
+        with connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT id, title, chunk, "offset", page_number, content, source
+                FROM {TABLE}
+                ORDER BY content_vector <=> %s::vector
+                LIMIT %s
+                """,
+                (vector, 5),
+            )
+            cur.fetchall()
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        return list(pool.map(retrieve, queries))
+
+
+def percentiles(latencies: List[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+
+def test_pooled_connections_lower_retrieval_latency(dsn: str):
+    # given
+    connection_pool = PostgresConnectionPool(lambda: psycopg2.connect(dsn))
+
+    # when
+    # the helper used to open a connection per query and close it afterwards
+    unpooled = measure_latencies(lambda: closing(psycopg2.connect(dsn)))
+    pooled = measure_latencies(connection_pool.connection)
+    connection_pool.close()
+
+    # then
+    unpooled_p50, unpooled_p99 = percentiles(unpooled)
+    pooled_p50, pooled_p99 = percentiles(pooled)
+    print(
+        f"\nRetrieval latency over {QUERY_COUNT} queries from {CONCURRENCY} threads:"
+        f"\n  connection per query: p50 {unpooled_p50:.1f} ms, p99 {unpooled_p99:.1f} ms"
+        f"\n  pooled connections:   p50 {pooled_p50:.1f} ms, p99 {pooled_p99:.1f} ms"
+        f"\n  {connection_pool.get_stats()}"
+    )
+    assert pooled_p50 < unpooled_p50
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from backend.batch.utilities.chat_history.postgres_conversation_pool import (
+    PostgresConversationPool,
+)
+from backend.batch.utilities.helpers.app_event_loop import AppEventLoop
+
+MODULE = "backend.batch.utilities.chat_history.postgres_conversation_pool"
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(f"{MODULE}.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_POSTGRES_CHAT_HISTORY_POOL_SIZE = 4
+        yield env_helper
+
+
+@pytest.fixture(autouse=True)
+def credential_mock():
+    with patch(f"{MODULE}.get_azure_credential") as mock:
+        credential = mock.return_value
+        credential.get_token.return_value = AccessToken(
+            "mock_token", int(time.time()) + 3600
+        )
+        yield credential
+
+
+@pytest.fixture
+def connection() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def create_pool_mock(connection: AsyncMock):
+    asyncpg_pool = MagicMock()
+    asyncpg_pool.close = AsyncMock()
+    asyncpg_pool.get_size.return_value = 1
+    asyncpg_pool.get_idle_size.return_value = 1
+    threads = []
+
+    @asynccontextmanager
+    async def acquire():
+        threads.append(threading.current_thread().name)
+        yield connection
+
+    asyncpg_pool.acquire = acquire
+    asyncpg_pool.threads = threads
+    with patch(
+        f"{MODULE}.asyncpg.create_pool", AsyncMock(return_value=asyncpg_pool)
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def pool(create_pool_mock):
+    pool = PostgresConversationPool("test_user", "test_host", "test_db")
+    yield pool
+    pool.close()
+
+
+def test_queries_of_every_event_loop_share_one_pool(
+    pool: PostgresConversationPool, create_pool_mock: AsyncMock, connection: AsyncMock
+):
+    # given
+    connection.fetchrow.return_value = {"id": "1"}
+    connection.execute.return_value = "DELETE 1"
+
+    # when
+    # like the function app, which runs an event loop per request
+    row = asyncio.run(pool.fetchrow("SELECT $1", "1"))
+    status = asyncio.run(pool.execute("DELETE $1", "1"))
+
+    # then
+    assert row == {"id": "1"}
+    assert status == "DELETE 1"
+    create_pool_mock.assert_awaited_once()
+    kwargs = create_pool_mock.call_args.kwargs
+    assert kwargs["user"] == "test_user"
+    assert kwargs["host"] == "test_host"
+    assert kwargs["database"] == "test_db"
+    assert kwargs["port"] == 5432
+    assert kwargs["ssl"] is True
+    assert kwargs["max_size"] == 4
+    connection.fetchrow.assert_awaited_once_with("SELECT $1", "1")
+    connection.execute.assert_awaited_once_with("DELETE $1", "1")
+    assert create_pool_mock.return_value.threads == ["app-event-loop"] * 2
+
+
+def test_queries_of_the_app_event_loop_run_in_it(
+    pool: PostgresConversationPool, create_pool_mock: AsyncMock, connection: AsyncMock
+):
+    # given
+    connection.fetch.return_value = [{"id": "1"}]
+
+    # when
+    rows = AppEventLoop().run(pool.fetch("SELECT 1"))
+
+    # then
+    assert rows == [{"id": "1"}]
+    assert create_pool_mock.return_value.threads == ["app-event-loop"]
+
+
+def test_token_is_fetched_again_once_about_to_expire(
+    pool: PostgresConversationPool,
+    create_pool_mock: AsyncMock,
+    credential_mock: MagicMock,
+):
+    # given
+    asyncio.run(pool.fetch("SELECT 1"))
+    password = create_pool_mock.call_args.kwargs["password"]
+
+    async def get_password() -> str:
+        return await password()
+
+    # when
+    first = asyncio.run(get_password())
+    second = asyncio.run(get_password())
+    credential_mock.get_token.return_value = AccessToken(
+        "rotated_token", int(time.time()) + 3600
+    )
+    pool._PostgresConversationPool__token = AccessToken(
+        "mock_token", int(time.time()) + 60
+    )
+    third = asyncio.run(get_password())
+
+    # then
+    assert (first, second, third) == ("mock_token", "mock_token", "rotated_token")
+    assert credential_mock.get_token.call_count == 2
+    assert pool.get_stats()["token_refreshes"] == 2
+
+
+def test_get_stats_reports_pool_usage(
+    pool: PostgresConversationPool, create_pool_mock: AsyncMock
+):
+    # given
+    asyncio.run(pool.fetch("SELECT 1"))
+    asyncio.run(create_pool_mock.call_args.kwargs["init"](MagicMock()))
+
+    # when
+    stats = pool.get_stats()
+
+    # then
+    assert stats["size"] == 1
+    assert stats["idle"] == 1
+    assert stats["max_size"] == 4
+    assert stats["queries"] == 1
+    assert stats["connections_opened"] == 1
+    assert stats["acquire_wait_max_ms"] >= stats["acquire_wait_avg_ms"] >= 0
+
+
+def test_close_closes_the_pool(
+    pool: PostgresConversationPool, create_pool_mock: AsyncMock
+):
+    # given
+    asyncio.run(pool.fetch("SELECT 1"))
+
+    # when
+    pool.close()
+
+    # then
+    create_pool_mock.return_value.close.assert_awaited_once_with()
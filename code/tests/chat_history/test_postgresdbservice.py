@@ -20,28 +20,34 @@ def mock_connection():
     return AsyncMock()
 
 
-@patch("backend.batch.utilities.chat_history.postgresdbservice.asyncpg.connect")
-@patch("backend.batch.utilities.chat_history.postgresdbservice.get_azure_credential")
+@patch(
+    "backend.batch.utilities.chat_history.postgresdbservice.PostgresConversationPool"
+)
 @pytest.mark.asyncio
-async def test_connect(mock_credential, mock_connect, postgres_client, mock_connection):
-    # Mock get_azure_credential
-    mock_credential.return_value.get_token.return_value.token = "mock_token"
+async def test_connect(mock_pool, postgres_client):
+    # Test the connect method
+    await postgres_client.connect()
 
-    # Mock asyncpg connection
-    mock_connect.return_value = mock_connection
+    mock_pool.assert_called_once_with("test_user", "test_host", "test_db")
+    assert postgres_client.conn == mock_pool.return_value
+
+
+@patch(
+    "backend.batch.utilities.chat_history.postgresdbservice.PostgresConversationPool"
+)
+@pytest.mark.asyncio
+async def test_connect_shares_the_pool_across_clients(mock_pool, postgres_client):
+    # Set up a client of another request
+    other_client = PostgresConversationClient(
+        user="test_user", host="test_host", database="test_db"
+    )
 
     # Test the connect method
     await postgres_client.connect()
+    await other_client.connect()
 
-    mock_connect.assert_called_once_with(
-        user="test_user",
-        host="test_host",
-        database="test_db",
-        password="mock_token",
-        port=5432,
-        ssl=True,
-    )
-    assert postgres_client.conn == mock_connection
+    mock_pool.assert_called_once()
+    assert other_client.conn is postgres_client.conn
 
 
 @pytest.mark.asyncio
@@ -51,7 +57,8 @@ async def test_close(postgres_client, mock_connection):
 
     # Test the close method
     await postgres_client.close()
-    mock_connection.close.assert_called_once()
+    mock_connection.close.assert_not_called()
+    assert postgres_client.conn is None
 
 
 @pytest.mark.asyncio
@@ -3,6 +3,15 @@ import ssl
 import pytest
 import trustme
 
+from backend.batch.utilities.helpers.app_event_loop import AppEventLoop
+from backend.batch.utilities.helpers.blob_sas_cache import BlobSasCache
+from backend.batch.utilities.helpers.client_registry import ClientRegistry
+from backend.batch.utilities.helpers.config.active_config_cache import (
+    ActiveConfigCache,
+)
+from backend.batch.utilities.helpers.query_vector_cache import QueryVectorCache
+from backend.batch.utilities.helpers.semantic_answer_cache import SemanticAnswerCache
+
 
 @pytest.fixture(scope="session")
 def ca():
@@ -33,3 +42,68 @@ def httpclient_ssl_context(ca):
     """
     with ca.cert_pem.tempfile() as ca_temp_path:
         return ssl.create_default_context(cafile=ca_temp_path)
+
+
+@pytest.fixture(autouse=True)
+def reset_client_registry():
+    """
+    The clients are shared by the whole process, so each test must create its
+    own with the mocks and configuration it sets up.
+    """
+    ClientRegistry.clear_instance()
+    yield
+    ClientRegistry.clear_instance()
+
+
+@pytest.fixture(autouse=True)
+def reset_blob_sas_cache():
+    """
+    The user delegation keys and SAS tokens are shared by the whole process,
+    so each test must get them from its own mocks.
+    """
+    BlobSasCache.clear_instance()
+    yield
+    BlobSasCache.clear_instance()
+
+
+@pytest.fixture(autouse=True)
+def reset_query_vector_cache():
+    """
+    The question vectors are shared by the whole process, so each test must
+    vectorize its questions with its own mocks.
+    """
+    QueryVectorCache.clear_instance()
+    yield
+    QueryVectorCache.clear_instance()
+
+
+@pytest.fixture(autouse=True)
+def reset_semantic_answer_cache():
+    """
+    Each test must answer its questions with its own mocks, and enable the
+    cache with its own configuration.
+    """
+    SemanticAnswerCache.clear_instance()
+    yield
+    SemanticAnswerCache.clear_instance()
+
+
+@pytest.fixture(autouse=True)
+def reset_active_config_cache():
+    """
+    The active configuration is shared by the whole process, so each test must
+    load the one it sets up.
+    """
+    ActiveConfigCache.clear_instance()
+    yield
+    ActiveConfigCache.clear_instance()
+
+
+@pytest.fixture(autouse=True)
+def reset_app_event_loop():
+    """
+    The async clients are bound to the event loop they are created in, so
+    each test runs its async views in an event loop of its own.
+    """
+    yield
+    AppEventLoop.clear_instance()
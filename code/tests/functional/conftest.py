@@ -2,6 +2,8 @@ import re
 import pytest
 from pytest_httpserver import HTTPServer
 from tests.functional.app_config import AppConfig
+from backend.batch.utilities.helpers.azure_search_helper import AzureSearchHelper
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
 from tests.constants import (
     AZURE_STORAGE_CONFIG_CONTAINER_NAME,
     AZURE_STORAGE_CONFIG_FILE_NAME,
@@ -17,7 +19,7 @@ def setup_default_mocking(httpserver: HTTPServer, app_config: AppConfig):
     httpserver.expect_request(
         f"/{AZURE_STORAGE_CONFIG_CONTAINER_NAME}/{AZURE_STORAGE_CONFIG_FILE_NAME}",
         method="HEAD",
-    ).respond_with_data()
+    ).respond_with_data(headers={"ETag": '"0x8DC0000000000001"'})
 
     httpserver.expect_request(
         f"/openai/deployments/{app_config.get_from_json('AZURE_OPENAI_EMBEDDING_MODEL_INFO','model')}/embeddings",
@@ -239,6 +241,19 @@ def setup_default_mocking(httpserver: HTTPServer, app_config: AppConfig):
     httpserver.check()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_search_caches():
+    """
+    Each test primes its own index listing and expects the index to be created,
+    so nothing the previous test found out about the indexes may be reused
+    """
+    SearchIndexCache.clear_instance()
+    AzureSearchHelper.clear_ensured_indexes()
+    yield
+    SearchIndexCache.clear_instance()
+    AzureSearchHelper.clear_ensured_indexes()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def prime_search_to_trigger_creation_of_index(
     httpserver: HTTPServer, app_config: AppConfig
@@ -0,0 +1,108 @@
+import json
+import pytest
+from pytest_httpserver import HTTPServer
+import requests
+
+from tests.functional.app_config import AppConfig
+
+pytestmark = pytest.mark.functional
+
+path = "/api/conversation"
+body = {
+    "conversation_id": "123",
+    "messages": [
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi, how can I help?"},
+        {"role": "user", "content": "What is the meaning of life?"},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def completions_mocking(httpserver: HTTPServer, app_config: AppConfig):
+    model = app_config.get_from_json("AZURE_OPENAI_MODEL_INFO", "model")
+    httpserver.expect_oneshot_request(
+        f"/openai/deployments/{model}/chat/completions",
+        method="POST",
+    ).respond_with_json(
+        {
+            "id": "chatcmpl-6v7mkQj980V1yBec6ETrKPRqFjNw9",
+            "object": "chat.completion",
+            "created": 1679072642,
+            "model": model,
+            "usage": {
+                "prompt_tokens": 58,
+                "completion_tokens": 68,
+                "total_tokens": 126,
+            },
+            "choices": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "function_call": {
+                            "name": "search_documents",
+                            "arguments": '{"question": "What is the meaning of life?"}',
+                        },
+                    },
+                    "finish_reason": "function_call",
+                    "index": 0,
+                }
+            ],
+        }
+    )
+
+    chunks = [
+        {"choices": [], "prompt_filter_results": []},
+        {"choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}}]},
+        {"choices": [{"index": 0, "delta": {"content": "42 is "}}]},
+        {"choices": [{"index": 0, "delta": {"content": "the meaning of life"}}]},
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+    ]
+    httpserver.expect_oneshot_request(
+        f"/openai/deployments/{model}/chat/completions",
+        method="POST",
+    ).respond_with_data(
+        "".join(
+            "data: "
+            + json.dumps(
+                {
+                    "id": "chatcmpl-6v7mkQj980V1yBec6ETrKPRqFjNw9",
+                    "object": "chat.completion.chunk",
+                    "created": 1679072642,
+                    "model": model,
+                    **chunk,
+                }
+            )
+            + "\n\n"
+            for chunk in chunks
+        )
+        + "data: [DONE]\n\n",
+        content_type="text/event-stream",
+    )
+
+
+def test_post_streams_deltas_when_asked_to(app_url: str, app_config: AppConfig):
+    # when
+    response = requests.post(
+        f"{app_url}{path}", json=body, headers={"X-Stream-Mode": "delta"}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/json-lines"
+    assert response.headers["X-Stream-Mode"] == "delta"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    deltas = [line["choices"][0]["messages"] for line in lines]
+    assert deltas[0][0]["role"] == "tool"
+    assert json.loads(deltas[0][0]["content"])["intent"] == (
+        "What is the meaning of life?"
+    )
+    assert (
+        "".join(message["content"] for delta in deltas[1:] for message in delta)
+        == "42 is the meaning of life"
+    )
+    assert deltas[-1][-1]["end_turn"] is True
+    assert lines[0]["model"] == app_config.get_from_json(
+        "AZURE_OPENAI_MODEL_INFO", "model"
+    )
@@ -154,7 +154,7 @@ def test_post_makes_correct_call_to_list_vector_store(
                 "Api-Key": app_config.get("AZURE_SEARCH_KEY"),
             },
             query_string="api-version=2023-10-01-Preview",
-            times=2,
+            times=1,
         ),
     )
 
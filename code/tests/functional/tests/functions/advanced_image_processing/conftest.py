@@ -10,6 +10,10 @@ sys.path.append(
 # The below imports are needed due to the sys.path.append above as the backend function is not aware of the folders outside of the function
 from utilities.helpers.config.config_helper import ConfigHelper  # noqa: E402
 from utilities.helpers.env_helper import EnvHelper  # noqa: E402
+from utilities.helpers.azure_search_helper import AzureSearchHelper  # noqa: E402
+from utilities.helpers.blob_sas_cache import BlobSasCache  # noqa: E402
+from utilities.helpers.client_registry import ClientRegistry  # noqa: E402
+from utilities.helpers.search_index_cache import SearchIndexCache  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -44,3 +48,16 @@ def manage_app(app_config: AppConfig):
     app_config.remove_from_environment()
     EnvHelper.clear_instance()
     ConfigHelper.clear_config()
+
+
+@pytest.fixture(autouse=True)
+def reset_search_caches():
+    SearchIndexCache.clear_instance()
+    AzureSearchHelper.clear_ensured_indexes()
+    ClientRegistry.clear_instance()
+    BlobSasCache.clear_instance()
+    yield
+    SearchIndexCache.clear_instance()
+    AzureSearchHelper.clear_ensured_indexes()
+    ClientRegistry.clear_instance()
+    BlobSasCache.clear_instance()
@@ -1,5 +1,6 @@
+import threading
 import pytest
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from backend.batch.utilities.search.azure_search_handler import AzureSearchHandler
 import json
 from azure.search.documents.models import VectorizedQuery
@@ -170,6 +171,118 @@ def test_query_search_uses_tiktoken_encoder(mock_tiktoken, handler, mock_llm_hel
     mock_llm_helper.generate_embeddings.assert_called_once_with([1, 2, 3])
 
 
+@patch("backend.batch.utilities.search.azure_search_handler.tiktoken")
+def test_query_search_vectorizes_repeated_questions_once(
+    mock_tiktoken,
+    handler,
+    mock_llm_helper,
+    mock_azure_computer_vision_client,
+    env_helper_mock,
+):
+    # given
+    env_helper_mock.USE_ADVANCED_IMAGE_PROCESSING = True
+    mock_tiktoken.get_encoding.return_value.encode.return_value = [1, 2, 3]
+    mock_llm_helper.get_embedding_model_key.return_value = "text-embedding/1536"
+    mock_llm_helper.generate_embeddings.return_value = [1, 2, 3]
+
+    # when
+    handler.query_search("What is the PTO policy?")
+    handler.query_search("  what is the  PTO policy? ")
+
+    # then
+    mock_llm_helper.generate_embeddings.assert_called_once_with([1, 2, 3])
+    mock_azure_computer_vision_client.vectorize_text.assert_called_once_with(
+        "What is the PTO policy?"
+    )
+    first_search, second_search = handler.search_client.search.call_args_list
+    assert (
+        first_search.kwargs["vector_queries"] == second_search.kwargs["vector_queries"]
+    )
+
+
+@patch("backend.batch.utilities.search.azure_search_handler.tiktoken")
+def test_query_search_vectorizes_text_and_image_concurrently(
+    mock_tiktoken,
+    handler,
+    mock_llm_helper,
+    mock_azure_computer_vision_client,
+    env_helper_mock,
+):
+    # given
+    env_helper_mock.USE_ADVANCED_IMAGE_PROCESSING = True
+    embedding_started = threading.Event()
+
+    def generate_embeddings(tokenised_question):
+        embedding_started.set()
+        return [1, 2, 3]
+
+    def vectorize_text(question):
+        # only returns if the question is embedded at the same time
+        assert embedding_started.wait(timeout=5)
+        return [3, 2, 1]
+
+    mock_llm_helper.generate_embeddings.side_effect = generate_embeddings
+    mock_azure_computer_vision_client.vectorize_text.side_effect = vectorize_text
+
+    # when
+    handler.query_search("What is the answer?")
+
+    # then
+    vector_queries = handler.search_client.search.call_args.kwargs["vector_queries"]
+    assert [query.vector for query in vector_queries] == [[1, 2, 3], [3, 2, 1]]
+
+
+@pytest.mark.asyncio
+@patch("backend.batch.utilities.search.azure_search_handler.tiktoken")
+async def test_aquery_search_uses_async_clients(
+    mock_tiktoken,
+    handler,
+    mock_llm_helper,
+    mock_search_client,
+    env_helper_mock,
+):
+    # given
+    env_helper_mock.USE_ADVANCED_IMAGE_PROCESSING = True
+    mock_tiktoken.get_encoding.return_value.encode.return_value = [1, 2, 3]
+    mock_llm_helper.agenerate_embeddings = AsyncMock(return_value=[1, 2, 3])
+
+    async def search_results():
+        yield {
+            "id": "some-id",
+            "content": "some-content",
+            "title": "some-title",
+            "source": "some-source",
+        }
+
+    async_search_client = MagicMock()
+    async_search_client.search = AsyncMock(return_value=search_results())
+
+    # when
+    with patch(
+        "backend.batch.utilities.search.azure_search_handler.AzureSearchHelper"
+    ) as azure_search_helper_mock:
+        azure_search_helper_mock.return_value.get_async_search_client = AsyncMock(
+            return_value=async_search_client
+        )
+        source_documents = await handler.aquery_search("What is the answer?")
+
+    # then
+    mock_llm_helper.agenerate_embeddings.assert_awaited_once_with([1, 2, 3])
+    mock_llm_helper.generate_embeddings.assert_not_called()
+    mock_search_client.search.assert_not_called()
+    async_search_client.search.assert_awaited_once_with(
+        **handler._get_hybrid_search_kwargs("What is the answer?", [1, 2, 3], [3, 2, 1])
+    )
+    assert source_documents == [
+        SourceDocument(
+            id="some-id",
+            content="some-content",
+            title="some-title",
+            source="some-source",
+        )
+    ]
+
+
 def test_query_search_performs_hybrid_search(handler, mock_llm_helper):
     # given
     question = "What is the answer?"
@@ -7,6 +7,7 @@ from azure.search.documents.models import VectorizableTextQuery
 from azure.search.documents import SearchItemPaged
 
 from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
 
 
 @pytest.fixture
@@ -288,3 +289,58 @@ def test_delete_from_index(env_helper_mock, handler, search_client_mock):
         filter=f"title eq '{title}'",
     )
     search_client_mock.delete_documents.assert_called_once_with(ids_to_delete)
+
+
+@patch(
+    "backend.batch.utilities.search.integrated_vectorization_search_handler.SearchIndexClient"
+)
+@patch("backend.batch.utilities.helpers.search_index_cache.EnvHelper")
+def test_check_index_exists_lists_the_indexes_once(
+    search_index_cache_env_helper_mock,
+    search_index_client_mock,
+    env_helper_mock,
+    search_client_mock,
+):
+    # given
+    search_index_cache_env_helper_mock.return_value.AZURE_SEARCH_INDEX_CACHE_TTL = 300
+    search_index_client_mock.return_value.list_index_names.return_value = [
+        "example-index"
+    ]
+    SearchIndexCache.clear_instance()
+    handler = IntegratedVectorizationSearchHandler(env_helper_mock)
+
+    # when
+    handler.get_files()
+    IntegratedVectorizationSearchHandler(env_helper_mock).query_search("question")
+
+    # then
+    search_index_client_mock.return_value.list_index_names.assert_called_once_with()
+    SearchIndexCache.clear_instance()
+
+
+@patch(
+    "backend.batch.utilities.search.integrated_vectorization_search_handler.SearchIndexClient"
+)
+@patch("backend.batch.utilities.helpers.search_index_cache.EnvHelper")
+def test_check_index_exists_reuses_the_search_index_client(
+    search_index_cache_env_helper_mock,
+    search_index_client_mock,
+    env_helper_mock,
+    search_client_mock,
+):
+    # given
+    # the names are listed on every check
+    search_index_cache_env_helper_mock.return_value.AZURE_SEARCH_INDEX_CACHE_TTL = 0
+    search_index_client_mock.return_value.list_index_names.return_value = [
+        "example-index"
+    ]
+    SearchIndexCache.clear_instance()
+
+    # when
+    IntegratedVectorizationSearchHandler(env_helper_mock).get_files()
+    IntegratedVectorizationSearchHandler(env_helper_mock).get_files()
+
+    # then
+    assert search_index_client_mock.return_value.list_index_names.call_count >= 2
+    search_index_client_mock.assert_called_once()
+    SearchIndexCache.clear_instance()
@@ -1,4 +1,5 @@
 import json
+import threading
 import pytest
 from unittest.mock import MagicMock, patch
 from backend.batch.utilities.common.source_document import SourceDocument
@@ -74,6 +75,25 @@ def test_query_search(handler, mock_search_client):
     assert result[1].content == "Content2"
 
 
+@pytest.mark.asyncio
+async def test_aquery_search_runs_query_search_in_a_thread(handler):
+    # given
+    caller_thread = threading.get_ident()
+    search_threads = []
+    handler.query_search = MagicMock(
+        side_effect=lambda question: search_threads.append(threading.get_ident())
+        or ["mock source document"]
+    )
+
+    # when
+    result = await handler.aquery_search("Sample question")
+
+    # then
+    handler.query_search.assert_called_once_with("Sample question")
+    assert result == ["mock source document"]
+    assert search_threads != [caller_thread]
+
+
 def test_convert_to_source_documents(handler):
     search_results = [
         {
@@ -104,14 +124,13 @@ def test_convert_to_source_documents(handler):
     assert result[1].page_number == 2
 
 
-def test_create_search_client(handler, mock_search_client):
-    handler.azure_postgres_helper.get_search_client = MagicMock(
-        return_value=mock_search_client
-    )
+def test_create_search_client_does_not_open_a_connection(handler):
+    handler.azure_postgres_helper.get_search_client = MagicMock()
 
     result = handler.create_search_client()
 
-    assert result == mock_search_client
+    assert result is None
+    handler.azure_postgres_helper.get_search_client.assert_not_called()
 
 
 def test_get_files(handler):
@@ -82,3 +82,32 @@ def test_batch_start_processing_processes_all_integrated_vectorization(
     send_message_calls = mock_queue_client.send_message.call_args_list
     assert len(send_message_calls) == 0
     mock_integrated_vectorization_embedder.return_value.reprocess_all.assert_called_once()
+
+
+@patch("backend.batch.batch_start_processing.create_queue_client")
+@patch("backend.batch.batch_start_processing.AzureBlobStorageClient")
+def test_batch_start_processing_incremental_processes_changed_files_only(
+    mock_blob_storage_client, mock_create_queue_client, env_helper_mock
+):
+    # given
+    mock_http_request = Mock()
+    mock_http_request.params = {"incremental": "true"}
+
+    mock_queue_client = Mock()
+    mock_create_queue_client.return_value = mock_queue_client
+    mock_blob_storage_client.return_value.get_changed_files.return_value = [
+        "file_name_two"
+    ]
+    env_helper_mock.AZURE_SEARCH_USE_INTEGRATED_VECTORIZATION = False
+
+    # when
+    response = batch_start_processing.build().get_user_function()(mock_http_request)
+
+    # then
+    assert response.status_code == 200
+    assert response.get_body() == b"Conversion started successfully for 1 documents."
+
+    mock_blob_storage_client.return_value.get_all_files.assert_not_called()
+    mock_queue_client.send_message.assert_called_once_with(
+        b'{"filename": "file_name_two"}'
+    )
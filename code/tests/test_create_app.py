@@ -2,16 +2,29 @@
 This module tests the entry point for the application.
 """
 
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import asyncio
+import json
+import threading
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, patch
 from urllib.parse import quote
 
 from azure.core.exceptions import ClientAuthenticationError, ResourceNotFoundError, ServiceRequestError
 from openai import RateLimitError, BadRequestError, InternalServerError
 import pytest
+from flask import jsonify, request
 from flask.testing import FlaskClient
+from backend.batch.utilities.helpers.app_event_loop import AppEventLoop
 from backend.batch.utilities.helpers.config.conversation_flow import ConversationFlow
 from backend.batch.utilities.helpers.prompt_utils import get_current_date_suffix
-from create_app import create_app, get_markdown_url, get_citations
+from backend.batch.utilities.helpers.client_registry import ClientRegistry
+from create_app import (
+    AsyncFlask,
+    create_app,
+    get_markdown_url,
+    get_citations,
+    stream_custom,
+    stream_with_data,
+)
 
 AZURE_SPEECH_KEY = "mock-speech-key"
 AZURE_SPEECH_SERVICE_REGION = "mock-speech-service-region"
@@ -217,6 +230,77 @@ class TestConfig:
         assert response.status_code == 200
         assert response.text == "OK"
 
+    def test_debug_metrics_is_not_found_when_disabled(self, env_helper_mock, client):
+        """Test that the debug metrics endpoint is disabled by default."""
+        # given
+        env_helper_mock.DEBUG_METRICS_ENABLED = False
+
+        # when
+        response = client.get("/api/debug/metrics")
+
+        # then
+        assert response.status_code == 404
+
+    def test_debug_metrics_returns_client_stats(self, env_helper_mock, client):
+        """Test that the debug metrics endpoint returns the stats of the shared clients."""
+        # given
+        env_helper_mock.DEBUG_METRICS_ENABLED = True
+        pool = MagicMock()
+        pool.get_stats.return_value = {"size": 1, "idle": 1}
+        ClientRegistry().get_or_create("postgres", "key", lambda: pool)
+        ClientRegistry().get_or_create("postgres", "key", lambda: pool)
+
+        # when
+        response = client.get("/api/debug/metrics")
+
+        # then
+        assert response.status_code == 200
+        assert response.json["clients"]["postgres"] == {"created": 1, "reused": 1}
+        assert response.json["pools"]["postgres"] == {"size": 1, "idle": 1}
+        assert set(response.json["event_loop"]) == {
+            "tasks",
+            "active_tasks",
+            "max_active_tasks",
+        }
+
+
+class TestAsyncFlask:
+    """Test that the async views run in the shared event loop."""
+
+    def test_async_views_run_in_the_app_event_loop(self):
+        """Test that async views run in the AppEventLoop, in the request context."""
+        # given
+        app = AsyncFlask(__name__)
+
+        @app.route("/thread")
+        async def thread():
+            await asyncio.sleep(0)
+            return jsonify(
+                {
+                    "thread": threading.current_thread().name,
+                    "name": request.args["name"],
+                }
+            )
+
+        # when
+        first = app.test_client().get("/thread?name=first")
+        second = app.test_client().get("/thread?name=second")
+
+        # then
+        assert first.json == {"thread": "app-event-loop", "name": "first"}
+        assert second.json == {"thread": "app-event-loop", "name": "second"}
+        assert AppEventLoop().get_stats()["tasks"] == 2
+
+    def test_async_to_sync_raises_the_exception_of_the_view(self):
+        """Test that the exceptions of async views are raised to Flask."""
+        # given
+        async def fail():
+            raise ValueError("Test exception")
+
+        # when / then
+        with pytest.raises(ValueError, match="Test exception"):
+            AsyncFlask(__name__).async_to_sync(fail)()
+
 
 class TestConversationCustom:
     """Test the custom conversation endpoint."""
@@ -285,6 +369,136 @@ class TestConversationCustom:
             "object": "response.object",
         }
 
+    @patch("create_app.get_message_orchestrator")
+    @patch("create_app.get_orchestrator_config")
+    @patch(
+        "backend.batch.utilities.helpers.config.config_helper.ConfigHelper.get_active_config_or_default"
+    )
+    def test_conversation_custom_streams_deltas_when_asked_to(
+        self,
+        get_active_config_or_default_mock,
+        get_orchestrator_config_mock,
+        get_message_orchestrator_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that the custom conversation endpoint streams the deltas of the orchestrator."""
+        # given
+        get_active_config_or_default_mock.return_value.prompts.conversational_flow = (
+            "custom"
+        )
+        get_orchestrator_config_mock.return_value = self.orchestrator_config
+
+        threads = set()
+
+        async def handle_message_stream():
+            threads.add(threading.current_thread().name)
+            yield self.messages[:1]
+            yield [{"content": "An ", "end_turn": False, "role": "assistant"}]
+            yield [{"content": "answer", "end_turn": True, "role": "assistant"}]
+            threads.add(threading.current_thread().name)
+
+        message_orchestrator_mock = AsyncMock()
+        message_orchestrator_mock.handle_message_stream = MagicMock(
+            return_value=handle_message_stream()
+        )
+        get_message_orchestrator_mock.return_value = message_orchestrator_mock
+
+        env_helper_mock.AZURE_OPENAI_MODEL = self.openai_model
+
+        # when
+        response = client.post(
+            "/api/conversation",
+            headers={"content-type": "application/json", "X-Stream-Mode": "delta"},
+            json=self.body,
+        )
+
+        # then
+        assert response.status_code == 200
+        assert response.headers["X-Stream-Mode"] == "delta"
+        lines = [json.loads(line) for line in str(response.data, "utf-8").splitlines()]
+        assert [line["choices"][0]["messages"] for line in lines] == [
+            self.messages[:1],
+            [{"content": "An ", "end_turn": False, "role": "assistant"}],
+            [{"content": "answer", "end_turn": True, "role": "assistant"}],
+        ]
+        assert lines[0]["model"] == self.openai_model
+        # the deltas are awaited in the shared event loop
+        assert threads == {"app-event-loop"}
+        message_orchestrator_mock.handle_message.assert_not_called()
+        message_orchestrator_mock.handle_message_stream.assert_called_once_with(
+            user_message=self.body["messages"][-1]["content"],
+            chat_history=self.body["messages"][:-1],
+            conversation_id=self.body["conversation_id"],
+            orchestrator=self.orchestrator_config,
+        )
+
+    def test_stream_custom_closes_the_deltas_when_the_client_goes_away(self):
+        """Test that the deltas are closed in the event loop when the stream is closed early."""
+        # given
+        closed = []
+
+        async def deltas():
+            try:
+                yield self.messages[:1]
+                yield self.messages[1:]
+            finally:
+                closed.append(threading.current_thread().name)
+
+        stream = stream_custom(deltas(), self.openai_model, "123", "user-id")
+
+        # when
+        first = json.loads(next(stream))
+        stream.close()
+
+        # then
+        assert first["choices"][0]["messages"] == self.messages[:1]
+        assert closed == ["app-event-loop"]
+
+    @patch("create_app.get_message_orchestrator")
+    @patch("create_app.get_orchestrator_config")
+    @patch(
+        "backend.batch.utilities.helpers.config.config_helper.ConfigHelper.get_active_config_or_default"
+    )
+    def test_conversation_custom_streams_errors_as_the_last_line(
+        self,
+        get_active_config_or_default_mock,
+        get_orchestrator_config_mock,
+        get_message_orchestrator_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that errors while streaming are sent as the last line."""
+        # given
+        get_active_config_or_default_mock.return_value.prompts.conversational_flow = (
+            "custom"
+        )
+        get_orchestrator_config_mock.return_value = self.orchestrator_config
+
+        async def handle_message_stream():
+            yield self.messages[:1]
+            raise Exception("Test exception")
+
+        message_orchestrator_mock = AsyncMock()
+        message_orchestrator_mock.handle_message_stream = MagicMock(
+            return_value=handle_message_stream()
+        )
+        get_message_orchestrator_mock.return_value = message_orchestrator_mock
+
+        # when
+        response = client.post(
+            "/api/conversation",
+            headers={"content-type": "application/json", "X-Stream-Mode": "delta"},
+            json=self.body,
+        )
+
+        # then
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in str(response.data, "utf-8").splitlines()]
+        assert lines[-1] == {
+            "error": "An error occurred. Please try again. If the problem persists, please contact the site administrator."
+        }
+
     @patch("create_app.get_message_orchestrator")
     @patch("create_app.get_orchestrator_config")
     @patch(
@@ -788,6 +1002,7 @@ class TestConversationAzureByod:
             azure_endpoint=AZURE_OPENAI_ENDPOINT,
             api_version=AZURE_OPENAI_API_VERSION,
             api_key=AZURE_OPENAI_API_KEY,
+            http_client=ANY,
         )
 
         openai_client_mock.chat.completions.create.assert_called_once_with(
@@ -801,6 +1016,53 @@ class TestConversationAzureByod:
             stream=False,
         )
 
+    @patch(
+        "backend.batch.utilities.search.azure_search_handler.AzureSearchHelper._index_not_exists"
+    )
+    @patch("create_app.AzureOpenAI")
+    @patch(
+        "backend.batch.utilities.helpers.config.config_helper.ConfigHelper.get_active_config_or_default"
+    )
+    def test_conversation_azure_byod_reuses_the_openai_client(
+        self,
+        get_active_config_or_default_mock,
+        azure_openai_mock,
+        index_not_exists_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that the Azure BYOD conversation endpoint shares one OpenAI client across requests."""
+        # given
+        env_helper_mock.SHOULD_STREAM = False
+        get_active_config_or_default_mock.return_value.prompts.conversational_flow = (
+            "byod"
+        )
+        index_not_exists_mock.return_value = True
+        openai_client_mock = azure_openai_mock.return_value
+        openai_create_mock = MagicMock(
+            id="response.id",
+            model=AZURE_OPENAI_MODEL,
+            created=0,
+            object="response.object",
+        )
+        openai_create_mock.choices[0].message.content = self.content
+        openai_client_mock.chat.completions.create.return_value = openai_create_mock
+
+        # when
+        responses = [
+            client.post(
+                "/api/conversation",
+                headers={"content-type": "application/json"},
+                json=self.body,
+            )
+            for _ in range(2)
+        ]
+
+        # then
+        assert [response.status_code for response in responses] == [200, 200]
+        azure_openai_mock.assert_called_once()
+        assert openai_client_mock.chat.completions.create.call_count == 2
+
     @patch(
         "backend.batch.utilities.search.azure_search_handler.AzureSearchHelper._index_not_exists"
     )
@@ -820,6 +1082,7 @@ class TestConversationAzureByod:
         # given
         env_helper_mock.SHOULD_STREAM = False
         env_helper_mock.AZURE_AUTH_TYPE = "rbac"
+        env_helper_mock.is_auth_type_keys.return_value = False
         env_helper_mock.AZURE_OPENAI_STOP_SEQUENCE = ""
         get_active_config_or_default_mock.return_value.prompts.conversational_flow = (
             "byod"
@@ -868,6 +1131,7 @@ class TestConversationAzureByod:
             azure_endpoint=AZURE_OPENAI_ENDPOINT,
             api_version=AZURE_OPENAI_API_VERSION,
             azure_ad_token_provider=env_helper_mock.AZURE_TOKEN_PROVIDER,
+            http_client=ANY,
         )
 
         openai_client_mock.chat.completions.create.assert_called_once_with(
@@ -931,6 +1195,110 @@ class TestConversationAzureByod:
             == '{"id": "response.id", "model": "mock-openai-model", "created": 0, "object": "response.object", "choices": [{"messages": [{"role": "assistant", "content": "mock content"}]}]}\n'
         )
 
+    @patch(
+        "backend.batch.utilities.search.azure_search_handler.AzureSearchHelper._index_not_exists"
+    )
+    @patch("create_app.AzureOpenAI")
+    @patch(
+        "backend.batch.utilities.helpers.config.config_helper.ConfigHelper.get_active_config_or_default"
+    )
+    def test_conversation_azure_byod_streams_deltas_without_data_when_asked_to(
+        self,
+        get_active_config_or_default_mock,
+        azure_openai_mock,
+        index_not_exists_mock,
+        env_helper_mock,
+        client,
+    ):
+        """Test that only the new content is streamed when the client asks for deltas."""
+        # given
+        get_active_config_or_default_mock.return_value.prompts.conversational_flow = (
+            "byod"
+        )
+        index_not_exists_mock.return_value = True
+        openai_client_mock = MagicMock()
+        azure_openai_mock.return_value = openai_client_mock
+
+        chunks = []
+        for content in ["mock ", "content"]:
+            chunk = MagicMock(
+                id="response.id",
+                model=AZURE_OPENAI_MODEL,
+                created=0,
+                object="response.object",
+            )
+            chunk.choices[0].delta.content = content
+            chunks.append(chunk)
+
+        openai_client_mock.chat.completions.create.return_value = chunks
+
+        # when
+        response = client.post(
+            "/api/conversation",
+            headers={"content-type": "application/json", "X-Stream-Mode": "delta"},
+            json=self.body,
+        )
+
+        # then
+        assert response.status_code == 200
+        assert response.headers["X-Stream-Mode"] == "delta"
+
+        lines = [json.loads(line) for line in str(response.data, "utf-8").splitlines()]
+        assert [line["choices"][0]["messages"] for line in lines] == [
+            [{"role": "assistant", "content": "mock "}],
+            [{"role": "assistant", "content": "content"}],
+        ]
+
+    @patch("create_app.get_citations")
+    def test_stream_with_data_sends_the_whole_response_on_every_line(
+        self, get_citations_mock
+    ):
+        """Test that every streamed line holds the citations and the answer so far."""
+        # given
+        get_citations_mock.return_value = {"citations": ["citation"]}
+
+        # when
+        lines = [
+            json.loads(line) for line in stream_with_data(self.mock_streamed_response)
+        ]
+
+        # then
+        assert len(lines) == 3
+        assert lines[-1]["choices"][0]["messages"] == [
+            {
+                "content": '{"citations": ["citation"]}',
+                "end_turn": False,
+                "role": "tool",
+            },
+            {"content": "A question\n?", "end_turn": True, "role": "assistant"},
+        ]
+
+    @patch("create_app.get_citations")
+    def test_stream_with_data_sends_deltas_when_asked_to(self, get_citations_mock):
+        """Test that the citations are sent once, and the answer as deltas."""
+        # given
+        get_citations_mock.return_value = {"citations": ["citation"]}
+
+        # when
+        lines = [
+            json.loads(line)
+            for line in stream_with_data(self.mock_streamed_response, True)
+        ]
+
+        # then
+        assert [line["choices"][0]["messages"] for line in lines] == [
+            [
+                {
+                    "content": '{"citations": ["citation"]}',
+                    "end_turn": False,
+                    "role": "tool",
+                }
+            ],
+            [{"content": "A question\n?", "end_turn": False, "role": "assistant"}],
+            [{"content": "", "end_turn": True, "role": "assistant"}],
+        ]
+        assert lines[0]["id"] == "response.id"
+
 
 class TestGetFile:
     """Test the get_file endpoint for downloading files from blob storage."""
@@ -90,6 +90,44 @@ def test_returns_citations():
     assert messages[0]["content"] == expected_content
 
 
+def test_parse_citations_cites_every_source_document():
+    # Given
+    output_parser = OutputParserTool()
+    question = "A question?"
+    source_documents = [
+        SourceDocument(
+            id="1",
+            content="Some content",
+            title="A title",
+            source="A source",
+            chunk="A chunk",
+            offset="An offset",
+            page_number="1",
+        ),
+        SourceDocument(
+            id="2",
+            content="Some more content",
+            title="Another title",
+            source="Another source",
+            chunk="Another chunk",
+            offset="Another offset",
+            page_number="",
+        ),
+    ]
+
+    # When
+    message = output_parser.parse_citations(question, source_documents)
+
+    # Then
+    assert message == {
+        "role": "tool",
+        "content": json.dumps(
+            _convert_source_documents_to_content(question, source_documents)
+        ),
+        "end_turn": False,
+    }
+
+
 def test_orders_citations_in_ascending_order():
     # Given
     output_parser = OutputParserTool()
@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.batch.utilities.helpers.config.active_config_cache import (
+    ActiveConfigCache,
+)
+
+MODULE = "backend.batch.utilities.helpers.config.active_config_cache"
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(f"{MODULE}.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.CONFIG_REFRESH_INTERVAL = 60
+        yield env_helper
+
+
+@pytest.fixture
+def monotonic_mock():
+    with patch(f"{MODULE}.time") as mock:
+        mock.monotonic.return_value = 1000.0
+        yield mock.monotonic
+
+
+@pytest.fixture
+def threads_mock():
+    """
+    Runs the revalidations synchronously.
+    """
+    with patch(f"{MODULE}.threading.Thread") as mock:
+        mock.side_effect = lambda target, args, **kwargs: MagicMock(
+            start=lambda: target(*args)
+        )
+        yield mock
+
+
+def test_get_loads_the_config_once(monotonic_mock: MagicMock):
+    # given
+    load = MagicMock(side_effect=lambda: (object(), '"etag"'))
+    get_etag = MagicMock()
+    cache = ActiveConfigCache()
+
+    # when
+    first = cache.get(load, get_etag)
+    monotonic_mock.return_value += 59
+    second = ActiveConfigCache().get(load, get_etag)
+
+    # then
+    assert first is second
+    load.assert_called_once_with()
+    get_etag.assert_not_called()
+    assert cache.get_stats()["loads"] == 1
+
+
+def test_get_keeps_the_config_when_the_etag_did_not_change(
+    monotonic_mock: MagicMock, threads_mock: MagicMock
+):
+    # given
+    load = MagicMock(side_effect=lambda: (object(), '"etag"'))
+    get_etag = MagicMock(return_value='"etag"')
+    cache = ActiveConfigCache()
+    config = cache.get(load, get_etag)
+
+    # when
+    monotonic_mock.return_value += 60
+    revalidated = cache.get(load, get_etag)
+    monotonic_mock.return_value += 1
+    cached = cache.get(load, get_etag)
+
+    # then
+    assert revalidated is config
+    assert cached is config
+    load.assert_called_once_with()
+    get_etag.assert_called_once_with()
+    assert cache.get_stats()["revalidations"] == 1
+
+
+def test_get_loads_the_config_again_when_the_etag_changed(
+    monotonic_mock: MagicMock, threads_mock: MagicMock
+):
+    # given
+    old_config, new_config = object(), object()
+    load = MagicMock(side_effect=[(old_config, '"old"'), (new_config, '"new"')])
+    get_etag = MagicMock(return_value='"new"')
+    cache = ActiveConfigCache()
+    cache.get(load, get_etag)
+
+    # when
+    monotonic_mock.return_value += 60
+    # the revalidation runs in the background, so this request gets the old config
+    stale = cache.get(load, get_etag)
+    fresh = cache.get(load, get_etag)
+
+    # then
+    assert stale is old_config
+    assert fresh is new_config
+    assert load.call_count == 2
+    assert cache.get_stats()["loads"] == 2
+
+
+def test_get_keeps_the_config_when_the_revalidation_fails(
+    monotonic_mock: MagicMock, threads_mock: MagicMock
+):
+    # given
+    config = object()
+    load = MagicMock(return_value=(config, '"etag"'))
+    get_etag = MagicMock(side_effect=Exception("storage unavailable"))
+    cache = ActiveConfigCache()
+    cache.get(load, get_etag)
+
+    # when
+    monotonic_mock.return_value += 60
+    first = cache.get(load, get_etag)
+    second = cache.get(load, get_etag)
+
+    # then
+    assert first is config
+    assert second is config
+    # not revalidated again before the next interval
+    get_etag.assert_called_once_with()
+    assert cache.get_stats()["failed_revalidations"] == 1
+
+
+def test_invalidate_loads_the_config_again(monotonic_mock: MagicMock):
+    # given
+    old_config, new_config = object(), object()
+    load = MagicMock(side_effect=[(old_config, '"old"'), (new_config, '"new"')])
+    cache = ActiveConfigCache()
+    cache.get(load, MagicMock())
+
+    # when
+    cache.invalidate()
+    config = cache.get(load, MagicMock())
+
+    # then
+    assert config is new_config
+    assert load.call_count == 2
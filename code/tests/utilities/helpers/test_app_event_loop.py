@@ -0,0 +1,253 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.batch.utilities.helpers.app_event_loop import AppEventLoop
+
+MODULE = "backend.batch.utilities.helpers.app_event_loop"
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(f"{MODULE}.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.APP_EVENT_LOOP_BLOCKING_THREADS = 2
+        yield env_helper
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_run_returns_the_result_in_the_context_of_the_caller():
+    # given
+    async def get_request_id():
+        return request_id.get(), threading.current_thread().name
+
+    request_id.set("123")
+
+    # when
+    result = AppEventLoop().run(get_request_id())
+
+    # then
+    assert result == ("123", "app-event-loop")
+
+
+def test_run_raises_the_exception_of_the_coroutine():
+    # given
+    async def fail():
+        raise ValueError("Test exception")
+
+    # when / then
+    with pytest.raises(ValueError, match="Test exception"):
+        AppEventLoop().run(fail())
+    assert AppEventLoop().get_stats()["active_tasks"] == 0
+
+
+def test_run_raises_when_the_coroutine_is_cancelled():
+    # given
+    async def cancel():
+        asyncio.current_task().cancel()
+        await asyncio.sleep(0)
+
+    # when / then
+    with pytest.raises(concurrent.futures.CancelledError):
+        AppEventLoop().run(cancel())
+
+
+def test_run_raises_when_the_coroutine_times_out():
+    # given
+    async def time_out():
+        await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+    # when / then
+    with pytest.raises(asyncio.TimeoutError):
+        AppEventLoop().run(time_out())
+
+
+def test_run_cannot_be_called_from_the_loop():
+    # given
+    event_loop = AppEventLoop()
+
+    async def run_nested():
+        coroutine = asyncio.sleep(0)
+        try:
+            event_loop.run(coroutine)
+        finally:
+            coroutine.close()
+
+    # when / then
+    with pytest.raises(RuntimeError):
+        event_loop.run(run_nested())
+
+
+def test_run_interleaves_the_coroutines_of_concurrent_callers():
+    # given
+    event_loop = AppEventLoop()
+    release = threading.Event()
+
+    async def wait():
+        await asyncio.to_thread(release.wait)
+
+    callers = [
+        threading.Thread(target=event_loop.run, args=(wait(),)) for _ in range(2)
+    ]
+
+    # when
+    for caller in callers:
+        caller.start()
+    wait_for(lambda: event_loop.get_stats()["active_tasks"] == 2)
+    release.set()
+    for caller in callers:
+        caller.join(5)
+
+    # then
+    assert event_loop.get_stats() == {
+        "tasks": 2,
+        "active_tasks": 0,
+        "max_active_tasks": 2,
+    }
+
+
+def test_run_raises_when_the_loop_is_closed():
+    # given
+    event_loop = AppEventLoop()
+    event_loop.close()
+
+    # when / then
+    with pytest.raises(RuntimeError):
+        event_loop.run(asyncio.sleep(0))
+    assert event_loop.get_stats()["active_tasks"] == 0
+
+
+def test_arun_awaits_the_coroutine_in_the_loop_from_another_loop():
+    # given
+    async def get_thread():
+        return threading.current_thread().name
+
+    async def arun():
+        return await AppEventLoop().arun(get_thread())
+
+    # when
+    from_other_loop = asyncio.run(arun())
+    from_app_event_loop = AppEventLoop().run(arun())
+
+    # then
+    assert from_other_loop == "app-event-loop"
+    assert from_app_event_loop == "app-event-loop"
+
+
+def test_blocking_calls_are_capped_to_the_blocking_threads():
+    # given
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def block():
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def block_concurrently():
+        await asyncio.gather(*[asyncio.to_thread(block) for _ in range(6)])
+
+    # when
+    AppEventLoop().run(block_concurrently())
+
+    # then
+    assert max_running == 2
+
+
+def test_iterate_yields_the_items_in_order():
+    # given
+    async def items():
+        for item in range(3):
+            await asyncio.sleep(0)
+            yield item
+
+    # when
+    result = list(AppEventLoop().iterate(items()))
+
+    # then
+    assert result == [0, 1, 2]
+
+
+def test_iterate_raises_the_exception_of_the_iterator():
+    # given
+    async def items():
+        yield 0
+        raise ValueError("Test exception")
+
+    iterator = AppEventLoop().iterate(items())
+
+    # when / then
+    assert next(iterator) == 0
+    with pytest.raises(ValueError, match="Test exception"):
+        next(iterator)
+
+
+def test_iterate_closes_the_iterator_when_stopped_early():
+    # given
+    closed = []
+
+    async def items():
+        try:
+            yield 0
+            yield 1
+        finally:
+            closed.append(threading.current_thread().name)
+
+    iterator = AppEventLoop().iterate(items())
+
+    # when
+    next(iterator)
+    iterator.close()
+
+    # then
+    assert closed == ["app-event-loop"]
+
+
+def test_close_closes_the_async_clients_of_the_loop():
+    # given
+    with patch(f"{MODULE}.ClientRegistry") as client_registry_mock:
+        aclose_loop_clients = AsyncMock()
+        client_registry_mock.return_value.aclose_loop_clients = aclose_loop_clients
+        event_loop = AppEventLoop()
+        event_loop.run(asyncio.sleep(0))
+
+        # when
+        event_loop.close()
+
+    # then
+    aclose_loop_clients.assert_awaited_once_with()
+
+
+def test_clear_instance_stops_the_loop_thread():
+    # given
+    event_loop = AppEventLoop()
+    event_loop.run(asyncio.sleep(0))
+    threads = [
+        thread for thread in threading.enumerate() if thread.name == "app-event-loop"
+    ]
+
+    # when
+    AppEventLoop.clear_instance()
+
+    # then
+    assert threads
+    assert not any(thread.is_alive() for thread in threads)
+    assert AppEventLoop() is not event_loop
@@ -7,6 +7,7 @@ and authentication modes (key-based vs RBAC).
 from unittest.mock import Mock, patch
 
 import pytest
+from azure.core.exceptions import ResourceNotFoundError
 
 from backend.batch.utilities.helpers.azure_blob_storage_client import (
     AzureBlobStorageClient,
@@ -190,6 +191,42 @@ class TestFileExistsAndDelete:
 
         assert result is False
 
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
+    def test_get_etag_returns_etag_of_blob(self, mock_credential_class, mock_blob_service_class, mock_env_helper):
+        """Test get_etag returns the ETag of the blob properties."""
+        mock_blob_client = Mock()
+        mock_blob_client.get_blob_properties.return_value.etag = '"0x8DC"'
+
+        mock_blob_service = Mock()
+        mock_blob_service.get_blob_client.return_value = mock_blob_client
+        mock_blob_service_class.return_value = mock_blob_service
+
+        client = AzureBlobStorageClient()
+        result = client.get_etag("active.json")
+
+        assert result == '"0x8DC"'
+        mock_blob_service.get_blob_client.assert_called_once_with(
+            container="test-container",
+            blob="active.json"
+        )
+
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
+    def test_get_etag_returns_none_when_blob_does_not_exist(self, mock_credential_class, mock_blob_service_class, mock_env_helper):
+        """Test get_etag returns None when blob doesn't exist."""
+        mock_blob_client = Mock()
+        mock_blob_client.get_blob_properties.side_effect = ResourceNotFoundError()
+
+        mock_blob_service = Mock()
+        mock_blob_service.get_blob_client.return_value = mock_blob_client
+        mock_blob_service_class.return_value = mock_blob_service
+
+        client = AzureBlobStorageClient()
+        result = client.get_etag("active.json")
+
+        assert result is None
+
     @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
     @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
     def test_delete_file_when_exists(self, mock_credential_class, mock_blob_service_class, mock_env_helper):
@@ -477,6 +514,78 @@ class TestGetAllFiles:
         assert result[0]['converted_path'] == ""
 
 
+class TestGetChangedFiles:
+    """Tests for listing files that changed since they were last ingested."""
+
+    @staticmethod
+    def create_blob(name, metadata, content_md5):
+        blob = Mock()
+        blob.name = name
+        blob.metadata = metadata
+        blob.content_settings.content_md5 = content_md5
+        return blob
+
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
+    def test_get_changed_files_returns_new_and_modified_files(self, mock_credential_class, mock_blob_service_class, mock_env_helper):
+        """Test get_changed_files skips files whose content MD5 matches the ingested one."""
+        blobs = [
+            self.create_blob(
+                "unchanged.pdf",
+                {"embeddings_added": "true", "ingested_content_md5": "AQID"},
+                bytearray(b"\x01\x02\x03"),
+            ),
+            self.create_blob(
+                "modified.pdf",
+                {"embeddings_added": "true", "ingested_content_md5": "AQID"},
+                bytearray(b"\x04\x05\x06"),
+            ),
+            self.create_blob("new.pdf", None, bytearray(b"\x01\x02\x03")),
+            self.create_blob(
+                "ingested-before-manifest.pdf",
+                {"embeddings_added": "true"},
+                bytearray(b"\x01\x02\x03"),
+            ),
+            self.create_blob(
+                "no-md5.pdf",
+                {"embeddings_added": "true", "ingested_content_md5": "AQID"},
+                None,
+            ),
+            self.create_blob("converted/unchanged.pdf", {}, None),
+        ]
+
+        mock_container_client = Mock()
+        mock_container_client.list_blobs.return_value = blobs
+        mock_blob_service = Mock()
+        mock_blob_service.get_container_client.return_value = mock_container_client
+        mock_blob_service_class.return_value = mock_blob_service
+
+        client = AzureBlobStorageClient()
+        result = client.get_changed_files()
+
+        assert result == [
+            "modified.pdf",
+            "new.pdf",
+            "ingested-before-manifest.pdf",
+            "no-md5.pdf",
+        ]
+        mock_container_client.list_blobs.assert_called_once_with(include="metadata")
+
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
+    def test_get_blob_content_md5_returns_base64_digest(self, mock_credential_class, mock_blob_service_class, mock_env_helper):
+        """Test get_blob_content_md5 encodes the blob's Content-MD5 as base64."""
+        mock_blob_client = Mock()
+        mock_blob_client.get_blob_properties.return_value.content_settings.content_md5 = bytearray(b"\x01\x02\x03")
+        mock_blob_service = Mock()
+        mock_blob_service.get_blob_client.return_value = mock_blob_client
+        mock_blob_service_class.return_value = mock_blob_service
+
+        client = AzureBlobStorageClient()
+
+        assert client.get_blob_content_md5("document.pdf") == "AQID"
+
+
 class TestMetadataOperations:
     """Tests for blob metadata management."""
 
@@ -571,3 +680,36 @@ class TestSASGeneration:
         sas_call_kwargs = mock_sas.call_args[1]
         assert sas_call_kwargs['user_delegation_key'] == mock_user_delegation_key
         assert sas_call_kwargs['account_key'] is None
+
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.generate_container_sas")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.AzureNamedKeyCredential")
+    def test_get_container_sas_is_signed_once_for_all_clients(self, mock_credential_class, mock_blob_service_class, mock_sas, mock_env_helper):
+        """Test the container SAS is cached across clients of the same container."""
+        mock_sas.return_value = "sv=2021-06-08&sig=container"
+        mock_blob_service_class.return_value = Mock()
+
+        results = [AzureBlobStorageClient().get_container_sas() for _ in range(3)]
+
+        assert results == ["?sv=2021-06-08&sig=container"] * 3
+        mock_sas.assert_called_once()
+
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.get_azure_credential")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.generate_container_sas")
+    @patch("backend.batch.utilities.helpers.azure_blob_storage_client.BlobServiceClient")
+    def test_user_delegation_key_is_requested_once_for_all_clients(self, mock_blob_service_class, mock_sas, mock_get_credential, mock_env_helper_rbac):
+        """Test clients of the same account share the user delegation key and the SAS signed with it."""
+        mock_user_delegation_key = Mock()
+        mock_blob_service = Mock()
+        mock_blob_service.get_user_delegation_key.return_value = mock_user_delegation_key
+        mock_blob_service_class.return_value = mock_blob_service
+        mock_sas.return_value = "sv=2021-06-08&sig=container"
+
+        first = AzureBlobStorageClient()
+        second = AzureBlobStorageClient()
+        first.get_container_sas()
+        second.get_container_sas()
+
+        assert second.user_delegation_key is first.user_delegation_key
+        mock_blob_service.get_user_delegation_key.assert_called_once()
+        mock_sas.assert_called_once()
@@ -8,6 +8,7 @@ import html
 from unittest.mock import Mock, patch
 
 import pytest
+from azure.core.exceptions import HttpResponseError
 
 from backend.batch.utilities.helpers.azure_form_recognizer_helper import AzureFormRecognizerClient
 
@@ -21,6 +22,8 @@ def mock_env_helper():
         env.AZURE_FORM_RECOGNIZER_KEY = "test-key-12345"
         env.AZURE_AUTH_TYPE = "keys"
         env.MANAGED_IDENTITY_CLIENT_ID = None
+        env.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 0
+        env.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY = 4
         mock.return_value = env
         yield env
 
@@ -33,6 +36,8 @@ def mock_env_helper_rbac():
         env.AZURE_FORM_RECOGNIZER_ENDPOINT = "https://test-endpoint.cognitiveservices.azure.com/"
         env.AZURE_AUTH_TYPE = "rbac"
         env.MANAGED_IDENTITY_CLIENT_ID = "test-client-id"
+        env.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 0
+        env.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY = 4
         mock.return_value = env
         yield env
 
@@ -371,3 +376,144 @@ class TestDocumentAnalysisIntegration:
         page_text = result[0]['page_text']
         assert '<h1>' in page_text  # title role
         assert '<h2>' in page_text  # sectionHeading role
+
+    @patch("backend.batch.utilities.helpers.azure_form_recognizer_helper.DocumentAnalysisClient")
+    def test_analyze_document_builds_exact_page_text(self, mock_client_class):
+        """Test the page text replaces table spans and wraps paragraphs in role tags."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        mock_title = Mock(role="title", spans=[Mock(offset=0, length=5)])
+        # Tags inside a table span are dropped along with the table text
+        mock_in_table = Mock(role=None, spans=[Mock(offset=8, length=2)])
+        mock_after_table = Mock(role=None, spans=[Mock(offset=12, length=4)])
+        mock_footer = Mock(role="pageFooter", spans=[Mock(offset=17, length=2)])
+
+        mock_table = Mock()
+        mock_table.row_count = 1
+        mock_table.bounding_regions = [Mock(page_number=1)]
+        mock_table.spans = [Mock(offset=6, length=6)]
+        mock_table.cells = [
+            Mock(row_index=0, column_index=0, kind="content", content="Data", column_span=1, row_span=1)
+        ]
+
+        mock_poller = Mock()
+        mock_result = Mock()
+        mock_result.paragraphs = [mock_title, mock_in_table, mock_after_table, mock_footer]
+        mock_result.tables = [mock_table]
+        mock_result.content = "Title [DATA]Text 42Next"
+        mock_result.pages = [
+            Mock(spans=[Mock(offset=0, length=19)]),
+            Mock(spans=[Mock(offset=19, length=4)]),
+        ]
+
+        mock_poller.result.return_value = mock_result
+        mock_client.begin_analyze_document_from_url.return_value = mock_poller
+
+        client = AzureFormRecognizerClient()
+        result = client.begin_analyze_document_from_url("https://example.com/doc.pdf")
+
+        first_page = "<h1>Title</h1> <table><tr><td>Data</td></tr></table><p>Text</p> 42 "
+        assert result == [
+            {"page_number": 0, "offset": 0, "page_text": first_page},
+            {"page_number": 1, "offset": len(first_page), "page_text": "Next "},
+        ]
+
+
+class TestAnalyzeDocumentInPageRanges:
+    """Tests for analyzing large documents in concurrent page ranges."""
+
+    PAGE_COUNT = 5
+
+    @classmethod
+    def analyze_page_range(cls, model_id, document_url, pages):
+        """Returns the result of analyzing the given pages of a 5 pages document."""
+        first, last = [int(page) for page in pages.split("-")]
+        if first > cls.PAGE_COUNT:
+            raise HttpResponseError(response=Mock(status_code=400, reason="Bad Request"))
+        page_numbers = range(first, min(last, cls.PAGE_COUNT) + 1)
+
+        # offsets are relative to the content of each range
+        mock_result = Mock()
+        mock_result.content = "".join(f"Page {page_number}." for page_number in page_numbers)
+        mock_result.pages = [
+            Mock(spans=[Mock(offset=i * 7, length=7)]) for i in range(len(page_numbers))
+        ]
+        mock_result.paragraphs = []
+        mock_table = Mock()
+        mock_table.row_count = 1
+        mock_table.bounding_regions = [Mock(page_number=4)]
+        # page 4 is the second page of its range
+        mock_table.spans = [Mock(offset=7, length=7)]
+        mock_table.cells = [
+            Mock(row_index=0, column_index=0, kind="content", content="Data", column_span=1, row_span=1)
+        ]
+        mock_result.tables = [mock_table] if 4 in page_numbers else []
+        mock_poller = Mock()
+        mock_poller.result.return_value = mock_result
+        return mock_poller
+
+    @patch("backend.batch.utilities.helpers.azure_form_recognizer_helper.DocumentAnalysisClient")
+    def test_analyze_document_in_page_ranges_stitches_pages(self, mock_client_class, mock_env_helper):
+        """Test page numbers and offsets are continuous across page ranges."""
+        mock_env_helper.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 2
+        mock_env_helper.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY = 2
+        mock_client = mock_client_class.return_value
+        mock_client.begin_analyze_document_from_url.side_effect = self.analyze_page_range
+
+        client = AzureFormRecognizerClient()
+        result = client.begin_analyze_document_from_url("https://example.com/doc.pdf")
+
+        table_html = "<table><tr><td>Data</td></tr></table> "
+        assert result == [
+            {"page_number": 0, "offset": 0, "page_text": "Page 1. "},
+            {"page_number": 1, "offset": 8, "page_text": "Page 2. "},
+            {"page_number": 2, "offset": 16, "page_text": "Page 3. "},
+            {"page_number": 3, "offset": 24, "page_text": table_html},
+            {"page_number": 4, "offset": 24 + len(table_html), "page_text": "Page 5. "},
+        ]
+        requested_pages = [
+            call.kwargs["pages"]
+            for call in mock_client.begin_analyze_document_from_url.call_args_list
+        ]
+        assert sorted(requested_pages) == ["1-2", "3-4", "5-6", "7-8"]
+
+    @patch("backend.batch.utilities.helpers.azure_form_recognizer_helper.DocumentAnalysisClient")
+    def test_analyze_document_in_page_ranges_stops_past_the_last_page(self, mock_client_class, mock_env_helper):
+        """Test a range past the end of the document ends the analysis."""
+        mock_env_helper.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 5
+        mock_env_helper.AZURE_FORM_RECOGNIZER_MAX_CONCURRENCY = 1
+        mock_client = mock_client_class.return_value
+        mock_client.begin_analyze_document_from_url.side_effect = self.analyze_page_range
+
+        client = AzureFormRecognizerClient()
+        result = client.begin_analyze_document_from_url("https://example.com/doc.pdf")
+
+        assert len(result) == self.PAGE_COUNT
+        assert mock_client.begin_analyze_document_from_url.call_count == 2
+
+    @patch("backend.batch.utilities.helpers.azure_form_recognizer_helper.DocumentAnalysisClient")
+    def test_analyze_document_in_page_ranges_places_tables_on_their_page(self, mock_client_class, mock_env_helper):
+        """Test tables of later ranges are matched to their absolute page number."""
+        mock_env_helper.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 2
+        mock_client = mock_client_class.return_value
+        mock_client.begin_analyze_document_from_url.side_effect = self.analyze_page_range
+
+        client = AzureFormRecognizerClient()
+        result = client.begin_analyze_document_from_url("https://example.com/doc.pdf")
+
+        assert [page["page_number"] for page in result if "<table>" in page["page_text"]] == [3]
+
+    @patch("backend.batch.utilities.helpers.azure_form_recognizer_helper.DocumentAnalysisClient")
+    def test_analyze_document_in_page_ranges_raises_errors_of_first_range(self, mock_client_class, mock_env_helper):
+        """Test a bad request for the first pages is not mistaken for the end of the document."""
+        mock_env_helper.AZURE_FORM_RECOGNIZER_PAGES_PER_REQUEST = 2
+        mock_client = mock_client_class.return_value
+        mock_client.begin_analyze_document_from_url.side_effect = HttpResponseError(
+            response=Mock(status_code=400, reason="Bad Request")
+        )
+
+        client = AzureFormRecognizerClient()
+
+        with pytest.raises(ValueError):
+            client.begin_analyze_document_from_url("https://example.com/doc.pdf")
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from backend.batch.utilities.helpers.azure_postgres_helper import AzurePostgresHelper
 
 
@@ -14,6 +15,10 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_credential.return_value.get_token.return_value = mock_access_token
 
         mock_connection = MagicMock()
+
+        mock_connection.closed = 0
+
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_connect.return_value = mock_connection
 
         helper = AzurePostgresHelper()
@@ -37,6 +42,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
     def test_get_search_client_reuses_connection(self, mock_connect):
         # Arrange
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_connection.closed = 0  # Simulate an open connection
         mock_connect.return_value = mock_connection
 
@@ -69,6 +76,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the database connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_connect.return_value = mock_connection
         mock_cursor_instance = MagicMock()
         mock_cursor.return_value = mock_cursor_instance
@@ -95,6 +104,36 @@ class TestAzurePostgresHelper(unittest.TestCase):
             "host=mock_host user=mock_user dbname=mock_database password=mock-access-token sslmode=require"
         )
 
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
+    def test_helpers_share_pooled_connections(self, mock_connect, mock_credential):
+        # Arrange
+        mock_env_helper = MagicMock()
+        mock_env_helper.POSTGRESQL_USER = "mock_user"
+        mock_env_helper.POSTGRESQL_HOST = "mock_host"
+        mock_env_helper.POSTGRESQL_DATABASE = "mock_database"
+
+        mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+        mock_connect.return_value = mock_connection
+
+        search_helper = AzurePostgresHelper()
+        search_helper.env_helper = mock_env_helper
+        embedder_helper = AzurePostgresHelper()
+        embedder_helper.env_helper = mock_env_helper
+
+        # Act
+        search_helper.get_vector_store([1, 2, 3])
+        search_helper.get_vector_store([1, 2, 3])
+        embedder_helper.perform_search("mock title")
+
+        # Assert
+        mock_connect.assert_called_once()
+        mock_credential.return_value.get_token.assert_called_once()
+        self.assertEqual(mock_connection.cursor.call_count, 3)
+        mock_connection.close.assert_not_called()
+
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
     def test_get_vector_store_query_error(self, mock_connect, mock_credential):
@@ -112,6 +151,10 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_credential.return_value.get_token.return_value = mock_access_token
 
         mock_connection = MagicMock()
+
+        mock_connection.closed = 0
+
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_connect.return_value = mock_connection
 
         def raise_exception(*args, **kwargs):
@@ -181,6 +224,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Arrange: Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -201,7 +246,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(
             result, [{"id": 1, "title": "Title 1"}, {"id": 2, "title": "Title 2"}]
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -220,6 +265,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Arrange: Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -235,7 +282,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Assert: Check that the result is None
         self.assertIsNone(result)
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -257,6 +304,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Arrange: Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -274,7 +323,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_logger.error.assert_called_with(
             "Database error while fetching titles: Database error"
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -296,6 +345,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Arrange: Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -313,7 +364,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_logger.error.assert_called_with(
             "Unexpected error while fetching titles: Unexpected error"
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -335,6 +386,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -354,7 +407,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         # Assert: Check that the correct number of rows were deleted
         self.assertEqual(result, 3)
         mock_connection.commit.assert_called_once()
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Deleted 3 documents.")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -377,6 +430,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -393,7 +448,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         # Assert: Check that no rows were deleted and a warning was logged
         self.assertEqual(result, 0)
         mock_logger.warning.assert_called_with("No IDs provided for deletion.")
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -415,6 +470,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -435,7 +492,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
             "Database error while deleting documents: Database error"
         )
         mock_connection.rollback.assert_called_once()
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -457,6 +514,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -477,7 +536,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
             "Unexpected error while deleting documents: Unexpected error"
         )
         mock_connection.rollback.assert_called_once()
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -499,6 +558,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -527,7 +588,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result[0]["metadata"], "Test Metadata")
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 1 search result(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -550,6 +611,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -569,7 +632,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result, [])  # Empty list returned for no results
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 0 search result(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -592,6 +655,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -611,7 +676,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_logger.error.assert_called_with(
             "Error executing search query: Database error"
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -633,6 +698,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -655,7 +722,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result[1]["title"], "Unique Title 2")
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 2 unique title(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -678,6 +745,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -695,7 +764,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result, [])  # Empty list returned for no results
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 0 unique title(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -718,6 +787,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -735,7 +806,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_logger.error.assert_called_with(
             "Error executing search query: Database error"
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -757,6 +828,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -780,7 +853,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result[1]["title"], "Title 2")
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 2 unique title(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -803,6 +876,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -821,7 +896,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         self.assertEqual(result, [])  # Empty list returned for no results
 
         # Ensure the connection was closed
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Retrieved 0 unique title(s).")
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
@@ -844,6 +919,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -862,7 +939,7 @@ class TestAzurePostgresHelper(unittest.TestCase):
         mock_logger.error.assert_called_with(
             "Error executing search query: Database error"
         )
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
 
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
@@ -927,6 +1004,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -968,9 +1047,109 @@ class TestAzurePostgresHelper(unittest.TestCase):
         # Assert: Verify execute_values was called
         mock_execute_values.assert_called_once()
         mock_connection.commit.assert_called_once()
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
         mock_logger.info.assert_called_with("Inserted 2 documents successfully.")
 
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.execute_values")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.EnvHelper")
+    def test_create_vector_store_deletes_replaced_documents_first(
+        self, mock_env_helper, mock_execute_values, mock_connect, mock_credential
+    ):
+        # Arrange: Mock the connection and cursor
+        mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+        call_order = []
+        mock_cursor.execute.side_effect = lambda *args: call_order.append("delete")
+        mock_execute_values.side_effect = lambda *args: call_order.append("insert")
+
+        helper = AzurePostgresHelper()
+
+        # Act: Replace doc1 and delete the orphaned doc2
+        helper.create_vector_store(
+            [
+                {
+                    "id": "doc1",
+                    "title": "Title 1",
+                    "chunk": 1,
+                    "chunk_id": "chunk1",
+                    "offset": 0,
+                    "page_number": 1,
+                    "content": "Content 1",
+                    "source": "source1.pdf",
+                    "metadata": "{}",
+                    "content_vector": [0.1, 0.2, 0.3],
+                }
+            ],
+            ids_to_replace=["doc1", "doc2"],
+        )
+
+        # Assert: Both statements ran in a single transaction
+        self.assertEqual(call_order, ["delete", "insert"])
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (["doc1", "doc2"],))
+        mock_connection.commit.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
+
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.EnvHelper")
+    def test_get_chunks_by_source_success(
+        self, mock_env_helper, mock_connect, mock_credential
+    ):
+        # Arrange: Mock the connection and cursor
+        mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+        mock_cursor.fetchall.return_value = [
+            {"id": "doc1", "content": "Content 1", "metadata": "{}"}
+        ]
+
+        helper = AzurePostgresHelper()
+
+        # Act: Call the method under test
+        result = helper.get_chunks_by_source({"source1.pdf"})
+
+        # Assert: The rows are returned and the sources passed as an array
+        self.assertEqual(result, mock_cursor.fetchall.return_value)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (["source1.pdf"],))
+        mock_connection.close.assert_not_called()  # returned to the pool
+
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
+    @patch("backend.batch.utilities.helpers.azure_postgres_helper.EnvHelper")
+    def test_get_vectors_by_id_success(
+        self, mock_env_helper, mock_connect, mock_credential
+    ):
+        # Arrange: Mock the connection and cursor
+        mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+        mock_cursor.fetchall.return_value = [
+            {"id": "doc1", "content_vector": [0.1, 0.2]}
+        ]
+
+        helper = AzurePostgresHelper()
+
+        # Act: Call the method under test
+        result = helper.get_vectors_by_id({"doc1"})
+
+        # Assert: The vectors are read as arrays and the ids passed as an array
+        self.assertEqual(result, mock_cursor.fetchall.return_value)
+        self.assertIn("content_vector::real[]", mock_cursor.execute.call_args[0][0])
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (["doc1"],))
+        mock_connection.close.assert_not_called()  # returned to the pool
+
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.get_azure_credential")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.psycopg2.connect")
     @patch("backend.batch.utilities.helpers.azure_postgres_helper.execute_values")
@@ -992,6 +1171,8 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         # Mock the connection and cursor
         mock_connection = MagicMock()
+        mock_connection.closed = 0
+        mock_connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
@@ -1024,4 +1205,4 @@ class TestAzurePostgresHelper(unittest.TestCase):
 
         mock_logger.error.assert_called_with("Error during index creation: Insert failed")
         mock_connection.rollback.assert_called_once()
-        mock_connection.close.assert_called_once()
+        mock_connection.close.assert_not_called()  # returned to the pool
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import ANY, MagicMock, patch
 from backend.batch.utilities.helpers.azure_search_helper import AzureSearchHelper
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
 from azure.search.documents.indexes.models import (
     ExhaustiveKnnAlgorithmConfiguration,
     ExhaustiveKnnParameters,
@@ -52,6 +53,22 @@ def azure_search_mock():
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def cleanup():
+    AzureSearchHelper.clear_ensured_indexes()
+    yield
+    AzureSearchHelper.clear_ensured_indexes()
+
+
+@pytest.fixture(autouse=True)
+def search_index_cache_env_helper_mock():
+    with patch("backend.batch.utilities.helpers.search_index_cache.EnvHelper") as mock:
+        mock.return_value.AZURE_SEARCH_INDEX_CACHE_TTL = 300
+        SearchIndexCache.clear_instance()
+        yield mock.return_value
+        SearchIndexCache.clear_instance()
+
+
 @pytest.fixture(autouse=True)
 def llm_helper_mock():
     with patch("backend.batch.utilities.helpers.azure_search_helper.LLMHelper") as mock:
@@ -135,9 +152,12 @@ def test_creates_search_clients_with_keys(
         endpoint=AZURE_SEARCH_SERVICE,
         index_name=AZURE_SEARCH_INDEX,
         credential=azure_key_credential_mock.return_value,
+        transport=ANY,
     )
     search_index_client_mock.assert_called_once_with(
-        endpoint=AZURE_SEARCH_SERVICE, credential=azure_key_credential_mock.return_value
+        endpoint=AZURE_SEARCH_SERVICE,
+        credential=azure_key_credential_mock.return_value,
+        transport=ANY,
     )
 
 
@@ -162,10 +182,12 @@ def test_creates_search_clients_with_rabc(
         endpoint=AZURE_SEARCH_SERVICE,
         index_name=AZURE_SEARCH_INDEX,
         credential=default_azure_credential_mock.return_value,
+        transport=ANY,
     )
     search_index_client_mock.assert_called_once_with(
         endpoint=AZURE_SEARCH_SERVICE,
         credential=default_azure_credential_mock.return_value,
+        transport=ANY,
     )
 
 
@@ -184,6 +206,61 @@ def test_returns_search_client(
     assert search_client is search_client_mock.return_value
 
 
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_shares_search_clients_between_instances(
+    search_index_client_mock: MagicMock, search_client_mock: MagicMock
+):
+    # when
+    first = AzureSearchHelper()
+    second = AzureSearchHelper()
+
+    # then
+    assert first.search_client is second.search_client
+    assert first.search_index_client is second.search_index_client
+    search_client_mock.assert_called_once()
+    search_index_client_mock.assert_called_once()
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_ensures_the_search_index_once_per_process(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+    llm_helper_mock: MagicMock,
+):
+    # given
+    search_index_client_mock.return_value.list_index_names.return_value = []
+
+    # when
+    AzureSearchHelper().get_search_client()
+    AzureSearchHelper().get_search_client()
+
+    # then
+    search_index_client_mock.return_value.list_index_names.assert_called_once_with()
+    search_index_client_mock.return_value.create_index.assert_called_once()
+
+
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_does_not_build_the_index_schema_if_the_index_exists(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+    llm_helper_mock: MagicMock,
+):
+    # given
+    AzureSearchHelper._search_dimension = None
+    search_index_client_mock.return_value.list_index_names.return_value = [
+        AZURE_SEARCH_INDEX
+    ]
+
+    # when
+    AzureSearchHelper().create_index()
+
+    # then
+    llm_helper_mock.get_embedding_model.assert_not_called()
+
+
 @patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
 @patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
 def test_creates_search_index_if_not_exists(
@@ -357,6 +434,26 @@ def test_does_not_create_search_index_if_it_exists(
     search_index_client_mock.return_value.create_index.assert_not_called()
 
 
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
+@patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
+def test_lists_indexes_once_and_records_the_created_index(
+    search_index_client_mock: MagicMock,
+    search_client_mock: MagicMock,
+):
+    # given
+    search_index_client_mock.return_value.list_index_names.return_value = []
+    azure_search_helper = AzureSearchHelper()
+
+    # when
+    azure_search_helper.get_search_client()
+    index_not_exists = azure_search_helper._index_not_exists(AZURE_SEARCH_INDEX)
+
+    # then
+    assert not index_not_exists
+    search_index_client_mock.return_value.list_index_names.assert_called_once_with()
+    search_index_client_mock.return_value.create_index.assert_called_once()
+
+
 @patch("backend.batch.utilities.helpers.azure_search_helper.SearchClient")
 @patch("backend.batch.utilities.helpers.azure_search_helper.SearchIndexClient")
 def test_propogates_exceptions_when_creating_search_index(
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.batch.utilities.helpers.blob_sas_cache import BlobSasCache
+
+ACCOUNT_URL = "https://account.blob.core.windows.net/"
+MARGIN = 900
+NOW = datetime(2024, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.utilities.helpers.blob_sas_cache.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_BLOB_SAS_EXPIRY_MARGIN = MARGIN
+        yield env_helper
+
+
+def create_user_delegation_key(start: datetime, expiry: datetime):
+    user_delegation_key = MagicMock()
+    user_delegation_key.value = f"key-{start.isoformat()}"
+    return user_delegation_key
+
+
+@pytest.fixture
+def utcnow_mock():
+    with patch("backend.batch.utilities.helpers.blob_sas_cache.datetime") as mock:
+        mock.utcnow.return_value = NOW
+        yield mock.utcnow
+
+
+def test_get_user_delegation_key_requests_one_key_per_account(utcnow_mock):
+    # given
+    request = MagicMock(side_effect=create_user_delegation_key)
+    cache = BlobSasCache()
+
+    # when
+    first = cache.get_user_delegation_key(ACCOUNT_URL, request)
+    second = BlobSasCache().get_user_delegation_key(ACCOUNT_URL, request)
+
+    # then
+    assert first is second
+    request.assert_called_once_with(NOW, NOW + timedelta(days=1))
+    assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+
+def test_get_user_delegation_key_requests_a_new_key_before_it_expires(utcnow_mock):
+    # given
+    request = MagicMock(side_effect=create_user_delegation_key)
+    cache = BlobSasCache()
+    first = cache.get_user_delegation_key(ACCOUNT_URL, request)
+
+    # when
+    utcnow_mock.return_value = NOW + timedelta(days=1, seconds=-MARGIN)
+    second = cache.get_user_delegation_key(ACCOUNT_URL, request)
+
+    # then
+    assert second is not first
+    assert request.call_count == 2
+
+
+def test_get_sas_signs_once_per_key_until_it_is_about_to_expire(utcnow_mock):
+    # given
+    generate = MagicMock(side_effect=lambda expiry: f"se={expiry.isoformat()}")
+    cache = BlobSasCache()
+
+    # when
+    first = cache.get_sas("container", timedelta(hours=3), generate)
+    cached = cache.get_sas("container", timedelta(hours=3), generate)
+    other = cache.get_sas("other-container", timedelta(hours=3), generate)
+    utcnow_mock.return_value = NOW + timedelta(hours=3, seconds=-MARGIN)
+    renewed = cache.get_sas("container", timedelta(hours=3), generate)
+
+    # then
+    assert cached == first == f"se={(NOW + timedelta(hours=3)).isoformat()}"
+    assert other == first
+    assert renewed != first
+    assert generate.call_count == 3
+
+
+def test_get_sas_expires_with_the_user_delegation_key(utcnow_mock):
+    # given
+    generate = MagicMock(side_effect=lambda expiry: f"se={expiry.isoformat()}")
+    cache = BlobSasCache()
+    user_delegation_key = cache.get_user_delegation_key(
+        ACCOUNT_URL, create_user_delegation_key
+    )
+
+    # when
+    sas = cache.get_sas(
+        "container", timedelta(days=365), generate, user_delegation_key.value
+    )
+
+    # then
+    assert sas == f"se={(NOW + timedelta(days=1)).isoformat()}"
+
+
+def test_get_sas_drops_the_tokens_of_a_replaced_user_delegation_key(utcnow_mock):
+    # given
+    generate = MagicMock(side_effect=lambda expiry: f"se={expiry.isoformat()}")
+    cache = BlobSasCache()
+    first_key = cache.get_user_delegation_key(ACCOUNT_URL, create_user_delegation_key)
+    first = cache.get_sas("container", timedelta(days=365), generate, first_key.value)
+    utcnow_mock.return_value = NOW + timedelta(days=1, seconds=-MARGIN)
+
+    # when
+    second_key = cache.get_user_delegation_key(ACCOUNT_URL, create_user_delegation_key)
+    second = cache.get_sas("container", timedelta(days=365), generate, second_key.value)
+
+    # then
+    assert second != first
+    assert second == f"se={(NOW + timedelta(days=2, seconds=-MARGIN)).isoformat()}"
+    assert generate.call_count == 2
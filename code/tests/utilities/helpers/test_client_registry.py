@@ -0,0 +1,186 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from backend.batch.utilities.helpers.client_registry import ClientRegistry
+
+POOL_SIZE = 4
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.utilities.helpers.client_registry.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_CLIENT_CONNECTION_POOL_SIZE = POOL_SIZE
+        env_helper.AZURE_CLIENT_KEEPALIVE_EXPIRY = 30
+        yield env_helper
+
+
+def test_get_or_create_creates_one_client_per_name_and_key():
+    # given
+    registry = ClientRegistry()
+    factory = MagicMock(side_effect=lambda: object())
+
+    # when
+    first = registry.get_or_create("search", ("service", "index"), factory)
+    second = ClientRegistry().get_or_create("search", ("service", "index"), factory)
+    other = registry.get_or_create("search", ("service", "other-index"), factory)
+
+    # then
+    assert first is second
+    assert other is not first
+    assert factory.call_count == 2
+    assert registry.get_stats()["clients"] == {"search": {"created": 2, "reused": 1}}
+
+
+def test_get_or_create_does_not_hold_up_other_clients_while_creating_one():
+    # given
+    registry = ClientRegistry()
+    creating = threading.Event()
+    release = threading.Event()
+
+    def create_slowly():
+        creating.set()
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(2) as pool:
+        slow_clients = [
+            pool.submit(registry.get_or_create, "search", "slow", create_slowly)
+            for _ in range(2)
+        ]
+        creating.wait(5)
+
+        # when
+        other = registry.get_or_create("search", "other", lambda: object())
+        release.set()
+
+    # then
+    assert other is not None
+    assert slow_clients[0].result() is slow_clients[1].result()
+    assert registry.get_stats()["clients"] == {"search": {"created": 2, "reused": 1}}
+
+
+def test_hooks_are_called_when_clients_are_created_and_closed():
+    # given
+    registry = ClientRegistry()
+    hook = MagicMock()
+    registry.add_hook("created", hook.created)
+    registry.add_hook("closed", hook.closed)
+    client = MagicMock()
+
+    # when
+    registry.get_or_create("blob", "endpoint", lambda: client)
+    registry.get_or_create("blob", "endpoint", lambda: client)
+    registry.close()
+
+    # then
+    assert hook.mock_calls == [
+        call.created("blob", client),
+        call.closed("blob", client),
+    ]
+    client.close.assert_called_once_with()
+    assert registry.get_or_create("blob", "endpoint", MagicMock) is not client
+
+
+def test_add_hook_raises_for_unknown_event():
+    # when + then
+    with pytest.raises(ValueError, match="Unknown client registry event"):
+        ClientRegistry().add_hook("reused", MagicMock())
+
+
+def test_transport_reuses_its_connections_under_concurrent_requests(
+    httpserver: HTTPServer, ca
+):
+    # given
+    httpserver.expect_request("/ping").respond_with_data("pong")
+    registry = ClientRegistry()
+    session = registry.create_transport("search").session
+
+    # when
+    with ca.cert_pem.tempfile() as ca_temp_path, ThreadPoolExecutor(POOL_SIZE) as pool:
+        responses = list(
+            pool.map(
+                lambda _: session.get(httpserver.url_for("/ping"), verify=ca_temp_path),
+                range(40),
+            )
+        )
+
+    # then
+    assert all(response.text == "pong" for response in responses)
+    stats = registry.get_stats()["transports"]["search"]
+    assert stats["requests"] == 40
+    assert 1 <= stats["connections"] <= POOL_SIZE
+
+
+def test_async_clients_are_shared_per_event_loop_and_closed_with_it():
+    # given
+    registry = ClientRegistry()
+    factory = AsyncMock(side_effect=lambda: AsyncMock())
+
+    async def get_clients():
+        first = await registry.aget_or_create("search_async", "index", factory)
+        second = await registry.aget_or_create("search_async", "index", factory)
+        await registry.aclose_loop_clients()
+        return first, second
+
+    # when
+    first_loop = asyncio.run(get_clients())
+    second_loop = asyncio.run(get_clients())
+
+    # then
+    assert first_loop[0] is first_loop[1]
+    assert second_loop[0] is not first_loop[0]
+    assert factory.await_count == 2
+    first_loop[0].close.assert_awaited_once_with()
+    second_loop[0].close.assert_awaited_once_with()
+    assert registry.get_stats()["clients"] == {
+        "search_async": {"created": 2, "reused": 2}
+    }
+
+
+def test_http_client_measures_waits_for_a_connection(
+    httpserver: HTTPServer, ca, monkeypatch
+):
+    # given
+    httpserver.expect_request("/ping").respond_with_data("pong")
+    registry = ClientRegistry()
+
+    # when
+    with ca.cert_pem.tempfile() as ca_temp_path:
+        monkeypatch.setenv("SSL_CERT_FILE", ca_temp_path)
+        http_client = registry.create_http_client("openai")
+        with ThreadPoolExecutor(POOL_SIZE * 2) as pool:
+            responses = list(
+                pool.map(
+                    lambda _: http_client.get(httpserver.url_for("/ping")), range(40)
+                )
+            )
+
+    # then
+    assert all(response.text == "pong" for response in responses)
+    stats = registry.get_stats()["transports"]["openai"]
+    assert stats["requests"] == 40
+    # the mock server closes the connection after each response
+    assert 1 <= stats["connections"] <= 40
+    assert stats["connection_wait_max_ms"] >= stats["connection_wait_avg_ms"] > 0
+    assert http_client._transport._pool._keepalive_expiry == 30
+
+
+def test_get_stats_includes_the_stats_of_pools():
+    # given
+    registry = ClientRegistry()
+    pool = MagicMock()
+    pool.get_stats.return_value = {"size": 2}
+    registry.get_or_create("postgres", "dsn", lambda: pool)
+    registry.get_or_create("search", "index", lambda: object())
+
+    # when
+    stats = registry.get_stats()
+
+    # then
+    assert stats["pools"] == {"postgres": {"size": 2}}
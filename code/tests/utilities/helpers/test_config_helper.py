@@ -142,10 +142,8 @@ def env_helper_mock():
 @pytest.fixture(autouse=True)
 def reset_default_config():
     ConfigHelper._default_config = None
-    ConfigHelper.get_active_config_or_default.cache_clear()
     yield
     ConfigHelper._default_config = None
-    ConfigHelper.get_active_config_or_default.cache_clear()
 
 
 def test_active_config_or_default_is_cached(env_helper_mock: MagicMock):
@@ -247,7 +245,7 @@ def test_get_default_config_when_not_in_azure(
     blob_client_mock: MagicMock,
 ):
     # given
-    blob_client_mock.file_exists.return_value = False
+    blob_client_mock.get_etag.return_value = None
     config_dict["prompts"][
         "answering_system_prompt"
     ] = "mock_default_answering_system_prompt"
@@ -280,6 +278,24 @@ def test_save_config_as_active(
     )
 
 
+def test_save_config_as_active_reloads_the_active_config(
+    blob_client_mock: MagicMock,
+    config_dict: dict,
+):
+    # given
+    ConfigHelper.get_active_config_or_default()
+    config_dict["prompts"]["condense_question_prompt"] = "mock_saved_prompt"
+    blob_client_mock.download_file.return_value = json.dumps(config_dict)
+
+    # when
+    ConfigHelper.save_config_as_active(config_dict)
+    config = ConfigHelper.get_active_config_or_default()
+
+    # then
+    assert config.prompts.condense_question_prompt == "mock_saved_prompt"
+    assert blob_client_mock.download_file.call_count == 2
+
+
 def test_save_config_as_active_validates_advanced_image_file_types_are_valid(
     AzureBlobStorageClientMock: MagicMock,
     config_dict: dict,
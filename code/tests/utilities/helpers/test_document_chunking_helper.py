@@ -1,9 +1,20 @@
+import re
+from unittest.mock import patch
+
+import pytest
+from langchain.text_splitter import MarkdownTextSplitter
+
 from backend.batch.utilities.common.source_document import SourceDocument
 from backend.batch.utilities.helpers.document_chunking_helper import DocumentChunking
 from backend.batch.utilities.document_chunking.chunking_strategy import (
     ChunkingStrategy,
     ChunkingSettings,
 )
+from backend.batch.utilities.document_chunking.streaming import (
+    count_tokens,
+    split_markdown,
+    split_tokens,
+)
 
 # Create a sample document
 documents = [
@@ -143,3 +154,264 @@ def test_document_chunking_json():
     assert len(chunked_documents) == 2
     assert chunked_documents[0].content == "{'window': {'title': 'Sample Widget', 'name': 'main_window', 'width': 500, 'height': 500}}"
     assert chunked_documents[1].content == "{'image': {'src': 'Images/Sun.png', 'name': 'sun1', 'hOffset': 250, 'vOffset': 250, 'alignment': 'center'}}"
+
+
+class WordEncoder:
+    """Encodes every word, with the whitespace before it, as one token."""
+
+    def __init__(self):
+        self.words = []
+
+    def encode(self, text):
+        tokens = []
+        for word in re.findall(r"\s*\S+|\s+", text):
+            if word not in self.words:
+                self.words.append(word)
+            tokens.append(self.words.index(word))
+        return tokens
+
+    def decode(self, tokens):
+        return "".join(self.words[token] for token in tokens)
+
+    def decode_bytes(self, tokens):
+        return self.decode(tokens).encode("utf-8")
+
+
+@pytest.fixture
+def word_encoder():
+    with patch(
+        "backend.batch.utilities.document_chunking.streaming.get_encoder"
+    ) as mock:
+        mock.return_value = WordEncoder()
+        yield mock.return_value
+
+
+def test_split_tokens_chunks_across_pages(word_encoder):
+    # given
+    pages = [
+        SourceDocument(content="one two three", source="https://example.com/a"),
+        SourceDocument(content=" fóur five", source="https://example.com/a"),
+        SourceDocument(content=" six seven", source="https://example.com/a"),
+    ]
+    full_document_content = "".join(page.content for page in pages)
+
+    # when
+    chunks = list(split_tokens(pages, chunk_size=3, chunk_overlap=1))
+
+    # then
+    assert [content for content, _ in chunks] == [
+        "one two three",
+        " three fóur five",
+        " five six seven",
+    ]
+    for content, offset in chunks:
+        assert full_document_content[offset : offset + len(content)] == content
+
+
+def test_split_tokens_reads_pages_as_chunks_are_consumed(word_encoder):
+    # given
+    read_pages = []
+
+    def pages():
+        for content in ["one two three four", " five six"]:
+            read_pages.append(content)
+            yield SourceDocument(content=content, source="https://example.com/a")
+
+    # when
+    chunks = split_tokens(pages(), chunk_size=2, chunk_overlap=0)
+
+    # then
+    assert next(chunks) == ("one two", 0)
+    assert read_pages == ["one two three four"]
+    assert list(chunks) == [(" three four", 7), (" five six", 18)]
+
+
+def test_split_tokens_raises_when_overlap_is_not_smaller_than_size(word_encoder):
+    # when + then
+    with pytest.raises(ValueError):
+        list(split_tokens(documents, chunk_size=5, chunk_overlap=5))
+
+
+@pytest.mark.parametrize(
+    "pages",
+    [
+        [page.content for page in documents],
+        [
+            "# Title\n\nThe first para",
+            "graph of the page.\nA second line",
+            "",
+            " and a third\n\n",
+        ],
+        [
+            "| a | b |\n|---|---|\n| 1 | 2 |\n",
+            "| 3 | 4 |\n\nSome text after the table ends here",
+        ],
+    ],
+)
+def test_split_markdown_matches_splitting_the_full_document(word_encoder, pages):
+    # given
+    page_documents = [
+        SourceDocument(content=content, source="https://example.com/a")
+        for content in pages
+    ]
+    full_document_content = "".join(pages)
+    splitter = MarkdownTextSplitter(
+        chunk_size=6, chunk_overlap=2, length_function=count_tokens
+    )
+
+    # when
+    chunks = list(split_markdown(page_documents, chunk_size=6, chunk_overlap=2))
+
+    # then
+    assert [content for content, _ in chunks] == splitter.split_text(
+        full_document_content
+    )
+    for content, offset in chunks:
+        assert full_document_content[offset : offset + len(content)] == content
+
+
+def test_split_markdown_carries_at_most_a_few_chunks_of_a_long_piece(word_encoder):
+    # given
+    # a section going on for pages, which is a single piece of the top level
+    # separator, the heading
+    pages = ["# Title\n\n"] + [
+        f"word{page}a word{page}b word{page}c word{page}d " for page in range(50)
+    ]
+    page_documents = [
+        SourceDocument(content=content, source="https://example.com/a")
+        for content in pages
+    ]
+    full_document_content = "".join(pages)
+    split_texts = []
+    split_text = MarkdownTextSplitter.split_text
+
+    def record_split_text(splitter, text):
+        split_texts.append(text)
+        return split_text(splitter, text)
+
+    # when
+    with patch.object(MarkdownTextSplitter, "split_text", record_split_text):
+        chunks = list(split_markdown(page_documents, chunk_size=6, chunk_overlap=2))
+
+    # then
+    assert max(count_tokens(text) for text in split_texts) <= 6 * 3 + 4
+    assert all(count_tokens(content) <= 6 for content, _ in chunks)
+    for content, offset in chunks:
+        assert full_document_content[offset : offset + len(content)] == content
+    assert chunks[-1][0].endswith("word49d")
+
+
+def test_document_chunking_paragraph_packs_whole_paragraphs(word_encoder):
+    # given
+    chunking = ChunkingSettings(
+        {"strategy": ChunkingStrategy.PARAGRAPH, "size": 8, "overlap": 3}
+    )
+    paragraph_documents = [
+        SourceDocument(
+            content="<h1>Title</h1>\n<p>one two three</p>\n<p>four five</p>\n<p>six seven eight</p>\n",
+            source="https://example.com/sample_document.pdf",
+            page_number=1,
+        ),
+        SourceDocument(
+            content="<h2>Section</h2>\n<p>nine ten</p>\nUntagged text\n\nafter a blank line",
+            source="https://example.com/sample_document.pdf",
+            page_number=2,
+        ),
+    ]
+
+    # when
+    chunked_documents = DocumentChunking().chunk(paragraph_documents, chunking)
+
+    # then
+    assert [document.content for document in chunked_documents] == [
+        "<h1>Title</h1>\n<p>one two three</p>\n<p>four five</p>",
+        "<h1>Title</h1>\n<p>four five</p>\n<p>six seven eight</p>",
+        "<h1>Title</h1>\n<h2>Section</h2>\n<p>nine ten</p>\nUntagged text",
+        "<h1>Title</h1>\n<h2>Section</h2>\nUntagged text\nafter a blank line",
+    ]
+    assert [document.page_number for document in chunked_documents] == [1, 1, 2, 2]
+    full_document_content = "".join(
+        document.content for document in paragraph_documents
+    )
+    assert chunked_documents[1].offset == full_document_content.index(
+        "<p>four five</p>"
+    )
+    assert chunked_documents[3].offset == full_document_content.index(
+        "Untagged text"
+    )
+
+
+def test_document_chunking_paragraph_splits_paragraphs_larger_than_a_chunk(
+    word_encoder,
+):
+    # given
+    chunking = ChunkingSettings(
+        {"strategy": ChunkingStrategy.PARAGRAPH, "size": 5, "overlap": 1}
+    )
+    paragraph_documents = [
+        SourceDocument(
+            content="<h1>Title</h1><p>one two three four five six seven</p>",
+            source="https://example.com/sample_document.pdf",
+        ),
+    ]
+
+    # when
+    chunked_documents = DocumentChunking().chunk(paragraph_documents, chunking)
+
+    # then
+    assert [document.content for document in chunked_documents] == [
+        "<h1>Title</h1>\n<p>one two three four</p>",
+        "<h1>Title</h1>\n<p> four five six seven</p>",
+    ]
+
+
+def test_document_chunking_paragraph_keeps_headings_of_sections_without_paragraphs(
+    word_encoder,
+):
+    # given
+    chunking = ChunkingSettings(
+        {"strategy": ChunkingStrategy.PARAGRAPH, "size": 8, "overlap": 0}
+    )
+    paragraph_documents = [
+        SourceDocument(
+            content="<h1>Title</h1><h2>Empty</h2><h2>Section</h2><p>one two</p><h2>Appendix</h2>",
+            source="https://example.com/sample_document.pdf",
+        ),
+    ]
+
+    # when
+    chunked_documents = DocumentChunking().chunk(paragraph_documents, chunking)
+
+    # then
+    assert [document.content for document in chunked_documents] == [
+        "<h1>Title</h1>\n<h2>Empty</h2>\n<h2>Section</h2>\n<p>one two</p>",
+        "<h1>Title</h1>\n<h2>Appendix</h2>",
+    ]
+    assert chunked_documents[1].offset == paragraph_documents[0].content.index(
+        "<h2>Appendix</h2>"
+    )
+
+
+def test_document_chunking_paragraph_splits_headings_larger_than_a_chunk(
+    word_encoder,
+):
+    # given
+    chunking = ChunkingSettings(
+        {"strategy": ChunkingStrategy.PARAGRAPH, "size": 5, "overlap": 1}
+    )
+    paragraph_documents = [
+        SourceDocument(
+            content="<h1>Title</h1><h2>one two three four five six seven</h2><p>eight</p>",
+            source="https://example.com/sample_document.pdf",
+        ),
+    ]
+
+    # when
+    chunked_documents = DocumentChunking().chunk(paragraph_documents, chunking)
+
+    # then
+    assert [document.content for document in chunked_documents] == [
+        "<h1>Title</h1>\n<h2>one two three four</h2>",
+        "<h1>Title</h1>\n<h2> four five six seven</h2>",
+        "<h1>Title</h1>\n<p>eight</p>",
+    ]
@@ -0,0 +1,192 @@
+import threading
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.document_chunking.chunking_strategy import (
+    ChunkingSettings,
+)
+from backend.batch.utilities.helpers.document_chunking_helper import DocumentChunking
+from backend.batch.utilities.helpers.document_processing_pipeline import (
+    DocumentProcessingPipeline,
+    chunk_documents,
+)
+
+TIMEOUT = 10
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(
+        "backend.batch.utilities.helpers.document_processing_pipeline.EnvHelper"
+    ) as mock:
+        env_helper = mock.return_value
+        env_helper.DOCUMENT_PROCESSING_STAGE_WORKERS = 2
+        env_helper.DOCUMENT_PROCESSING_STAGE_QUEUE_SIZE = 1
+        env_helper.DOCUMENT_PROCESSING_CHUNKING_PROCESSES = 0
+        yield env_helper
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    DocumentProcessingPipeline.clear_instance()
+    yield
+    DocumentProcessingPipeline.clear_instance()
+
+
+def run_in_thread(pipeline: DocumentProcessingPipeline, **steps) -> dict:
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = pipeline.run(**steps)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    outcome["thread"] = thread
+    return outcome
+
+
+def test_run_passes_each_stage_result_to_the_next_one():
+    # given
+    pipeline = DocumentProcessingPipeline()
+
+    # when
+    result = pipeline.run(
+        fetch=lambda: "document",
+        chunk=lambda document: [document, document],
+        embed=lambda chunks: [(chunk, len(chunk)) for chunk in chunks],
+        upload=lambda embedded: {"uploaded": embedded},
+    )
+
+    # then
+    assert result == {"uploaded": [("document", 8), ("document", 8)]}
+    assert pipeline.get_stats()["completed"] == 1
+
+
+def test_run_raises_the_error_of_the_failing_stage():
+    # given
+    pipeline = DocumentProcessingPipeline()
+    uploaded = []
+
+    def embed(chunks):
+        raise RuntimeError("embedding failed")
+
+    # when + then
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        pipeline.run(
+            fetch=lambda: "document",
+            chunk=lambda document: [document],
+            embed=embed,
+            upload=uploaded.append,
+        )
+    assert uploaded == []
+    assert pipeline.get_stats()["failed"] == 1
+
+
+def test_run_fetches_a_document_while_another_one_is_embedded():
+    # given
+    pipeline = DocumentProcessingPipeline()
+    embedding_started = threading.Event()
+    second_document_fetched = threading.Event()
+
+    def embed(chunks):
+        embedding_started.set()
+        assert second_document_fetched.wait(TIMEOUT)
+        return chunks
+
+    first = run_in_thread(
+        pipeline,
+        fetch=lambda: "first",
+        chunk=lambda document: [document],
+        embed=embed,
+        upload=lambda chunks: chunks,
+    )
+    assert embedding_started.wait(TIMEOUT)
+
+    # when
+    second = run_in_thread(
+        pipeline,
+        fetch=lambda: second_document_fetched.set() or "second",
+        chunk=lambda document: [document],
+        embed=lambda chunks: chunks,
+        upload=lambda chunks: chunks,
+    )
+
+    # then
+    first["thread"].join(TIMEOUT)
+    second["thread"].join(TIMEOUT)
+    assert first["result"] == ["first"]
+    assert second["result"] == ["second"]
+
+
+def test_run_blocks_new_documents_while_a_stage_is_behind(env_helper_mock):
+    # given
+    env_helper_mock.DOCUMENT_PROCESSING_STAGE_WORKERS = 1
+    pipeline = DocumentProcessingPipeline()
+    release_upload = threading.Event()
+    fetched = []
+
+    def fetch(document):
+        fetched.append(document)
+        return document
+
+    def upload(chunks):
+        assert release_upload.wait(TIMEOUT)
+        return chunks
+
+    runs = [
+        run_in_thread(
+            pipeline,
+            fetch=partial(fetch, document),
+            chunk=lambda document: [document],
+            embed=lambda chunks: chunks,
+            upload=upload,
+        )
+        for document in range(10)
+    ]
+
+    # when
+    runs[0]["thread"].join(0.5)
+
+    # then
+    # one document in each stage's worker and in the upload, embed and chunk
+    # queues, while the others wait to be fetched
+    assert len(fetched) == 7
+    assert pipeline.get_stats()["in_progress"]["upload"] == 1
+    release_upload.set()
+    for run in runs:
+        run["thread"].join(TIMEOUT)
+    assert sorted(run["result"][0] for run in runs) == list(range(10))
+
+
+def test_run_chunks_documents_in_worker_processes(env_helper_mock):
+    # given
+    env_helper_mock.DOCUMENT_PROCESSING_CHUNKING_PROCESSES = 1
+    pipeline = DocumentProcessingPipeline()
+    chunking = ChunkingSettings({"strategy": "json", "size": 80, "overlap": 0})
+    documents = [
+        SourceDocument(
+            content='{"window": {"title": "Sample Widget", "width": 500}, '
+            '"image": {"src": "Images/Sun.png", "name": "sun1"}}',
+            source="https://example.com/document.json",
+        )
+    ]
+
+    # when
+    chunks = pipeline.run(
+        fetch=lambda: documents,
+        chunk=partial(chunk_documents, DocumentChunking(), chunking),
+        embed=lambda documents: documents,
+        upload=lambda documents: [document.content for document in documents],
+    )
+
+    # then
+    assert len(chunks) == 2
+    assert chunks == [
+        document.content for document in DocumentChunking().chunk(documents, chunking)
+    ]
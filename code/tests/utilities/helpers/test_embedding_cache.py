@@ -0,0 +1,191 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+from backend.batch.utilities.helpers.embedding_cache import (
+    BlobEmbeddingCacheBackend,
+    EmbeddingCache,
+    SqliteEmbeddingCacheBackend,
+)
+
+MODEL = "text-embedding-3-small"
+DIMENSIONS = 1536
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    EmbeddingCache.clear_instance()
+    yield
+    EmbeddingCache.clear_instance()
+
+
+@pytest.fixture
+def env_helper_mock(tmp_path):
+    with patch("backend.batch.utilities.helpers.embedding_cache.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_OPENAI_EMBEDDING_CACHE = "sqlite"
+        env_helper.AZURE_OPENAI_EMBEDDING_CACHE_PATH = str(tmp_path / "cache.sqlite")
+        env_helper.AZURE_OPENAI_EMBEDDING_CACHE_CONTAINER = "embedding-cache"
+        yield env_helper
+
+
+@pytest.fixture
+def blob_client_mock():
+    with patch(
+        "backend.batch.utilities.helpers.embedding_cache.AzureBlobStorageClient"
+    ) as mock:
+        yield mock.return_value
+
+
+def embed(inputs):
+    return [[float(len(input))] for input in inputs]
+
+
+def test_embedding_cache_is_disabled_by_default(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_CACHE = ""
+
+    # when
+    embedding_cache = EmbeddingCache()
+
+    # then
+    assert not embedding_cache.enabled
+
+
+def test_embedding_cache_raises_for_unknown_backend(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_CACHE = "redis"
+
+    # when + then
+    with pytest.raises(ValueError):
+        EmbeddingCache()
+
+
+def test_get_or_embed_embeds_only_inputs_not_cached(env_helper_mock):
+    # given
+    embedding_cache = EmbeddingCache()
+    embedding_cache.get_or_embed(MODEL, DIMENSIONS, ["a", "bb"], embed)
+    embed_mock = MagicMock(side_effect=embed)
+
+    # when
+    embeddings = embedding_cache.get_or_embed(
+        MODEL, DIMENSIONS, ["a", "ccc", "bb"], embed_mock
+    )
+
+    # then
+    assert embeddings == [[1.0], [3.0], [2.0]]
+    embed_mock.assert_called_once_with(["ccc"])
+
+
+def test_get_or_embed_embeds_duplicate_inputs_once(env_helper_mock):
+    # given
+    embedding_cache = EmbeddingCache()
+    embed_mock = MagicMock(side_effect=embed)
+
+    # when
+    embeddings = embedding_cache.get_or_embed(
+        MODEL, DIMENSIONS, ["a", "a", "bb"], embed_mock
+    )
+
+    # then
+    assert embeddings == [[1.0], [1.0], [2.0]]
+    embed_mock.assert_called_once_with(["a", "bb"])
+
+
+def test_get_or_embed_does_not_share_embeddings_across_models(env_helper_mock):
+    # given
+    embedding_cache = EmbeddingCache()
+    embedding_cache.get_or_embed(MODEL, DIMENSIONS, ["a"], embed)
+    embed_mock = MagicMock(side_effect=embed)
+
+    # when
+    embedding_cache.get_or_embed(MODEL, 256, ["a"], embed_mock)
+    embedding_cache.get_or_embed("text-embedding-ada-002", None, ["a"], embed_mock)
+
+    # then
+    assert embed_mock.call_count == 2
+
+
+def test_get_or_embed_persists_embeddings_across_instances(env_helper_mock):
+    # given
+    EmbeddingCache().get_or_embed(MODEL, DIMENSIONS, ["a"], embed)
+    EmbeddingCache.clear_instance()
+    embed_mock = MagicMock(side_effect=embed)
+
+    # when
+    EmbeddingCache().get_or_embed(MODEL, DIMENSIONS, ["a"], embed_mock)
+
+    # then
+    embed_mock.assert_not_called()
+
+
+def test_get_stats_reports_hit_rate(env_helper_mock):
+    # given
+    embedding_cache = EmbeddingCache()
+    embedding_cache.get_or_embed(MODEL, DIMENSIONS, ["a", "b", "c"], embed)
+
+    # when
+    embedding_cache.get_or_embed(MODEL, DIMENSIONS, ["a", "d"], embed)
+
+    # then
+    assert embedding_cache.get_stats() == {"hits": 1, "misses": 4, "hit_rate": 0.2}
+
+
+def test_sqlite_backend_reads_more_keys_than_query_parameter_limit(tmp_path):
+    # given
+    backend = SqliteEmbeddingCacheBackend(str(tmp_path / "cache.sqlite"))
+    items = {f"key-{i}": [float(i)] for i in range(1200)}
+    backend.set_many(items)
+
+    # when
+    cached = backend.get_many(list(items.keys()))
+
+    # then
+    assert cached == items
+
+
+def test_blob_backend_creates_container_if_missing(blob_client_mock):
+    # given
+    blob_client_mock.blob_service_client.create_container.side_effect = (
+        ResourceExistsError()
+    )
+
+    # when
+    BlobEmbeddingCacheBackend("embedding-cache")
+
+    # then
+    blob_client_mock.blob_service_client.create_container.assert_called_once_with(
+        "embedding-cache"
+    )
+
+
+def test_blob_backend_skips_missing_blobs(blob_client_mock):
+    # given
+    def download_file(file_name):
+        if file_name != "cached.json":
+            raise ResourceNotFoundError()
+        return json.dumps([1.0]).encode("utf-8")
+
+    blob_client_mock.download_file.side_effect = download_file
+    backend = BlobEmbeddingCacheBackend("embedding-cache")
+
+    # when
+    cached = backend.get_many(["cached", "missing"])
+
+    # then
+    assert cached == {"cached": [1.0]}
+
+
+def test_blob_backend_uploads_embeddings_as_json(blob_client_mock):
+    # given
+    backend = BlobEmbeddingCacheBackend("embedding-cache")
+
+    # when
+    backend.set_many({"some-key": [1.0, 2.0]})
+
+    # then
+    blob_client_mock.upload_file.assert_called_once_with(
+        b"[1.0, 2.0]", "some-key.json", content_type="application/json"
+    )
@@ -0,0 +1,206 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+from openai.types.create_embedding_response import CreateEmbeddingResponse
+from openai.types.embedding import Embedding
+
+from backend.batch.utilities.helpers.embedding_executor import (
+    EmbeddingExecutor,
+    EmbeddingRateLimiter,
+)
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.utilities.helpers.embedding_executor.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY = 4
+        env_helper.AZURE_OPENAI_EMBEDDING_TOKENS_PER_MINUTE = 0
+        env_helper.AZURE_OPENAI_EMBEDDING_MAX_RETRIES = 2
+        yield env_helper
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    EmbeddingRateLimiter.clear_instance()
+    yield
+    EmbeddingRateLimiter.clear_instance()
+
+
+def create_embedding_response(batch: list[str]):
+    return CreateEmbeddingResponse(
+        data=[
+            Embedding(embedding=[float(len(text))], index=index, object="embedding")
+            for index, text in enumerate(batch)
+        ],
+        model="mock-model",
+        object="list",
+        usage={"prompt_tokens": len(batch), "total_tokens": len(batch)},
+    )
+
+
+def create_rate_limit_error(headers: dict):
+    response = httpx.Response(
+        429,
+        headers=headers,
+        request=httpx.Request("POST", "https://mock-endpoint/embeddings"),
+    )
+    return RateLimitError("Too Many Requests", response=response, body=None)
+
+
+@pytest.fixture
+def llm_helper_mock():
+    llm_helper = MagicMock()
+    llm_helper.embed_with_cache.side_effect = lambda inputs, embed: embed(inputs)
+    llm_helper.split_embedding_batches.side_effect = lambda inputs: [
+        inputs[i : i + 2] for i in range(0, len(inputs), 2)
+    ]
+    llm_helper.create_embeddings.side_effect = (
+        lambda batch, max_retries=None: create_embedding_response(batch)
+    )
+    return llm_helper
+
+
+def test_embed_returns_embeddings_in_input_order(llm_helper_mock, env_helper_mock):
+    # given
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    embeddings = executor.embed(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    # then
+    assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert llm_helper_mock.create_embeddings.call_count == 3
+
+
+def test_embed_reuses_one_pool_sized_by_the_max_concurrency(
+    llm_helper_mock, env_helper_mock
+):
+    # given
+    with patch(
+        "backend.batch.utilities.helpers.embedding_executor.ThreadPoolExecutor",
+        wraps=ThreadPoolExecutor,
+    ) as pool_mock:
+        executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+        # when
+        executor.embed(["a", "bb", "ccc"])
+        executor.embed(["dddd", "eeeee"])
+
+    # then
+    pool_mock.assert_called_once_with(max_workers=4, thread_name_prefix="embedding")
+
+
+def test_embed_goes_through_the_embedding_cache(llm_helper_mock, env_helper_mock):
+    # given
+    llm_helper_mock.embed_with_cache.side_effect = None
+    llm_helper_mock.embed_with_cache.return_value = [[42.0]]
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    embeddings = executor.embed(["a"])
+
+    # then
+    assert embeddings == [[42.0]]
+    llm_helper_mock.create_embeddings.assert_not_called()
+
+
+def test_embed_disables_client_retries(llm_helper_mock, env_helper_mock):
+    # given
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    executor.embed(["a"])
+
+    # then
+    llm_helper_mock.create_embeddings.assert_called_once_with(["a"], max_retries=0)
+
+
+def test_embed_returns_empty_list_for_no_inputs(llm_helper_mock, env_helper_mock):
+    # given
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    embeddings = executor.embed([])
+
+    # then
+    assert embeddings == []
+    llm_helper_mock.create_embeddings.assert_not_called()
+
+
+def test_embed_retries_throttled_requests_and_reduces_concurrency(
+    llm_helper_mock, env_helper_mock
+):
+    # given
+    llm_helper_mock.create_embeddings.side_effect = [
+        create_rate_limit_error({"retry-after-ms": "1"}),
+        create_embedding_response(["a"]),
+    ]
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    embeddings = executor.embed(["a"])
+
+    # then
+    assert embeddings == [[1.0]]
+    assert llm_helper_mock.create_embeddings.call_count == 2
+    stats = executor.rate_limiter.get_stats()
+    assert stats["throttled_requests"] == 1
+    assert stats["concurrency"] == 2
+
+
+def test_embed_raises_when_retries_are_exhausted(llm_helper_mock, env_helper_mock):
+    # given
+    llm_helper_mock.create_embeddings.side_effect = create_rate_limit_error(
+        {"retry-after": "0"}
+    )
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when + then
+    with pytest.raises(RateLimitError):
+        executor.embed(["a"])
+    assert llm_helper_mock.create_embeddings.call_count == 3
+    assert executor.rate_limiter.get_stats()["in_flight"] == 0
+
+
+def test_embed_reports_throughput(llm_helper_mock, env_helper_mock):
+    # given
+    executor = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # when
+    executor.embed(["a", "b", "c"])
+
+    # then
+    stats = executor.rate_limiter.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["completed_requests"] == 2
+    assert stats["tokens_last_minute"] == 3
+    assert stats["inputs_per_second"] > 0
+
+
+def test_rate_limiter_restores_concurrency_after_successful_requests():
+    # given
+    rate_limiter = EmbeddingRateLimiter()
+    rate_limiter.record_throttle(0)
+    rate_limiter.record_throttle(0)
+    assert rate_limiter.concurrency == 1
+
+    # when
+    for _ in range(10):
+        rate_limiter.record_success(tokens=1, inputs=1)
+
+    # then
+    assert rate_limiter.concurrency == 3
+
+
+def test_rate_limiter_is_shared_across_executors(llm_helper_mock, env_helper_mock):
+    # when
+    first = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+    second = EmbeddingExecutor(llm_helper_mock, env_helper_mock)
+
+    # then
+    assert first.rate_limiter is second.rate_limiter
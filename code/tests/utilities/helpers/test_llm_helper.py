@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from backend.batch.utilities.helpers.llm_helper import LLMHelper
@@ -21,6 +21,8 @@ PROMPT_FLOW_DEPLOYMENT_NAME = "mock-deployment-name"
 
 
 AZURE_SEARCH_DIMENSIONS = "1536"
+AZURE_OPENAI_EMBEDDING_BATCH_SIZE = 16
+AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS = 100000
 
 
 @pytest.fixture(autouse=True)
@@ -40,16 +42,51 @@ def env_helper_mock():
         env_helper.PROMPT_FLOW_ENDPOINT_NAME = PROMPT_FLOW_ENDPOINT_NAME
         env_helper.PROMPT_FLOW_DEPLOYMENT_NAME = PROMPT_FLOW_DEPLOYMENT_NAME
         env_helper.AZURE_SEARCH_DIMENSIONS = AZURE_SEARCH_DIMENSIONS
+        env_helper.AZURE_OPENAI_EMBEDDING_BATCH_SIZE = AZURE_OPENAI_EMBEDDING_BATCH_SIZE
+        env_helper.AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS = (
+            AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS
+        )
 
         yield env_helper
 
 
+@pytest.fixture(autouse=True)
+def embedding_cache_mock():
+    with patch("backend.batch.utilities.helpers.llm_helper.EmbeddingCache") as mock:
+        embedding_cache = mock.return_value
+        embedding_cache.enabled = False
+        yield embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def tiktoken_mock():
+    with patch("backend.batch.utilities.helpers.llm_helper.tiktoken") as mock:
+        # one token per word keeps the token budget easy to reason about
+        mock.get_encoding.return_value.encode.side_effect = lambda text: text.split()
+        yield mock
+
+
 @pytest.fixture(autouse=True)
 def azure_openai_mock():
     with patch("backend.batch.utilities.helpers.llm_helper.AzureOpenAI") as mock:
         yield mock
 
 
+def test_llm_helpers_share_the_openai_client(azure_openai_mock: MagicMock):
+    # when
+    first = LLMHelper()
+    second = LLMHelper()
+
+    # then
+    assert first.openai_client is second.openai_client
+    azure_openai_mock.assert_called_once_with(
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        api_version=AZURE_OPENAI_API_VERSION,
+        api_key=OPENAI_API_KEY,
+        http_client=ANY,
+    )
+
+
 @patch("backend.batch.utilities.helpers.llm_helper.AzureChatCompletion")
 def test_get_sk_chat_completion_service_keys(AzureChatCompletionMock: MagicMock):
     # given
@@ -143,6 +180,181 @@ def test_generate_embeddings_returns_embeddings(azure_openai_mock):
     assert actual_embeddings == expected_embeddings
 
 
+def create_embedding_response(embeddings: list[list[float]]):
+    return CreateEmbeddingResponse(
+        data=[
+            Embedding(embedding=embedding, index=index, object="embedding")
+            for index, embedding in enumerate(embeddings)
+        ],
+        model="mock-model",
+        object="list",
+        usage={"prompt_tokens": 0, "total_tokens": 0},
+    )
+
+
+def test_generate_embeddings_batch_embeds_inputs_in_a_single_request(
+    azure_openai_mock,
+):
+    # given
+    llm_helper = LLMHelper()
+    azure_openai_mock.return_value.embeddings.create.return_value = (
+        create_embedding_response([[1.0], [2.0]])
+    )
+
+    # when
+    embeddings = llm_helper.generate_embeddings_batch(["first input", "second input"])
+
+    # then
+    azure_openai_mock.return_value.embeddings.create.assert_called_once_with(
+        input=["first input", "second input"], model=AZURE_OPENAI_EMBEDDING_MODEL
+    )
+    assert embeddings == [[1.0], [2.0]]
+
+
+def test_generate_embeddings_batch_passes_dimensions_for_supported_models(
+    azure_openai_mock, env_helper_mock
+):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+    llm_helper = LLMHelper()
+    azure_openai_mock.return_value.embeddings.create.return_value = (
+        create_embedding_response([[1.0]])
+    )
+
+    # when
+    llm_helper.generate_embeddings_batch(["some input"])
+
+    # then
+    azure_openai_mock.return_value.embeddings.create.assert_called_once_with(
+        input=["some input"],
+        model="text-embedding-3-small",
+        dimensions=int(AZURE_SEARCH_DIMENSIONS),
+    )
+
+
+def test_create_embeddings_overrides_client_retries(azure_openai_mock):
+    # given
+    llm_helper = LLMHelper()
+
+    # when
+    response = llm_helper.create_embeddings(["some input"], max_retries=0)
+
+    # then
+    azure_openai_mock.return_value.with_options.assert_called_once_with(max_retries=0)
+    client = azure_openai_mock.return_value.with_options.return_value
+    client.embeddings.create.assert_called_once_with(
+        input=["some input"], model=AZURE_OPENAI_EMBEDDING_MODEL
+    )
+    assert response == client.embeddings.create.return_value
+
+
+def test_generate_embeddings_batch_returns_embeddings_in_input_order(
+    azure_openai_mock,
+):
+    # given
+    llm_helper = LLMHelper()
+    response = create_embedding_response([[1.0], [2.0]])
+    response.data.reverse()
+    azure_openai_mock.return_value.embeddings.create.return_value = response
+
+    # when
+    embeddings = llm_helper.generate_embeddings_batch(["first", "second"])
+
+    # then
+    assert embeddings == [[1.0], [2.0]]
+
+
+def test_generate_embeddings_does_not_use_embedding_cache(
+    azure_openai_mock, embedding_cache_mock
+):
+    # given
+    embedding_cache_mock.enabled = True
+    azure_openai_mock.return_value.embeddings.create.return_value = (
+        create_embedding_response([[1.0, 2.0]])
+    )
+    llm_helper = LLMHelper()
+
+    # when
+    embeddings = llm_helper.generate_embeddings("some input")
+
+    # then
+    assert embeddings == [1.0, 2.0]
+    embedding_cache_mock.get_or_embed.assert_not_called()
+
+
+def test_generate_embeddings_batch_embeds_only_cache_misses(
+    azure_openai_mock, embedding_cache_mock
+):
+    # given
+    embedding_cache_mock.enabled = True
+    embedding_cache_mock.get_or_embed.side_effect = (
+        lambda model, dimensions, inputs, embed: [[0.0]] + embed(inputs[1:])
+    )
+    azure_openai_mock.return_value.embeddings.create.return_value = (
+        create_embedding_response([[2.0]])
+    )
+    llm_helper = LLMHelper()
+
+    # when
+    embeddings = llm_helper.generate_embeddings_batch(["cached", "not cached"])
+
+    # then
+    assert embeddings == [[0.0], [2.0]]
+    azure_openai_mock.return_value.embeddings.create.assert_called_once_with(
+        input=["not cached"], model=AZURE_OPENAI_EMBEDDING_MODEL
+    )
+
+
+def test_split_embedding_batches_limits_inputs_per_batch(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_BATCH_SIZE = 2
+    llm_helper = LLMHelper()
+
+    # when
+    batches = llm_helper.split_embedding_batches(["a", "b", "c", "d", "e"])
+
+    # then
+    assert batches == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_split_embedding_batches_limits_tokens_per_batch(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS = 4
+    llm_helper = LLMHelper()
+
+    # when
+    batches = llm_helper.split_embedding_batches(
+        ["one two", "three four", "five", "six seven eight nine ten", "eleven"]
+    )
+
+    # then
+    assert batches == [
+        ["one two", "three four"],
+        ["five"],
+        ["six seven eight nine ten"],
+        ["eleven"],
+    ]
+
+
+def test_generate_embeddings_batch_sends_one_request_per_batch(
+    azure_openai_mock, env_helper_mock
+):
+    # given
+    env_helper_mock.AZURE_OPENAI_EMBEDDING_BATCH_SIZE = 2
+    llm_helper = LLMHelper()
+    azure_openai_mock.return_value.embeddings.create.side_effect = [
+        create_embedding_response([[1.0], [2.0]]),
+        create_embedding_response([[3.0]]),
+    ]
+
+    # when
+    embeddings = llm_helper.generate_embeddings_batch(["a", "b", "c"])
+
+    # then
+    assert azure_openai_mock.return_value.embeddings.create.call_count == 2
+    assert embeddings == [[1.0], [2.0], [3.0]]
+
+
 @patch("backend.batch.utilities.helpers.llm_helper.get_azure_credential")
 @patch("backend.batch.utilities.helpers.llm_helper.MLClient")
 def test_get_ml_client_initializes_with_expected_parameters(
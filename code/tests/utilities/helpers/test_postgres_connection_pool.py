@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+from backend.batch.utilities.helpers.postgres_connection_pool import (
+    PostgresConnectionPool,
+)
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(
+        "backend.batch.utilities.helpers.postgres_connection_pool.EnvHelper"
+    ) as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_POSTGRES_POOL_SIZE = 2
+        env_helper.AZURE_POSTGRES_CONNECTION_MAX_LIFETIME = 1800
+        yield env_helper
+
+
+def create_connection() -> MagicMock:
+    connection = MagicMock()
+    connection.closed = 0
+    connection.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+    return connection
+
+
+@pytest.fixture
+def connect() -> MagicMock:
+    return MagicMock(side_effect=create_connection)
+
+
+def test_connection_is_reused_and_its_transaction_rolled_back(connect: MagicMock):
+    # given
+    pool = PostgresConnectionPool(connect)
+
+    # when
+    with pool.connection() as first:
+        first.get_transaction_status.return_value = TRANSACTION_STATUS_INTRANS
+    with pool.connection() as second:
+        second.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+
+    # then
+    assert first is second
+    connect.assert_called_once_with()
+    first.rollback.assert_called_once_with()
+    first.close.assert_not_called()
+    assert pool.get_stats() == {"opened": 1, "reused": 1, "discarded": 0, "idle": 1}
+
+
+def test_closed_connection_is_replaced(connect: MagicMock):
+    # given
+    pool = PostgresConnectionPool(connect)
+    with pool.connection() as first:
+        first.closed = 1
+
+    # when
+    with pool.connection() as second:
+        pass
+
+    # then
+    assert second is not first
+    assert connect.call_count == 2
+    assert pool.get_stats()["discarded"] == 1
+
+
+def test_connection_is_reopened_after_its_maximum_lifetime(
+    connect: MagicMock, env_helper_mock: MagicMock
+):
+    # given
+    env_helper_mock.AZURE_POSTGRES_CONNECTION_MAX_LIFETIME = 0
+    pool = PostgresConnectionPool(connect)
+    with pool.connection() as first:
+        pass
+
+    # when
+    with pool.connection() as second:
+        pass
+
+    # then
+    assert second is not first
+    first.close.assert_called_once_with()
+    assert connect.call_count == 2
+
+
+def test_idle_connection_failing_its_health_check_is_replaced(connect: MagicMock):
+    # given
+    pool = PostgresConnectionPool(connect)
+    pool.HEALTH_CHECK_INTERVAL = 0
+    with pool.connection() as first:
+        first.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            Exception("server closed the connection unexpectedly")
+        )
+
+    # when
+    with pool.connection() as second:
+        pass
+
+    # then
+    assert second is not first
+    first.close.assert_called_once_with()
+    assert connect.call_count == 2
+
+
+def test_connection_waits_for_one_to_be_returned_beyond_the_pool_size(
+    connect: MagicMock,
+):
+    # given
+    pool = PostgresConnectionPool(connect)
+    pool.ACQUIRE_TIMEOUT = 0.01
+
+    # when + then
+    with pool.connection(), pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+    with pool.connection():
+        assert connect.call_count == 2
+
+
+def test_close_closes_idle_connections_and_returned_ones(connect: MagicMock):
+    # given
+    pool = PostgresConnectionPool(connect)
+    with pool.connection() as idle:
+        pass
+
+    # when
+    with pool.connection() as lent:
+        pool.close()
+        lent.close.assert_not_called()
+
+    # then
+    idle.close.assert_called_once_with()
+    lent.close.assert_called_once_with()
+    assert pool.get_stats()["idle"] == 0
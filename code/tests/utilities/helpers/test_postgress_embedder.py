@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import MagicMock, patch
 
 import pytest
 from backend.batch.utilities.helpers.embedders.postgres_embedder import PostgresEmbedder
@@ -29,6 +29,15 @@ def llm_helper_mock():
         yield llm_helper
 
 
+@pytest.fixture(autouse=True)
+def embedding_executor_mock():
+    with patch(
+        "backend.batch.utilities.helpers.embedders.postgres_embedder.EmbeddingExecutor"
+    ) as mock:
+        mock.return_value.embed.side_effect = lambda inputs: [[123] for _ in inputs]
+        yield mock.return_value
+
+
 @pytest.fixture(autouse=True)
 def env_helper_mock():
     with patch(
@@ -120,7 +129,7 @@ def document_chunking_mock():
 def test_embed_file(
     document_chunking_mock,
     document_loading_mock,
-    llm_helper_mock,
+    embedding_executor_mock,
     azure_postgres_helper_mock,
 ):
     postgres_embedder = PostgresEmbedder(MagicMock(), MagicMock())
@@ -134,7 +143,9 @@ def test_embed_file(
     )
 
     # Mock methods
-    llm_helper_mock.generate_embeddings.return_value = [0.1, 0.2, 0.3]
+    embedding_executor_mock.embed.side_effect = lambda inputs: [
+        [0.1, 0.2, 0.3] for _ in inputs
+    ]
     azure_postgres_helper_mock.create_vector_store.return_value = True
 
     # Execute
@@ -147,8 +158,163 @@ def test_embed_file(
     document_chunking_mock.return_value.chunk.assert_called_once_with(
         document_loading_mock.return_value.load.return_value, embedding_config.chunking
     )
-    llm_helper_mock.generate_embeddings.assert_has_calls(
-        [call("some content"), call("some other content")]
+    embedding_executor_mock.embed.assert_called_once_with(
+        ["some content", "some other content"]
+    )
+    uploaded_documents = (
+        azure_postgres_helper_mock.return_value.create_vector_store.call_args[0][0]
+    )
+    assert [d["content_vector"] for d in uploaded_documents] == [
+        [0.1, 0.2, 0.3],
+        [0.1, 0.2, 0.3],
+    ]
+
+
+def test_embed_file_replaces_only_changed_chunks_and_deletes_orphans(
+    embedding_executor_mock, azure_postgres_helper_mock, env_helper_mock
+):
+    # given
+    postgres_helper = azure_postgres_helper_mock.return_value
+    postgres_embedder = PostgresEmbedder(MagicMock(), env_helper_mock)
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+    indexed_documents = postgres_helper.create_vector_store.call_args[0][0]
+    postgres_helper.get_chunks_by_source.return_value = [
+        indexed_documents[0],
+        {"id": "some orphan id", "content": "some removed content", "metadata": "{}"},
+    ]
+    postgres_helper.create_vector_store.reset_mock()
+    embedding_executor_mock.embed.reset_mock()
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    postgres_helper.get_chunks_by_source.assert_called_with(
+        [SourceDocument.get_source("some-url")]
+    )
+    embedding_executor_mock.embed.assert_called_once_with(["some other content"])
+    uploaded_documents = postgres_helper.create_vector_store.call_args[0][0]
+    assert [document["id"] for document in uploaded_documents] == ["some other id"]
+    assert postgres_helper.create_vector_store.call_args.kwargs["ids_to_replace"] == [
+        "some other id",
+        "some orphan id",
+    ]
+
+
+def test_embed_file_reuses_the_indexed_embeddings_of_moved_chunks(
+    embedding_executor_mock, azure_postgres_helper_mock, env_helper_mock
+):
+    # given
+    postgres_helper = azure_postgres_helper_mock.return_value
+    postgres_embedder = PostgresEmbedder(MagicMock(), env_helper_mock)
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+    indexed_documents = postgres_helper.create_vector_store.call_args[0][0]
+    # the two chunks swapped places since the document was indexed
+    postgres_helper.get_chunks_by_source.return_value = [
+        {**indexed_documents[0], "id": "some other id"},
+        {**indexed_documents[1], "id": "some id"},
+    ]
+    postgres_helper.get_vectors_by_id.return_value = [
+        {"id": "some id", "content_vector": [1]},
+        {"id": "some other id", "content_vector": [2]},
+    ]
+    postgres_helper.create_vector_store.reset_mock()
+    embedding_executor_mock.embed.reset_mock()
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    embedding_executor_mock.embed.assert_called_once_with([])
+    assert sorted(postgres_helper.get_vectors_by_id.call_args[0][0]) == [
+        "some id",
+        "some other id",
+    ]
+    uploaded_documents = postgres_helper.create_vector_store.call_args[0][0]
+    assert {
+        document["id"]: document["content_vector"] for document in uploaded_documents
+    } == {"some id": [2], "some other id": [1]}
+    assert sorted(
+        postgres_helper.create_vector_store.call_args.kwargs["ids_to_replace"]
+    ) == ["some id", "some other id"]
+
+
+def test_embed_file_embeds_moved_chunks_without_indexed_embedding_again(
+    embedding_executor_mock, azure_postgres_helper_mock, env_helper_mock
+):
+    # given
+    postgres_helper = azure_postgres_helper_mock.return_value
+    postgres_embedder = PostgresEmbedder(MagicMock(), env_helper_mock)
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+    indexed_documents = postgres_helper.create_vector_store.call_args[0][0]
+    postgres_helper.get_chunks_by_source.return_value = [
+        {**indexed_documents[0], "metadata": "{}"},
+        indexed_documents[1],
+    ]
+    postgres_helper.get_vectors_by_id.return_value = []
+    embedding_executor_mock.embed.reset_mock()
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    postgres_helper.get_vectors_by_id.assert_called_once_with(["some id"])
+    embedding_executor_mock.embed.assert_called_once_with(["some content"])
+
+
+def test_embed_file_deletes_indexed_chunks_of_a_document_without_chunks(
+    document_chunking_mock, azure_postgres_helper_mock, env_helper_mock
+):
+    # given
+    postgres_helper = azure_postgres_helper_mock.return_value
+    postgres_helper.get_chunks_by_source.return_value = [
+        {"id": "some orphan id", "content": "some removed content", "metadata": "{}"},
+    ]
+    document_chunking_mock.return_value.chunk.return_value = []
+    postgres_embedder = PostgresEmbedder(MagicMock(), env_helper_mock)
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    postgres_helper.create_vector_store.assert_called_once_with(
+        [], ids_to_replace=["some orphan id"]
+    )
+
+
+def test_embed_file_skips_upload_when_nothing_changed(
+    embedding_executor_mock, azure_postgres_helper_mock, env_helper_mock
+):
+    # given
+    postgres_helper = azure_postgres_helper_mock.return_value
+    postgres_embedder = PostgresEmbedder(MagicMock(), env_helper_mock)
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+    postgres_helper.get_chunks_by_source.return_value = (
+        postgres_helper.create_vector_store.call_args[0][0]
+    )
+    postgres_helper.create_vector_store.reset_mock()
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    postgres_helper.create_vector_store.assert_not_called()
+
+
+def test_embed_file_records_ingested_content_md5(env_helper_mock):
+    # given
+    blob_client = MagicMock()
+    blob_client.get_blob_content_md5.return_value = "some-md5"
+    postgres_embedder = PostgresEmbedder(blob_client, env_helper_mock)
+
+    # when
+    postgres_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    blob_client.get_blob_content_md5.assert_called_once_with("some-file-name.pdf")
+    blob_client.upsert_blob_metadata.assert_called_once_with(
+        "some-file-name.pdf",
+        {"embeddings_added": "true", "ingested_content_md5": "some-md5"},
     )
 
 
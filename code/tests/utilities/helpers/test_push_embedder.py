@@ -1,7 +1,7 @@
 import hashlib
 import json
 import pytest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 from backend.batch.utilities.helpers.embedders.push_embedder import PushEmbedder
 from backend.batch.utilities.document_chunking.chunking_strategy import ChunkingSettings
 from backend.batch.utilities.document_loading import LoadingSettings
@@ -48,6 +48,15 @@ def llm_helper_mock():
         yield llm_helper
 
 
+@pytest.fixture(autouse=True)
+def embedding_executor_mock():
+    with patch(
+        "backend.batch.utilities.helpers.embedders.push_embedder.EmbeddingExecutor"
+    ) as mock:
+        mock.return_value.embed.side_effect = lambda inputs: [[123] for _ in inputs]
+        yield mock.return_value
+
+
 @pytest.fixture(autouse=True)
 def env_helper_mock():
     with patch(
@@ -235,7 +244,7 @@ def test_embed_file_advanced_image_processing_uses_vision_model_for_captioning(
 
 
 def test_embed_file_advanced_image_processing_stores_embeddings_in_search_index(
-    llm_helper_mock,
+    embedding_executor_mock,
     azure_computer_vision_mock,
     azure_search_helper_mock: MagicMock,
 ):
@@ -259,8 +268,8 @@ def test_embed_file_advanced_image_processing_stores_embeddings_in_search_index(
     hash_key = hashlib.sha1(f"{host_path}_1".encode("utf-8")).hexdigest()
     expected_id = f"doc_{hash_key}"
 
-    llm_helper_mock.generate_embeddings.assert_called_once_with(
-        "This is a caption for an image"
+    embedding_executor_mock.embed.assert_called_once_with(
+        ["This is a caption for an image"]
     )
 
     azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.assert_called_once_with(
@@ -388,9 +397,31 @@ def test_embed_file_chunks_documents_upper_case(
 
 
 def test_embed_file_generates_embeddings_for_documents(
-    llm_helper_mock, env_helper_mock
+    llm_helper_mock, embedding_executor_mock, env_helper_mock
+):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+
+    # when
+    push_embedder.embed_file(
+        "some-url",
+        "some-file-name.pdf",
+    )
+
+    # then
+    embedding_executor_mock.embed.assert_called_once_with(
+        ["some content", "some other content"]
+    )
+    llm_helper_mock.generate_embeddings.assert_not_called()
+
+
+def test_embed_file_pairs_batched_embeddings_with_documents(
+    embedding_executor_mock, azure_search_helper_mock: MagicMock, env_helper_mock
 ):
     # given
+    embedding_executor_mock.embed.side_effect = lambda inputs: [
+        [float(i)] for i, _ in enumerate(inputs)
+    ]
     push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
 
     # when
@@ -400,9 +431,18 @@ def test_embed_file_generates_embeddings_for_documents(
     )
 
     # then
-    llm_helper_mock.generate_embeddings.assert_has_calls(
-        [call("some content"), call("some other content")]
+    uploaded_documents = (
+        azure_search_helper_mock.return_value.get_search_client.return_value.upload_documents.call_args[
+            0
+        ][0]
     )
+    assert [
+        (
+            document[AZURE_SEARCH_CONTENT_COLUMN],
+            document[AZURE_SEARCH_CONTENT_VECTOR_COLUMN],
+        )
+        for document in uploaded_documents
+    ] == [("some content", [0.0]), ("some other content", [1.0])]
 
 
 def test_embed_file_stores_documents_in_search_index(
@@ -427,7 +467,7 @@ def test_embed_file_stores_documents_in_search_index(
             {
                 AZURE_SEARCH_FIELDS_ID: expected_chunked_documents[0].id,
                 AZURE_SEARCH_CONTENT_COLUMN: expected_chunked_documents[0].content,
-                AZURE_SEARCH_CONTENT_VECTOR_COLUMN: llm_helper_mock.generate_embeddings.return_value,
+                AZURE_SEARCH_CONTENT_VECTOR_COLUMN: [123],
                 AZURE_SEARCH_FIELDS_METADATA: json.dumps(
                     {
                         AZURE_SEARCH_FIELDS_ID: expected_chunked_documents[0].id,
@@ -451,7 +491,7 @@ def test_embed_file_stores_documents_in_search_index(
             {
                 AZURE_SEARCH_FIELDS_ID: expected_chunked_documents[1].id,
                 AZURE_SEARCH_CONTENT_COLUMN: expected_chunked_documents[1].content,
-                AZURE_SEARCH_CONTENT_VECTOR_COLUMN: llm_helper_mock.generate_embeddings.return_value,
+                AZURE_SEARCH_CONTENT_VECTOR_COLUMN: [123],
                 AZURE_SEARCH_FIELDS_METADATA: json.dumps(
                     {
                         AZURE_SEARCH_FIELDS_ID: expected_chunked_documents[1].id,
@@ -476,6 +516,26 @@ def test_embed_file_stores_documents_in_search_index(
     )
 
 
+@patch("backend.batch.utilities.helpers.embedders.embedder_base.SemanticAnswerCache")
+def test_embed_file_invalidates_cached_answers_of_the_index(
+    semantic_answer_cache_mock: MagicMock, env_helper_mock
+):
+    # given
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+
+    # when
+    push_embedder.embed_file(
+        "some-url",
+        "some-file-name.pdf",
+    )
+
+    # then
+    semantic_answer_cache_mock.get_index_name.assert_called_once_with(env_helper_mock)
+    semantic_answer_cache_mock.return_value.invalidate.assert_called_once_with(
+        semantic_answer_cache_mock.get_index_name.return_value
+    )
+
+
 def test_embed_file_stores_documents_in_search_index_in_batches(
     document_chunking_mock,
     llm_helper_mock,
@@ -500,6 +560,205 @@ def test_embed_file_stores_documents_in_search_index_in_batches(
     )
 
 
+def test_embed_file_uploads_only_changed_chunks_and_deletes_orphans(
+    embedding_executor_mock, azure_search_helper_mock: MagicMock, env_helper_mock
+):
+    # given
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+    indexed_documents = search_client.upload_documents.call_args[0][0]
+    search_client.search.return_value = [
+        indexed_documents[0],
+        {
+            AZURE_SEARCH_FIELDS_ID: "some orphan id",
+            AZURE_SEARCH_CONTENT_COLUMN: "some removed content",
+            AZURE_SEARCH_FIELDS_METADATA: "{}",
+        },
+    ]
+    search_client.upload_documents.reset_mock()
+    embedding_executor_mock.embed.reset_mock()
+
+    # when
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    embedding_executor_mock.embed.assert_called_once_with(["some other content"])
+    uploaded_documents = search_client.upload_documents.call_args[0][0]
+    assert [document[AZURE_SEARCH_FIELDS_ID] for document in uploaded_documents] == [
+        "some other id"
+    ]
+    search_client.delete_documents.assert_called_once_with(
+        [{AZURE_SEARCH_FIELDS_ID: "some orphan id"}]
+    )
+
+
+def test_embed_file_reuses_the_indexed_embeddings_of_moved_chunks(
+    embedding_executor_mock, azure_search_helper_mock: MagicMock, env_helper_mock
+):
+    # given
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+    indexed_documents = search_client.upload_documents.call_args[0][0]
+    # the two chunks swapped places since the document was indexed
+    indexed_chunks = [
+        {**indexed_documents[0], AZURE_SEARCH_FIELDS_ID: "some other id"},
+        {**indexed_documents[1], AZURE_SEARCH_FIELDS_ID: "some id"},
+    ]
+    indexed_vectors = [
+        {AZURE_SEARCH_FIELDS_ID: "some id", AZURE_SEARCH_CONTENT_VECTOR_COLUMN: [1]},
+        {
+            AZURE_SEARCH_FIELDS_ID: "some other id",
+            AZURE_SEARCH_CONTENT_VECTOR_COLUMN: [2],
+        },
+    ]
+    search_client.search.side_effect = [indexed_chunks, indexed_vectors]
+    search_client.upload_documents.reset_mock()
+    embedding_executor_mock.embed.reset_mock()
+
+    # when
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    embedding_executor_mock.embed.assert_called_once_with([])
+    id_filter = search_client.search.call_args.kwargs["filter"]
+    assert id_filter in [
+        f"search.in({AZURE_SEARCH_FIELDS_ID}, 'some id,some other id', ',')",
+        f"search.in({AZURE_SEARCH_FIELDS_ID}, 'some other id,some id', ',')",
+    ]
+    uploaded_documents = search_client.upload_documents.call_args[0][0]
+    assert {
+        document[AZURE_SEARCH_FIELDS_ID]: document[AZURE_SEARCH_CONTENT_VECTOR_COLUMN]
+        for document in uploaded_documents
+    } == {"some id": [2], "some other id": [1]}
+    search_client.delete_documents.assert_not_called()
+
+
+def test_embed_file_looks_up_indexed_chunks_by_source(
+    azure_search_helper_mock: MagicMock, env_helper_mock
+):
+    # given
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+
+    # when
+    push_embedder.embed_file(
+        "https://some-account.blob.core.windows.net/documents/some-file-name.pdf?some-sas",
+        "some-file-name.pdf",
+    )
+
+    # then
+    assert search_client.search.call_args.kwargs["filter"] == (
+        f"{AZURE_SEARCH_SOURCE_COLUMN} eq 'https://some-account.blob.core.windows.net"
+        "/documents/some-file-name.pdf_SAS_TOKEN_PLACEHOLDER_'"
+    )
+    search_client.delete_documents.assert_not_called()
+
+
+def test_embed_file_deletes_indexed_chunks_of_a_document_without_chunks(
+    document_chunking_mock, azure_search_helper_mock: MagicMock, env_helper_mock
+):
+    # given
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    search_client.search.return_value = [
+        {
+            AZURE_SEARCH_FIELDS_ID: "some orphan id",
+            AZURE_SEARCH_CONTENT_COLUMN: "some removed content",
+            AZURE_SEARCH_FIELDS_METADATA: "{}",
+        },
+    ]
+    document_chunking_mock.return_value.chunk.return_value = []
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+
+    # when
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    search_client.upload_documents.assert_not_called()
+    search_client.delete_documents.assert_called_once_with(
+        [{AZURE_SEARCH_FIELDS_ID: "some orphan id"}]
+    )
+
+
+def test_embed_file_pages_through_all_indexed_chunks(
+    azure_search_helper_mock: MagicMock, env_helper_mock
+):
+    # given
+    search_client = azure_search_helper_mock.return_value.get_search_client.return_value
+    indexed_documents = [
+        {
+            AZURE_SEARCH_FIELDS_ID: f"some orphan id {i}",
+            AZURE_SEARCH_CONTENT_COLUMN: f"some removed content {i}",
+            AZURE_SEARCH_FIELDS_METADATA: "{}",
+        }
+        for i in range(120)
+    ]
+
+    def search(*args, top=50, skip=0, **kwargs):
+        # like the search service, which returns 50 results by default
+        return iter(indexed_documents[skip : skip + top])
+
+    search_client.search.side_effect = search
+    push_embedder = PushEmbedder(MagicMock(), env_helper_mock)
+    push_embedder.INDEXED_CHUNKS_PAGE_SIZE = 50
+
+    # when
+    push_embedder.embed_file("some-url", "some-file-name.pdf")
+
+    # then
+    assert [
+        (call.kwargs["top"], call.kwargs["skip"])
+        for call in search_client.search.call_args_list
+    ] == [(50, 0), (50, 50), (50, 100)]
+    deleted_documents = [
+        document
+        for call in search_client.delete_documents.call_args_list
+        for document in call.args[0]
+    ]
+    assert deleted_documents == [
+        {AZURE_SEARCH_FIELDS_ID: f"some orphan id {i}"} for i in range(120)
+    ]
+
+
+def test_embed_file_records_ingested_content_md5(env_helper_mock):
+    # given
+    blob_client = MagicMock()
+    blob_client.get_blob_content_md5.return_value = "some-md5"
+    push_embedder = PushEmbedder(blob_client, env_helper_mock)
+
+    # when
+    push_embedder.embed_file(
+        "some-url",
+        "some-file-name.pdf",
+    )
+
+    # then
+    blob_client.get_blob_content_md5.assert_called_once_with("some-file-name.pdf")
+    blob_client.upsert_blob_metadata.assert_called_once_with(
+        "some-file-name.pdf",
+        {"embeddings_added": "true", "ingested_content_md5": "some-md5"},
+    )
+
+
+def test_embed_file_does_not_record_missing_content_md5(env_helper_mock):
+    # given
+    blob_client = MagicMock()
+    blob_client.get_blob_content_md5.return_value = None
+    push_embedder = PushEmbedder(blob_client, env_helper_mock)
+
+    # when
+    push_embedder.embed_file(
+        "some-url",
+        "some-file-name.pdf",
+    )
+
+    # then
+    blob_client.upsert_blob_metadata.assert_called_once_with(
+        "some-file-name.pdf", {"embeddings_added": "true"}
+    )
+
+
 def test_embed_file_raises_exception_on_failure(
     azure_search_helper_mock,
 ):
@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.batch.utilities.helpers.query_vector_cache import QueryVectorCache
+
+MODEL = "text-embedding-3-small/1536"
+TTL = 3600
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.utilities.helpers.query_vector_cache.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_TTL = TTL
+        env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES = 2
+        env_helper.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_MB = 1
+        yield env_helper
+
+
+@pytest.fixture
+def monotonic_mock():
+    with patch(
+        "backend.batch.utilities.helpers.query_vector_cache.time.monotonic",
+        return_value=1000.0,
+    ) as mock:
+        yield mock
+
+
+def test_get_or_vectorize_vectorizes_normalized_questions_once(monotonic_mock):
+    # given
+    vectorize = MagicMock(return_value=[0.1, 0.2])
+    cache = QueryVectorCache()
+
+    # when
+    first = cache.get_or_vectorize(MODEL, "What is the PTO policy?", vectorize)
+    second = QueryVectorCache().get_or_vectorize(
+        MODEL, " what is the\tPTO  Policy? ", vectorize
+    )
+    other_model = cache.get_or_vectorize("other", "What is the PTO policy?", vectorize)
+
+    # then
+    assert first == second == other_model == [0.1, 0.2]
+    assert vectorize.call_count == 2
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+
+
+def test_get_or_vectorize_vectorizes_again_once_the_ttl_is_over(monotonic_mock):
+    # given
+    vectorize = MagicMock(side_effect=[[0.1], [0.2]])
+    cache = QueryVectorCache()
+    cache.get_or_vectorize(MODEL, "question", vectorize)
+
+    # when
+    monotonic_mock.return_value += TTL
+    vector = cache.get_or_vectorize(MODEL, "question", vectorize)
+
+    # then
+    assert vector == [0.2]
+    assert vectorize.call_count == 2
+
+
+def test_get_or_vectorize_evicts_the_least_recently_used(monotonic_mock):
+    # given
+    cache = QueryVectorCache()
+    cache.get_or_vectorize(MODEL, "first", lambda: [1.0])
+    cache.get_or_vectorize(MODEL, "second", lambda: [2.0])
+    cache.get_or_vectorize(MODEL, "first", lambda: [0.0])
+
+    # when
+    cache.get_or_vectorize(MODEL, "third", lambda: [3.0])
+
+    # then
+    assert cache.get_or_vectorize(MODEL, "first", lambda: [0.0]) == [1.0]
+    assert cache.get_or_vectorize(MODEL, "second", lambda: [0.0]) == [0.0]
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_get_or_vectorize_evicts_vectors_over_the_memory_bound(
+    monotonic_mock, env_helper_mock
+):
+    # given
+    env_helper_mock.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES = 100
+    cache = QueryVectorCache()
+    large_vector = [0.0] * (1024**2 // 32 // 2 + 1)
+
+    # when
+    cache.get_or_vectorize(MODEL, "first", lambda: large_vector)
+    cache.get_or_vectorize(MODEL, "second", lambda: large_vector)
+
+    # then
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= 1024**2
+
+
+def test_get_or_vectorize_does_not_cache_when_disabled(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_SEARCH_QUERY_VECTOR_CACHE_MAX_ENTRIES = 0
+    vectorize = MagicMock(return_value=[0.1])
+    cache = QueryVectorCache()
+
+    # when
+    cache.get_or_vectorize(MODEL, "question", vectorize)
+    cache.get_or_vectorize(MODEL, "question", vectorize)
+
+    # then
+    assert vectorize.call_count == 2
+    assert not cache.enabled
@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.batch.utilities.helpers.search_index_cache import SearchIndexCache
+
+SERVICE = "https://example.search.windows.net"
+OTHER_SERVICE = "https://other.search.windows.net"
+TTL = 300
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch("backend.batch.utilities.helpers.search_index_cache.EnvHelper") as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_SEARCH_INDEX_CACHE_TTL = TTL
+        yield env_helper
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    SearchIndexCache.clear_instance()
+    yield
+    SearchIndexCache.clear_instance()
+
+
+@pytest.fixture
+def monotonic_mock():
+    with patch(
+        "backend.batch.utilities.helpers.search_index_cache.time.monotonic",
+        return_value=1000.0,
+    ) as mock:
+        yield mock
+
+
+def test_index_exists_lists_the_indexes_once_per_service(monotonic_mock):
+    # given
+    list_index_names = MagicMock(return_value=["index-1", "index-2"])
+    cache = SearchIndexCache()
+
+    # when
+    results = [
+        cache.index_exists(SERVICE, "index-1", list_index_names),
+        cache.index_exists(SERVICE, "index-2", list_index_names),
+        SearchIndexCache().index_exists(SERVICE, "index-3", list_index_names),
+    ]
+
+    # then
+    assert results == [True, True, False]
+    list_index_names.assert_called_once_with()
+    assert cache.get_stats() == {"hits": 2, "misses": 1, "services": 1}
+
+
+def test_index_exists_lists_the_indexes_again_once_the_ttl_is_over(monotonic_mock):
+    # given
+    list_index_names = MagicMock(side_effect=[[], ["index-1"]])
+    cache = SearchIndexCache()
+    assert not cache.index_exists(SERVICE, "index-1", list_index_names)
+
+    # when
+    monotonic_mock.return_value += TTL
+
+    # then
+    assert cache.index_exists(SERVICE, "index-1", list_index_names)
+    assert list_index_names.call_count == 2
+
+
+def test_index_exists_is_cached_per_service(monotonic_mock):
+    # given
+    cache = SearchIndexCache()
+    cache.index_exists(SERVICE, "index-1", lambda: ["index-1"])
+
+    # when
+    exists = cache.index_exists(OTHER_SERVICE, "index-1", lambda: [])
+
+    # then
+    assert not exists
+    assert cache.index_exists(SERVICE, "index-1", lambda: [])
+
+
+def test_mark_created_adds_the_index_to_the_cached_names(monotonic_mock):
+    # given
+    list_index_names = MagicMock(return_value=["index-1"])
+    cache = SearchIndexCache()
+    cache.index_exists(SERVICE, "index-1", list_index_names)
+
+    # when
+    cache.mark_created(SERVICE, "index-2")
+
+    # then
+    assert cache.index_exists(SERVICE, "index-2", list_index_names)
+    assert cache.index_exists(SERVICE, "index-1", list_index_names)
+    list_index_names.assert_called_once_with()
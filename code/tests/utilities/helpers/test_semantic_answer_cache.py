@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+import pytest
+
+from backend.batch.utilities.common.answer import Answer
+from backend.batch.utilities.common.source_document import SourceDocument
+from backend.batch.utilities.helpers.semantic_answer_cache import (
+    InMemorySemanticAnswerCacheBackend,
+    SemanticAnswerCache,
+)
+
+INDEX = "https://search.example.com/index"
+CONTEXT = "context"
+DOCUMENTS = [
+    SourceDocument(id="doc-1", content="PTO is 25 days.", source="source-1"),
+    SourceDocument(id="doc-2", content="Sick leave is unlimited.", source="source-2"),
+]
+
+
+@pytest.fixture(autouse=True)
+def env_helper_mock():
+    with patch(
+        "backend.batch.utilities.helpers.semantic_answer_cache.EnvHelper"
+    ) as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE = "memory"
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD = 0.9
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_TTL = 3600
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES = 2
+        yield env_helper
+
+
+def create_answer(answer: str = "You get 25 days of PTO [doc1].") -> Answer:
+    return Answer(
+        question="What is the PTO policy?",
+        answer=answer,
+        source_documents=DOCUMENTS,
+        prompt_tokens=100,
+        completion_tokens=10,
+    )
+
+
+def test_get_returns_the_answer_of_a_similar_question():
+    # given
+    cache = SemanticAnswerCache()
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer())
+
+    # when
+    answer = cache.get(
+        INDEX, CONTEXT, [0.99, 0.05], "How much PTO do I get?", DOCUMENTS
+    )
+
+    # then
+    assert answer == Answer(
+        question="How much PTO do I get?",
+        answer="You get 25 days of PTO [doc1].",
+        source_documents=DOCUMENTS,
+        prompt_tokens=0,
+        completion_tokens=0,
+    )
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_get_returns_none_for_a_different_question_or_context():
+    # given
+    cache = SemanticAnswerCache()
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer())
+
+    # when
+    different_question = cache.get(INDEX, CONTEXT, [0.5, 0.5], "q", DOCUMENTS)
+    different_context = cache.get(INDEX, "other", [1.0, 0.0], "q", DOCUMENTS)
+
+    # then
+    assert different_question is None
+    assert different_context is None
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_get_returns_none_when_a_cited_document_changed():
+    # given
+    cache = SemanticAnswerCache()
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer())
+    changed = SourceDocument(id="doc-1", content="PTO is 30 days.", source="source-1")
+
+    # when
+    answer = cache.get(INDEX, CONTEXT, [1.0, 0.0], "q", [changed, DOCUMENTS[1]])
+
+    # then
+    assert answer is None
+    assert cache.get_stats()["stale"] == 1
+
+
+def test_get_ignores_documents_that_are_not_cited():
+    # given
+    cache = SemanticAnswerCache()
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer())
+
+    # when
+    answer = cache.get(INDEX, CONTEXT, [1.0, 0.0], "q", DOCUMENTS[:1])
+
+    # then
+    assert answer is not None
+
+
+def test_add_does_not_cache_answers_without_citations():
+    # given
+    cache = SemanticAnswerCache()
+
+    # when
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer("I don't know."))
+
+    # then
+    assert len(cache.backend) == 0
+
+
+def test_invalidate_drops_the_answers_of_the_index():
+    # given
+    cache = SemanticAnswerCache()
+    cache.add(INDEX, CONTEXT, [1.0, 0.0], create_answer())
+    cache.add("other-index", CONTEXT, [1.0, 0.0], create_answer())
+
+    # when
+    cache.invalidate(INDEX)
+
+    # then
+    assert cache.get(INDEX, CONTEXT, [1.0, 0.0], "q", DOCUMENTS) is None
+    assert cache.get("other-index", CONTEXT, [1.0, 0.0], "q", DOCUMENTS) is not None
+
+
+def test_in_memory_backend_evicts_the_least_recently_used():
+    # given
+    backend = InMemorySemanticAnswerCacheBackend(max_entries=2, ttl=3600)
+    backend.add(INDEX, CONTEXT, [1.0, 0.0], "first")
+    backend.add(INDEX, CONTEXT, [0.0, 1.0], "second")
+    backend.search(INDEX, CONTEXT, [1.0, 0.0])
+
+    # when
+    backend.add(INDEX, CONTEXT, [-1.0, 0.0], "third")
+
+    # then
+    assert backend.search(INDEX, CONTEXT, [0.0, 1.0])[1] != "second"
+    assert backend.search(INDEX, CONTEXT, [1.0, 0.0]) == (1.0, "first")
+    assert backend.evictions == 1
+
+
+def test_in_memory_backend_expires_entries():
+    # given
+    backend = InMemorySemanticAnswerCacheBackend(max_entries=2, ttl=60)
+    with patch(
+        "backend.batch.utilities.helpers.semantic_answer_cache.time.monotonic",
+        return_value=1000.0,
+    ) as monotonic_mock:
+        backend.add(INDEX, CONTEXT, [1.0, 0.0], "answer")
+
+        # when
+        monotonic_mock.return_value += 60
+
+        # then
+        assert backend.search(INDEX, CONTEXT, [1.0, 0.0]) is None
+
+
+def test_unknown_backend_raises(env_helper_mock):
+    # given
+    env_helper_mock.AZURE_SEMANTIC_ANSWER_CACHE = "redis"
+
+    # when + then
+    with pytest.raises(ValueError, match="Unknown semantic answer cache backend"):
+        SemanticAnswerCache()
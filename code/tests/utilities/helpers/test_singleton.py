@@ -0,0 +1,50 @@
+import pytest
+
+from backend.batch.utilities.helpers.singleton import Singleton
+
+
+class Counter(Singleton):
+    initializations = 0
+
+    def _initialize(self) -> None:
+        Counter.initializations += 1
+        self.other = OtherCounter()
+
+
+class OtherCounter(Singleton):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_instances():
+    yield
+    Counter.clear_instance()
+    OtherCounter.clear_instance()
+
+
+def test_singleton_initializes_one_instance_per_class():
+    # given
+    Counter.initializations = 0
+
+    # when
+    first = Counter()
+    second = Counter()
+
+    # then
+    assert first is second
+    assert Counter.initializations == 1
+    # created while the instance of Counter is created, with a lock of its own
+    assert first.other is OtherCounter()
+    assert first.other is not first
+
+
+def test_clear_instance_creates_a_new_instance_on_the_next_call():
+    # given
+    first = Counter()
+
+    # when
+    Counter.clear_instance()
+
+    # then
+    assert Counter() is not first
+    assert OtherCounter() is first.other
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from backend.batch.utilities.orchestrator.open_ai_functions import (
@@ -110,13 +110,13 @@ async def test_orchestrate_with_search_documents_function_call(
         completion_tokens=10,
     )
     qa_tool_instance = qa_tool_mock.return_value
-    qa_tool_instance.answer_question.return_value = answer
+    qa_tool_instance.aanswer_question = AsyncMock(return_value=answer)
 
     # when
     response = await orchestrator.orchestrate("What is Azure?", [])
 
     # then
-    qa_tool_instance.answer_question.assert_called_once_with(
+    qa_tool_instance.aanswer_question.assert_awaited_once_with(
         "What is Azure?", []
     )
     assert len(response) > 0
@@ -274,7 +274,7 @@ async def test_orchestrate_with_post_answering_prompt_enabled(
     )
 
     qa_tool_instance = qa_tool_mock.return_value
-    qa_tool_instance.answer_question.return_value = initial_answer
+    qa_tool_instance.aanswer_question = AsyncMock(return_value=initial_answer)
 
     post_tool_instance = post_tool_mock.return_value
     post_tool_instance.validate_answer.return_value = validated_answer
@@ -397,7 +397,7 @@ async def test_orchestrate_with_null_answer_gets_default_message(
         completion_tokens=10,
     )
     qa_tool_instance = qa_tool_mock.return_value
-    qa_tool_instance.answer_question.return_value = answer
+    qa_tool_instance.aanswer_question = AsyncMock(return_value=answer)
 
     # when
     response = await orchestrator.orchestrate("Test", [])
@@ -408,3 +408,87 @@ async def test_orchestrate_with_null_answer_gets_default_message(
         "requested information is not available" in str(r).lower()
         for r in response
     )
+
+
+@patch("backend.batch.utilities.orchestrator.open_ai_functions.QuestionAnswerTool")
+@pytest.mark.asyncio
+async def test_orchestrate_stream_sends_citations_then_streams_the_answer(
+    qa_tool_mock,
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock,
+    env_helper_mock,
+):
+    """Test that the citations are sent once retrieved, before the answer is streamed."""
+    orchestrator.config.prompts.enable_content_safety = False
+    orchestrator.config.prompts.enable_post_answering_prompt = False
+
+    mock_result = MagicMock()
+    mock_result.choices = [MagicMock()]
+    mock_result.choices[0].finish_reason = "function_call"
+    mock_result.choices[0].message.function_call.name = "search_documents"
+    mock_result.choices[0].message.function_call.arguments = (
+        '{"question": "What is Azure?"}'
+    )
+    mock_result.usage.prompt_tokens = 10
+    mock_result.usage.completion_tokens = 20
+    llm_helper_mock.get_chat_completion_with_functions.return_value = mock_result
+
+    answer = Answer(question="What is Azure?", answer="", source_documents=[])
+
+    async def text_stream():
+        yield "Azure is "
+        yield "a cloud"
+        answer.prompt_tokens = 5
+        answer.completion_tokens = 3
+
+    qa_tool_instance = qa_tool_mock.return_value
+    qa_tool_instance.aanswer_question_stream = AsyncMock(
+        return_value=(answer, text_stream())
+    )
+
+    # when
+    deltas = [
+        delta async for delta in orchestrator.orchestrate_stream("What is Azure?", [])
+    ]
+
+    # then
+    qa_tool_instance.aanswer_question_stream.assert_awaited_once_with(
+        "What is Azure?", []
+    )
+    assert deltas == [
+        [
+            {
+                "role": "tool",
+                "content": '{"citations": [], "intent": "What is Azure?"}',
+                "end_turn": False,
+            }
+        ],
+        [{"role": "assistant", "content": "Azure is ", "end_turn": False}],
+        [{"role": "assistant", "content": "a cloud", "end_turn": False}],
+        [{"role": "assistant", "content": "", "end_turn": True}],
+    ]
+    assert orchestrator.tokens == {"prompt": 15, "completion": 23, "total": 38}
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_stream_sends_other_answers_at_once(
+    orchestrator: OpenAIFunctionsOrchestrator,
+    llm_helper_mock,
+    env_helper_mock,
+):
+    """Test that answers not searched for in the documents are sent at once."""
+    orchestrator.config.prompts.enable_content_safety = False
+
+    mock_result = MagicMock()
+    mock_result.choices = [MagicMock()]
+    mock_result.choices[0].finish_reason = "stop"
+    mock_result.choices[0].message.content = "Hello!"
+    mock_result.usage.prompt_tokens = 10
+    mock_result.usage.completion_tokens = 20
+    llm_helper_mock.get_chat_completion_with_functions.return_value = mock_result
+
+    # when
+    deltas = [delta async for delta in orchestrator.orchestrate_stream("Hi", [])]
+
+    # then
+    assert deltas == [await orchestrator.orchestrate("Hi", [])]
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from backend.batch.utilities.orchestrator.orchestrator_base import OrchestratorBase
@@ -106,3 +106,131 @@ def test_call_content_safety_output_no_replace(content_safety_checker_mock: Magi
 
     # then
     assert result is None
+
+
+async def stream(*texts: str):
+    for text in texts:
+        yield text
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_streams_text_as_it_comes(config_mock: MagicMock):
+    # given
+    config_mock.prompts.enable_content_safety = False
+    orchestrator = MockOrchestrator()
+
+    # when
+    deltas = [
+        delta
+        async for delta in orchestrator.stream_answer("user message", stream("a", "b"))
+    ]
+
+    # then
+    assert deltas == [
+        [{"role": "assistant", "content": "a", "end_turn": False}],
+        [{"role": "assistant", "content": "b", "end_turn": False}],
+        [{"role": "assistant", "content": "", "end_turn": True}],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_checks_windows_with_content_safety(
+    config_mock: MagicMock, content_safety_checker_mock: MagicMock
+):
+    # given
+    config_mock.prompts.enable_content_safety = True
+    orchestrator = MockOrchestrator()
+    orchestrator.CONTENT_SAFETY_WINDOW = 4
+    orchestrator.CONTENT_SAFETY_OVERLAP = 2
+    content_safety_checker_mock.validate_output_and_replace_if_harmful.side_effect = (
+        lambda text: ("filtered answer" if "bad" in text else text)
+    )
+
+    # when
+    deltas = [
+        delta
+        async for delta in orchestrator.stream_answer(
+            "user message", stream("fi", "ne ", "so ", "bad", " end")
+        )
+    ]
+
+    # then
+    assert [
+        call.args[0]
+        for call in content_safety_checker_mock.validate_output_and_replace_if_harmful.call_args_list
+    ] == ["fine ", "e so bad"]
+    assert deltas == [
+        [{"role": "assistant", "content": "fine ", "end_turn": False}],
+        [
+            {
+                "role": "tool",
+                "content": '{"citations": [], "intent": "user message"}',
+                "end_turn": False,
+            },
+            {
+                "role": "assistant",
+                "content": "filtered answer",
+                "end_turn": True,
+                "replace": True,
+            },
+        ],
+    ]
+
+
+def test_apply_deltas_appends_answers_and_replaces_citations():
+    # given
+    messages = [
+        {"role": "tool", "content": "citations", "end_turn": False},
+        {"role": "assistant", "content": "a", "end_turn": False},
+    ]
+
+    # when
+    messages = OrchestratorBase.apply_deltas(
+        messages,
+        [
+            {"role": "tool", "content": "no citations", "end_turn": False},
+            {"role": "assistant", "content": "b", "end_turn": True},
+        ],
+    )
+
+    # then
+    assert messages == [
+        {"role": "tool", "content": "no citations", "end_turn": False},
+        {"role": "assistant", "content": "ab", "end_turn": True},
+    ]
+    assert OrchestratorBase.apply_deltas(
+        messages, [{"role": "assistant", "content": "c", "replace": True}]
+    )[1] == {"role": "assistant", "content": "c", "end_turn": True}
+
+
+@pytest.mark.asyncio
+async def test_handle_message_stream_logs_the_whole_messages(
+    config_mock: MagicMock, conversation_logger_mock: MagicMock
+):
+    # given
+    config_mock.logging.log_user_interactions = "true"
+    orchestrator = MockOrchestrator()
+    orchestrator.orchestrate = AsyncMock(
+        return_value=[{"role": "assistant", "content": "answer", "end_turn": True}]
+    )
+
+    # when
+    deltas = [
+        delta
+        async for delta in orchestrator.handle_message_stream(
+            "user message", [], "conversation id"
+        )
+    ]
+
+    # then
+    assert deltas == [[{"role": "assistant", "content": "answer", "end_turn": True}]]
+    conversation_logger_mock.log.assert_called_once_with(
+        messages=[
+            {
+                "role": "user",
+                "content": "user message",
+                "conversation_id": "conversation id",
+            },
+            {"role": "assistant", "content": "answer", "end_turn": True},
+        ]
+    )
@@ -1,4 +1,5 @@
-from unittest.mock import patch, MagicMock
+import threading
+from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 from backend.batch.utilities.common.answer import Answer
@@ -25,7 +26,9 @@ async def test_search_documents(QuestionAnswerToolMock: MagicMock):
 
     mock_answer = Answer(question=question, answer="mock-answer")
 
-    QuestionAnswerToolMock.return_value.answer_question.return_value = mock_answer
+    QuestionAnswerToolMock.return_value.aanswer_question = AsyncMock(
+        return_value=mock_answer
+    )
 
     # when
     answer = await kernel.invoke(plugin["search_documents"], question=question)
@@ -34,7 +37,7 @@ async def test_search_documents(QuestionAnswerToolMock: MagicMock):
     assert answer is not None
     assert answer.value == mock_answer
 
-    QuestionAnswerToolMock.return_value.answer_question.assert_called_once_with(
+    QuestionAnswerToolMock.return_value.aanswer_question.assert_awaited_once_with(
         question=question,
         chat_history=chat_history,
     )
@@ -61,7 +64,13 @@ async def test_text_processing(TextProcessingToolMock: MagicMock):
     operation = "mock-operation"
     mock_answer = Answer(question=question, answer="mock-answer")
 
-    TextProcessingToolMock.return_value.answer_question.return_value = mock_answer
+    threads = []
+
+    def answer_question(**kwargs):
+        threads.append(threading.current_thread())
+        return mock_answer
+
+    TextProcessingToolMock.return_value.answer_question.side_effect = answer_question
 
     # when
     answer = await kernel.invoke(
@@ -80,3 +89,6 @@ async def test_text_processing(TextProcessingToolMock: MagicMock):
         text=text,
         operation=operation,
     )
+    # the tool calls Azure OpenAI synchronously, so it runs on a worker thread
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 import pytest
 from azure.core.exceptions import HttpResponseError
 from backend.batch.utilities.tools.content_safety_checker import ContentSafetyChecker
@@ -35,7 +35,7 @@ def test_init_with_rbac_authentication(env_helper_mock, client_mock, credential_
     # Then
     credential_mock.assert_called_once_with("test-client-id")
     client_mock.assert_called_once_with(
-        "https://test.endpoint", credential_mock.return_value
+        "https://test.endpoint", credential_mock.return_value, transport=ANY
     )
     assert checker.content_safety_client == client_mock.return_value
 
@@ -59,7 +59,7 @@ def test_init_with_key_authentication(
     # Then
     key_credential_mock.assert_called_once_with("test-key")
     client_mock.assert_called_once_with(
-        "https://test.endpoint", key_credential_mock.return_value
+        "https://test.endpoint", key_credential_mock.return_value, transport=ANY
     )
     assert checker.content_safety_client == client_mock.return_value
 
@@ -1,5 +1,5 @@
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from backend.batch.utilities.common.answer import Answer
@@ -126,6 +126,82 @@ def test_answer_question_returns_source_documents(
     assert answer.source_documents == get_source_documents_mock.return_value
 
 
+@pytest.mark.asyncio
+async def test_aanswer_question_searches_and_answers_asynchronously(
+    llm_helper_mock: MagicMock,
+    search_handler_mock: MagicMock,
+    get_source_documents_mock: MagicMock,
+):
+    # given
+    llm_helper_mock.aget_chat_completion = AsyncMock(
+        return_value=llm_helper_mock.get_chat_completion.return_value
+    )
+    tool = QuestionAnswerTool()
+
+    # when
+    with patch(
+        "backend.batch.utilities.tools.question_answer_tool.Search.aget_source_documents",
+        AsyncMock(return_value=get_source_documents_mock.return_value),
+    ) as aget_source_documents_mock:
+        answer = await tool.aanswer_question("mock question", [])
+
+    # then
+    aget_source_documents_mock.assert_awaited_once_with(
+        search_handler_mock, "mock question"
+    )
+    get_source_documents_mock.assert_not_called()
+    llm_helper_mock.get_chat_completion.assert_not_called()
+    llm_helper_mock.aget_chat_completion.assert_awaited_once_with(
+        ANY, model=None, temperature=0
+    )
+    assert answer.answer == "mock content"
+    assert answer.source_documents == get_source_documents_mock.return_value
+    assert answer.prompt_tokens == 100
+
+
+@pytest.mark.asyncio
+async def test_aanswer_question_stream_returns_sources_before_streaming_the_answer(
+    llm_helper_mock: MagicMock,
+    get_source_documents_mock: MagicMock,
+):
+    # given
+    chunks = [MagicMock(choices=[], usage=None)]
+    for content in ["mock ", "content"]:
+        chunk = MagicMock(usage=None)
+        chunk.choices[0].delta.content = content
+        chunks.append(chunk)
+    chunks.append(
+        MagicMock(choices=[], usage=MagicMock(prompt_tokens=100, completion_tokens=2))
+    )
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    llm_helper_mock.aget_chat_completion = AsyncMock(return_value=stream())
+    tool = QuestionAnswerTool()
+
+    # when
+    with patch(
+        "backend.batch.utilities.tools.question_answer_tool.Search.aget_source_documents",
+        AsyncMock(return_value=get_source_documents_mock.return_value),
+    ):
+        answer, text_stream = await tool.aanswer_question_stream("mock question", [])
+
+    # then
+    assert answer.source_documents == get_source_documents_mock.return_value
+    assert answer.answer == ""
+    llm_helper_mock.aget_chat_completion.assert_not_called()
+
+    assert [text async for text in text_stream] == ["mock ", "content"]
+    llm_helper_mock.aget_chat_completion.assert_awaited_once_with(
+        ANY, model=None, temperature=0, stream=True
+    )
+    assert answer.answer == "mock content"
+    assert answer.prompt_tokens == 100
+    assert answer.completion_tokens == 2
+
+
 def test_answer_question_returns_answer():
     # given
     tool = QuestionAnswerTool()
@@ -426,3 +502,81 @@ def test_limit_number_of_images_passed_to_llm(
         model="mock vision model",
         temperature=0,
     )
+
+
+@pytest.fixture
+def semantic_answer_cache_enabled(llm_helper_mock: MagicMock):
+    with patch(
+        "backend.batch.utilities.helpers.semantic_answer_cache.EnvHelper"
+    ) as mock:
+        env_helper = mock.return_value
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE = "memory"
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_THRESHOLD = 0.95
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_TTL = 3600
+        env_helper.AZURE_SEMANTIC_ANSWER_CACHE_MAX_ENTRIES = 10
+
+        llm_helper_mock.get_embedding_model_key.return_value = "mock embedding model"
+        llm_helper_mock.generate_embeddings.return_value = [1.0, 0.0]
+        llm_helper_mock.get_chat_completion.return_value.choices[
+            0
+        ].message.content = "mock answer [doc1]"
+
+        yield
+
+
+def test_answer_question_answers_similar_questions_from_the_cache(
+    semantic_answer_cache_enabled, llm_helper_mock: MagicMock
+):
+    # given
+    tool = QuestionAnswerTool()
+    tool.answer_question("mock question", [])
+
+    # when
+    answer = tool.answer_question("mock question?", [])
+
+    # then
+    llm_helper_mock.get_chat_completion.assert_called_once()
+    assert answer.question == "mock question?"
+    assert answer.answer == "mock answer [doc1]"
+    assert answer.prompt_tokens == 0
+    assert answer.completion_tokens == 0
+
+
+def test_answer_question_does_not_use_the_cache_for_another_conversation(
+    semantic_answer_cache_enabled, llm_helper_mock: MagicMock
+):
+    # given
+    tool = QuestionAnswerTool()
+    tool.answer_question("mock question", [])
+
+    # when
+    tool.answer_question(
+        "mock question",
+        [
+            {"role": "user", "content": "mock previous question"},
+            {"role": "assistant", "content": "mock previous answer"},
+        ],
+    )
+
+    # then
+    assert llm_helper_mock.get_chat_completion.call_count == 2
+
+
+def test_answer_question_does_not_use_the_cache_when_cited_documents_changed(
+    semantic_answer_cache_enabled,
+    llm_helper_mock: MagicMock,
+    get_source_documents_mock: MagicMock,
+):
+    # given
+    tool = QuestionAnswerTool()
+    tool.answer_question("mock question", [])
+    get_source_documents_mock.return_value = [
+        SourceDocument(id="mock id", content="mock updated content", source="source")
+    ]
+
+    # when
+    answer = tool.answer_question("mock question", [])
+
+    # then
+    assert llm_helper_mock.get_chat_completion.call_count == 2
+    assert answer.prompt_tokens == 100